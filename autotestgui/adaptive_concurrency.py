@@ -0,0 +1,382 @@
+"""
+Adaptive Concurrency
+
+A fixed number of cases and pool threads is wrong both ways: too many and
+SQL Server or the disk saturates and every step slows down, too few and the
+machine sits idle. With adaptive concurrency a parallel run starts small and
+a controller adjusts the limits while it runs, the way TCP sizes its window.
+Every interval it looks at:
+
+- the latency of the steps each resource pool ran, compared with the best
+  latency seen for the same step type during the run
+- host CPU, memory and disk pressure (psutil)
+
+A limit that was fully used while more work waited grows: it doubles until
+the first congestion of the run (slow start), then grows by one (additive
+increase). A pool whose steps got markedly slower is cut by the backoff
+factor (multiplicative decrease), and host
+pressure cuts the limits it concerns: CPU the cpu pool and the cases, disk
+the file_io pool and the cases, memory everything. Nothing grows while the
+host is under pressure. The wait pool does not
+react to latency, since waiting steps are slow by design.
+
+The limits chosen over time are written to the summary file and to the
+combined HTML report.
+"""
+import collections
+import concurrent.futures
+import configparser
+import statistics
+import threading
+import time
+
+import psutil
+
+from resource_pools import CONFIG_PATH, CPU, FILE_IO, WAIT
+
+# Cases in flight when a run starts; the limit grows from there
+INITIAL_CASES = 4
+
+# Latency samples a pool needs within one interval to judge congestion
+MIN_SAMPLES = 3
+
+# Latency increases below this many seconds are noise, not congestion
+MIN_LATENCY_DELTA = 0.05
+
+DEFAULT_SETTINGS = {
+    "interval": 2.0,
+    "cpu_high": 90.0,
+    "memory_high": 90.0,
+    "disk_high": 90.0,
+    "latency_tolerance": 1.5,
+    "backoff": 0.7,
+    "max_growth": 4,
+}
+
+
+def load_adaptive_concurrency(path=CONFIG_PATH):
+    """
+    Read the [adaptive_concurrency] section of config.ini
+
+    Returns:
+        (enabled, settings): settings are keyword arguments for ConcurrencyController
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    enabled = parser.getboolean("adaptive_concurrency", "enabled", fallback=False)
+    settings = dict(DEFAULT_SETTINGS)
+    for key, default in DEFAULT_SETTINGS.items():
+        getter = parser.getint if isinstance(default, int) else parser.getfloat
+        try:
+            settings[key] = getter("adaptive_concurrency", key, fallback=default)
+        except ValueError:
+            pass
+    return enabled, settings
+
+
+def host_pressure(previous_disk, interval):
+    """
+    Sample host CPU, memory and disk utilisation
+
+    Args:
+        previous_disk: psutil disk counters of the previous sample, or None
+        interval: Seconds since the previous sample
+
+    Returns:
+        (cpu %, memory %, disk busy % or None, disk counters)
+    """
+    cpu = psutil.cpu_percent(interval=None)
+    memory = psutil.virtual_memory().percent
+    try:
+        disk_counters = psutil.disk_io_counters()
+    except (OSError, RuntimeError):
+        disk_counters = None
+    disk = None
+    if disk_counters is not None and previous_disk is not None and interval > 0:
+        if hasattr(disk_counters, "busy_time"):
+            busy_ms = disk_counters.busy_time - previous_disk.busy_time
+        else:
+            # Windows has no busy time; time spent in reads and writes is close
+            busy_ms = (disk_counters.read_time - previous_disk.read_time
+                       + disk_counters.write_time - previous_disk.write_time)
+        disk = min(100.0, max(0.0, busy_ms / (interval * 1000) * 100))
+    return cpu, memory, disk, disk_counters
+
+
+class _CaseGate:
+    """Admits cases in submission order while fewer than `limit` are running"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.active = 0
+        self._waiting = collections.deque()
+        self._lock = threading.Lock()
+        self._open = False
+
+    def _admit(self):
+        # Caller holds the lock
+        while self._waiting and (self._open or self.active < self.limit):
+            self.active += 1
+            self._waiting.popleft().set()
+
+    def acquire(self):
+        with self._lock:
+            if not self._waiting and (self._open or self.active < self.limit):
+                self.active += 1
+                return
+            admitted = threading.Event()
+            self._waiting.append(admitted)
+        admitted.wait()
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+            self._admit()
+
+    def set_limit(self, limit):
+        with self._lock:
+            self.limit = limit
+            self._admit()
+
+    def open(self):
+        """Admit every case; used once the run is cancelled, so waiting cases finish quickly"""
+        with self._lock:
+            self._open = True
+            self._admit()
+
+    def load(self):
+        """Return (running cases, waiting cases)"""
+        with self._lock:
+            return self.active, len(self._waiting)
+
+
+class ConcurrencyController:
+    """Adjusts the number of cases in flight and the resource pool sizes during a run"""
+
+    def __init__(self, max_cases, interval=2.0, cpu_high=90.0, memory_high=90.0, disk_high=90.0,
+                 latency_tolerance=1.5, backoff=0.7, max_growth=4, output=None):
+        """
+        Args:
+            max_cases: Upper limit of cases in flight
+            interval: Seconds between adjustments
+            cpu_high: CPU utilisation (%) counted as pressure
+            memory_high: Memory utilisation (%) counted as pressure
+            disk_high: Disk busy time (%) counted as pressure
+            latency_tolerance: Step latency, relative to the best seen, counted as congestion
+            backoff: Factor a limit is multiplied by on congestion
+            max_growth: Pools grow to at most this multiple of their configured size
+            output: Optional callable receiving a line for every change
+        """
+        self.max_cases = max(1, max_cases)
+        self.interval = interval
+        self.cpu_high = cpu_high
+        self.memory_high = memory_high
+        self.disk_high = disk_high
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.max_growth = max_growth
+        self._output = output
+        self.gate = _CaseGate(min(INITIAL_CASES, self.max_cases))
+        self.pools = None
+        self._pool_limits = {}
+        self._samples = collections.defaultdict(list)
+        self._best = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._dispatch = None
+        self._start_time = None
+        self._disk = None
+        # Limits double while saturated until the first congestion of the run
+        self._slow_start = True
+        # Samples of the limits, one per change (see describe_timeline)
+        self.timeline = []
+
+    def observe(self, resource_class, fn, args, seconds):
+        """ResourcePools observer: record the latency of a finished step"""
+        # The step executors take the step type first; steps compare with their own type
+        key = args[0] if args and isinstance(args[0], str) else getattr(fn, "__qualname__", repr(fn))
+        with self._lock:
+            self._samples[resource_class].append((key, seconds))
+
+    def start(self, pools=None, cancel_token=None):
+        """
+        Start adjusting
+
+        Args:
+            pools: Optional ResourcePools created with observer=self.observe;
+                   without them only the number of cases adapts
+            cancel_token: Optional CancellationToken of the run; once
+                          cancelled, waiting cases start at once
+        """
+        self.pools = pools
+        if pools is not None:
+            self._pool_limits = {name: (1, max(1, pools.sizes[name] * self.max_growth))
+                                 for name in pools.resizable()}
+        if cancel_token is not None:
+            cancel_token.add_callback(self.gate.open)
+        self._start_time = time.monotonic()
+        psutil.cpu_percent(interval=None)  # The first reading only sets the reference point
+        _, _, _, self._disk = host_pressure(None, 0)
+        self._record(None, None, None, "start")
+        self._dispatch = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="case-gate")
+        self._thread = threading.Thread(target=self._control_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop adjusting and record the final limits"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._dispatch is not None:
+            self._dispatch.shutdown(wait=False)
+        self._record(None, None, None, "end")
+
+    def submit_case(self, start, *args):
+        """
+        Start a case once a case slot is free, in submission order
+
+        Args:
+            start: Callable starting the case and returning a Future of its result
+            args: Arguments for start
+
+        Returns:
+            concurrent.futures.Future: Resolves to the result of the case
+        """
+        future = concurrent.futures.Future()
+
+        def dispatch():
+            self.gate.acquire()
+            try:
+                started = start(*args)
+            except Exception as e:
+                self.gate.release()
+                future.set_exception(e)
+                return
+
+            def finished(started):
+                self.gate.release()
+                try:
+                    future.set_result(started.result())
+                except Exception as e:
+                    future.set_exception(e)
+            started.add_done_callback(finished)
+
+        self._dispatch.submit(dispatch)
+        return future
+
+    def _latency_ratio(self, samples):
+        """Return the median latency relative to the best seen for each step type, or None"""
+        if len(samples) < MIN_SAMPLES:
+            return None
+        ratios = []
+        by_type = collections.defaultdict(list)
+        for key, seconds in samples:
+            by_type[key].append(seconds)
+        for key, values in by_type.items():
+            mean = statistics.fmean(values)
+            best = self._best.get(key)
+            if best is None or mean < best:
+                self._best[key] = best = mean
+            if mean - best < MIN_LATENCY_DELTA:
+                ratios.append(1.0)
+            else:
+                ratios.append(mean / best if best > 0 else self.latency_tolerance)
+        return statistics.median(ratios)
+
+    def _control_loop(self):
+        last = time.monotonic()
+        while not self._stopped.wait(self.interval):
+            now = time.monotonic()
+            try:
+                self._adjust(now - last)
+            except Exception as e:
+                if self._output is not None:
+                    self._output(f"⚠️ Adaptive concurrency: {e}\n")
+            last = now
+
+    def _adjust(self, elapsed):
+        cpu, memory, disk, self._disk = host_pressure(self._disk, elapsed)
+        pressure = []
+        if cpu >= self.cpu_high:
+            pressure.append(f"cpu {cpu:.0f}%")
+        if memory >= self.memory_high:
+            pressure.append(f"memory {memory:.0f}%")
+        if disk is not None and disk >= self.disk_high:
+            pressure.append(f"disk {disk:.0f}%")
+        if pressure:
+            self._slow_start = False
+        with self._lock:
+            samples, self._samples = self._samples, collections.defaultdict(list)
+
+        changes = []
+        if self.pools is not None:
+            for name, (low, high) in self._pool_limits.items():
+                limit = self.pools.sizes[name]
+                running, queued = self.pools.load(name)
+                ratio = None if name == WAIT else self._latency_ratio(samples.get(name, []))
+                hit = (memory >= self.memory_high
+                       or (name == CPU and cpu >= self.cpu_high)
+                       or (name == FILE_IO and disk is not None and disk >= self.disk_high))
+                if hit or (ratio is not None and ratio >= self.latency_tolerance):
+                    new_limit = max(low, int(limit * self.backoff))
+                    why = "host pressure" if hit else f"latency x{ratio:.1f}"
+                    self._slow_start = False
+                elif running >= limit and queued and not pressure:
+                    new_limit, why = self._grow(limit, high), "saturated"
+                else:
+                    continue
+                if new_limit != limit:
+                    self.pools.resize(name, new_limit)
+                    changes.append(f"{name} {limit}→{new_limit} ({why})")
+
+        limit = self.gate.limit
+        running, waiting = self.gate.load()
+        if pressure:
+            new_limit = max(1, int(limit * self.backoff))
+        elif running >= limit and waiting:
+            new_limit = self._grow(limit, self.max_cases)
+        else:
+            new_limit = limit
+        if new_limit != limit:
+            self.gate.set_limit(new_limit)
+            changes.append(f"cases {limit}→{new_limit}" + (f" ({', '.join(pressure)})" if pressure else ""))
+
+        if changes:
+            self._record(cpu, memory, disk, "; ".join(changes))
+            if self._output is not None:
+                self._output(f"⚙️ Concurrency: {'; '.join(changes)}\n")
+
+    def _grow(self, limit, high):
+        return min(high, limit * 2 if self._slow_start else limit + 1)
+
+    def _record(self, cpu, memory, disk, change):
+        self.timeline.append({
+            'time': time.monotonic() - self._start_time,
+            'cases': self.gate.limit,
+            'pools': {name: self.pools.sizes[name] for name in self._pool_limits} if self.pools else {},
+            'cpu': cpu, 'memory': memory, 'disk': disk,
+            'change': change,
+        })
+
+
+def describe_timeline(timeline):
+    """
+    Describe the limits chosen during a run for the summary file
+
+    Args:
+        timeline: ConcurrencyController.timeline
+
+    Returns:
+        str: One line per change
+    """
+    lines = ["Adaptive concurrency (limits over time):"]
+    for sample in timeline:
+        limits = " ".join([f"cases={sample['cases']}"] + [f"{name}={size}" for name, size in sample['pools'].items()])
+        host = ""
+        if sample['cpu'] is not None:
+            host = f"  cpu {sample['cpu']:.0f}% memory {sample['memory']:.0f}%"
+            if sample['disk'] is not None:
+                host += f" disk {sample['disk']:.0f}%"
+        lines.append(f"  {sample['time']:7.1f}s  {limits}{host}  {sample['change']}")
+    return "\n".join(lines)
@@ -0,0 +1,170 @@
+"""
+Asyncio Test Case Runner
+
+An event-loop engine for CaseRunner. Step delays, the Check Log File
+"Wait Before Search" pause, Wait for File polling and waited-for commands and
+processes are asyncio timers and subprocesses, so a waiting case holds no OS
+thread and one process can run thousands of waiting cases at once. Step types
+without an async implementation run on worker threads (or the resource pools)
+and report exactly as they do in the threaded engine.
+"""
+import asyncio
+from datetime import datetime
+import time
+
+from case_runner import CancellationToken, CaseRunner, registry, use_token
+from condition_handler import ConditionHandler
+from step_watchdog import GRACE_PERIOD, StepTimeout
+
+
+class AsyncCaseRunner(CaseRunner):
+    """Runs one test case as a coroutine on an asyncio event loop"""
+
+    async def run_async(self):
+        """
+        Execute all steps and write the case reports
+
+        Returns:
+            dict: Structured result, as returned by CaseRunner.run()
+        """
+        self.emit(f"▶ Running test case: {self.name}")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_lines = [f"[{timestamp}] Running {self.name}"]
+        html_rows = {}
+
+        result = None
+        case_dir = await asyncio.to_thread(self._open_case_dir)
+        try:
+            try:
+                if self.parallel_steps:
+                    step_results = await self._run_step_graph_async(log_lines, html_rows)
+                else:
+                    step_results = await self._run_sequential_async(log_lines, html_rows)
+            finally:
+                self.cancel_token.detach()
+
+            html_report = [html_rows[index] for index in sorted(html_rows)]
+            # Report files are written on a worker thread to keep the loop free
+            result = await asyncio.to_thread(self._finish, log_lines, html_report, step_results)
+        finally:
+            self._close_case_dir(case_dir, result)
+        return result
+
+    async def _run_sequential_async(self, log_lines, html_rows):
+        """Run the steps one after another in step order"""
+        condition_handler = ConditionHandler()
+        condition_handler.reset_history()
+        step_results = []
+        for step in self.plan.steps:
+            step_result = self._step_finished(await self._run_step_async(step, condition_handler, log_lines, html_rows))
+            condition_handler.record_step_result(step.index, step.name, step_result['result'],
+                                                 was_skipped=step_result['result'] is None)
+            step_results.append(step_result)
+        return step_results
+
+    async def _run_step_graph_async(self, log_lines, html_rows):
+        """Run independent steps concurrently as tasks (see CaseRunner._run_step_graph)"""
+        graph = self._build_step_graph()
+        pending = {step.index: step for step in self.plan.steps}
+        finished = {}
+        running = {}
+        # Same per-case limit as the threaded engine
+        slots = asyncio.Semaphore(self.step_workers)
+
+        async def run_step(step, handler):
+            async with slots:
+                return await self._run_step_async(step, handler, log_lines, html_rows)
+
+        while pending or running:
+            for index in self._ready_steps(pending, graph, finished):
+                step = pending.pop(index)
+                task = asyncio.ensure_future(run_step(step, self._condition_handler_for(step, finished)))
+                running[task] = index
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                finished[running.pop(task)] = self._step_finished(task.result())
+
+        return [finished[index] for index in sorted(finished)]
+
+    async def _run_step_async(self, step, condition_handler, log_lines, html_rows):
+        """Evaluate the run condition of one step and execute it (see CaseRunner._run_step)"""
+        if step.index in self.carry_over:
+            return self._carry_over_step(step, log_lines, html_rows)
+        step_result = self._new_step_result(step)
+        step_start_time = time.time()
+        try:
+            if not self._should_run(step, condition_handler, log_lines, html_rows):
+                return step_result
+
+            step_start_time = time.time()
+            delay_msg = self._start_delay(step)
+            if delay_msg:
+                await self.cancel_token.sleep_async(step.delay)
+                log_lines.append(f"[{datetime.now()}] {delay_msg}")
+            self._announce_step(step, log_lines)
+            # Fingerprinting reads files, so it stays off the event loop
+            if self.step_cache is not None and await asyncio.to_thread(self._cached, step):
+                self._record_cached(step, step_result, step_start_time, log_lines, html_rows)
+                return step_result
+
+            passed = await self.execute_step_async(step.step_type, step.details, log_lines,
+                                                   self._timeout_for(step))
+            self._record_outcome(step, step_result, passed, step_start_time, log_lines, html_rows)
+            if passed and self.step_cache is not None:
+                await asyncio.to_thread(self._remember, step)
+        except Exception as e:
+            self._record_error(step, step_result, e, step_start_time, log_lines, html_rows)
+        return step_result
+
+    async def execute_step_async(self, step_type, details, log_lines, timeout=None):
+        """
+        Execute one step, waiting on the event loop where the step type allows
+
+        Args:
+            step_type: Step type name
+            details: Step details dict
+            log_lines: Log list to append to
+            timeout: Optional limit in seconds; raises StepTimeout when exceeded
+
+        Returns:
+            bool: True if the step passed
+        """
+        if step_type == "Check Log File":
+            wait_msg = self._start_log_check_wait(details)
+            if wait_msg:
+                await self.cancel_token.sleep_async(int(details.get("delay", 0)))
+                log_lines.append(f"[{datetime.now()}] {wait_msg}")
+
+        registered = registry.get_step_type(step_type) if registry is not None else None
+        if registered is not None and registered.execute_async is not None:
+            self.cancel_token.raise_if_cancelled()
+            token = CancellationToken(parent=self.cancel_token) if timeout else self.cancel_token
+            try:
+                with use_token(token):
+                    success_result, message, output = await self._run_watched_async(
+                        registered.run_async(details), timeout, token)
+            finally:
+                if token is not self.cancel_token:
+                    token.detach()
+            return self._report_step_output(success_result, message, output, log_lines)
+
+        return await asyncio.to_thread(self._dispatch_step, step_type, details, log_lines, timeout)
+
+    @staticmethod
+    async def _run_watched_async(coroutine, timeout, token):
+        """Event-loop version of step_watchdog.run_watched"""
+        if not timeout:
+            return await coroutine
+        task = asyncio.ensure_future(coroutine)
+        done, _ = await asyncio.wait([task], timeout=timeout)
+        if done:
+            return task.result()
+        # Let the step kill its subprocess or end its wait, then drop it
+        token.cancel(f"Timed out after {timeout}s")
+        done, _ = await asyncio.wait([task], timeout=GRACE_PERIOD)
+        if done:
+            task.exception()  # Retrieved so a late failure is not reported as unhandled
+        else:
+            task.cancel()
+        raise StepTimeout(timeout)
@@ -0,0 +1,104 @@
+"""
+Per-Case Run History
+
+Durations and outcomes of past runs are persisted per test case in
+TestReports/case_history.json so later runs can schedule the longest cases
+first, split suites into balanced shards (see sharding) or run the cases and
+steps most likely to fail first (see failure_ordering).
+"""
+import json
+import os
+import tempfile
+
+import reporting
+
+HISTORY_PATH = os.path.join(reporting.REPORT_OUTPUT_FOLDER, "case_history.json")
+
+# Number of recent durations kept per case; estimates use their mean
+MAX_DURATIONS = 5
+
+# Number of recent outcomes (1 = failed, 0 = passed) kept per case and step
+MAX_OUTCOMES = 20
+
+FAILED_RESULTS = ("FAIL", "ERROR", "TIMEOUT")
+
+
+def load_history(path=HISTORY_PATH):
+    """
+    Load the run history
+
+    Returns:
+        dict: Case name -> {"durations": [...], "steps": int, "outcomes": [...],
+                            "step_outcomes": {step number: [...]}}
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            history = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return history if isinstance(history, dict) else {}
+
+
+def save_history(history, path=HISTORY_PATH):
+    """Write the history atomically so concurrent runs never leave a torn file"""
+    # A temp file of its own, also for runs sharing a process (the runner daemon)
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp",
+                                    dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def record_results(results, path=HISTORY_PATH):
+    """
+    Add the durations and outcomes of finished cases to the history
+
+    Cases without executed steps (errors before the run started) are skipped.
+    A case adds a duration only when its time is a real run of the case: not
+    when it was cancelled, and not when most of its steps were cached or kept
+    from a previous run. Cancelled cases add no outcome either. Steps add an
+    outcome only when they were executed in this run (not skipped, cached or
+    kept from a previous run).
+
+    Args:
+        results: Structured case results as returned by CaseRunner.run()
+    """
+    # Re-read right before writing so shards finishing together lose little
+    history = load_history(path)
+    for result in results:
+        steps = result.get('steps') or []
+        if not steps:
+            continue
+        if str(result.get('status', '')).startswith("CANCELLED"):
+            continue
+        entry = history.setdefault(result['name'], {})
+        reused = sum(1 for step in steps if step.get('cached') or step.get('carried_over'))
+        executed = sum(1 for step in steps if step['result'] is not None) - reused
+        if executed > reused:
+            durations = entry.get("durations", []) + [round(result['execution_time'], 3)]
+            entry["durations"] = durations[-MAX_DURATIONS:]
+            entry["steps"] = len(steps)
+        entry["outcomes"] = (entry.get("outcomes", []) + [0 if result['success'] else 1])[-MAX_OUTCOMES:]
+        step_outcomes = entry.setdefault("step_outcomes", {})
+        for step in steps:
+            if step['result'] is None or step.get('cached') or step.get('carried_over'):
+                continue
+            key = str(step['index'])
+            failed = 1 if step['result'] in FAILED_RESULTS else 0
+            step_outcomes[key] = (step_outcomes.get(key, []) + [failed])[-MAX_OUTCOMES:]
+    try:
+        save_history(history, path)
+    except OSError:
+        pass
+
+
+def average_duration(entry):
+    """Return the mean recorded duration of a history entry, or None"""
+    durations = entry.get("durations") if entry else None
+    if not durations:
+        return None
+    return sum(durations) / len(durations)
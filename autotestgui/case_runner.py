@@ -0,0 +1,649 @@
+"""
+Headless Test Case Runner
+
+This module executes a single compiled test case (see execution_plan). It holds
+the run loop that used to live inside the GUI, so the same step semantics,
+ConditionHandler evaluation and report output are shared by the Tk runner and
+the command-line suite runner.
+"""
+import concurrent.futures
+import os
+import sys
+import time
+from datetime import datetime
+
+from case_sandbox import expand_case_dir, persistent_case_dir, uses_case_dir
+from condition_handler import ConditionHandler
+from execution_plan import CasePlan, thaw
+from fail_fast import FailFastPolicy
+import reporting
+import resource_pools
+from step_graph import build_step_graph, ignored_dependencies
+from step_watchdog import TIMEOUT, StepTimeout, run_watched
+
+# Add parent directory to path so the step_types package can be imported
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from step_types import registry
+    STEP_TYPES_IMPORT_ERROR = None
+except ImportError as e:
+    # Reported by every step instead of failing the whole run
+    registry = None
+    STEP_TYPES_IMPORT_ERROR = e
+from step_types.cancellation import CancellationToken, Cancelled, use_token
+from step_types.fixtures import USE_FIXTURE, use_fixtures
+
+# Maximum concurrent steps of one case in parallel-steps mode
+DEFAULT_STEP_WORKERS = 8
+
+
+class CaseRunner:
+    """Runs one test case and produces its structured result and reports"""
+
+    def __init__(self, plan, output=None, pools=None, parallel_steps=False, step_workers=DEFAULT_STEP_WORKERS,
+                 refresh_combined=True, cancel_token=None, fail_fast=None, step_timeout=None,
+                 step_cache=None, carry_over=None, fixtures=None, step_priority=None, on_step=None,
+                 sandboxes=None, on_step_start=None):
+        """
+        Args:
+            plan: CasePlan compiled by execution_plan.compile_case()
+            output: Callable receiving console text (defaults to print)
+            pools: Optional ResourcePools; steps then run on the pool of
+                   their resource class instead of the case thread
+            parallel_steps: Run independent steps concurrently (see step_graph)
+            step_workers: Maximum concurrent steps when parallel_steps is set
+            refresh_combined: Rewrite the combined dashboard when the case
+                              finishes (the suite runner writes it once at the end)
+            cancel_token: Optional CancellationToken of the suite; cancelling
+                          it stops this case
+            fail_fast: Optional FailFastPolicy (see fail_fast)
+            step_timeout: Default timeout in seconds for steps without their
+                          own Step Timeout (None or 0 = no limit)
+            step_cache: Optional StepCache of an incremental run; passing
+                        steps with unchanged inputs are not executed again
+            carry_over: Optional dict of step number -> step result of the
+                        previous run; those steps are not executed and keep
+                        their result (see last_run)
+            fixtures: Optional SuiteFixtures the Use Fixture steps of the
+                      case refer to (see suite_fixtures)
+            step_priority: Optional dict of step number -> priority; with
+                           parallel_steps, ready steps start highest first
+                           (see failure_ordering)
+            on_step: Optional callable receiving each step result as soon
+                     as the step has finished or was skipped
+            sandboxes: Optional CaseSandboxes; ${CASE_DIR} in the step
+                       details is then a fresh scratch directory, removed
+                       after the case (see case_sandbox)
+            on_step_start: Optional callable receiving the step number of
+                           each step as it starts executing
+        """
+        self.plan = plan
+        self.name = plan.name
+        self._output = output or (lambda text: print(text, end=""))
+        self.pools = pools
+        self.parallel_steps = parallel_steps
+        self.step_workers = step_workers
+        self.refresh_combined = refresh_combined
+        # The case follows the suite token; a Critical failure cancels only the case
+        self.cancel_token = CancellationToken(parent=cancel_token)
+        self.fail_fast = fail_fast or FailFastPolicy()
+        self.step_timeout = step_timeout or None
+        self.step_cache = step_cache
+        self.carry_over = carry_over or {}
+        self.fixtures = fixtures
+        self.step_priority = step_priority or {}
+        self.on_step = on_step
+        self.sandboxes = sandboxes
+        self.on_step_start = on_step_start
+        self._aborted = False
+        self._interrupted = False
+
+    @staticmethod
+    def resource_class(step_type):
+        """Return the resource class registered for a step type (file I/O if unknown)"""
+        registered = registry.get_step_type(step_type) if registry is not None else None
+        if registered is None:
+            return resource_pools.FILE_IO
+        return registered.resource_class
+
+    def emit(self, text):
+        """Send a line of console output"""
+        self._output(text + "\n")
+
+    def run(self):
+        """
+        Execute all steps and write the case reports
+
+        Returns:
+            dict: Structured result with keys 'name', 'success', 'status',
+                  'steps', 'execution_time' and 'report'
+        """
+        self.emit(f"▶ Running test case: {self.name}")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_lines = [f"[{timestamp}] Running {self.name}"]
+
+        # Step rows for the HTML report, keyed by step number so rows stay in
+        # step order when steps finish out of order
+        html_rows = {}
+
+        result = None
+        case_dir = self._open_case_dir()
+        try:
+            try:
+                if self.parallel_steps:
+                    step_results = self._run_step_graph(log_lines, html_rows)
+                else:
+                    step_results = self._run_sequential(log_lines, html_rows)
+            finally:
+                self.cancel_token.detach()
+
+            html_report = [html_rows[index] for index in sorted(html_rows)]
+            result = self._finish(log_lines, html_report, step_results)
+        finally:
+            self._close_case_dir(case_dir, result)
+        return result
+
+    def _open_case_dir(self):
+        """
+        Create the ${CASE_DIR} of the case and point its steps at it
+
+        Returns:
+            str: The directory, or None if no step refers to ${CASE_DIR}
+        """
+        if not uses_case_dir(self.plan):
+            return None
+        if self.sandboxes is not None:
+            case_dir = self.sandboxes.create(self.name)
+        else:
+            case_dir = persistent_case_dir(self.name)
+        self.plan = expand_case_dir(self.plan, case_dir)
+        self.emit(f"📁 ${{CASE_DIR}}: {case_dir}")
+        return case_dir
+
+    def _close_case_dir(self, case_dir, result):
+        """Hand the sandbox of the finished case to the background cleanup"""
+        if case_dir is None or self.sandboxes is None:
+            return
+        if self.sandboxes.release(case_dir, result is not None and result['success']):
+            self.emit(f"📁 Sandbox kept for inspection: {case_dir}")
+
+    def _run_sequential(self, log_lines, html_rows):
+        """Run the steps one after another in step order"""
+        condition_handler = ConditionHandler()
+        condition_handler.reset_history()
+        step_results = []
+        for step in self.plan.steps:
+            step_result = self._step_finished(self._run_step(step, condition_handler, log_lines, html_rows))
+            condition_handler.record_step_result(step.index, step.name, step_result['result'],
+                                                 was_skipped=step_result['result'] is None)
+            step_results.append(step_result)
+        return step_results
+
+    def _build_step_graph(self):
+        """Build the step dependency graph, warning about ignored Depends On entries"""
+        for step in self.plan.steps:
+            ignored = ignored_dependencies(step)
+            if ignored:
+                self.emit(f"⚠ Step {step.index}: ignoring Depends On {ignored} (only earlier steps can be dependencies)")
+        return build_step_graph(self.plan)
+
+    def _condition_handler_for(self, step, finished):
+        """Return a ConditionHandler holding the finished steps before a step"""
+        handler = ConditionHandler()
+        for earlier in sorted(i for i in finished if i < step.index):
+            result = finished[earlier]['result']
+            handler.record_step_result(earlier, finished[earlier]['name'], result, was_skipped=result is None)
+        return handler
+
+    def _ready_steps(self, pending, graph, finished):
+        """Return the pending steps whose dependencies have finished, highest priority first"""
+        ready = [index for index in sorted(pending) if graph[index] <= finished.keys()]
+        # Stable sort: equal priorities keep step order
+        return sorted(ready, key=lambda index: -self.step_priority.get(index, 0))
+
+    def _run_step_graph(self, log_lines, html_rows):
+        """
+        Run independent steps concurrently
+
+        A step starts as soon as every step it depends on (see step_graph)
+        has finished. Its run condition is then evaluated against the results
+        of all finished earlier steps, which always include the steps the
+        condition looks at.
+        """
+        graph = self._build_step_graph()
+
+        pending = {step.index: step for step in self.plan.steps}
+        finished = {}
+        running = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.step_workers,
+                                                   thread_name_prefix=f"steps-{self.name}") as executor:
+            while pending or running:
+                for index in self._ready_steps(pending, graph, finished):
+                    step = pending.pop(index)
+                    handler = self._condition_handler_for(step, finished)
+                    future = executor.submit(self._run_step, step, handler, log_lines, html_rows)
+                    running[future] = index
+
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    finished[running.pop(future)] = self._step_finished(future.result())
+
+        return [finished[index] for index in sorted(finished)]
+
+    def _run_step(self, step, condition_handler, log_lines, html_rows):
+        """
+        Evaluate the run condition of one step and execute it
+
+        Args:
+            step: StepPlan
+            condition_handler: ConditionHandler holding the earlier results
+            log_lines: Log list to append to
+            html_rows: Dict of step number -> HTML report row
+
+        Returns:
+            dict: Step result; 'result' is None when the step was skipped
+        """
+        if step.index in self.carry_over:
+            return self._carry_over_step(step, log_lines, html_rows)
+        step_result = self._new_step_result(step)
+        step_start_time = time.time()
+        try:
+            if not self._should_run(step, condition_handler, log_lines, html_rows):
+                return step_result
+
+            step_start_time = time.time()
+            delay_msg = self._start_delay(step)
+            if delay_msg:
+                self.cancel_token.sleep(step.delay)
+                log_lines.append(f"[{datetime.now()}] {delay_msg}")
+            self._announce_step(step, log_lines)
+            if self._cached(step):
+                self._record_cached(step, step_result, step_start_time, log_lines, html_rows)
+                return step_result
+
+            passed = self.execute_step(step.step_type, step.details, log_lines, self._timeout_for(step))
+            self._record_outcome(step, step_result, passed, step_start_time, log_lines, html_rows)
+            if passed:
+                self._remember(step)
+        except Exception as e:
+            self._record_error(step, step_result, e, step_start_time, log_lines, html_rows)
+        return step_result
+
+    def _step_finished(self, step_result):
+        """Pass a step result to the on_step callback and return it"""
+        if self.on_step is not None:
+            try:
+                self.on_step(step_result)
+            except Exception:
+                pass
+        return step_result
+
+    def _cached(self, step):
+        """Return True if the step cache holds a pass for the step's current parameters and inputs"""
+        if self.step_cache is None or registry is None:
+            return False
+        return self.step_cache.lookup(registry.get_step_type(step.step_type), step.details)
+
+    def _remember(self, step):
+        """Add a passed step to the step cache"""
+        if self.step_cache is not None and registry is not None:
+            self.step_cache.store(registry.get_step_type(step.step_type), step.details)
+
+    def _timeout_for(self, step):
+        """Return the watchdog timeout of a step: its own Step Timeout or the suite default"""
+        return step.timeout or self.step_timeout
+
+    def _new_step_result(self, step):
+        return {
+            'index': step.index,
+            'name': step.name,
+            'type': step.step_type,
+            'category': step.category,
+            'run_condition': step.run_condition,
+            'result': None,
+            'execution_time': 0.0,
+        }
+
+    def _should_run(self, step, condition_handler, log_lines, html_rows):
+        """Evaluate the run condition of a step, reporting it if skipped"""
+        if self.cancel_token.cancelled:
+            self._interrupted = True
+            should_run, skip_reason = False, f"Cancelled: {self.cancel_token.reason}"
+        else:
+            should_run, skip_reason = condition_handler.should_run_step(
+                step.index, step.run_condition, len(self.plan.steps), step.target_step)
+        if not should_run:
+            msg = f"⏭ Step {step.index}: {step.name} [{step.category}]: SKIPPED - {skip_reason}"
+            self.emit(msg)
+            log_lines.append(f"[{datetime.now()}] {msg}")
+            html_rows[step.index] = reporting.skipped_row_html(msg)
+        return should_run
+
+    def _start_delay(self, step):
+        """
+        Announce the delay before a step
+
+        Returns:
+            str or None: The message to log once the delay is over, or None
+                         if the step has no delay
+        """
+        if step.error:
+            raise ValueError(step.error)
+        if step.delay > 0:
+            msg = f"⏱ Waiting {step.delay} seconds before Step {step.index}"
+            self.emit(msg)
+            return msg
+        return None
+
+    def _announce_step(self, step, log_lines):
+        msg = f"➡ Step {step.index}: {step.name} [{step.category}]: {step.step_type}"
+        self.emit(msg)
+        log_lines.append(f"[{datetime.now()}] {msg}")
+        if self.on_step_start is not None:
+            try:
+                self.on_step_start(step.index)
+            except Exception:
+                pass
+
+    def _record_outcome(self, step, step_result, passed, step_start_time, log_lines, html_rows):
+        if not passed and self.cancel_token.cancelled:
+            # The step failed because it was interrupted
+            self._record_error(step, step_result, Cancelled(self.cancel_token.reason),
+                               step_start_time, log_lines, html_rows)
+            return
+        i, step_name, category = step.index, step.name, step.category
+        step_execution_time = time.time() - step_start_time
+        step_result['result'] = "PASS" if passed else "FAIL"
+        step_result['execution_time'] = step_execution_time
+
+        result_msg = f"{'✔️' if passed else '❌'} Step {i}: {step_name} [{category}] {'passed' if passed else 'failed'} ({step_execution_time:.2f}s)"
+        self.emit(result_msg)
+        html_rows[i] = reporting.step_row_html(i, step_name, passed, step_execution_time, category)
+        log_lines.append(f"[{datetime.now()}] {result_msg}")
+        if not passed:
+            self._apply_fail_fast(step, step_result['result'], log_lines)
+
+    def _carry_over_step(self, step, log_lines, html_rows):
+        """Report a step that keeps its result from the previous run"""
+        step_result = dict(self.carry_over[step.index], carried_over=True)
+        i, step_name, category = step.index, step.name, step.category
+        if step_result['result'] is None:
+            msg = f"⏭ Step {i}: {step_name} [{category}]: SKIPPED - Skipped in the previous run"
+            html_rows[i] = reporting.skipped_row_html(msg)
+        else:
+            msg = f"↩ Step {i}: {step_name} [{category}] {step_result['result']} (previous run)"
+            html_rows[i] = reporting.step_row_html(i, step_name, step_result['result'] == "PASS",
+                                                   step_result['execution_time'], category)
+        self.emit(msg)
+        log_lines.append(f"[{datetime.now()}] {msg}")
+        return step_result
+
+    def _record_cached(self, step, step_result, step_start_time, log_lines, html_rows):
+        i, step_name, category = step.index, step.name, step.category
+        step_execution_time = time.time() - step_start_time
+        step_result['result'] = "PASS"
+        step_result['cached'] = True
+        step_result['execution_time'] = step_execution_time
+
+        msg = f"✔️ Step {i}: {step_name} [{category}] PASS (cached) ({step_execution_time:.2f}s)"
+        self.emit(msg)
+        html_rows[i] = reporting.step_row_html(i, step_name, True, step_execution_time, category, cached=True)
+        log_lines.append(f"[{datetime.now()}] {msg}")
+
+    def _record_error(self, step, step_result, e, step_start_time, log_lines, html_rows):
+        i, step_name, category = step.index, step.name, step.category
+        step_execution_time = time.time() - step_start_time
+        step_result['result'] = "ERROR"
+        step_result['execution_time'] = step_execution_time
+
+        if isinstance(e, StepTimeout):
+            step_result['result'] = TIMEOUT
+            msg = f"⌛ Step {i}: {step_name} [{category}] timed out after {e.timeout}s ({step_execution_time:.2f}s)"
+            self.emit(msg)
+            html_rows[i] = reporting.error_row_html(i, step_name, e, step_execution_time, category, status=TIMEOUT)
+            log_lines.append(f"[{datetime.now()}] {msg}")
+            self._apply_fail_fast(step, TIMEOUT, log_lines)
+            return
+        if isinstance(e, Cancelled):
+            self._interrupted = True
+            msg = f"⏹ Step {i}: {step_name} [{category}] cancelled: {e} ({step_execution_time:.2f}s)"
+            e = f"Cancelled: {e}"
+        else:
+            msg = f"❌ Error in Step {i}: {step_name}: {e} ({step_execution_time:.2f}s)"
+        self.emit(msg)
+        html_rows[i] = reporting.error_row_html(i, step_name, e, step_execution_time, category)
+        log_lines.append(f"[{datetime.now()}] {msg}")
+        self._apply_fail_fast(step, "ERROR", log_lines)
+
+    def _apply_fail_fast(self, step, result, log_lines):
+        """Cancel the rest of the case if the fail-fast policy says a failed step aborts it"""
+        reason = self.fail_fast.step_abort_reason(step, result)
+        if reason and self.cancel_token.cancel(reason):
+            self._aborted = True
+            self._log(f"⛔ {reason}: aborting test case", log_lines)
+
+    def cancel(self, reason="Cancelled"):
+        """Stop the case: running waits and commands are interrupted, later steps are skipped"""
+        self.cancel_token.cancel(reason)
+
+    def execute_step(self, step_type, details, log_lines, timeout=None):
+        """
+        Execute one step and report its outcome on the console and log
+
+        Args:
+            step_type: Step type name
+            details: Step details dict
+            log_lines: Log list to append to
+            timeout: Optional limit in seconds, enforced by the watchdog
+                     (see step_watchdog); raises StepTimeout when exceeded
+
+        Returns:
+            bool: True if the step passed
+        """
+        if step_type == "Check Log File":
+            # Wait on the case thread so the pause does not hold a pool slot
+            wait_msg = self._start_log_check_wait(details)
+            if wait_msg:
+                self.cancel_token.sleep(int(details.get("delay", 0)))
+                log_lines.append(f"[{datetime.now()}] {wait_msg}")
+        return self._dispatch_step(step_type, details, log_lines, timeout)
+
+    def _dispatch_step(self, step_type, details, log_lines, timeout=None):
+        """Run a step on the pool of its resource class, or inline without pools"""
+        if step_type == USE_FIXTURE:
+            # Waits for the fixture on the case thread, so the fixture's own
+            # steps (with their own timeouts) can take the pool slots
+            return self._execute_step(step_type, details, log_lines)
+        resource_class = self.resource_class(step_type)
+        in_process = self.pools is not None and self.pools.uses_processes(resource_class)
+        # A timed-out step is cancelled on its own token, not the whole case
+        token = CancellationToken(parent=self.cancel_token) if timeout else self.cancel_token
+        if in_process:
+            # Tokens cannot cross processes; these steps are short CPU work
+            token.raise_if_cancelled()
+            # Plan details are read-only mappings, which cannot be pickled
+            fn, args = execute_step_in_process, (step_type, thaw(details))
+        else:
+            fn, args = self._execute_step, (step_type, details, log_lines, token)
+
+        try:
+            if timeout:
+                result = run_watched(self.pools, resource_class, timeout, token, fn, *args)
+            elif self.pools is None:
+                result = fn(*args)
+            else:
+                result = self.pools.run(resource_class, fn, *args)
+        finally:
+            if token is not self.cancel_token:
+                token.detach()
+
+        if in_process:
+            passed, console_text, step_log = result
+            self._output(console_text)
+            log_lines.extend(step_log)
+            return passed
+        return result
+
+    def _execute_step(self, step_type, details, log_lines, token=None):
+        token = token or self.cancel_token
+        # The step may have waited for a pool slot
+        token.raise_if_cancelled()
+        if registry is None:
+            self._log(f"❌ Module import failed: {str(STEP_TYPES_IMPORT_ERROR)}. Install required dependencies.", log_lines)
+            return False
+        registered = registry.get_step_type(step_type)
+        if registered is None:
+            return True
+        # Operations interrupt their waits and subprocesses through the current token
+        with use_token(token), use_fixtures(self.fixtures):
+            success_result, message, output = registered.run(details, self._step_log(log_lines))
+        return self._report_step_output(success_result, message, output, log_lines)
+
+    def _report_step_output(self, success_result, message, output, log_lines):
+        """Report the (success, message, output) result of a step type"""
+        if message is None:
+            # The step type has logged its own progress
+            return success_result
+        icon = "✅" if success_result else "❌"
+        msg = f"{icon} {message}"
+        self.emit(msg)
+        if output and output != message:
+            self.emit(f"Output:\n{output}")
+
+        log_lines.append(f"[{datetime.now()}] {msg}")
+        if output and output != message:
+            log_lines.append(f"[{datetime.now()}] Output: {output}")
+        return success_result
+
+    def _log(self, msg, log_lines):
+        self.emit(msg)
+        log_lines.append(f"[{datetime.now()}] {msg}")
+
+    def _step_log(self, log_lines):
+        """Return the log(msg, console_only=False) writer passed to step executors"""
+        def log(msg, console_only=False):
+            if console_only:
+                self.emit(msg)
+            else:
+                self._log(msg, log_lines)
+        return log
+
+    def _start_log_check_wait(self, details):
+        """Announce the "Wait Before Search" pause of Check Log File, if any"""
+        log_delay = int(details.get("delay", 0))
+        if log_delay > 0:
+            msg = f"⏳ Waiting {log_delay}s before log check"
+            self.emit(msg)
+            return msg
+        return None
+
+    def _finish(self, log_lines, html_report, step_results):
+        """Build the execution summary, write the reports and return the result"""
+        executed = [s for s in step_results if s['result'] is not None]
+        total_steps = len(step_results)
+        executed_steps = len(executed)
+        skipped_steps = total_steps - executed_steps
+        success = all(s['result'] in (None, 'PASS') for s in step_results)
+        # Stopped from outside (Stop button, suite fail-fast) rather than by its own Critical step
+        cancelled = self._interrupted and not self._aborted
+        if cancelled:
+            success = False
+        total_execution_time = sum(s['execution_time'] for s in executed)
+        passed_steps = sum(1 for s in executed if s['result'] == 'PASS')
+        failed_steps = sum(1 for s in executed if s['result'] == 'FAIL')
+        # Timed-out steps count as errors in the reports
+        timeout_steps = sum(1 for s in executed if s['result'] == TIMEOUT)
+        error_steps = sum(1 for s in executed if s['result'] == 'ERROR') + timeout_steps
+        cached_steps = sum(1 for s in executed if s.get('cached'))
+        carried_steps = sum(1 for s in step_results if s.get('carried_over'))
+
+        # Calculate category breakdown
+        category_stats = {}
+        for s in step_results:
+            cat = s['category']
+            if cat not in category_stats:
+                category_stats[cat] = {'passed': 0, 'failed': 0, 'skipped': 0, 'total': 0}
+            category_stats[cat]['total'] += 1
+            if s['result'] == 'PASS':
+                category_stats[cat]['passed'] += 1
+            elif s['result'] in ['FAIL', 'ERROR', TIMEOUT]:
+                category_stats[cat]['failed'] += 1
+            else:
+                category_stats[cat]['skipped'] += 1
+
+        pass_rate = (passed_steps / executed_steps * 100) if executed_steps > 0 else 0
+        avg_time = total_execution_time / executed_steps if executed_steps > 0 else 0
+
+        # Find slowest steps
+        step_times = [(s['name'], s['execution_time']) for s in executed]
+        slowest_steps = sorted(step_times, key=lambda x: x[1], reverse=True)[:3]
+
+        # Generate execution summary
+        final_msg = f"\n{'✅ PASSED' if success else '⏹ CANCELLED' if cancelled else '❌ FAILED'}"
+        summary = f"\n📊 Execution Summary:\n"
+        summary += f"   • Total Steps: {total_steps}\n"
+        summary += f"   • Executed: {executed_steps} | Passed: {passed_steps} | Failed: {failed_steps} | Errors: {error_steps}\n"
+        if timeout_steps:
+            summary += f"   • Timed Out: {timeout_steps}\n"
+        if cached_steps:
+            summary += f"   • Cached: {cached_steps} (passed before with unchanged inputs)\n"
+        if carried_steps:
+            summary += f"   • From Previous Run: {carried_steps} (not rerun)\n"
+        summary += f"   • Skipped: {skipped_steps}\n"
+        summary += f"   • Pass Rate: {pass_rate:.1f}%\n"
+        summary += f"   • Total Time: {total_execution_time:.2f}s | Avg: {avg_time:.2f}s/step\n"
+
+        self.emit(final_msg)
+        self._output(summary)
+
+        log_lines.append(f"[{datetime.now()}] {final_msg}")
+        log_lines.append(f"[{datetime.now()}] {summary}")
+
+        report_data = {
+            'html': reporting.build_case_summary_html(
+                self.name, success, html_report, passed_steps, failed_steps, error_steps,
+                skipped_steps, total_steps, executed_steps, total_execution_time,
+                slowest_steps, category_stats),
+            'name': self.name,
+            'passed_steps': passed_steps,
+            'failed_steps': failed_steps,
+            'total_steps': total_steps,
+            'execution_time': total_execution_time,
+            'success': success
+        }
+        try:
+            reporting.write_case_reports(self.name, log_lines, html_report, report_data,
+                                         refresh_combined=self.refresh_combined)
+        except Exception as e:
+            self.emit(f"❌ Failed to write HTML report: {e}")
+
+        return {
+            'name': self.name,
+            'success': success,
+            'status': "PASS" if success else f"CANCELLED - {self.cancel_token.reason}" if cancelled else "FAIL",
+            'steps': step_results,
+            'execution_time': total_execution_time,
+            'report': report_data,
+        }
+
+
+def execute_step_in_process(step_type, details):
+    """
+    Execute one step in a worker process of the cpu pool
+
+    Console output is captured and returned so the calling case can merge it
+    into its own console and log.
+
+    Args:
+        step_type: Step type name
+        details: Plain (picklable) step details dict
+
+    Returns:
+        tuple: (passed, console text, log lines)
+    """
+    output = []
+    log_lines = []
+    runner = CaseRunner(CasePlan(step_type, []), output=output.append)
+    passed = runner._execute_step(step_type, details, log_lines)
+    return passed, "".join(output), log_lines
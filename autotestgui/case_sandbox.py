@@ -0,0 +1,171 @@
+"""
+Per-Case Sandboxes
+
+Step details can refer to ${CASE_DIR}, the working directory of the case, in
+any path field (Copy File, Move File, Create Directory, Extract Archive, ...).
+Cases that only write below ${CASE_DIR} share no paths, so the conflict
+scheduler (see resource_conflicts) lets them run in parallel.
+
+In sandbox mode every run of a case gets a fresh scratch directory under the
+sandbox root: tmpfs (/dev/shm) where available, the temp folder otherwise.
+It is removed on a background thread once the case has finished, so the
+next case does not wait for the deletion. Without sandbox mode ${CASE_DIR}
+is TestReports/case_dirs/<case name>, which is kept between runs.
+"""
+import collections
+import configparser
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+from execution_plan import compile_case
+import reporting
+from resource_pools import CONFIG_PATH
+
+CASE_DIR_VARIABLE = "${CASE_DIR}"
+
+# Where ${CASE_DIR} points when sandbox mode is off
+CASE_DIRS_FOLDER = os.path.join(reporting.REPORT_OUTPUT_FOLDER, "case_dirs")
+
+# tmpfs mount used as the sandbox root when it exists
+TMPFS_ROOT = "/dev/shm"
+
+# Folder created under the root to hold the sandboxes
+SANDBOX_FOLDER = "vcb-sandboxes"
+
+
+def _replace(value, case_dir):
+    if isinstance(value, str):
+        return value.replace(CASE_DIR_VARIABLE, case_dir)
+    if isinstance(value, dict):
+        return {key: _replace(item, case_dir) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_replace(item, case_dir) for item in value]
+    return value
+
+
+def _safe_name(name):
+    """Return a case name usable as a folder name"""
+    return re.sub(r"[^\w.-]+", "_", name).strip("._")[:40] or "case"
+
+
+def uses_case_dir(plan):
+    """Return True if any step detail of a case refers to ${CASE_DIR}"""
+    return CASE_DIR_VARIABLE in repr(plan.to_data())
+
+
+def expand_case_dir(plan, case_dir):
+    """
+    Point the steps of a case at its working directory
+
+    Args:
+        plan: CasePlan
+        case_dir: Directory ${CASE_DIR} stands for
+
+    Returns:
+        CasePlan: Plan with ${CASE_DIR} replaced in every step detail
+    """
+    steps = plan.to_data()
+    for step in steps:
+        step["details"] = _replace(step["details"], case_dir)
+    return compile_case(plan.name, steps)
+
+
+def persistent_case_dir(name):
+    """Return (and create) the ${CASE_DIR} of a case when sandbox mode is off"""
+    path = os.path.abspath(os.path.join(CASE_DIRS_FOLDER, _safe_name(name)))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def default_sandbox_root():
+    """Return tmpfs when it is available, otherwise the temp folder"""
+    if os.path.isdir(TMPFS_ROOT) and os.access(TMPFS_ROOT, os.W_OK):
+        return TMPFS_ROOT
+    return tempfile.gettempdir()
+
+
+class CaseSandboxes:
+    """Creates a scratch directory for each case run and removes it in the background"""
+
+    def __init__(self, root=None, keep_failed=False):
+        """
+        Args:
+            root: Folder the sandboxes are created in (None = tmpfs or the
+                  temp folder, see default_sandbox_root)
+            keep_failed: Keep the sandboxes of failed cases for inspection
+        """
+        self.root = os.path.join(root or default_sandbox_root(), SANDBOX_FOLDER)
+        self.keep_failed = keep_failed
+        self._removals = collections.deque()
+        self._cleaner = None
+        self._lock = threading.Lock()
+
+    def create(self, name):
+        """Create a fresh sandbox for a case and return its path"""
+        os.makedirs(self.root, exist_ok=True)
+        return tempfile.mkdtemp(prefix=f"{_safe_name(name)}-", dir=self.root)
+
+    def release(self, path, passed):
+        """
+        Queue the sandbox of a finished case for removal
+
+        Args:
+            path: Sandbox returned by create()
+            passed: Whether the case passed
+
+        Returns:
+            bool: True if the sandbox is kept (a failed case with keep_failed)
+        """
+        if self.keep_failed and not passed:
+            return True
+        with self._lock:
+            self._removals.append(path)
+            if self._cleaner is None:
+                self._cleaner = threading.Thread(target=self._remove_released, name="sandbox-cleanup",
+                                                 daemon=True)
+                self._cleaner.start()
+        return False
+
+    def _remove_released(self):
+        while True:
+            with self._lock:
+                if not self._removals:
+                    self._cleaner = None
+                    return
+                path = self._removals.popleft()
+            shutil.rmtree(path, ignore_errors=True)
+
+    def wait(self):
+        """Wait until the released sandboxes have been removed"""
+        with self._lock:
+            cleaner = self._cleaner
+        if cleaner is not None:
+            cleaner.join()
+
+    def describe(self):
+        """Return a one-line summary of the sandbox settings"""
+        kept = ", failed cases keep theirs" if self.keep_failed else ""
+        return f"a fresh ${{CASE_DIR}} per case in {self.root}{kept}"
+
+
+def load_case_sandboxes(enabled=None, path=CONFIG_PATH):
+    """
+    Create the CaseSandboxes of a run from the [sandbox] section of config.ini
+
+    Args:
+        enabled: Force sandbox mode on or off (None = use config.ini)
+
+    Returns:
+        CaseSandboxes, or None when sandbox mode is off
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    if enabled is None:
+        enabled = parser.getboolean("sandbox", "enabled", fallback=False)
+    if not enabled:
+        return None
+    return CaseSandboxes(root=parser.get("sandbox", "root", fallback="").strip() or None,
+                         keep_failed=parser.getboolean("sandbox", "keep_failed", fallback=False))
@@ -37,7 +37,7 @@ class ConditionHandler:
         Args:
             step_index: The step number (1-based)
             step_name: Name of the step
-            result: 'PASS', 'FAIL', 'ERROR', or None
+            result: 'PASS', 'FAIL', 'ERROR', 'TIMEOUT', or None
             was_skipped: Whether the step was skipped
         """
         self.step_history.append({
@@ -123,7 +123,7 @@ class ConditionHandler:
             if not executed_steps:
                 return False, "No previous steps were executed"
             
-            if any(s['result'] in ['FAIL', 'ERROR'] for s in executed_steps):
+            if any(s['result'] in ['FAIL', 'ERROR', 'TIMEOUT'] for s in executed_steps):
                 return True, None
             else:
                 return False, "No previous steps failed"
@@ -132,7 +132,7 @@ class ConditionHandler:
             if step_index == 1:
                 return False, "No previous steps to check"
             
-            if any(s['result'] == 'ERROR' for s in self.step_history if not s['skipped']):
+            if any(s['result'] in ['ERROR', 'TIMEOUT'] for s in self.step_history if not s['skipped']):
                 return True, None
             else:
                 return False, "No previous errors detected"
@@ -196,7 +196,7 @@ class ConditionHandler:
             if target_step_data['skipped']:
                 return False, f"Step {target_step} was skipped"
             
-            if target_step_data['result'] in ['FAIL', 'ERROR']:
+            if target_step_data['result'] in ['FAIL', 'ERROR', 'TIMEOUT']:
                 return True, None
             else:
                 return False, f"Step {target_step} did not fail"
@@ -215,7 +215,7 @@ class ConditionHandler:
         executed = len([s for s in self.step_history if not s['skipped']])
         skipped = len([s for s in self.step_history if s['skipped']])
         passed = len([s for s in self.step_history if s['result'] == 'PASS' and not s['skipped']])
-        failed = len([s for s in self.step_history if s['result'] in ['FAIL', 'ERROR'] and not s['skipped']])
+        failed = len([s for s in self.step_history if s['result'] in ['FAIL', 'ERROR', 'TIMEOUT'] and not s['skipped']])
         
         return {
             'total': total,
@@ -0,0 +1,132 @@
+"""
+Thread-safe Console Output
+
+Worker threads must never touch Tk widgets. Each test case gets a
+ConsoleQueue: the run loop appends text to it without blocking, and the Tk
+main thread drains it at a fixed frame rate, coalescing everything that
+arrived since the last frame into a single Text insert.
+
+One timer per Tk application drains every console, so idle test cases cost
+nothing per frame; a console leaves it when stopped or when its widget is
+destroyed, and the timer ends with the last console.
+"""
+import collections
+import tkinter as tk
+
+# Drain interval for console queues (20 frames per second)
+FRAME_INTERVAL_MS = 50
+
+_CLEAR = object()
+
+
+class _Drainer:
+    """The single drain timer of a Tk application"""
+
+    # Tk root -> _Drainer
+    _by_root = {}
+
+    def __init__(self, root, interval_ms):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.consoles = []
+        self._after_id = None
+
+    @classmethod
+    def of(cls, widget, interval_ms):
+        root = widget._root()
+        drainer = cls._by_root.get(root)
+        if drainer is None:
+            drainer = cls._by_root[root] = cls(root, interval_ms)
+        return drainer
+
+    def add(self, console):
+        self.consoles.append(console)
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def remove(self, console):
+        if console in self.consoles:
+            self.consoles.remove(console)
+        if self.consoles:
+            return
+        self._by_root.pop(self.root, None)
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+    def _tick(self):
+        self._after_id = None
+        for console in list(self.consoles):
+            if console._pending and not console._drain():
+                self.remove(console)
+        if self.consoles:
+            try:
+                self._after_id = self.root.after(self.interval_ms, self._tick)
+            except tk.TclError:
+                # The application is being destroyed
+                self._by_root.pop(self.root, None)
+
+
+class ConsoleQueue:
+    """Buffers console text from worker threads for a Tk Text widget"""
+
+    def __init__(self, text_widget, interval_ms=FRAME_INTERVAL_MS):
+        """
+        Must be created on the Tk main thread.
+
+        Args:
+            text_widget: tk.Text the output is written to
+            interval_ms: Drain interval in milliseconds (the first console of
+                         the application sets it for all of them)
+        """
+        self.text_widget = text_widget
+        self.interval_ms = interval_ms
+        # deque.append/popleft are atomic, so writers never take a lock
+        self._pending = collections.deque()
+        self._drainer = _Drainer.of(text_widget, interval_ms)
+        self._drainer.add(self)
+        # A destroyed widget leaves the timer even if nobody calls stop()
+        text_widget.bind("<Destroy>", lambda event: self.stop(), add="+")
+
+    def write(self, text):
+        """Queue text for display; safe to call from any thread"""
+        self._pending.append(text)
+
+    def clear(self):
+        """Queue a clear of the console; safe to call from any thread"""
+        self._pending.append(_CLEAR)
+
+    def _drain(self):
+        """Show the queued text; returns False once the widget is gone"""
+        chunks = []
+        clear = False
+        while True:
+            try:
+                item = self._pending.popleft()
+            except IndexError:
+                break
+            if item is _CLEAR:
+                # Anything queued before the clear would be wiped anyway
+                chunks = []
+                clear = True
+            else:
+                chunks.append(item)
+
+        try:
+            if clear:
+                self.text_widget.delete("1.0", tk.END)
+            if chunks:
+                self.text_widget.insert(tk.END, "".join(chunks))
+                self.text_widget.see(tk.END)
+        except tk.TclError:
+            # Widget was destroyed (test case deleted or GUI closed)
+            return False
+        return True
+
+    def stop(self):
+        """Stop draining; call on the Tk main thread before destroying the widget"""
+        self._pending.clear()
+        self._drainer.remove(self)
@@ -0,0 +1,625 @@
+"""
+Distributed Suite Execution
+
+A coordinator splits an exported suite into case-level work units and hands
+them to worker processes over a TCP or Unix socket. Workers run each case with
+CaseRunner and send back the structured result, which the coordinator merges
+into the usual summary file and combined HTML report.
+
+Messages are JSON objects, one per line:
+    worker -> coordinator: hello {worker, slots}, output {id, text},
+                           result {id, result}, heartbeat
+    coordinator -> worker: case {id, name, steps, parallel_steps, fixtures, fixture_results},
+                           cancel {reason}, shutdown
+
+A worker that disconnects or stops sending heartbeats is treated as dead and
+its unfinished cases are requeued for the other workers. When no worker is
+connected for worker_timeout seconds, the remaining cases fail instead of
+waiting for a worker that may never come.
+
+Setup and Cleanup fixtures (see suite_fixtures) are not handed out as cases.
+The coordinator runs the Setup fixtures once before it hands out the first
+case and the Cleanup fixtures once after the last result, as the suite runner
+does. Workers only receive the outcomes, which decide their Use Fixture steps.
+
+Usage:
+    python autotestgui/distributed.py coordinator suite.json --listen tcp://0.0.0.0:7345
+    python autotestgui/distributed.py worker --connect tcp://coordinator-host:7345 --slots 4
+
+    # Single machine: coordinator plus 4 local worker processes
+    python autotestgui/distributed.py coordinator suite.json --listen unix:/tmp/vcb.sock --local-workers 4
+"""
+import argparse
+import collections
+import concurrent.futures
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import case_history
+import last_run
+from case_runner import CancellationToken, CaseRunner
+from case_sandbox import load_case_sandboxes
+from execution_plan import compile_case, compile_suite
+from fail_fast import FailFastPolicy, load_fail_fast
+from failure_ordering import ORDERS, describe_order, likely_failures_first, load_case_order, step_priorities
+import reporting
+from resource_pools import ResourcePools, load_cpu_processes, load_pool_sizes
+from sharding import longest_first
+from step_cache import load_step_cache
+from step_watchdog import load_default_step_timeout
+from suite_fixtures import SuiteFixtures, split_fixtures
+from suite_runner import load_suite, write_suite_summary
+
+DEFAULT_ADDRESS = "tcp://127.0.0.1:7345"
+
+# Workers send a heartbeat this often; silence for HEARTBEAT_TIMEOUT seconds
+# means the worker is gone
+HEARTBEAT_INTERVAL = 5
+HEARTBEAT_TIMEOUT = 30
+
+# A case that takes down this many workers is reported as an error
+MAX_ATTEMPTS = 3
+
+# Seconds without any connected worker before the remaining cases fail
+WORKER_TIMEOUT = 120
+
+
+def parse_address(address):
+    """
+    Parse "tcp://host:port", "host:port" or "unix:/path"
+
+    Returns:
+        tuple: (socket family, address for bind/connect)
+    """
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    if address.startswith("tcp://"):
+        address = address[len("tcp://"):]
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Invalid address '{address}', expected tcp://host:port or unix:/path")
+    return socket.AF_INET, (host or "0.0.0.0", int(port))
+
+
+class Connection:
+    """Line-delimited JSON messages over a socket"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self._reader = sock.makefile("rb")
+        self._send_lock = threading.Lock()
+
+    def send(self, message):
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        with self._send_lock:
+            self.sock.sendall(data)
+
+    def receive(self):
+        """Return the next message, or None when the peer has closed the connection"""
+        line = self._reader.readline()
+        if not line:
+            return None
+        return json.loads(line)
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class _WorkerState:
+    def __init__(self, connection, name, slots):
+        self.connection = connection
+        self.name = name
+        self.slots = slots
+        self.in_flight = set()
+        self.alive = True
+
+
+class Coordinator:
+    """Hands cases to connected workers and collects their results"""
+
+    def __init__(self, plans, address=DEFAULT_ADDRESS, output=None, parallel_steps=False,
+                 heartbeat_timeout=HEARTBEAT_TIMEOUT, max_attempts=MAX_ATTEMPTS, fail_fast=None,
+                 step_timeout=None, incremental=False, order="suite", sandbox=False,
+                 worker_timeout=WORKER_TIMEOUT):
+        """
+        Args:
+            plans: List of CasePlans to run, in suite order; fixtures among
+                   them are sent along with every case
+            address: Listen address (tcp://host:port or unix:/path)
+            output: Callable receiving console text (defaults to stdout)
+            parallel_steps: Ask workers to run independent steps concurrently
+            heartbeat_timeout: Seconds of silence after which a worker is dead
+            max_attempts: Times a case is handed out before it is given up
+            fail_fast: Optional FailFastPolicy; the suite limit is enforced
+                       here, the Critical step rule on the workers
+            step_timeout: Default step timeout in seconds sent to the workers
+            incremental: Let workers reuse passing steps from their local step cache
+            order: "suite" (longest first) or "failures" (likeliest failures
+                   first, see failure_ordering)
+            sandbox: Have workers give every case a fresh ${CASE_DIR} on
+                     their machine (see case_sandbox)
+            worker_timeout: Seconds without a connected worker, before the
+                            first one connects or after the last one is
+                            lost, after which the remaining cases fail
+                            (0 = wait forever)
+        """
+        self.fixtures, self.plans = split_fixtures(plans)
+        self.address = address
+        self.parallel_steps = parallel_steps
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.fail_fast = fail_fast or FailFastPolicy()
+        self.step_timeout = step_timeout
+        self.incremental = incremental
+        self.order = order
+        self.sandbox = sandbox
+        self.worker_timeout = worker_timeout
+        self.cancel_token = CancellationToken()
+        self._output = output or sys.stdout.write
+        self._output_lock = threading.Lock()
+
+        self._condition = threading.Condition()
+        self._history = case_history.load_history()
+        if order == "failures":
+            ordered = likely_failures_first(self.plans, self._history)
+        else:
+            # Hand out the longest cases first so the slowest ones never start last
+            ordered = longest_first(self.plans, self._history)
+        case_ids = {id(plan): case_id for case_id, plan in enumerate(self.plans)}
+        self._queue = collections.deque(case_ids[id(plan)] for plan in ordered)
+        self._attempts = collections.Counter()
+        self._results = {}
+        self._workers = []
+        # Cases are handed out once the Setup fixtures have run
+        self._fixture_results = None
+        self._server = None
+        self.cancel_token.add_callback(self._cancel_run)
+
+    def _write(self, text):
+        with self._output_lock:
+            self._output(text)
+
+    def _case_output(self, case_id, text):
+        name = self.plans[case_id].name
+        self._write("".join(f"[{name}] {line}\n" for line in text.rstrip("\n").split("\n")))
+
+    def _run_fixture(self, plan, cleanup):
+        """Run a fixture here on the coordinator (run_fixture of SuiteFixtures)"""
+        self._write(f"🔧 {'Cleanup' if cleanup else 'Setup'} fixture: {plan.name}\n")
+
+        def output(text):
+            self._write("".join(f"[{plan.name}] {line}\n" for line in text.rstrip("\n").split("\n")))
+
+        # Cleanup fixtures also run after a cancellation
+        result = CaseRunner(plan, output=output, parallel_steps=self.parallel_steps, refresh_combined=False,
+                            cancel_token=None if cleanup else self.cancel_token, fail_fast=self.fail_fast,
+                            step_timeout=self.step_timeout).run()
+        self.fail_fast.case_finished(result, self.cancel_token)
+        return result
+
+    def _listen(self):
+        family, bind_address = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(bind_address):
+            os.unlink(bind_address)
+        server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(bind_address)
+        server.listen()
+        return server
+
+    def _accept_loop(self):
+        while True:
+            try:
+                sock, _ = self._server.accept()
+            except OSError:
+                return  # Server socket closed at the end of the run
+            threading.Thread(target=self._serve_worker, args=(sock,), daemon=True).start()
+
+    def _dispatch(self):
+        """Send queued cases to workers with free slots; caller holds the lock"""
+        if self._fixture_results is None:
+            return
+        for worker in self._workers:
+            while worker.alive and self._queue and len(worker.in_flight) < worker.slots:
+                case_id = self._queue.popleft()
+                plan = self.plans[case_id]
+                self._attempts[case_id] += 1
+                worker.in_flight.add(case_id)
+                try:
+                    worker.connection.send({"type": "case", "id": case_id, "name": plan.name,
+                                            "steps": plan.to_data(), "parallel_steps": self.parallel_steps,
+                                            "abort_on_critical": self.fail_fast.abort_case_on_critical,
+                                            "step_timeout": self.step_timeout,
+                                            "incremental": self.incremental,
+                                            "sandbox": self.sandbox,
+                                            "fixtures": {fixture.name: fixture.to_data()
+                                                         for fixture in self.fixtures},
+                                            "fixture_results": self._fixture_results,
+                                            "step_priority": step_priorities(plan, self._history)
+                                            if self.order == "failures" else None})
+                except OSError:
+                    # The reader thread notices the dead connection and requeues
+                    break
+
+    def _serve_worker(self, sock):
+        sock.settimeout(self.heartbeat_timeout)
+        connection = Connection(sock)
+        worker = None
+        try:
+            hello = connection.receive()
+            if not hello or hello.get("type") != "hello":
+                return
+            worker = _WorkerState(connection, hello.get("worker", "worker"), max(1, int(hello.get("slots", 1))))
+            self._write(f"🔌 Worker connected: {worker.name} ({worker.slots} slots)\n")
+            with self._condition:
+                self._workers.append(worker)
+                self._dispatch()
+
+            while True:
+                message = connection.receive()
+                if message is None:
+                    break
+                kind = message.get("type")
+                if kind == "output":
+                    self._case_output(message["id"], message["text"])
+                elif kind == "result":
+                    with self._condition:
+                        case_id = message["id"]
+                        worker.in_flight.discard(case_id)
+                        # A case requeued after a false death may finish twice
+                        self._results.setdefault(case_id, message["result"])
+                        self._dispatch()
+                        self._condition.notify_all()
+                    self.fail_fast.case_finished(message["result"], self.cancel_token)
+        except (OSError, ValueError):
+            pass
+        finally:
+            if worker is not None:
+                self._worker_lost(worker)
+            connection.close()
+
+    def _worker_lost(self, worker):
+        with self._condition:
+            worker.alive = False
+            if worker in self._workers:
+                self._workers.remove(worker)
+            lost = sorted(case_id for case_id in worker.in_flight if case_id not in self._results)
+            worker.in_flight.clear()
+            done = len(self._results) == len(self.plans)
+            for case_id in lost:
+                name = self.plans[case_id].name
+                if self.cancel_token.cancelled:
+                    self._results[case_id] = {
+                        'name': name, 'success': False, 'steps': [], 'execution_time': 0.0,
+                        'status': f"CANCELLED - {self.cancel_token.reason}",
+                    }
+                elif self._attempts[case_id] >= self.max_attempts:
+                    self._results[case_id] = {
+                        'name': name, 'success': False, 'steps': [], 'execution_time': 0.0,
+                        'status': f"ERROR - worker lost {self._attempts[case_id]} times",
+                    }
+                else:
+                    self._write(f"♻ Requeueing {name} (worker {worker.name} lost)\n")
+                    self._queue.appendleft(case_id)
+            if not done:
+                self._write(f"⚠ Worker disconnected: {worker.name}\n")
+            self._dispatch()
+            self._condition.notify_all()
+
+    def _wait_for_results(self):
+        """Wait until every case has a result; caller holds the lock"""
+        idle_since = None
+        while len(self._results) < len(self.plans):
+            if self._workers or not self.worker_timeout:
+                idle_since = None
+                self._condition.wait()
+                continue
+            if idle_since is None:
+                idle_since = time.monotonic()
+            remaining = idle_since + self.worker_timeout - time.monotonic()
+            if remaining > 0:
+                self._condition.wait(remaining)
+                continue
+            self._write(f"⚠ No worker connected for {self.worker_timeout}s: failing the remaining cases\n")
+            self._queue.clear()
+            for case_id, plan in enumerate(self.plans):
+                self._results.setdefault(case_id, {
+                    'name': plan.name, 'success': False, 'steps': [], 'execution_time': 0.0,
+                    'status': f"ERROR - no worker connected for {self.worker_timeout}s",
+                })
+
+    def cancel(self, reason="Cancelled"):
+        """Stop the run: queued cases are dropped and workers cancel their running cases"""
+        self.cancel_token.cancel(reason)
+
+    def _cancel_run(self):
+        reason = self.cancel_token.reason
+        self._write(f"⏹ {reason}: cancelling the run\n")
+        with self._condition:
+            while self._queue:
+                case_id = self._queue.popleft()
+                self._results[case_id] = {'name': self.plans[case_id].name, 'success': False,
+                                          'status': f"CANCELLED - {reason}", 'steps': [], 'execution_time': 0.0}
+            for worker in self._workers:
+                try:
+                    worker.connection.send({"type": "cancel", "reason": reason})
+                except OSError:
+                    pass
+            self._condition.notify_all()
+
+    def run(self, on_listening=None):
+        """
+        Run the Setup fixtures, serve the suite until every case has a
+        result, run the Cleanup fixtures, then write the reports
+
+        Args:
+            on_listening: Optional callable run once the socket is listening
+                          (used to start local workers)
+
+        Returns:
+            list: Structured results of the Setup fixtures, the cases in
+                  completion order and the Cleanup fixtures
+        """
+        reporting.combined_report_data.clear()
+        start_time = time.time()
+        self._server = self._listen()
+        self._write(f"📡 Coordinator listening on {self.address} ({len(self.plans)} cases)\n")
+        run_order = None
+        if self.order == "failures":
+            run_order = describe_order([self.plans[case_id] for case_id in self._queue], self._history)
+            self._write(f"{run_order}\n")
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        if on_listening is not None:
+            on_listening()
+
+        # Workers connect while the Setup fixtures run
+        fixtures = SuiteFixtures(self.fixtures, self._run_fixture)
+        results = fixtures.run_setup()
+        try:
+            with self._condition:
+                # Only the outcome matters to Use Fixture steps; the reports stay here
+                self._fixture_results = [{'name': result['name'], 'success': result['success'],
+                                          'status': result['status'], 'steps': [],
+                                          'execution_time': result['execution_time']} for result in results]
+                self._dispatch()
+                self._wait_for_results()
+                for worker in self._workers:
+                    try:
+                        worker.connection.send({"type": "shutdown"})
+                    except OSError:
+                        pass
+            # Results are stored in completion order
+            results += list(self._results.values())
+        finally:
+            self._server.close()
+            results += fixtures.run_cleanup()
+
+        for result in results:
+            if result.get('report'):
+                reporting.combined_report_data.append(result['report'])
+        write_suite_summary(results, time.time() - start_time, True, self._write, run_order=run_order)
+        case_history.record_results(results)
+        last_run.record_results(results)
+        return results
+
+
+class Worker:
+    """Connects to a coordinator and runs the cases it is given"""
+
+    def __init__(self, address=DEFAULT_ADDRESS, slots=1, name=None, pool_sizes=None, cpu_processes=False):
+        """
+        Args:
+            address: Coordinator address (tcp://host:port or unix:/path)
+            slots: Number of cases run at the same time
+            name: Worker name shown by the coordinator (host:pid by default)
+            pool_sizes: Resource pool size overrides
+            cpu_processes: Run CPU-heavy steps in worker processes
+        """
+        self.address = address
+        self.slots = slots
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.pool_sizes = pool_sizes
+        self.cpu_processes = cpu_processes
+        self._stopped = threading.Event()
+        # Cancelled when the coordinator cancels the run
+        self.cancel_token = CancellationToken()
+        # Fixtures of the suite with the outcomes the coordinator sent along
+        self._fixtures = None
+        self._fixtures_lock = threading.Lock()
+        # Sandboxes live on this machine, at its [sandbox] root
+        self._sandboxes = load_case_sandboxes(True)
+
+    def _connect(self):
+        family, connect_address = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.connect(connect_address)
+        return Connection(sock)
+
+    def _heartbeat(self, connection):
+        while not self._stopped.wait(HEARTBEAT_INTERVAL):
+            try:
+                connection.send({"type": "heartbeat"})
+            except OSError:
+                return
+
+    def _suite_fixtures(self, message):
+        """Return the SuiteFixtures of the run, created from the first case message"""
+        with self._fixtures_lock:
+            if self._fixtures is None and message.get("fixtures"):
+                def run_fixture(plan, cleanup):
+                    return {'name': plan.name, 'success': False, 'steps': [], 'execution_time': 0.0,
+                            'status': "NOT RUN - fixtures run on the coordinator"}
+
+                self._fixtures = SuiteFixtures([compile_case(name, steps)
+                                                for name, steps in message["fixtures"].items()], run_fixture)
+                # The coordinator ran the Setup fixtures before handing out cases
+                for result in message.get("fixture_results") or []:
+                    self._fixtures.record(result)
+            return self._fixtures
+
+    def _run_case(self, connection, message, pools):
+        case_id = message["id"]
+
+        def output(text):
+            connection.send({"type": "output", "id": case_id, "text": text})
+
+        plan = compile_case(message["name"], message["steps"])
+        fail_fast = FailFastPolicy(abort_case_on_critical=message.get("abort_on_critical", False))
+        # Each machine keeps its own cache, since fingerprints describe its local files
+        step_cache = load_step_cache(True) if message.get("incremental") else None
+        try:
+            fixtures = self._suite_fixtures(message)
+            result = CaseRunner(plan, output=output, pools=pools, parallel_steps=message.get("parallel_steps", False),
+                                refresh_combined=False, cancel_token=self.cancel_token, fail_fast=fail_fast,
+                                step_timeout=message.get("step_timeout"), step_cache=step_cache,
+                                fixtures=fixtures, sandboxes=self._sandboxes if message.get("sandbox") else None,
+                                # JSON object keys are strings
+                                step_priority={int(index): priority for index, priority
+                                               in (message.get("step_priority") or {}).items()}).run()
+        except Exception as e:
+            result = {'name': plan.name, 'success': False, 'status': f"ERROR - {e}",
+                      'steps': [], 'execution_time': 0.0}
+        if step_cache is not None:
+            step_cache.save()
+        connection.send({"type": "result", "id": case_id, "result": result})
+
+    def run(self):
+        """Run cases until the coordinator sends shutdown or goes away"""
+        connection = self._connect()
+        connection.send({"type": "hello", "worker": self.name, "slots": self.slots})
+        threading.Thread(target=self._heartbeat, args=(connection,), daemon=True).start()
+        pools = ResourcePools(self.pool_sizes, cpu_processes=self.cpu_processes)
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.slots) as executor:
+                while True:
+                    message = connection.receive()
+                    if message is None or message.get("type") == "shutdown":
+                        break
+                    if message.get("type") == "case":
+                        executor.submit(self._run_case, connection, message, pools)
+                    elif message.get("type") == "cancel":
+                        self.cancel_token.cancel(message.get("reason", "Cancelled"))
+        except OSError:
+            pass
+        finally:
+            # Do not leave cases running for a coordinator that has gone away
+            self.cancel_token.cancel("Coordinator disconnected")
+            self._stopped.set()
+            pools.shutdown()
+            self._sandboxes.wait()
+            connection.close()
+
+
+def start_local_workers(address, count, slots):
+    """Start worker processes on this machine; returns the Popen objects"""
+    command = [sys.executable, os.path.abspath(__file__), "worker", "--connect", address, "--slots", str(slots)]
+    return [subprocess.Popen(command) for _ in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run an exported test suite across worker processes")
+    subparsers = parser.add_subparsers(dest="role", required=True)
+
+    coordinator_parser = subparsers.add_parser("coordinator", help="Serve a suite to workers")
+    coordinator_parser.add_argument("suite", help="JSON file produced by Export All")
+    coordinator_parser.add_argument("--listen", default=DEFAULT_ADDRESS,
+                                    help=f"tcp://host:port or unix:/path (default: {DEFAULT_ADDRESS})")
+    coordinator_parser.add_argument("--case", action="append", dest="case_names", metavar="NAME",
+                                    help="Only run the named test case (may be repeated)")
+    coordinator_parser.add_argument("--parallel-steps", action="store_true",
+                                    help="Run independent steps of a case concurrently on the workers")
+    coordinator_parser.add_argument("--local-workers", type=int, default=0,
+                                    help="Also start this many worker processes on this machine")
+    coordinator_parser.add_argument("--slots", type=int, default=1,
+                                    help="Concurrent cases per local worker")
+    coordinator_parser.add_argument("--abort-on-critical", action="store_true", default=None,
+                                    help="Skip the rest of a case once one of its Critical steps fails")
+    coordinator_parser.add_argument("--max-failures", type=int, metavar="N", default=None,
+                                    help="Cancel the suite once N cases have failed (0 = never)")
+    coordinator_parser.add_argument("--step-timeout", type=int, metavar="SECONDS", default=None,
+                                    help="Timeout for steps without their own Step Timeout (0 = none)")
+    coordinator_parser.add_argument("--incremental", action="store_true",
+                                    help="Let workers skip steps that passed before with unchanged inputs")
+    coordinator_parser.add_argument("--sandbox", action="store_true",
+                                    help="Give every case a fresh scratch directory as ${CASE_DIR} on its worker")
+    coordinator_parser.add_argument("--worker-timeout", type=int, metavar="SECONDS", default=WORKER_TIMEOUT,
+                                    help="Fail the remaining cases when no worker has been connected for this "
+                                         f"long (default: {WORKER_TIMEOUT}, 0 = wait forever)")
+    coordinator_parser.add_argument("--order", choices=ORDERS, default=None,
+                                    help="Hand out the cases most likely to fail first with 'failures' "
+                                         "(default: [scheduling] order in config.ini)")
+
+    worker_parser = subparsers.add_parser("worker", help="Run cases for a coordinator")
+    worker_parser.add_argument("--connect", default=DEFAULT_ADDRESS,
+                               help=f"Coordinator address (default: {DEFAULT_ADDRESS})")
+    worker_parser.add_argument("--slots", type=int, default=1, help="Concurrent cases on this worker")
+    worker_parser.add_argument("--name", help="Worker name shown by the coordinator")
+    args = parser.parse_args(argv)
+
+    if args.role == "worker":
+        Worker(args.connect, slots=args.slots, name=args.name, pool_sizes=load_pool_sizes(),
+               cpu_processes=load_cpu_processes()).run()
+        return 0
+
+    try:
+        parse_address(args.listen)
+    except ValueError as e:
+        parser.error(str(e))
+    cases = load_suite(args.suite)
+    if args.case_names:
+        missing = [name for name in args.case_names if name not in cases]
+        if missing:
+            parser.error(f"Unknown test case(s): {', '.join(missing)}")
+    # Fixtures are sent along with the selected cases
+    plans = [plan for plan in compile_suite(cases)
+             if plan.fixture or not args.case_names or plan.name in args.case_names]
+
+    local_workers = []
+
+    def on_listening():
+        if args.local_workers:
+            local_workers.extend(start_local_workers(args.listen, args.local_workers, args.slots))
+
+    fail_fast = load_fail_fast()
+    if args.abort_on_critical:
+        fail_fast.abort_case_on_critical = True
+    if args.max_failures is not None:
+        fail_fast.max_failed_cases = args.max_failures
+
+    coordinator = Coordinator(plans, args.listen, parallel_steps=args.parallel_steps,
+                              fail_fast=fail_fast,
+                              step_timeout=load_default_step_timeout() if args.step_timeout is None
+                              else args.step_timeout,
+                              incremental=args.incremental, order=args.order or load_case_order(),
+                              sandbox=args.sandbox, worker_timeout=args.worker_timeout)
+
+    def interrupt(signum, frame):
+        # First Ctrl+C cancels the run and still writes the reports; a second one exits at once
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        coordinator.cancel("Interrupted")
+
+    signal.signal(signal.SIGINT, interrupt)
+    try:
+        results = coordinator.run(on_listening)
+    finally:
+        for process in local_workers:
+            try:
+                process.wait(timeout=HEARTBEAT_INTERVAL)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return 0 if all(r['success'] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
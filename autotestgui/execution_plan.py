@@ -0,0 +1,205 @@
+"""
+Compiled Execution Plans
+
+Test cases are compiled once, before a run starts, into immutable plan
+objects. Every step is snapshotted from its step data with delays, timeouts
+and target steps already parsed to numbers, so the run loop and the reporters
+never read Tk widgets and a run is unaffected by edits made to the form while
+it is executing.
+"""
+from types import MappingProxyType
+
+# Detail fields holding numbers; they are parsed once at compile time
+NUMERIC_DETAIL_FIELDS = {
+    "step_delay": int,
+    "step_timeout": int,
+    "delay": int,
+    "duration": int,
+    "timeout": int,
+    "pid": int,
+    "required_gb": float,
+    "required_mb": float,
+}
+
+# Step categories that turn a test case into a suite-level fixture when all of
+# its steps share them (see suite_fixtures)
+SETUP_FIXTURE = "Setup"
+CLEANUP_FIXTURE = "Cleanup"
+
+
+def _freeze(value):
+    """Return a read-only copy of a step detail value"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """Return a plain (JSON-serialisable) copy of a frozen detail value"""
+    if isinstance(value, MappingProxyType):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+class _Frozen:
+    """Base for slotted plan objects that cannot be modified after compiling"""
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _set(self, **fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+
+class StepPlan(_Frozen):
+    """Snapshot of one test step, ready to execute"""
+    __slots__ = ('index', 'name', 'step_type', 'category', 'run_condition',
+                 'target_step', 'depends_on', 'exclusive', 'delay', 'timeout', 'details', 'error')
+
+    def __init__(self, index, step_data):
+        """
+        Args:
+            index: Step number (1-based)
+            step_data: Step dict as produced by TestStep.get_step_data()
+        """
+        raw_details = step_data.get("details", {}) or {}
+        details = {}
+        error = None
+        for key, value in raw_details.items():
+            parse = NUMERIC_DETAIL_FIELDS.get(key)
+            if parse is not None and isinstance(value, str):
+                try:
+                    value = parse(value.strip())
+                except ValueError:
+                    # Keep the raw text; the step reports it when it runs
+                    pass
+            details[key] = value
+
+        delay = details.get("step_delay", 0)
+        if not isinstance(delay, (int, float)):
+            error = f"invalid literal for int() with base 10: {delay!r}"
+            delay = 0
+
+        # Watchdog limit for the whole step; blank means the suite default
+        timeout = details.get("step_timeout")
+        if isinstance(timeout, str) and not timeout.strip():
+            timeout = None
+        if timeout is not None and not isinstance(timeout, (int, float)):
+            error = error or f"Invalid step timeout: {timeout!r}"
+            timeout = None
+        elif timeout is not None and timeout <= 0:
+            timeout = None
+
+        target_step = None
+        target_step_str = step_data.get("target_step", "") or ""
+        if str(target_step_str).strip():
+            try:
+                target_step = int(str(target_step_str).strip())
+            except ValueError:
+                pass
+
+        # "Depends On" holds step numbers separated by commas or spaces
+        depends_on = []
+        for token in str(step_data.get("depends_on", "") or "").replace(",", " ").split():
+            if token.isdigit() and int(token) not in depends_on:
+                depends_on.append(int(token))
+
+        # "Exclusive" names resources, separated by commas, that no other case
+        # may use while this one runs (see resource_conflicts)
+        exclusive = []
+        for tag in str(step_data.get("exclusive", "") or "").split(","):
+            if tag.strip() and tag.strip() not in exclusive:
+                exclusive.append(tag.strip())
+
+        self._set(
+            index=index,
+            name=step_data.get("name", f"Step {index}"),
+            step_type=step_data.get("type", ""),
+            category=step_data.get("category", "General"),
+            run_condition=step_data.get("run_condition", "Always"),
+            target_step=target_step,
+            depends_on=tuple(depends_on),
+            exclusive=tuple(exclusive),
+            delay=int(delay),
+            timeout=timeout,
+            details=_freeze(details),
+            error=error,
+        )
+
+    def to_step_data(self):
+        """Return the step in the exported step dict format"""
+        return {
+            "name": self.name,
+            "type": self.step_type,
+            "details": thaw(self.details),
+            "run_condition": self.run_condition,
+            "category": self.category,
+            "target_step": "" if self.target_step is None else str(self.target_step),
+            "depends_on": ", ".join(str(d) for d in self.depends_on),
+            "exclusive": ", ".join(self.exclusive),
+        }
+
+    def __repr__(self):
+        return f"StepPlan({self.index}, {self.name!r}, {self.step_type!r})"
+
+
+class CasePlan(_Frozen):
+    """Compiled test case: a name and an ordered tuple of StepPlans"""
+    __slots__ = ('name', 'steps')
+
+    def __init__(self, name, steps):
+        self._set(name=name, steps=tuple(steps))
+
+    def to_data(self):
+        """Return the steps in the exported step dict format"""
+        return [step.to_step_data() for step in self.steps]
+
+    @property
+    def fixture(self):
+        """Return "Setup" or "Cleanup" if every step has that category, else None"""
+        categories = {step.category for step in self.steps}
+        if len(categories) == 1 and categories & {SETUP_FIXTURE, CLEANUP_FIXTURE}:
+            return categories.pop()
+        return None
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __repr__(self):
+        return f"CasePlan({self.name!r}, {len(self.steps)} steps)"
+
+
+def compile_case(name, steps_data):
+    """
+    Compile a test case into an immutable plan
+
+    Args:
+        name: Test case name
+        steps_data: List of step dicts
+
+    Returns:
+        CasePlan
+    """
+    return CasePlan(name, [StepPlan(i, step_data) for i, step_data in enumerate(steps_data, 1)])
+
+
+def compile_suite(cases):
+    """
+    Compile every test case of a suite
+
+    Args:
+        cases: Mapping of test case name to its list of step dicts
+
+    Returns:
+        list: CasePlans in suite order
+    """
+    return [compile_case(name, steps_data) for name, steps_data in cases.items()]
@@ -0,0 +1,75 @@
+"""
+Fail-Fast Policies
+
+Decide when a run stops early: a failed step in the "Critical" category can
+abort the rest of its test case, and a suite can be aborted once a number of
+test cases have failed. Aborting cancels the CancellationToken of the case or
+suite, which interrupts in-flight delays, waits, commands and queries.
+"""
+import configparser
+import threading
+
+from resource_pools import CONFIG_PATH
+
+CRITICAL_CATEGORY = "Critical"
+
+
+class FailFastPolicy:
+    """Fail-fast settings of one run and the failed-case count they act on"""
+
+    def __init__(self, abort_case_on_critical=False, max_failed_cases=0):
+        """
+        Args:
+            abort_case_on_critical: Cancel the rest of a case when a Critical step fails
+            max_failed_cases: Cancel the suite once this many cases have failed (0 = never)
+        """
+        self.abort_case_on_critical = abort_case_on_critical
+        self.max_failed_cases = max_failed_cases
+        self._failed_cases = 0
+        self._lock = threading.Lock()
+
+    def step_abort_reason(self, step, result):
+        """
+        Return why a finished step aborts its case, or None
+
+        Args:
+            step: StepPlan
+            result: "PASS", "FAIL" or "ERROR"
+        """
+        if self.abort_case_on_critical and step.category == CRITICAL_CATEGORY and result != "PASS":
+            return f"Critical step {step.index} ({step.name}) failed"
+        return None
+
+    def case_finished(self, result, suite_token):
+        """
+        Count a finished case and cancel the suite when the failure limit is reached
+
+        Args:
+            result: Structured case result
+            suite_token: CancellationToken of the suite
+        """
+        if result['success'] or not self.max_failed_cases:
+            return
+        with self._lock:
+            self._failed_cases += 1
+            reached = self._failed_cases >= self.max_failed_cases
+        if reached:
+            suite_token.cancel(f"Suite aborted after {self.max_failed_cases} failed case(s)")
+
+    def describe(self):
+        rules = []
+        if self.abort_case_on_critical:
+            rules.append("abort case on Critical failure")
+        if self.max_failed_cases:
+            rules.append(f"abort suite after {self.max_failed_cases} failed case(s)")
+        return ", ".join(rules) or "off"
+
+
+def load_fail_fast(path=CONFIG_PATH):
+    """Read the [fail_fast] section of config.ini"""
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    return FailFastPolicy(
+        abort_case_on_critical=parser.getboolean("fail_fast", "abort_case_on_critical", fallback=False),
+        max_failed_cases=parser.getint("fail_fast", "max_failed_cases", fallback=0),
+    )
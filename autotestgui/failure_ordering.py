@@ -0,0 +1,116 @@
+"""
+Failure-Probability Ordering
+
+With order = failures, cases that are most likely to fail run first, so a
+broken build shows up in the first minutes of a run instead of after every
+green case. The same order decides which ready steps start first when the
+independent steps of a case run concurrently.
+
+The likelihood comes from the recorded outcomes (see case_history):
+recent runs weigh more than old ones, and flaky history (outcomes flipping
+between pass and fail) raises it further. Cases without history count as a
+coin flip, so new cases also run early.
+"""
+import configparser
+
+from resource_pools import CONFIG_PATH
+from sharding import estimate_durations
+
+# Case orders: the suite order (longest first in parallel runs), or the
+# likeliest failures first
+ORDERS = ["suite", "failures"]
+
+# Weight of each older outcome relative to the next newer one
+RECENCY_DECAY = 0.7
+
+# Pseudo-runs of the 50% prior blended into every estimate
+PRIOR_RUNS = 1.0
+
+# Share of the remaining pass probability taken by a fully flaky history
+FLAKY_WEIGHT = 0.5
+
+# Flip rate from which a history is shown as flaky in the summary
+FLAKY_THRESHOLD = 0.3
+
+
+def load_case_order(path=CONFIG_PATH):
+    """Read the case order from the [scheduling] section of config.ini"""
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    order = parser.get("scheduling", "order", fallback="suite").strip().lower()
+    return order if order in ORDERS else "suite"
+
+
+def flakiness(outcomes):
+    """Return the share of consecutive outcomes that flipped between pass and fail"""
+    if len(outcomes) < 2:
+        return 0.0
+    flips = sum(1 for older, newer in zip(outcomes, outcomes[1:]) if older != newer)
+    return flips / (len(outcomes) - 1)
+
+
+def failure_probability(outcomes):
+    """
+    Estimate how likely the next run fails
+
+    Args:
+        outcomes: Recorded outcomes, oldest first (1 = failed, 0 = passed)
+
+    Returns:
+        float: Probability between 0 and 1
+    """
+    weight = failed = 0.0
+    for age, outcome in enumerate(reversed(outcomes)):
+        w = RECENCY_DECAY ** age
+        weight += w
+        failed += w * outcome
+    rate = (failed + 0.5 * PRIOR_RUNS) / (weight + PRIOR_RUNS)
+    return rate + (1.0 - rate) * FLAKY_WEIGHT * flakiness(outcomes)
+
+
+def case_probabilities(plans, history):
+    """
+    Return case name -> failure probability
+
+    Args:
+        plans: CasePlans
+        history: Run history from case_history.load_history()
+    """
+    return {plan.name: failure_probability((history.get(plan.name) or {}).get("outcomes", []))
+            for plan in plans}
+
+
+def step_priorities(plan, history):
+    """Return step number -> failure probability for the steps of a case"""
+    recorded = (history.get(plan.name) or {}).get("step_outcomes", {})
+    return {step.index: failure_probability(recorded.get(str(step.index), [])) for step in plan.steps}
+
+
+def likely_failures_first(plans, history):
+    """Return the plans ordered by failure probability; ties run the shorter case first"""
+    probabilities = case_probabilities(plans, history)
+    estimates = estimate_durations(plans, history)
+    return sorted(plans, key=lambda plan: (-probabilities[plan.name], estimates[plan.name][0]))
+
+
+def describe_order(plans, history):
+    """
+    Describe a run order for the run summary
+
+    Args:
+        plans: CasePlans in the order they are started
+
+    Returns:
+        str: One line per case with its failure probability and history
+    """
+    lines = ["Run order (likely failures first):"]
+    for position, plan in enumerate(plans, 1):
+        outcomes = (history.get(plan.name) or {}).get("outcomes", [])
+        if outcomes:
+            note = f"failed {sum(outcomes)} of the last {len(outcomes)} run(s)"
+            if flakiness(outcomes) >= FLAKY_THRESHOLD:
+                note += ", flaky"
+        else:
+            note = "no history"
+        lines.append(f"  {position}. {plan.name}: {failure_probability(outcomes):.0%} ({note})")
+    return "\n".join(lines)
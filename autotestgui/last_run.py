@@ -0,0 +1,125 @@
+"""
+Last-Run Results and Rerunning Failures
+
+The latest result of every test case, with its step results and report data,
+is persisted in TestReports/last_run.json. "Rerun Failed" uses it to execute
+only the cases that failed, errored or were cancelled. Within such a case
+only the steps that did not pass are executed again, together with the steps
+whose run condition looks at them and the steps their own run conditions and
+"Depends On" entries need. The other steps keep their previous results, and
+the new outcomes are merged into the combined report.
+"""
+import json
+import os
+
+from case_history import save_history
+import reporting
+from step_graph import build_step_graph
+
+LAST_RUN_PATH = os.path.join(reporting.REPORT_OUTPUT_FOLDER, "last_run.json")
+
+FAILED_STEP_RESULTS = ("FAIL", "ERROR", "TIMEOUT")
+
+
+def load_last_run(path=LAST_RUN_PATH):
+    """
+    Load the persisted results
+
+    Returns:
+        dict: Case name -> structured case result of its latest run
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            last_run = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return last_run if isinstance(last_run, dict) else {}
+
+
+def record_results(results, path=LAST_RUN_PATH):
+    """
+    Store the results of finished cases, replacing earlier results of the same cases
+
+    Args:
+        results: Structured case results as returned by CaseRunner.run()
+    """
+    last_run = load_last_run(path)
+    for result in results:
+        last_run[result['name']] = result
+    try:
+        # Same atomic replace as the duration history
+        save_history(last_run, path)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def failed_case_names(last_run, names):
+    """Return the names, in the given order, whose latest run did not pass"""
+    return [name for name in names if name in last_run and not last_run[name].get('success')]
+
+
+def _matches(plan, steps):
+    """Return True if recorded step results still describe the steps of a plan"""
+    return len(steps) == len(plan.steps) and all(
+        recorded.get('name') == step.name and recorded.get('type') == step.step_type
+        for recorded, step in zip(steps, plan.steps))
+
+
+def rerun_steps(plan, result):
+    """
+    Choose the steps of a failed case to execute again
+
+    Args:
+        plan: CasePlan of the case as it is now
+        result: Structured result of its latest run
+
+    Returns:
+        dict: Step number -> previous step result for the steps that keep
+              their previous outcome (empty when the whole case reruns)
+    """
+    steps = result.get('steps') or []
+    # Cancelled runs and edited cases are run again in full
+    if str(result.get('status', '')).startswith("CANCELLED") or not _matches(plan, steps):
+        return {}
+    previous = {step['index']: step for step in steps}
+    failed = [index for index, step in previous.items() if step['result'] in FAILED_STEP_RESULTS]
+    if not failed:
+        return {}
+
+    graph = build_step_graph(plan)
+    selected = set(failed)
+    # Skipped steps after the first failure may run once it passes (and a
+    # Critical abort skips every later step)
+    selected.update(index for index, step in previous.items()
+                    if step['result'] is None and index > min(failed))
+    # Steps whose conditions look at a rerun step; dependencies are earlier
+    # steps, so one pass in step order is enough
+    for index in sorted(graph):
+        if graph[index] & selected:
+            selected.add(index)
+    # Steps the rerun steps' conditions and Depends On entries need
+    for index in sorted(selected, reverse=True):
+        pending = list(graph[index])
+        while pending:
+            dependency = pending.pop()
+            if dependency not in selected:
+                selected.add(dependency)
+                pending.extend(graph[dependency])
+    return {index: step for index, step in previous.items() if index not in selected}
+
+
+def merged_report_data(last_run, results, names):
+    """
+    Combine previous report data with the results of a rerun
+
+    Args:
+        last_run: Results loaded before the rerun
+        results: Structured results of the rerun cases
+        names: Case names of the suite, in order
+
+    Returns:
+        list: One report dict per case for reporting.save_combined_html()
+    """
+    latest = dict(last_run)
+    latest.update((result['name'], result) for result in results)
+    return [latest[name]['report'] for name in names if latest.get(name, {}).get('report')]
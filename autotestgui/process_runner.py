@@ -0,0 +1,348 @@
+"""
+Process-Isolated Case Execution
+
+With the processes engine every case runs in a worker process from a bounded
+pool instead of on a thread of the runner. A case stuck in a blocking C call
+(a pyodbc query, a huge readlines() in Check Log File) then holds only its own
+worker, cases no longer share one GIL, and a worker that crashes fails only
+the case it was running.
+
+Workers get their cases over a pipe and stream the console output, every step
+result and the case result back over it. After recycle_after cases a worker
+is replaced by a fresh process, so memory that steps or libraries leak does
+not pile up over a long run. A case that has not stopped CANCEL_GRACE
+seconds after being cancelled has its worker terminated.
+
+Messages (pickled by multiprocessing):
+    runner -> worker: ("case", job), ("cancel", reason), ("stop",)
+    worker -> runner: ("output", text), ("step_start", step number), ("step", step_result),
+                      ("result", result)
+
+Setup fixtures run in the runner before the cases (see suite_fixtures); the
+workers get their outcomes, so Use Fixture steps pass or fail the same way.
+"""
+import concurrent.futures
+import configparser
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+
+from case_runner import DEFAULT_STEP_WORKERS, CancellationToken, CaseRunner
+from case_sandbox import load_case_sandboxes
+from execution_plan import compile_case
+from fail_fast import FailFastPolicy
+from resource_pools import CONFIG_PATH
+from step_cache import load_step_cache
+from suite_fixtures import SuiteFixtures
+
+# Cases a worker process runs before it is replaced by a fresh one
+DEFAULT_RECYCLE_AFTER = 20
+
+# Seconds a cancelled case gets to stop before its worker is terminated
+CANCEL_GRACE = 10.0
+
+# Seconds between checks of a worker that is running a case
+POLL_INTERVAL = 0.5
+
+
+def load_process_isolation(path=CONFIG_PATH):
+    """
+    Read the [process_isolation] section of config.ini
+
+    Returns:
+        (enabled, workers, recycle_after): enabled makes the GUI run Run All
+        Parallel in worker processes; workers is None for one per CPU core
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    enabled = parser.getboolean("process_isolation", "enabled", fallback=False)
+    workers = parser.getint("process_isolation", "workers", fallback=0)
+    recycle_after = parser.getint("process_isolation", "recycle_after", fallback=DEFAULT_RECYCLE_AFTER)
+    return enabled, workers if workers > 0 else None, max(recycle_after, 1)
+
+
+def _error_result(name, status):
+    return {'name': name, 'success': False, 'status': status, 'steps': [], 'execution_time': 0.0}
+
+
+def _run_job(job, token, send, sandboxes):
+    """Run one case in the worker process and return its structured result"""
+    plan = compile_case(job["name"], job["steps"])
+    fixtures = None
+    if job["fixtures"]:
+        def run_fixture(fixture, cleanup):
+            return _error_result(fixture.name, "NOT RUN - fixtures run before the cases in process-isolated runs")
+
+        fixtures = SuiteFixtures([compile_case(name, steps) for name, steps in job["fixtures"].items()],
+                                 run_fixture)
+        # The runner ran the Setup fixtures before the cases
+        for result in job["fixture_results"]:
+            fixtures.record(result)
+    # Each worker loads the cache itself and saves it after the case
+    step_cache = load_step_cache(True) if job["incremental"] else None
+    result = CaseRunner(plan, output=lambda text: send(("output", text)),
+                        parallel_steps=job["parallel_steps"], step_workers=job["step_workers"],
+                        refresh_combined=False, cancel_token=token,
+                        fail_fast=FailFastPolicy(abort_case_on_critical=job["abort_on_critical"]),
+                        step_timeout=job["step_timeout"], step_cache=step_cache,
+                        carry_over=job["carry_over"], fixtures=fixtures, step_priority=job["step_priority"],
+                        on_step=lambda step_result: send(("step", step_result)),
+                        sandboxes=sandboxes if job["sandbox"] else None,
+                        on_step_start=lambda index: send(("step_start", index))).run()
+    if step_cache is not None:
+        step_cache.save()
+    return result
+
+
+def _worker_main(connection):
+    """Entry point of a worker process: run cases until told to stop"""
+    # Ctrl+C reaches the whole process group; the runner cancels over the pipe
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    send_lock = threading.Lock()
+    token = None
+    # Sandboxes of finished cases are removed while the worker runs the next one
+    sandboxes = load_case_sandboxes(True)
+
+    def send(message):
+        with send_lock:
+            connection.send(message)
+
+    def run(job, token):
+        try:
+            result = _run_job(job, token, send, sandboxes)
+        except Exception as e:
+            result = _error_result(job["name"], f"ERROR - {e}")
+        try:
+            send(("result", result))
+        except OSError:
+            pass
+
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            message = ("stop",)
+        if message[0] == "stop":
+            if token is not None:
+                # The runner has gone away in the middle of a case
+                token.cancel("Runner exited")
+            sandboxes.wait()
+            return
+        if message[0] == "case":
+            token = CancellationToken()
+            if message[1].get("cancelled"):
+                token.cancel(message[1]["cancelled"])
+            threading.Thread(target=run, args=(message[1], token), daemon=True).start()
+        elif message[0] == "cancel" and token is not None:
+            token.cancel(message[1])
+
+
+class _WorkerLost(Exception):
+    """The worker process died or was terminated while running a case"""
+
+
+class _WorkerProcess:
+    """Runner side of one worker process"""
+
+    def __init__(self, context):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.cases = 0
+        self._send_lock = threading.Lock()
+
+    def _send(self, message):
+        with self._send_lock:
+            self.connection.send(message)
+
+    def run(self, job, output, on_step, on_step_start, token):
+        """
+        Run a case in the worker and stream its events
+
+        Returns:
+            dict: Structured case result
+
+        Raises:
+            _WorkerLost: The worker exited or was terminated; it cannot be reused
+        """
+        self.cases += 1
+        cancelled_at = []
+
+        def cancel():
+            cancelled_at.append(time.monotonic())
+            try:
+                self._send(("cancel", token.reason))
+            except OSError:
+                pass
+
+        job = dict(job, cancelled=token.reason if token.cancelled else None)
+        with token.on_cancel(cancel):
+            try:
+                self._send(("case", job))
+            except OSError:
+                raise _WorkerLost(f"ERROR - Worker process exited (code {self.process.exitcode})")
+            while True:
+                if not self.connection.poll(POLL_INTERVAL):
+                    if cancelled_at and time.monotonic() - cancelled_at[0] > CANCEL_GRACE:
+                        self.terminate()
+                        raise _WorkerLost(f"CANCELLED - {token.reason} (worker process terminated "
+                                          f"after {CANCEL_GRACE:g}s)")
+                    if self.process.is_alive():
+                        continue
+                try:
+                    message = self.connection.recv()
+                except (EOFError, OSError):
+                    self.process.join()
+                    raise _WorkerLost(f"ERROR - Worker process exited (code {self.process.exitcode})")
+                if message[0] == "output":
+                    output(message[1])
+                elif message[0] in ("step", "step_start"):
+                    callback = on_step if message[0] == "step" else on_step_start
+                    if callback is not None:
+                        try:
+                            callback(message[1])
+                        except Exception:
+                            pass
+                elif message[0] == "result":
+                    return message[1]
+
+    def stop(self):
+        try:
+            self._send(("stop",))
+        except OSError:
+            pass
+        self.process.join(CANCEL_GRACE)
+        if self.process.is_alive():
+            self.terminate()
+        self.connection.close()
+
+    def terminate(self):
+        self.process.terminate()
+        self.process.join()
+
+
+class CaseProcessPool:
+    """Bounded pool of worker processes, each running one case at a time"""
+
+    def __init__(self, workers=None, recycle_after=DEFAULT_RECYCLE_AFTER):
+        """
+        Args:
+            workers: Maximum number of worker processes (defaults to the CPU count)
+            recycle_after: Cases a worker runs before it is replaced
+        """
+        self.workers = workers or os.cpu_count() or 2
+        self.recycle_after = recycle_after
+        # Always spawn: forking a process that is running threads (and Tk) is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._jobs = queue.Queue()
+        self._slots = []
+        self._lock = threading.Lock()
+        self.started = 0
+
+    def describe(self):
+        """Return a one-line summary of the pool"""
+        return f"up to {self.workers} worker process(es), each replaced after {self.recycle_after} case(s)"
+
+    def submit(self, plan, output=None, on_step=None, cancel_token=None, parallel_steps=False,
+               step_workers=DEFAULT_STEP_WORKERS, abort_on_critical=False, step_timeout=None, incremental=False,
+               carry_over=None, step_priority=None, fixtures=None, sandbox=False, on_step_start=None,
+               admit=None):
+        """
+        Queue a case for the next free worker process
+
+        Args:
+            plan: CasePlan
+            output: Callable receiving the console text of the case
+            on_step: Optional callable receiving each step result
+            cancel_token: Optional CancellationToken of the run
+            fixtures: Optional SuiteFixtures whose Setup fixtures already ran;
+                      their outcomes decide the Use Fixture steps
+            sandbox: Give the case a fresh ${CASE_DIR} (see case_sandbox)
+            on_step_start: Optional callable receiving the number of each
+                           step as it starts
+            admit: Optional callable asked when a worker picks the case up;
+                   if it returns False the case does not run and its Future
+                   is cancelled (see time_budget)
+            Other arguments are passed on to CaseRunner in the worker
+
+        Returns:
+            concurrent.futures.Future: Resolves to the structured case result
+        """
+        job = {
+            "name": plan.name, "steps": plan.to_data(), "parallel_steps": parallel_steps,
+            "step_workers": step_workers, "abort_on_critical": abort_on_critical,
+            "step_timeout": step_timeout, "incremental": incremental,
+            "carry_over": carry_over, "step_priority": step_priority,
+            "fixtures": {}, "fixture_results": [], "sandbox": sandbox,
+        }
+        if fixtures:
+            job["fixtures"] = {fixture.name: fixture.to_data() for fixture in fixtures.setup + fixtures.cleanup}
+            # Only the outcome matters to Use Fixture steps; the report stays here
+            job["fixture_results"] = [{'name': result['name'], 'success': result['success'],
+                                       'status': result['status'], 'steps': [],
+                                       'execution_time': result['execution_time']}
+                                      for result in list(fixtures.results)]
+        future = concurrent.futures.Future()
+        self._jobs.put((job, output or sys.stdout.write, on_step, on_step_start, cancel_token or CancellationToken(),
+                        admit, future))
+        with self._lock:
+            if len(self._slots) < self.workers:
+                slot = threading.Thread(target=self._serve_slot, daemon=True)
+                self._slots.append(slot)
+                slot.start()
+        return future
+
+    def _serve_slot(self):
+        """Feed queued cases to one worker process, replacing it when needed"""
+        worker = None
+        try:
+            while True:
+                item = self._jobs.get()
+                if item is None:
+                    break
+                job, output, on_step, on_step_start, token, admit, future = item
+                if admit is not None and not admit():
+                    future.cancel()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if worker is None:
+                    worker = _WorkerProcess(self._context)
+                    with self._lock:
+                        self.started += 1
+                try:
+                    result = worker.run(job, output, on_step, on_step_start, token)
+                except _WorkerLost as e:
+                    worker = None
+                    output(f"❌ {str(e).split(' - ', 1)[1]}\n")
+                    result = _error_result(job["name"], str(e))
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+                future.set_result(result)
+                if worker is not None and worker.cases >= self.recycle_after:
+                    worker.stop()
+                    worker = None
+        finally:
+            if worker is not None:
+                worker.stop()
+
+    def shutdown(self):
+        """Stop the worker processes once the queued cases have run"""
+        with self._lock:
+            slots = list(self._slots)
+            self._slots.clear()
+        for _ in slots:
+            self._jobs.put(None)
+        for slot in slots:
+            slot.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
@@ -0,0 +1,741 @@
+"""
+Report Generation for Test Case Runs
+
+This module builds the per-case log/HTML reports and the combined dashboard
+written to the TestReports folder. It has no Tk dependency so it can be used
+by both the GUI and the headless suite runner.
+"""
+import html
+import os
+import re
+from datetime import datetime
+
+REPORT_OUTPUT_FOLDER = "TestReports"
+os.makedirs(REPORT_OUTPUT_FOLDER, exist_ok=True)
+
+combined_report_data = []
+
+def save_combined_html(report_data_list=None, concurrency=None):
+    """
+    Write the combined dashboard for all executed test cases
+
+    Args:
+        report_data_list: Report dicts to include (defaults to combined_report_data)
+        concurrency: Optional limits chosen over the run by adaptive
+                     concurrency (see adaptive_concurrency)
+    """
+    if report_data_list is None:
+        report_data_list = combined_report_data
+    if not report_data_list:
+        return
+    
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    version_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    # Parse all test case data to generate aggregate statistics
+    total_test_cases = len(report_data_list)
+    total_passed_cases = 0
+    total_failed_cases = 0
+    total_steps_all = 0
+    total_passed_steps = 0
+    total_failed_steps = 0
+    total_execution_time = 0.0
+    
+    test_case_summaries = []  # Store compact summaries for quick access table
+    
+    # Extract statistics from structured report data
+    for report_data in report_data_list:
+        # Handle both old (string) and new (dict) formats for backward compatibility
+        if isinstance(report_data, dict):
+            test_name = report_data['name']
+            passed_steps = report_data['passed_steps']
+            failed_steps = report_data['failed_steps']
+            total_steps = report_data['total_steps']
+            exec_time = report_data['execution_time']
+            is_passed = report_data['success']
+        else:
+            # Fallback to regex parsing for old format (string)
+            import re
+            report_html = report_data
+            name_match = re.search(r'Feature: ([^<]+)', report_html)
+            test_name = name_match.group(1) if name_match else "Unknown"
+            
+            is_passed = '#5cb85c' in report_html.split('cucumber-banner')[1].split('</div>')[0] if 'cucumber-banner' in report_html else False
+            
+            passed_match = re.search(r'(\d+)</div>\s*<div[^>]*>Passed</div>', report_html)
+            failed_match = re.search(r'(\d+)</div>\s*<div[^>]*>Failed</div>', report_html)
+            total_match = re.search(r'(\d+)</div>\s*<div[^>]*>Total</div>', report_html)
+            
+            passed_steps = int(passed_match.group(1)) if passed_match else 0
+            failed_steps = int(failed_match.group(1)) if failed_match else 0
+            total_steps = int(total_match.group(1)) if total_match else 0
+            
+            time_match = re.search(r'Total Duration</div>\s*<div[^>]*>([\d.]+)s</div>', report_html)
+            exec_time = float(time_match.group(1)) if time_match else 0.0
+        
+        # Aggregate statistics
+        if is_passed:
+            total_passed_cases += 1
+        else:
+            total_failed_cases += 1
+        
+        total_passed_steps += passed_steps
+        total_failed_steps += failed_steps
+        total_steps_all += total_steps
+        total_execution_time += exec_time
+        
+        # Store summary for table
+        test_case_summaries.append({
+            'name': test_name,
+            'status': 'PASS' if is_passed else 'FAIL',
+            'passed': passed_steps,
+            'failed': failed_steps,
+            'total': total_steps,
+            'time': exec_time
+        })
+    
+    # Calculate overall success rate
+    overall_success_rate = (total_passed_steps / total_steps_all * 100) if total_steps_all > 0 else 0
+    case_success_rate = (total_passed_cases / total_test_cases * 100) if total_test_cases > 0 else 0
+    
+    combined_html = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Test Execution Dashboard - v{version_timestamp}</title>
+    <style>
+        * {{ box-sizing: border-box; margin: 0; padding: 0; }}
+        body {{ 
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            padding: 20px;
+            line-height: 1.6;
+            color: #1e293b;
+        }}
+        .container {{ max-width: 1600px; margin: 0 auto; }}
+        .dashboard-header {{ 
+            background: white;
+            border-radius: 16px;
+            padding: 40px;
+            margin-bottom: 25px;
+            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+        }}
+        .dashboard-header h1 {{ 
+            font-size: 36px;
+            background: linear-gradient(135deg, #667eea, #764ba2);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            margin-bottom: 10px;
+            font-weight: 800;
+        }}
+        .stats-grid {{
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            margin: 25px 0;
+        }}
+        .stat-card {{
+            background: white;
+            border-radius: 12px;
+            padding: 25px;
+            text-align: center;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+            transition: transform 0.2s;
+        }}
+        .stat-card:hover {{ transform: translateY(-4px); box-shadow: 0 6px 20px rgba(0,0,0,0.15); }}
+        .stat-value {{ font-size: 42px; font-weight: 700; margin: 10px 0; }}
+        .stat-label {{ font-size: 13px; text-transform: uppercase; letter-spacing: 1px; color: #64748b; font-weight: 600; }}
+        .chart-section {{
+            background: white;
+            border-radius: 12px;
+            padding: 30px;
+            margin-bottom: 25px;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+        }}
+        .progress-bar {{
+            display: flex;
+            height: 50px;
+            border-radius: 25px;
+            overflow: hidden;
+            box-shadow: inset 0 2px 4px rgba(0,0,0,0.1);
+        }}
+        .progress-segment {{
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            color: white;
+            font-weight: 700;
+            font-size: 18px;
+            transition: all 0.3s;
+        }}
+        .summary-table {{
+            width: 100%;
+            border-collapse: separate;
+            border-spacing: 0;
+            background: white;
+            border-radius: 12px;
+            overflow: hidden;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+        }}
+        .summary-table thead {{
+            background: linear-gradient(135deg, #667eea, #764ba2);
+            color: white;
+        }}
+        .summary-table th {{
+            padding: 15px;
+            text-align: left;
+            font-weight: 600;
+            text-transform: uppercase;
+            font-size: 12px;
+            letter-spacing: 1px;
+        }}
+        .summary-table td {{
+            padding: 12px 15px;
+            border-bottom: 1px solid #e5e7eb;
+        }}
+        .summary-table tbody tr:hover {{ background: #f8fafc; }}
+        .badge {{ 
+            display: inline-block;
+            padding: 4px 12px;
+            border-radius: 12px;
+            font-weight: 600;
+            font-size: 11px;
+            text-transform: uppercase;
+        }}
+        .badge-pass {{ background: #d1fae5; color: #065f46; }}
+        .badge-fail {{ background: #fee2e2; color: #991b1b; }}
+        .compact-test {{ 
+            background: white;
+            border-radius: 8px;
+            padding: 15px 20px;
+            margin: 15px 0;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+            border-left: 4px solid #3b82f6;
+        }}
+        .compact-header {{
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            cursor: pointer;
+            user-select: none;
+        }}
+        .compact-header:hover {{ opacity: 0.8; }}
+        .details {{ display: none; margin-top: 15px; padding-top: 15px; border-top: 1px solid #e5e7eb; }}
+        .details.expanded {{ display: block; }}
+        @media print {{ body {{ background: white; }} }}
+    </style>
+    <script>
+        function toggleDetails(id) {{
+            const details = document.getElementById('details-' + id);
+            const arrow = document.getElementById('arrow-' + id);
+            if (details.classList.contains('expanded')) {{
+                details.classList.remove('expanded');
+                arrow.textContent = '▼';
+            }} else {{
+                details.classList.add('expanded');
+                arrow.textContent = '▲';
+            }}
+        }}
+    </script>
+</head>
+<body>
+    <div class="container">
+        <div class="dashboard-header">
+            <h1>🧪 Test Execution Dashboard</h1>
+            <p style='color: #64748b; font-size: 15px; margin-top: 5px;'>Comprehensive overview of all test executions</p>
+            <p style='color: #94a3b8; font-size: 13px; margin-top: 8px;'>📅 {timestamp} | 🔖 Version: {version_timestamp}</p>
+        </div>
+
+        <!-- Aggregate Statistics -->
+        <div class="stats-grid">
+            <div class="stat-card">
+                <div class="stat-label">Test Cases</div>
+                <div class="stat-value" style="color: #3b82f6;">{total_test_cases}</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-label">Passed Cases</div>
+                <div class="stat-value" style="color: #10b981;">{total_passed_cases}</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-label">Failed Cases</div>
+                <div class="stat-value" style="color: #ef4444;">{total_failed_cases}</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-label">Total Steps</div>
+                <div class="stat-value" style="color: #8b5cf6;">{total_steps_all}</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-label">Success Rate</div>
+                <div class="stat-value" style="color: {'#10b981' if overall_success_rate >= 80 else '#f59e0b' if overall_success_rate >= 50 else '#ef4444'};">{overall_success_rate:.1f}%</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-label">Total Time</div>
+                <div class="stat-value" style="color: #06b6d4;">{total_execution_time:.1f}s</div>
+            </div>
+        </div>
+
+        <!-- Visual Progress Chart -->
+        <div class="chart-section">
+            <h2 style="margin-bottom: 20px; font-size: 22px; color: #1e293b;">📊 Overall Test Execution</h2>
+            <div class="progress-bar">
+                <div class="progress-segment" style="flex: {total_passed_steps}; background: linear-gradient(135deg, #10b981, #059669);">
+                    {total_passed_steps if total_passed_steps > 0 else ''}
+                </div>
+                <div class="progress-segment" style="flex: {total_failed_steps}; background: linear-gradient(135deg, #ef4444, #dc2626);">
+                    {total_failed_steps if total_failed_steps > 0 else ''}
+                </div>
+            </div>
+            <div style="display: flex; justify-content: space-around; margin-top: 15px; font-size: 14px; color: #64748b;">
+                <span><strong style="color: #10b981;">✓ {total_passed_steps}</strong> Passed</span>
+                <span><strong style="color: #ef4444;">✗ {total_failed_steps}</strong> Failed</span>
+                <span><strong style="color: #3b82f6;">Total: {total_steps_all}</strong></span>
+            </div>
+        </div>
+
+        <!-- Quick Summary Table -->
+        <div class="chart-section">
+            <h2 style="margin-bottom: 20px; font-size: 22px; color: #1e293b;">📋 Test Cases Summary</h2>
+            <table class="summary-table">
+                <thead>
+                    <tr>
+                        <th>#</th>
+                        <th>Test Case Name</th>
+                        <th style="text-align: center;">Status</th>
+                        <th style="text-align: center;">Passed</th>
+                        <th style="text-align: center;">Failed</th>
+                        <th style="text-align: center;">Total</th>
+                        <th style="text-align: center;">Duration</th>
+                        <th style="text-align: center;">Details</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+    
+    # Add summary table rows
+    for idx, summary in enumerate(test_case_summaries, 1):
+        badge_class = 'badge-pass' if summary['status'] == 'PASS' else 'badge-fail'
+        combined_html += f"""
+                    <tr>
+                        <td><strong>#{idx}</strong></td>
+                        <td>{summary['name']}</td>
+                        <td style="text-align: center;"><span class="badge {badge_class}">{summary['status']}</span></td>
+                        <td style="text-align: center; color: #10b981; font-weight: 600;">{summary['passed']}</td>
+                        <td style="text-align: center; color: #ef4444; font-weight: 600;">{summary['failed']}</td>
+                        <td style="text-align: center; font-weight: 600;">{summary['total']}</td>
+                        <td style="text-align: center;">{summary['time']:.2f}s</td>
+                        <td style="text-align: center;"><a href="#test-{idx}" style="color: #3b82f6; text-decoration: none; font-weight: 600;">View ↓</a></td>
+                    </tr>
+"""
+    
+    combined_html += """
+                </tbody>
+            </table>
+        </div>
+"""
+    if concurrency:
+        combined_html += concurrency_section_html(concurrency)
+
+    combined_html += """
+        <!-- Detailed Test Cases (Compact, Expandable) -->
+        <div class="chart-section">
+            <h2 style="margin-bottom: 20px; font-size: 22px; color: #1e293b;">📝 Detailed Test Results</h2>
+"""
+    
+    # Add compact test case sections
+    for idx, report_data in enumerate(report_data_list, 1):
+        summary = test_case_summaries[idx - 1]
+        status_icon = '✓' if summary['status'] == 'PASS' else '✗'
+        status_color = '#10b981' if summary['status'] == 'PASS' else '#ef4444'
+        
+        # Extract HTML from report_data (handle both dict and string formats)
+        report_html = report_data['html'] if isinstance(report_data, dict) else report_data
+        
+        combined_html += f"""
+            <div class="compact-test" id="test-{idx}">
+                <div class="compact-header" onclick="toggleDetails({idx})">
+                    <div>
+                        <span style="font-size: 20px; margin-right: 10px;">{status_icon}</span>
+                        <strong style="font-size: 16px; color: {status_color};">#{idx}. {summary['name']}</strong>
+                        <span style="margin-left: 15px; color: #64748b; font-size: 14px;">
+                            {summary['passed']} passed, {summary['failed']} failed • {summary['time']:.2f}s
+                        </span>
+                    </div>
+                    <span id="arrow-{idx}" style="font-size: 14px; color: #64748b;">▼</span>
+                </div>
+                <div id="details-{idx}" class="details">
+                    {report_html}
+                </div>
+            </div>
+"""
+    
+    combined_html += """
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+    # Delete old combined reports to keep only the latest
+    import glob
+    old_reports = glob.glob(os.path.join(REPORT_OUTPUT_FOLDER, "Combined_Test_Summary_*.html"))
+    for old_report in old_reports:
+        try:
+            os.remove(old_report)
+        except:
+            pass
+    
+    # Save only the latest combined report
+    latest_filename = os.path.join(REPORT_OUTPUT_FOLDER, "Combined_Test_Summary_Latest.html")
+    
+    with open(latest_filename, "w", encoding="utf-8") as f:
+        f.write(combined_html)
+
+    print(f"✅ Combined report generated: Combined_Test_Summary_Latest.html")
+
+
+
+def concurrency_section_html(timeline):
+    """
+    Build the dashboard section listing the limits adaptive concurrency chose
+
+    Args:
+        timeline: ConcurrencyController.timeline samples
+    """
+    pools = list(timeline[0]['pools']) if timeline else []
+    header = "".join(f'<th style="text-align: center;">{name}</th>' for name in pools)
+    rows = ""
+    for sample in timeline:
+        cells = "".join(f'<td style="text-align: center;">{sample["pools"].get(name, "")}</td>' for name in pools)
+        host = "" if sample['cpu'] is None else f"{sample['cpu']:.0f}% / {sample['memory']:.0f}%"
+        if sample['cpu'] is not None and sample['disk'] is not None:
+            host += f" / {sample['disk']:.0f}%"
+        rows += f"""
+                    <tr>
+                        <td>{sample['time']:.1f}s</td>
+                        <td style="text-align: center; font-weight: 600;">{sample['cases']}</td>{cells}
+                        <td style="text-align: center;">{host}</td>
+                        <td>{html.escape(sample['change'])}</td>
+                    </tr>
+"""
+    return f"""
+        <!-- Adaptive Concurrency -->
+        <div class="chart-section">
+            <h2 style="margin-bottom: 20px; font-size: 22px; color: #1e293b;">⚙️ Concurrency Over Time</h2>
+            <table class="summary-table">
+                <thead>
+                    <tr>
+                        <th>Time</th>
+                        <th style="text-align: center;">Cases</th>{header}
+                        <th style="text-align: center;">CPU / Memory / Disk</th>
+                        <th>Change</th>
+                    </tr>
+                </thead>
+                <tbody>{rows}
+                </tbody>
+            </table>
+        </div>
+"""
+
+
+def step_row_html(step_index, step_name, passed, step_execution_time, category, cached=False):
+    """Build the Cucumber-style table row for an executed step (or one reused from the step cache)"""
+    status_icon = '✓' if passed else '✗'
+    status_color = '#10b981' if passed else '#ef4444'
+    status_bg = '#f0fdf4' if passed else '#fef2f2'
+    return f"""
+                        <tr style='background: {status_bg}; border-left: 4px solid {status_color};'>
+                            <td style='padding: 12px; font-weight: 600;'>Step {step_index}</td>
+                            <td style='padding: 12px;'>{step_name}</td>
+                            <td style='padding: 12px; text-align: center;'>
+                                <span style='display: inline-block; padding: 4px 12px; border-radius: 4px; background: {status_color}; color: white; font-weight: 600;'>
+                                    {status_icon} {'PASSED (cached)' if cached else 'PASSED' if passed else 'FAILED'}
+                                </span>
+                            </td>
+                            <td style='padding: 12px; text-align: center; font-weight: 600;'>{step_execution_time:.2f}s</td>
+                            <td style='padding: 12px; text-align: center;'><span style='padding: 4px 8px; background: #f3f4f6; border-radius: 4px; font-size: 12px;'>{category}</span></td>
+                        </tr>
+                    """
+
+
+def error_row_html(step_index, step_name, error, step_execution_time, category, status="ERROR"):
+    """Build the Cucumber-style table rows for a step that raised an error (or timed out)"""
+    return f"""
+                        <tr style='background: #fef2f2; border-left: 4px solid #dc2626;'>
+                            <td style='padding: 12px; font-weight: 600;'>Step {step_index}</td>
+                            <td style='padding: 12px;'>{step_name}</td>
+                            <td style='padding: 12px; text-align: center;'>
+                                <span style='display: inline-block; padding: 4px 12px; border-radius: 4px; background: #dc2626; color: white; font-weight: 600;'>
+                                    ⚠ {status}
+                                </span>
+                            </td>
+                            <td style='padding: 12px; text-align: center; font-weight: 600;'>{step_execution_time:.2f}s</td>
+                            <td style='padding: 12px; text-align: center;'><span style='padding: 4px 8px; background: #f3f4f6; border-radius: 4px; font-size: 12px;'>{category}</span></td>
+                        </tr>
+                        <tr style='background: #fef2f2;'>
+                            <td colspan='5' style='padding: 8px 12px; color: #dc2626; font-size: 13px; border-left: 4px solid #dc2626;'>
+                                <strong>Error Details:</strong> {str(error)}
+                            </td>
+                        </tr>
+                    """
+
+
+def skipped_row_html(msg):
+    """Build the entry for a skipped step"""
+    return f"<li style='color: #888;'>{msg}</li>"
+
+
+def build_case_summary_html(name, success, html_report, passed_steps, failed_steps, error_steps,
+                            skipped_steps, total_steps, executed_steps, total_execution_time,
+                            slowest_steps, category_stats):
+    """
+    Build the detailed HTML section for one test case
+
+    This is the block embedded in the combined dashboard: banner, summary bar,
+    steps table, execution time analysis and category breakdown.
+
+    Returns:
+        str: HTML fragment
+    """
+    pass_rate = (passed_steps / executed_steps * 100) if executed_steps > 0 else 0
+
+    # Build complete HTML structure with proper order: Banner -> Summary -> Steps Table -> Metrics
+    complete_html = []
+
+    # 1. Cucumber-style status banner (at top)
+    status_bg = '#5cb85c' if success else '#d9534f'
+    complete_html.append(f"""
+    <div class='cucumber-banner' style='background: {status_bg}; padding: 25px; margin: 30px 0; border-radius: 8px; color: white; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
+        <div style='display: flex; justify-content: space-between; align-items: center;'>
+            <div>
+                <h2 style='margin: 0; font-size: 28px; font-weight: 600;'>{'✓' if success else '✗'} Feature: {name}</h2>
+                <p style='margin: 8px 0 0 0; opacity: 0.95; font-size: 15px;'>Scenario executed on {datetime.now().strftime("%Y-%m-%d at %H:%M:%S")}</p>
+            </div>
+            <div class='stats-badge' style='text-align: right;'>
+                <div style='font-size: 42px; font-weight: bold;'>{pass_rate:.0f}%</div>
+                <div style='font-size: 13px; opacity: 0.9; text-transform: uppercase; letter-spacing: 1px;'>Success Rate</div>
+            </div>
+        </div>
+    </div>
+
+    <!-- JUnit-style summary bar -->
+    <div class='junit-summary' style='display: flex; gap: 0; border-radius: 8px; overflow: hidden; margin: 20px 0; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
+        <div style='flex: 1; background: #5cb85c; color: white; padding: 20px; text-align: center;'>
+            <div style='font-size: 32px; font-weight: bold;'>{passed_steps}</div>
+            <div style='font-size: 12px; text-transform: uppercase; letter-spacing: 1px; margin-top: 5px;'>Passed</div>
+        </div>
+        <div style='flex: 1; background: #d9534f; color: white; padding: 20px; text-align: center;'>
+            <div style='font-size: 32px; font-weight: bold;'>{failed_steps}</div>
+            <div style='font-size: 12px; text-transform: uppercase; letter-spacing: 1px; margin-top: 5px;'>Failed</div>
+        </div>
+        <div style='flex: 1; background: #f0ad4e; color: white; padding: 20px; text-align: center;'>
+            <div style='font-size: 32px; font-weight: bold;'>{error_steps}</div>
+            <div style='font-size: 12px; text-transform: uppercase; letter-spacing: 1px; margin-top: 5px;'>Errors</div>
+        </div>
+        <div style='flex: 1; background: #777; color: white; padding: 20px; text-align: center;'>
+            <div style='font-size: 32px; font-weight: bold;'>{skipped_steps}</div>
+            <div style='font-size: 12px; text-transform: uppercase; letter-spacing: 1px; margin-top: 5px;'>Skipped</div>
+        </div>
+        <div style='flex: 1; background: #5bc0de; color: white; padding: 20px; text-align: center;'>
+            <div style='font-size: 32px; font-weight: bold;'>{total_steps}</div>
+            <div style='font-size: 12px; text-transform: uppercase; letter-spacing: 1px; margin-top: 5px;'>Total</div>
+        </div>
+    </div>
+
+    <!-- Cucumber-style Steps Table -->
+    <div class='cucumber-steps-table' style='margin: 30px 0;'>
+        <h3 style='color: #333; font-size: 20px; margin-bottom: 20px; border-bottom: 2px solid #e0e0e0; padding-bottom: 10px;'>
+            📋 Scenario Steps Details
+        </h3>
+        <table style='width: 100%; border-collapse: separate; border-spacing: 0; box-shadow: 0 2px 8px rgba(0,0,0,0.08); border-radius: 8px; overflow: hidden; background: white;'>
+            <thead>
+                <tr style='background: linear-gradient(to right, #4a5568, #2d3748); color: white;'>
+                    <th style='padding: 15px; text-align: left; font-weight: 600; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px; width: 10%;'>Step</th>
+                    <th style='padding: 15px; text-align: left; font-weight: 600; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px; width: 40%;'>Given/When/Then</th>
+                    <th style='padding: 15px; text-align: center; font-weight: 600; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px; width: 15%;'>Status</th>
+                    <th style='padding: 15px; text-align: center; font-weight: 600; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px; width: 15%;'>Duration</th>
+                    <th style='padding: 15px; text-align: center; font-weight: 600; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px; width: 20%;'>Category</th>
+                </tr>
+            </thead>
+            <tbody>
+    """)
+
+    # Add all step rows
+    complete_html.extend(html_report)
+
+    complete_html.append("""</tbody></table></div>""")
+    complete_html.append(f"""
+
+    <!-- JUnit-style visual progress bar -->
+    <div style='margin: 25px 0;'>
+        <h3 style='color: #333; font-size: 18px; margin-bottom: 15px;'>Test Execution Progress</h3>
+        <div style='display: flex; height: 40px; border-radius: 8px; overflow: hidden; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
+            <div style='flex: {passed_steps}; background: #10b981; display: flex; align-items: center; justify-content: center; color: white; font-weight: 600; font-size: 14px;'>
+                {passed_steps if passed_steps > 0 else ''}
+            </div>
+            <div style='flex: {failed_steps}; background: #ef4444; display: flex; align-items: center; justify-content: center; color: white; font-weight: 600; font-size: 14px;'>
+                {failed_steps if failed_steps > 0 else ''}
+            </div>
+            <div style='flex: {error_steps}; background: #f59e0b; display: flex; align-items: center; justify-content: center; color: white; font-weight: 600; font-size: 14px;'>
+                {error_steps if error_steps > 0 else ''}
+            </div>
+            <div style='flex: {skipped_steps}; background: #9ca3af; display: flex; align-items: center; justify-content: center; color: white; font-weight: 600; font-size: 14px;'>
+                {skipped_steps if skipped_steps > 0 else ''}
+            </div>
+        </div>
+        <div style='display: flex; justify-content: space-between; margin-top: 10px; font-size: 13px; color: #6b7280;'>
+            <span>✓ Passed: {passed_steps}</span>
+            <span>✗ Failed: {failed_steps}</span>
+            <span>⚠ Errors: {error_steps}</span>
+            <span>⊘ Skipped: {skipped_steps}</span>
+        </div>
+    </div>
+
+    <!-- Execution Time Analysis -->
+    <div style='margin-top: 25px; padding: 20px; background: white; border-radius: 12px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);'>
+        <h3 style='margin-top: 0; color: #1f2937;'>⏱️ Execution Time Analysis</h3>
+        <div style='display: flex; justify-content: space-between; margin-bottom: 15px;'>
+            <div>
+                <div style='font-size: 14px; color: #6b7280;'>Total Duration</div>
+                <div style='font-size: 24px; font-weight: bold; color: #3b82f6;'>{total_execution_time:.2f}s</div>
+            </div>
+            <div>
+                <div style='font-size: 14px; color: #6b7280;'>Average per Step</div>
+                <div style='font-size: 24px; font-weight: bold; color: #3b82f6;'>{total_execution_time/executed_steps if executed_steps > 0 else 0:.2f}s</div>
+            </div>
+            <div>
+                <div style='font-size: 14px; color: #6b7280;'>Executed Steps</div>
+                <div style='font-size: 24px; font-weight: bold; color: #3b82f6;'>{executed_steps}/{total_steps}</div>
+            </div>
+        </div>
+
+        <h4 style='color: #1f2937; margin-top: 20px;'>🐌 Slowest Steps</h4>
+        <ul style='list-style: none; padding: 0;'>
+    """)
+
+    for step_name, step_time in slowest_steps:
+        complete_html.append(f"<li style='padding: 8px; background: #f9fafb; margin: 5px 0; border-radius: 6px;'>{step_name}: <strong>{step_time:.2f}s</strong></li>")
+
+    complete_html.append(f"""
+        </ul>
+    </div>
+
+    <!-- Category Breakdown -->
+    <div style='margin-top: 25px; padding: 20px; background: white; border-radius: 12px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);'>
+        <h3 style='margin-top: 0; color: #1f2937;'>📂 Category Breakdown</h3>
+        <table style='width: 100%; border-collapse: collapse;'>
+            <thead>
+                <tr style='background: #f3f4f6;'>
+                    <th style='padding: 10px; text-align: left; border-bottom: 2px solid #e5e7eb;'>Category</th>
+                    <th style='padding: 10px; text-align: center; border-bottom: 2px solid #e5e7eb;'>Total</th>
+                    <th style='padding: 10px; text-align: center; border-bottom: 2px solid #e5e7eb;'>Passed</th>
+                    <th style='padding: 10px; text-align: center; border-bottom: 2px solid #e5e7eb;'>Failed</th>
+                    <th style='padding: 10px; text-align: center; border-bottom: 2px solid #e5e7eb;'>Skipped</th>
+                    <th style='padding: 10px; text-align: center; border-bottom: 2px solid #e5e7eb;'>Success Rate</th>
+                </tr>
+            </thead>
+            <tbody>
+    """)
+
+    for category, stats in sorted(category_stats.items()):
+        executed_in_cat = stats['total'] - stats['skipped']
+        success_rate_cat = (stats['passed'] / executed_in_cat * 100) if executed_in_cat > 0 else 0
+        rate_color = '#10b981' if success_rate_cat >= 80 else '#f59e0b' if success_rate_cat >= 50 else '#ef4444'
+        complete_html.append(f"""
+            <tr style='border-bottom: 1px solid #e5e7eb;'>
+                <td style='padding: 10px;'><strong>{category}</strong></td>
+                <td style='padding: 10px; text-align: center;'>{stats['total']}</td>
+                <td style='padding: 10px; text-align: center; color: #10b981;'>{stats['passed']}</td>
+                <td style='padding: 10px; text-align: center; color: #ef4444;'>{stats['failed']}</td>
+                <td style='padding: 10px; text-align: center; color: #6b7280;'>{stats['skipped']}</td>
+                <td style='padding: 10px; text-align: center;'><span style='color: {rate_color}; font-weight: bold;'>{success_rate_cat:.0f}%</span></td>
+            </tr>
+        """)
+
+    complete_html.append(f"""
+            </tbody>
+        </table>
+    </div>
+    """)
+
+    return "".join(complete_html)
+
+
+def build_case_page_html(name, html_report):
+    """Build the standalone per-case HTML page from the step rows"""
+    rows_html = "\n".join(html_report)
+    return f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Test Report - {name}</title>
+        <style>
+            * {{ box-sizing: border-box; margin: 0; padding: 0; }}
+            body {{ 
+                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
+                background: #f9fafb;
+                padding: 40px 20px;
+                line-height: 1.6;
+                color: #1f2937;
+            }}
+            .container {{ max-width: 1200px; margin: 0 auto; }}
+            h2, h3, h4 {{ margin-bottom: 15px; }}
+            ul {{ margin: 15px 0; padding-left: 0; }}
+            li {{ 
+                padding: 12px 15px; 
+                margin: 8px 0; 
+                border-radius: 8px; 
+                background: white;
+                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+                list-style: none;
+            }}
+            @media print {{
+                body {{ background: white; }}
+                .no-print {{ display: none; }}
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            {rows_html}
+        </div>
+    </body>
+    </html>
+    """
+
+
+def write_case_reports(name, log_lines, html_report, report_data, refresh_combined=True):
+    """
+    Write the per-case log and HTML report and refresh the combined dashboard
+
+    Args:
+        name: Test case name
+        log_lines: Timestamped log lines
+        html_report: Step rows for the standalone HTML page
+        report_data: Structured report dict for the combined dashboard
+        refresh_combined: Rewrite the combined dashboard now; callers that
+                          write it once at the end of a run pass False
+
+    Returns:
+        tuple: (log_path, html_path)
+    """
+    safe_name = re.sub(r'[^a-zA-Z0-9_\-]', '_', name)
+    log_path = os.path.join(REPORT_OUTPUT_FOLDER, f"log_{safe_name}.txt")
+    html_path = os.path.join(REPORT_OUTPUT_FOLDER, f"report_{safe_name}.html")
+
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        log_file.write("\n".join(log_lines))
+
+    with open(html_path, "w", encoding="utf-8") as html_file:
+        html_file.write(build_case_page_html(name, html_report))
+
+    # Store report data with metadata for accurate combined report generation
+    combined_report_data.append(report_data)
+
+    # Generate combined report immediately after individual test execution
+    if refresh_combined:
+        save_combined_html()
+
+    return log_path, html_path
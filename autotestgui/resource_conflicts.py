@@ -0,0 +1,223 @@
+"""
+Resource-Conflict-Aware Scheduling
+
+Two cases that Copy File into, or Delete File/Folder on, the same directory
+corrupt each other when they run at the same time. Before a parallel run the
+resources every case touches are collected from its step details (see
+StepType.resources): paths, process names and database tables. What cannot
+be inferred, such as a license server or a shared test account, can be named
+in the Exclusive field of a step.
+
+Two cases conflict when one of them writes a resource the other one reads or
+writes; a path also covers everything below it, and an Exclusive tag
+conflicts with the same tag in any other case. The scheduler never runs two
+conflicting cases at the same time. Cases still start in the run order
+(longest or likeliest failures first), and a case held back by a conflict
+also holds back the later cases that conflict with it, so it is not overtaken
+over and over. Paths below ${CASE_DIR} belong to their case alone (see
+case_sandbox) and never conflict.
+"""
+import concurrent.futures
+import configparser
+import os
+import sys
+import threading
+
+from case_sandbox import CASE_DIR_VARIABLE
+from execution_plan import thaw
+from resource_pools import CONFIG_PATH
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from step_types import registry
+from step_types.registry import PATH_RESOURCE, TABLE_RESOURCE
+
+# Kind of the resources named in the Exclusive field of a step
+EXCLUSIVE_RESOURCE = "exclusive"
+
+
+def load_resource_conflicts(path=CONFIG_PATH):
+    """Return True if [resource_conflicts] enabled is set in config.ini (the default)"""
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    return parser.getboolean("resource_conflicts", "enabled", fallback=True)
+
+
+def _normalise(kind, name):
+    """Return the form of a resource name two cases are compared by"""
+    name = str(name).strip()
+    if kind == PATH_RESOURCE:
+        return os.path.normcase(os.path.abspath(os.path.expandvars(name)))
+    if kind == TABLE_RESOURCE:
+        # [dbo].[Orders], dbo.Orders and Orders are taken to be the same table
+        name = name.replace("[", "").replace("]", "").split(".")[-1]
+    return name.lower()
+
+
+def case_resources(plan):
+    """
+    Collect the resources the steps of a case touch
+
+    Args:
+        plan: CasePlan
+
+    Returns:
+        dict: (kind, normalised name) -> True if the case writes the resource
+    """
+    resources = {}
+    for step in plan.steps:
+        touched = [(EXCLUSIVE_RESOURCE, tag, True) for tag in step.exclusive]
+        registered = registry.get_step_type(step.step_type)
+        if registered is not None and registered.resources is not None:
+            try:
+                touched += list(registered.resources(registered.prepare(thaw(step.details))))
+            except Exception:
+                # Invalid details fail when the step runs
+                pass
+        for kind, name, writes in touched:
+            if kind == PATH_RESOURCE and CASE_DIR_VARIABLE in str(name):
+                # Every case has its own ${CASE_DIR}
+                continue
+            key = (kind, _normalise(kind, name))
+            resources[key] = resources.get(key, False) or bool(writes)
+    return resources
+
+
+def _inside(path, folder):
+    return path.startswith(folder.rstrip(os.sep) + os.sep)
+
+
+def _overlaps(first, second):
+    """Return True if two (kind, name) resources are or contain one another"""
+    if first[0] != second[0]:
+        return False
+    if first[1] == second[1]:
+        return True
+    return first[0] == PATH_RESOURCE and (_inside(first[1], second[1]) or _inside(second[1], first[1]))
+
+
+def find_conflict(first, second):
+    """
+    Return a resource two cases cannot share, or None
+
+    Args:
+        first, second: Resources of the cases, as returned by case_resources()
+
+    Returns:
+        tuple: (kind, name) of a resource of the first case, or None
+    """
+    for resource, writes in first.items():
+        for other, other_writes in second.items():
+            if (writes or other_writes) and _overlaps(resource, other):
+                return resource
+    return None
+
+
+def build_conflict_graph(plans):
+    """
+    Find the cases that must not run at the same time
+
+    Args:
+        plans: CasePlans of the run
+
+    Returns:
+        dict: Case name -> {conflicting case name: (kind, name) of a shared resource}
+    """
+    resources = {plan.name: case_resources(plan) for plan in plans}
+    graph = {name: {} for name in resources}
+    names = list(resources)
+    for i, first in enumerate(names):
+        for second in names[i + 1:]:
+            shared = find_conflict(resources[first], resources[second])
+            if shared is not None:
+                graph[first][second] = graph[second][first] = shared
+    return graph
+
+
+def describe_conflicts(graph):
+    """Return a printable list of the cases that never run together"""
+    pairs = {}
+    for name, conflicts in graph.items():
+        for other, resource in conflicts.items():
+            pairs.setdefault(tuple(sorted((name, other))), resource)
+    if not pairs:
+        return "Resource conflicts: none"
+    lines = [f"Resource conflicts: {len(pairs)} pair(s) of cases never run together"]
+    for (first, second), (kind, name) in sorted(pairs.items()):
+        lines.append(f"   {first} ↔ {second}: {kind} {name}")
+    return "\n".join(lines)
+
+
+class ConflictScheduler:
+    """Starts cases in submission order, never two conflicting cases at the same time"""
+
+    def __init__(self, graph):
+        """
+        Args:
+            graph: Conflict graph from build_conflict_graph()
+        """
+        self.graph = graph
+        self._pending = []
+        self._running = set()
+        self._lock = threading.Lock()
+
+    def submit_case(self, name, start, *args):
+        """
+        Start a case as soon as no running case conflicts with it
+
+        Args:
+            name: Case name, as in the conflict graph
+            start: Callable starting the case and returning a Future (or an
+                   asyncio Task) of its result
+            args: Arguments for start
+
+        Returns:
+            concurrent.futures.Future: Resolves to the result of the case
+        """
+        future = concurrent.futures.Future()
+        with self._lock:
+            self._pending.append((name, start, args, future))
+        self._dispatch()
+        return future
+
+    def _dispatch(self):
+        """Start every pending case that conflicts neither with a running one nor with an earlier pending one"""
+        with self._lock:
+            ready = []
+            pending = []
+            held = set()
+            for item in self._pending:
+                conflicts = self.graph.get(item[0], {})
+                if self._running.isdisjoint(conflicts) and held.isdisjoint(conflicts):
+                    self._running.add(item[0])
+                    ready.append(item)
+                else:
+                    held.add(item[0])
+                    pending.append(item)
+            self._pending = pending
+        # Started outside the lock: a Future that is already done runs its callback right away
+        for name, start, args, future in ready:
+            try:
+                started = start(*args)
+            except Exception as e:
+                self._finished(name)
+                future.set_exception(e)
+                continue
+            started.add_done_callback(lambda started, name=name, future=future: self._done(name, future, started))
+
+    def _finished(self, name):
+        with self._lock:
+            self._running.discard(name)
+        self._dispatch()
+
+    def _done(self, name, future, started):
+        self._finished(name)
+        if started.cancelled():
+            # Not run at all, e.g. deferred by the time budget. Like an
+            # executor, notify as_completed() and wait() of the cancellation
+            future.cancel()
+            future.set_running_or_notify_cancel()
+            return
+        try:
+            future.set_result(started.result())
+        except Exception as e:
+            future.set_exception(e)
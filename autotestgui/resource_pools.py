@@ -0,0 +1,290 @@
+"""
+Resource-Class Worker Pools
+
+Every step type declares the resource it mostly uses (file I/O, database,
+subprocess, CPU or waiting). During a run each class gets its own bounded
+thread pool, so a suite with hundreds of cases cannot put hundreds of
+concurrent operations on the disk, SQL Server or the process table at once.
+
+CPU-bound steps (checksums, archive extraction, log parsing) can optionally
+run in a pool of worker processes instead, so they scale across cores rather
+than serialising on the GIL. Work sent there must be a picklable module-level
+function with picklable arguments.
+"""
+import concurrent.futures
+import configparser
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+# Resource classes a step type can declare
+FILE_IO = "file_io"
+DATABASE = "database"
+SUBPROCESS = "subprocess"
+CPU = "cpu"
+WAIT = "wait"
+
+RESOURCE_CLASSES = [FILE_IO, DATABASE, SUBPROCESS, CPU, WAIT]
+
+DEFAULT_POOL_SIZES = {
+    FILE_IO: 8,
+    DATABASE: 4,
+    SUBPROCESS: 4,
+    CPU: os.cpu_count() or 2,
+    WAIT: 64,
+}
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.ini")
+
+
+def parse_pool_sizes(specs):
+    """
+    Parse pool size overrides of the form "class=size"
+
+    Args:
+        specs: Iterable of strings such as ["database=2", "cpu=4"]
+
+    Returns:
+        dict: Resource class to pool size
+    """
+    sizes = {}
+    for spec in specs or []:
+        name, sep, value = spec.partition("=")
+        name = name.strip()
+        if not sep or name not in RESOURCE_CLASSES:
+            raise ValueError(f"Invalid pool size '{spec}', expected one of {', '.join(RESOURCE_CLASSES)}=N")
+        size = int(value)
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1: {spec}")
+        sizes[name] = size
+    return sizes
+
+
+def load_pool_sizes(path=CONFIG_PATH):
+    """Read pool size defaults from the [resource_pools] section of config.ini"""
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    if not parser.has_section("resource_pools"):
+        return {}
+    return parse_pool_sizes(f"{key}={value}" for key, value in parser.items("resource_pools"))
+
+
+def load_cpu_processes(path=CONFIG_PATH):
+    """Read the cpu_steps switch from the [process_pool] section of config.ini"""
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    return parser.getboolean("process_pool", "cpu_steps", fallback=False)
+
+
+class _SlotPool:
+    """
+    Thread pool with a fixed number of working threads
+
+    Threads are started as work arrives, up to `size`. A thread stuck past its
+    step's timeout can be abandoned (see ResourcePools.abandon): it stops
+    counting against the pool, a new thread takes its place and the stuck one
+    exits once its call returns, so a hung step never shrinks the pool.
+    `size` can change while the pool runs (see resize); surplus threads exit
+    when they next look for work.
+    """
+
+    def __init__(self, name, size, observer=None):
+        self.name = name
+        self.size = size
+        self.observer = observer
+        self._tasks = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._workers = set()
+        self._running = {}
+        self._abandoned = set()
+        self._started = 0
+
+    def _retire_if_surplus(self):
+        """Drop the current thread from the pool if it has more threads than `size`"""
+        with self._lock:
+            if len(self._workers) <= self.size:
+                return False
+            self._workers.discard(threading.current_thread())
+            return True
+
+    def _work(self):
+        while True:
+            if self._retire_if_surplus():
+                return
+            task = self._tasks.get()
+            if task is None:
+                return
+            if self._retire_if_surplus():
+                # The pool shrank while this thread waited; leave the task to the others
+                self._tasks.put(task)
+                return
+            future, fn, args, kwargs = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            with self._lock:
+                self._running[future] = threading.current_thread()
+            started = time.monotonic()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            if self.observer is not None:
+                try:
+                    self.observer(self.name, fn, args, time.monotonic() - started)
+                except Exception:
+                    pass
+            with self._lock:
+                del self._running[future]
+                if future in self._abandoned:
+                    self._abandoned.discard(future)
+                    return
+
+    def _add_worker(self):
+        """Start a thread unless the pool already has `size` of them"""
+        with self._lock:
+            if len(self._workers) >= self.size:
+                return
+            self._started += 1
+            thread = threading.Thread(target=self._work, daemon=True,
+                                      name=f"pool-{self.name}_{self._started}")
+            self._workers.add(thread)
+        thread.start()
+
+    def submit(self, fn, *args, **kwargs):
+        future = concurrent.futures.Future()
+        self._tasks.put((future, fn, args, kwargs))
+        self._add_worker()
+        return future
+
+    def resize(self, size):
+        """Change the number of working threads; queued work starts at once when it grows"""
+        with self._lock:
+            self.size = size
+            missing = min(size - len(self._workers), self._tasks.qsize())
+        for _ in range(missing):
+            self._add_worker()
+
+    def load(self):
+        """Return (running tasks, queued tasks)"""
+        with self._lock:
+            return len(self._running), self._tasks.qsize()
+
+    def abandon(self, future):
+        """Stop counting the thread of a still-running task against the pool"""
+        with self._lock:
+            thread = self._running.get(future)
+            if thread is None or future in self._abandoned:
+                return
+            self._abandoned.add(future)
+            self._workers.discard(thread)
+        self._add_worker()
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            workers = list(self._workers)
+        for _ in workers:
+            self._tasks.put(None)
+        if wait:
+            for thread in workers:
+                thread.join()
+
+
+class ResourcePools:
+    """One bounded worker pool per resource class for the duration of a run"""
+
+    def __init__(self, sizes=None, cpu_processes=False, observer=None):
+        """
+        Args:
+            sizes: Optional overrides of DEFAULT_POOL_SIZES
+            cpu_processes: Back the cpu class with worker processes instead
+                           of threads
+            observer: Optional callable (resource class, fn, args, seconds)
+                      called after each task that ran on a thread pool
+        """
+        self.sizes = dict(DEFAULT_POOL_SIZES)
+        self.sizes.update(sizes or {})
+        self.cpu_processes = cpu_processes
+        self._executors = {
+            name: _SlotPool(name, size, observer)
+            for name, size in self.sizes.items() if not (cpu_processes and name == CPU)
+        }
+        if cpu_processes:
+            # Always spawn: forking a process that is running worker threads
+            # (and Tk) is unsafe, and spawn is what Windows uses anyway
+            self._executors[CPU] = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.sizes[CPU], mp_context=multiprocessing.get_context("spawn"))
+            # The executor queues work ahead of its processes where it can no
+            # longer be cancelled; hand it over only when a process is free
+            self._process_slots = threading.BoundedSemaphore(self.sizes[CPU])
+
+    def uses_processes(self, resource_class):
+        """Return True if work for a resource class runs in worker processes"""
+        return self.cpu_processes and resource_class == CPU
+
+    def submit(self, resource_class, fn, *args, **kwargs):
+        """
+        Submit work to the pool for a resource class and return its Future
+
+        Work for worker processes waits here until a process is free, so its
+        Future only exists once the work starts
+        """
+        executor = self._executors.get(resource_class, self._executors[FILE_IO])
+        if not self.uses_processes(resource_class):
+            return executor.submit(fn, *args, **kwargs)
+        self._process_slots.acquire()
+        try:
+            future = executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._process_slots.release()
+            raise
+        future.add_done_callback(lambda _: self._process_slots.release())
+        return future
+
+    def run(self, resource_class, fn, *args, **kwargs):
+        """Run work on the pool for a resource class and wait for its result"""
+        return self.submit(resource_class, fn, *args, **kwargs).result()
+
+    def resizable(self):
+        """Return the resource classes whose pool size can change during a run (thread pools)"""
+        return [name for name, executor in self._executors.items() if isinstance(executor, _SlotPool)]
+
+    def resize(self, resource_class, size):
+        """Change the size of a thread pool while it runs"""
+        self._executors[resource_class].resize(size)
+        self.sizes[resource_class] = size
+
+    def load(self, resource_class):
+        """Return (running tasks, queued tasks) of a thread pool"""
+        return self._executors[resource_class].load()
+
+    def abandon(self, resource_class, future):
+        """
+        Give the pool a new thread in place of one stuck in a task
+
+        Used for timed-out steps blocked in a call that cannot be interrupted.
+        Worker processes cannot be reclaimed; their slot frees when the task ends.
+        """
+        executor = self._executors.get(resource_class, self._executors[FILE_IO])
+        if isinstance(executor, _SlotPool):
+            executor.abandon(future)
+
+    def describe(self):
+        """Return a one-line summary of the pool sizes"""
+        summary = ", ".join(f"{name}={size}" for name, size in self.sizes.items())
+        if self.cpu_processes:
+            summary += " (cpu steps in worker processes)"
+        return summary
+
+    def shutdown(self, wait=True):
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
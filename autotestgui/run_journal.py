@@ -0,0 +1,224 @@
+"""
+Crash-Safe Run Journal
+
+Step results, logs and reports only live in memory until a case ends, so a
+crash or reboot in the middle of a long run used to lose everything. Every
+Run All and suite run therefore appends what happens to
+TestReports/run_journal.jsonl, one JSON object per line:
+
+    {"event": "run", "cases": [...], "resume": false, "time": ...}
+    {"event": "step_started", "case": "...", "step": 3, "time": ...}
+    {"event": "step", "case": "...", "result": {step result}}
+    {"event": "case", "result": {structured case result}}
+    {"event": "end", "time": ...}
+
+Each line reaches the operating system as soon as it is written; fsync runs
+at most every sync_interval seconds on a background thread, so a busy run
+does not wait for the disk after every step.
+
+A resume reads the journal of a run that has no "end" record. It skips the
+cases that finished and restarts each interrupted case at its first
+unfinished step: the finished steps keep their journaled results, which also
+seed the run conditions of the later steps. Setup and Cleanup fixtures run
+again. A resume appends to the same journal, so it can itself be resumed.
+"""
+import configparser
+import json
+import os
+import threading
+import time
+
+from case_sandbox import uses_case_dir
+import reporting
+from resource_pools import CONFIG_PATH
+
+JOURNAL_PATH = os.path.join(reporting.REPORT_OUTPUT_FOLDER, "run_journal.jsonl")
+
+# Longest time, in seconds, a journaled line may wait for fsync
+DEFAULT_SYNC_INTERVAL = 0.5
+
+
+def load_run_journal(resume=False, path=CONFIG_PATH):
+    """
+    Create the RunJournal of a run from the [journal] section of config.ini
+
+    Args:
+        resume: Append to the journal of the interrupted run instead of
+                starting a new one
+
+    Returns:
+        RunJournal, or None when journaling is off
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    if not parser.getboolean("journal", "enabled", fallback=True):
+        return None
+    return RunJournal(resume=resume,
+                      sync_interval=parser.getfloat("journal", "sync_interval", fallback=DEFAULT_SYNC_INTERVAL))
+
+
+class RunJournal:
+    """Append-only record of one run, written as it happens"""
+
+    def __init__(self, path=JOURNAL_PATH, resume=False, sync_interval=DEFAULT_SYNC_INTERVAL):
+        """
+        Args:
+            path: Journal file
+            resume: Append to the existing journal instead of replacing it
+            sync_interval: Longest time, in seconds, between a write and its fsync
+        """
+        self.path = path
+        self.resume = resume
+        self.sync_interval = sync_interval
+        self._file = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._syncer = None
+
+    def start(self, case_names):
+        """
+        Open the journal and record the start of a run
+
+        Args:
+            case_names: Cases of the run, without the fixtures
+        """
+        self._file = open(self.path, "a" if self.resume else "w", encoding="utf-8")
+        self._syncer = threading.Thread(target=self._sync_periodically, name="journal-sync", daemon=True)
+        self._syncer.start()
+        self._append({"event": "run", "cases": list(case_names), "resume": self.resume, "time": time.time()})
+
+    def _append(self, entry):
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            # Written through to the OS at once; only the fsync is batched
+            self._file.flush()
+            self._dirty = True
+
+    def _sync(self):
+        with self._lock:
+            if self._file is None or not self._dirty:
+                return
+            self._dirty = False
+            try:
+                os.fsync(self._file.fileno())
+            except OSError:
+                pass
+
+    def _sync_periodically(self):
+        while not self._stopped.wait(self.sync_interval):
+            self._sync()
+
+    def step_started(self, case_name, index):
+        self._append({"event": "step_started", "case": case_name, "step": index, "time": time.time()})
+
+    def step_finished(self, case_name, step_result):
+        self._append({"event": "step", "case": case_name, "result": step_result})
+
+    def case_finished(self, result):
+        self._append({"event": "case", "result": result})
+
+    def finish(self):
+        """Record the end of the run and close the journal"""
+        self._append({"event": "end", "time": time.time()})
+        self.close()
+
+    def close(self):
+        """Sync and close the journal; a run closed without finish() can be resumed"""
+        self._stopped.set()
+        if self._syncer is not None:
+            self._syncer.join()
+        self._sync()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def load_journal(path=JOURNAL_PATH):
+    """
+    Read the journal entries of the latest run and its resumes
+
+    Returns:
+        list: Entries in write order; a line torn by the crash is ignored
+    """
+    entries = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        return []
+    return entries
+
+
+def _matches(plan, index, step_result):
+    """Return True if a journaled step result still describes the step of the plan"""
+    return (0 < index <= len(plan.steps) and step_result.get('name') == plan.steps[index - 1].name
+            and step_result.get('type') == plan.steps[index - 1].step_type)
+
+
+def resume_state(entries, plans, sandboxed=False):
+    """
+    Work out what is left of an interrupted run
+
+    Args:
+        entries: Journal entries from load_journal()
+        plans: CasePlans of the suite as it is now
+        sandboxed: Whether the resume runs in sandbox mode; cases using
+                   ${CASE_DIR} then restart from their first step, since
+                   the sandbox their finished steps wrote to is gone
+
+    Returns:
+        (finished, remaining, carry_over), or None if there is nothing to
+        resume: finished maps case name -> structured result of the cases
+        that completed, remaining lists the names of the other cases of the
+        run in suite order, and carry_over maps case name -> step number ->
+        journaled step result for the interrupted cases
+    """
+    if not entries or entries[-1].get("event") == "end":
+        return None
+    cases = []
+    finished = {}
+    steps = {}
+    for entry in entries:
+        event = entry.get("event")
+        if event == "run":
+            if not entry.get("resume"):
+                # A new run; what came before it does not count
+                cases, finished, steps = list(entry.get("cases") or []), {}, {}
+        elif event == "step":
+            result = entry.get("result") or {}
+            steps.setdefault(entry.get("case"), {})[result.get('index')] = result
+        elif event == "case":
+            result = entry.get("result") or {}
+            finished[result.get('name')] = result
+            steps.pop(result.get('name'), None)
+    by_name = {plan.name: plan for plan in plans}
+    remaining = [name for name in cases if name in by_name and name not in finished]
+    carry_over = {}
+    for name in remaining:
+        plan = by_name[name]
+        if sandboxed and uses_case_dir(plan):
+            continue
+        kept = {index: result for index, result in steps.get(name, {}).items()
+                if isinstance(index, int) and _matches(plan, index, result)}
+        if kept:
+            carry_over[name] = kept
+    return {name: finished[name] for name in cases if name in finished}, remaining, carry_over
+
+
+def describe_resume(finished, remaining, carry_over):
+    """Return a printable summary of what a resume skips and reruns"""
+    lines = [f"Resuming the interrupted run: {len(finished)} case(s) finished, {len(remaining)} to run"]
+    for name in remaining:
+        kept = carry_over.get(name)
+        if kept:
+            lines.append(f"   {name}: continuing after {len(kept)} finished step(s)")
+    return "\n".join(lines)
@@ -0,0 +1,661 @@
+"""
+Runner Daemon
+
+A long-lived local runner. It keeps what every run would otherwise set up
+again:
+
+- imported modules (pyodbc, psutil, openpyxl and the step type plugins)
+- pooled SQL Server connections
+- psutil's table of running processes
+- the parsed db_config.json
+- the resource pools, including the cpu worker processes
+
+The GUI and the command-line client submit suites to it. Several submissions
+run at the same time on the shared pools. Each one streams its output and its
+step results back while it runs.
+
+Protocol: JSON-RPC 2.0, one JSON object per line, over a Unix socket (a
+localhost TCP port where Unix sockets are not available).
+
+    submit {suite, options}  -> {run_id}
+    cancel {run_id}          -> {cancelled}
+    status {}                -> {runs, pools}
+    shutdown {}              -> {}
+
+While a submission runs, the daemon sends "event" notifications
+{run_id, type, ...} on the connection that submitted it:
+
+    output   {case, text}       console text (case is null for run messages)
+    step     {case, step}       a step result as soon as the step has finished
+    case     {result}           a finished case, without its report
+    finished {results, success, deferred}
+
+A submission is cancelled when its client disconnects. Submissions that share
+test cases would overwrite each other's case reports, so a submission waits
+while another one runs any of its cases; the others run at the same time.
+
+Usage:
+    python autotestgui/runner_daemon.py serve [--listen unix:/tmp/vcb-runner.sock]
+    python autotestgui/runner_daemon.py submit suite.json [--parallel] [--parallel-steps] ...
+    python autotestgui/runner_daemon.py status
+    python autotestgui/runner_daemon.py stop
+"""
+import argparse
+import configparser
+import importlib
+import itertools
+import os
+import signal
+import socket
+import sys
+import tempfile
+import threading
+
+from distributed import Connection, parse_address
+from adaptive_concurrency import load_adaptive_concurrency
+from execution_plan import compile_suite
+from fail_fast import load_fail_fast
+from failure_ordering import ORDERS, load_case_order
+from case_sandbox import load_case_sandboxes
+from resource_conflicts import load_resource_conflicts
+from resource_pools import CONFIG_PATH, ResourcePools, load_cpu_processes, load_pool_sizes, parse_pool_sizes
+from step_cache import load_step_cache
+from time_budget import load_time_budget, parse_budget
+from step_watchdog import load_default_step_timeout
+from suite_runner import DEFAULT_STEP_WORKERS, ENGINES, SuiteRunner, load_suite
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from step_types import registry
+from step_types.application_operations import load_db_config
+
+if hasattr(socket, "AF_UNIX"):
+    DEFAULT_ADDRESS = "unix:" + os.path.join(tempfile.gettempdir(), "vcb-runner.sock")
+else:
+    DEFAULT_ADDRESS = "tcp://127.0.0.1:7346"
+
+# Modules imported once at startup; missing optional ones are skipped
+WARM_MODULES = ["psutil", "pyodbc", "openpyxl"]
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RunnerDaemonError(Exception):
+    """An error returned by the runner daemon, or no daemon to talk to"""
+
+
+def load_daemon_address(path=CONFIG_PATH):
+    """Read the daemon address from the [runner_daemon] section of config.ini"""
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    return parser.get("runner_daemon", "address", fallback="").strip() or DEFAULT_ADDRESS
+
+
+def _summary(result):
+    """Return a case result without its report, for events"""
+    return {key: value for key, value in result.items() if key != 'report'}
+
+
+class _DaemonSuiteRunner(SuiteRunner):
+    """SuiteRunner that reports to the client of its submission"""
+
+    def __init__(self, plans, emit, **kwargs):
+        self._emit = emit
+        super().__init__(plans, output=lambda text: emit("output", case=None, text=text),
+                         on_step=lambda case, step: emit("step", case=case, step=step), **kwargs)
+
+    def _case_output(self, name, prefix):
+        return lambda text: self._emit("output", case=name, text=text)
+
+    def _case_finished(self, result):
+        # Every engine passes its finished cases and fixtures through here
+        super()._case_finished(result)
+        self._emit("case", result=_summary(result))
+
+
+class RunnerDaemon:
+    """Serves suite submissions on shared, warm resource pools"""
+
+    def __init__(self, address=DEFAULT_ADDRESS, pool_sizes=None, cpu_processes=False, output=None):
+        """
+        Args:
+            address: Listen address (unix:/path, or tcp://host:port)
+            pool_sizes: Resource pool size overrides
+            cpu_processes: Run CPU-heavy steps in worker processes
+            output: Callable receiving console text (defaults to stdout)
+        """
+        self.address = address
+        self.pool_sizes = pool_sizes
+        self.cpu_processes = cpu_processes
+        self.pools = None
+        self._output = output or sys.stdout.write
+        self._server = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._run_ids = itertools.count(1)
+        # run_id -> {"runner", "cases", "thread", "waiting"}
+        self._runs = {}
+        # Names of the cases of the running submissions, and a wait for them to change
+        self._running_cases = set()
+        self._cases_released = threading.Condition(self._lock)
+
+    def warm(self):
+        """Import the step dependencies and load what later runs reuse"""
+        warmed = []
+        for name in WARM_MODULES:
+            try:
+                importlib.import_module(name)
+                warmed.append(name)
+            except ImportError:
+                pass
+        warmed.append(f"{len(registry.step_types())} step types")
+        if "psutil" in warmed:
+            import psutil
+            # psutil keeps the Process objects it has seen; later scans reuse them
+            list(psutil.process_iter(['name', 'pid']))
+        if load_db_config() is not None:
+            warmed.append("db_config.json")
+        self.pools = ResourcePools(self.pool_sizes, cpu_processes=self.cpu_processes)
+        # Start the cpu worker processes now rather than in the first run
+        self.pools.run("cpu", len, ())
+        self._output(f"Warm: {', '.join(warmed)}\nResource pools: {self.pools.describe()}\n")
+
+    def _listen(self):
+        family, bind_address = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(bind_address):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(bind_address)
+            except OSError:
+                # Left behind by a daemon that did not shut down cleanly
+                os.unlink(bind_address)
+            else:
+                probe.close()
+                raise RunnerDaemonError(f"A runner daemon is already listening on {self.address}")
+        server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(bind_address)
+        if family == socket.AF_UNIX:
+            # Only this user may submit suites
+            os.chmod(bind_address, 0o600)
+        server.listen()
+        return server
+
+    def serve(self):
+        """Accept clients until a shutdown request or stop()"""
+        self._server = self._listen()
+        self.warm()
+        self._output(f"🛰 Runner daemon listening on {self.address}\n")
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        try:
+            # Timed waits keep the main thread responsive to Ctrl+C
+            while not self._stopped.wait(1.0):
+                pass
+        finally:
+            self._shutdown()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                sock, _ = self._server.accept()
+            except OSError:
+                return  # Server socket closed by stop()
+            threading.Thread(target=self._serve_client, args=(sock,), daemon=True).start()
+
+    def stop(self):
+        """Stop accepting clients; running submissions are cancelled"""
+        self._stopped.set()
+
+    def _shutdown(self):
+        if self._server is not None:
+            self._server.close()
+        with self._lock:
+            runs = list(self._runs.values())
+        for run in runs:
+            run["runner"].cancel("Runner daemon stopped")
+        for run in runs:
+            run["thread"].join()
+        if self.pools is not None:
+            self.pools.shutdown()
+        family, bind_address = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(bind_address):
+            os.unlink(bind_address)
+        self._output("Runner daemon stopped\n")
+
+    def _serve_client(self, sock):
+        connection = Connection(sock)
+        # Submissions of this client, cancelled when it disconnects
+        submitted = []
+        try:
+            while True:
+                try:
+                    request = connection.receive()
+                except ValueError:
+                    connection.send(_error(None, PARSE_ERROR, "Parse error"))
+                    continue
+                if request is None:
+                    break
+                response = self._handle(connection, request, submitted)
+                if response is not None:
+                    connection.send(response)
+        except OSError:
+            pass
+        finally:
+            for run_id in submitted:
+                self.cancel(run_id, "Client disconnected")
+            connection.close()
+
+    def _handle(self, connection, request, submitted):
+        """Answer one JSON-RPC request; notifications get no response"""
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        params = request.get("params") or {}
+        method = request["method"]
+        try:
+            if method == "submit":
+                run_id = self.submit(connection, params.get("suite"), params.get("options") or {})
+                submitted.append(run_id)
+                result = {"run_id": run_id}
+            elif method == "cancel":
+                result = {"cancelled": self.cancel(params.get("run_id"))}
+            elif method == "status":
+                result = self.status()
+            elif method == "shutdown":
+                self.stop()
+                result = {}
+            else:
+                return _error(request_id, METHOD_NOT_FOUND, f"Unknown method: {method}")
+        except ValueError as e:
+            return _error(request_id, INVALID_PARAMS, str(e))
+        except Exception as e:
+            return _error(request_id, INTERNAL_ERROR, str(e))
+        if request_id is None:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def submit(self, connection, suite, options):
+        """
+        Start running a suite
+
+        Args:
+            connection: Connection the events of the run are sent on
+            suite: Mapping of test case name to its list of step dicts
+            options: Run options (see _options)
+
+        Returns:
+            int: Run id
+        """
+        if not isinstance(suite, dict) or not suite:
+            raise ValueError("suite must be an object of test cases")
+        options = _options(options)
+        case_names = options["case_names"]
+        missing = [name for name in case_names if name not in suite]
+        if missing:
+            raise ValueError(f"Unknown test case(s): {', '.join(missing)}")
+        # Fixtures stay in the run with a case selection
+        plans = [plan for plan in compile_suite(suite)
+                 if plan.fixture or not case_names or plan.name in case_names]
+
+        run_id = next(self._run_ids)
+
+        def emit(kind, **fields):
+            try:
+                connection.send({"jsonrpc": "2.0", "method": "event",
+                                 "params": dict(fields, run_id=run_id, type=kind)})
+            except OSError:
+                self.cancel(run_id, "Client disconnected")
+
+        fail_fast = load_fail_fast()
+        if options["abort_on_critical"]:
+            fail_fast.abort_case_on_critical = True
+        if options["max_failures"] is not None:
+            fail_fast.max_failed_cases = options["max_failures"]
+        runner = _DaemonSuiteRunner(plans, emit, parallel_steps=options["parallel_steps"],
+                                    step_workers=options["step_workers"], fail_fast=fail_fast,
+                                    step_timeout=options["step_timeout"],
+                                    step_cache=load_step_cache(options["incremental"]), order=options["order"],
+                                    adaptive=options["adaptive"], avoid_conflicts=options["avoid_conflicts"],
+                                    sandboxes=load_case_sandboxes(options["sandbox"]), budget=options["budget"])
+        thread = threading.Thread(target=self._execute, args=(run_id, runner, options, emit), daemon=True)
+        with self._lock:
+            self._runs[run_id] = {"runner": runner, "cases": len(plans), "thread": thread, "waiting": False}
+        thread.start()
+        self._output(f"▶ Run {run_id}: {len(plans)} case(s)\n")
+        return run_id
+
+    def _claim_cases(self, run_id, runner, emit):
+        """
+        Wait until no other submission runs any case of this one, then claim them
+
+        Returns:
+            set: The claimed case names, or None if the run was cancelled while waiting
+        """
+        names = {plan.name for plan in runner.plans}
+        with self._cases_released:
+            busy = bool(self._running_cases & names)
+        if busy:
+            emit("output", case=None, text="⏳ Waiting for another run of the same test cases\n")
+
+        def wake():
+            with self._cases_released:
+                self._cases_released.notify_all()
+
+        with runner.cancel_token.on_cancel(wake), self._cases_released:
+            while self._running_cases & names and not runner.cancel_token.cancelled:
+                self._runs[run_id]["waiting"] = True
+                self._cases_released.wait()
+            self._runs[run_id]["waiting"] = False
+            if runner.cancel_token.cancelled:
+                return None
+            self._running_cases |= names
+            return names
+
+    def _execute(self, run_id, runner, options, emit):
+        parallel = options["parallel"]
+        names = self._claim_cases(run_id, runner, emit)
+        try:
+            if names is None:
+                results = []
+            else:
+                results = runner.run(parallel=parallel, workers=options["workers"], engine=options["engine"],
+                                     pools=self.pools if parallel else None)
+        except Exception as e:
+            emit("output", case=None, text=f"❌ Run failed: {e}\n")
+            results = []
+        finally:
+            with self._cases_released:
+                self._running_cases -= names or set()
+                self._cases_released.notify_all()
+        success = bool(results) and all(result['success'] for result in results)
+        emit("finished", results=[_summary(result) for result in results], success=success,
+             deferred=runner.deferred)
+        with self._lock:
+            self._runs.pop(run_id, None)
+        self._output(f"■ Run {run_id}: {'passed' if success else 'failed'}\n")
+
+    def cancel(self, run_id, reason="Cancelled by client"):
+        """
+        Cancel a running submission
+
+        Returns:
+            bool: False if no such run is running
+        """
+        with self._lock:
+            run = self._runs.get(run_id)
+        if run is None:
+            return False
+        run["runner"].cancel(reason)
+        return True
+
+    def status(self):
+        with self._lock:
+            runs = [{"run_id": run_id, "cases": run["cases"],
+                     "state": "cancelling" if run["runner"].cancel_token.cancelled
+                     else "waiting" if run["waiting"] else "running"}
+                    for run_id, run in self._runs.items()]
+        return {"runs": runs, "pools": self.pools.describe() if self.pools is not None else ""}
+
+
+def _error(request_id, code, message):
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def _options(options):
+    """Validate submit options and fill in defaults from config.ini"""
+    if not isinstance(options, dict):
+        raise ValueError("options must be an object")
+    engine = options.get("engine", "threads")
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
+    order = options.get("order") or load_case_order()
+    if order not in ORDERS:
+        raise ValueError(f"order must be one of {', '.join(ORDERS)}")
+    try:
+        step_timeout = options.get("step_timeout")
+        return {
+            "parallel": bool(options.get("parallel", False)),
+            "workers": int(options["workers"]) if options.get("workers") else None,
+            "engine": engine,
+            "parallel_steps": bool(options.get("parallel_steps", False)),
+            "step_workers": int(options.get("step_workers") or DEFAULT_STEP_WORKERS),
+            "step_timeout": load_default_step_timeout() if step_timeout is None else int(step_timeout),
+            "incremental": options.get("incremental"),
+            "order": order,
+            "case_names": list(options.get("case_names") or []),
+            "abort_on_critical": bool(options.get("abort_on_critical", False)),
+            "max_failures": None if options.get("max_failures") is None else int(options["max_failures"]),
+            "adaptive": load_adaptive_concurrency()[0] if options.get("adaptive") is None
+            else bool(options["adaptive"]),
+            "avoid_conflicts": load_resource_conflicts() if options.get("avoid_conflicts") is None
+            else bool(options["avoid_conflicts"]),
+            "sandbox": options.get("sandbox"),
+            "budget": load_time_budget()[0] if options.get("budget") is None else parse_budget(options["budget"]),
+        }
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid options: {e}")
+
+
+class RunnerClient:
+    """Talks to a runner daemon; used by the GUI and the command-line client"""
+
+    def __init__(self, address=None):
+        """
+        Args:
+            address: Daemon address (defaults to [runner_daemon] address in config.ini)
+        """
+        self.address = address or load_daemon_address()
+        family, connect_address = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.connect(connect_address)
+        except OSError as e:
+            sock.close()
+            raise RunnerDaemonError(f"No runner daemon on {self.address} ({e}); start one with "
+                                    f"'python autotestgui/runner_daemon.py serve'")
+        self._connection = Connection(sock)
+        self._ids = itertools.count(1)
+        self.run_id = None
+        # Events that arrived while waiting for a response
+        self._events = []
+
+    def _send(self, method, params=None):
+        request_id = next(self._ids)
+        self._connection.send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+        return request_id
+
+    def _receive(self):
+        message = self._connection.receive()
+        if message is None:
+            raise RunnerDaemonError("The runner daemon closed the connection")
+        return message
+
+    def call(self, method, params=None):
+        """Send a request and wait for its result"""
+        request_id = self._send(method, params)
+        while True:
+            message = self._receive()
+            if message.get("method") == "event":
+                # A submission may send events before its response
+                self._events.append(message)
+                continue
+            if message.get("id") != request_id:
+                continue
+            if "error" in message:
+                raise RunnerDaemonError(message["error"]["message"])
+            return message["result"]
+
+    def submit(self, suite, options=None, on_event=None):
+        """
+        Run a suite on the daemon and wait for it to finish
+
+        Args:
+            suite: Mapping of test case name to its list of step dicts
+            options: Run options: parallel, workers, engine, parallel_steps,
+                     step_workers, step_timeout, incremental, order,
+                     case_names, abort_on_critical, max_failures, adaptive,
+                     avoid_conflicts, sandbox, budget
+            on_event: Optional callable receiving each event's params
+
+        Returns:
+            dict: Params of the "finished" event ({results, success, deferred})
+        """
+        self.run_id = self.call("submit", {"suite": suite, "options": options or {}})["run_id"]
+        while True:
+            message = self._events.pop(0) if self._events else self._receive()
+            if message.get("method") != "event":
+                continue  # Response to a cancel sent from another thread
+            event = message["params"]
+            if event.get("run_id") != self.run_id:
+                continue  # Events of an earlier submission
+            if on_event is not None:
+                on_event(event)
+            if event["type"] == "finished":
+                return event
+
+    def cancel(self):
+        """Ask the daemon to cancel the submitted run; safe to call from another thread"""
+        if self.run_id is not None:
+            try:
+                self._send("cancel", {"run_id": self.run_id})
+            except OSError:
+                pass
+
+    def close(self):
+        self._connection.close()
+
+
+def _submit_main(args):
+    client = RunnerClient(args.connect)
+    options = {
+        "parallel": args.parallel, "workers": args.workers, "engine": args.engine,
+        "parallel_steps": args.parallel_steps, "step_workers": args.step_workers,
+        "step_timeout": args.step_timeout, "abort_on_critical": args.abort_on_critical,
+        "max_failures": args.max_failures, "incremental": args.incremental, "order": args.order,
+        "case_names": args.case_names, "adaptive": args.adaptive,
+        "avoid_conflicts": None if args.ignore_conflicts is None else False, "sandbox": args.sandbox,
+        "budget": args.budget,
+    }
+
+    def on_event(event):
+        if event["type"] == "output":
+            text = event["text"]
+            if args.parallel and event["case"]:
+                text = "".join(f"[{event['case']}] {line}\n" for line in text.rstrip("\n").split("\n"))
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    def interrupt(signum, frame):
+        # First Ctrl+C cancels the run; a second one exits at once
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        client.cancel()
+
+    signal.signal(signal.SIGINT, interrupt)
+    try:
+        finished = client.submit(load_suite(args.suite), options, on_event)
+    finally:
+        client.close()
+    return 0 if finished["success"] else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Long-lived local runner with warm resource pools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Start the runner daemon")
+    serve_parser.add_argument("--listen", default=None,
+                              help="unix:/path or tcp://127.0.0.1:port "
+                                   "(default: [runner_daemon] address in config.ini, or " + DEFAULT_ADDRESS + ")")
+    serve_parser.add_argument("--pool", action="append", dest="pools", metavar="CLASS=N",
+                              help="Resource pool size, e.g. database=2")
+    serve_parser.add_argument("--cpu-processes", action="store_true", default=None,
+                              help="Run CPU-heavy steps in worker processes")
+
+    submit_parser = subparsers.add_parser("submit", help="Run a suite on the daemon and stream its output")
+    submit_parser.add_argument("suite", help="JSON file produced by Export All")
+    submit_parser.add_argument("--parallel", action="store_true", help="Run test cases in parallel")
+    submit_parser.add_argument("--workers", type=int, default=None,
+                               help="Maximum concurrent test cases in parallel mode")
+    submit_parser.add_argument("--engine", choices=ENGINES, default="threads", help="Execution engine")
+    submit_parser.add_argument("--parallel-steps", action="store_true",
+                               help="Run independent steps of a case concurrently")
+    submit_parser.add_argument("--step-workers", type=int, default=DEFAULT_STEP_WORKERS,
+                               help="Maximum concurrent steps per case with --parallel-steps")
+    submit_parser.add_argument("--abort-on-critical", action="store_true",
+                               help="Skip the rest of a case once one of its Critical steps fails")
+    submit_parser.add_argument("--max-failures", type=int, metavar="N", default=None,
+                               help="Cancel the suite once N cases have failed (0 = never)")
+    submit_parser.add_argument("--case", action="append", dest="case_names", metavar="NAME",
+                               help="Only run the named test case (may be repeated)")
+    submit_parser.add_argument("--step-timeout", type=int, metavar="SECONDS", default=None,
+                               help="Timeout for steps without their own Step Timeout (0 = none)")
+    submit_parser.add_argument("--incremental", action="store_true", default=None,
+                               help="Skip steps that passed before with unchanged inputs")
+    submit_parser.add_argument("--order", choices=ORDERS, default=None, help="Case start order")
+    submit_parser.add_argument("--adaptive", action="store_true", default=None,
+                               help="Adjust the cases in flight to step latency and host load "
+                                    "(the daemon's shared pools keep their sizes)")
+    submit_parser.add_argument("--sandbox", action="store_true", default=None,
+                               help="Give every case a fresh scratch directory as ${CASE_DIR}")
+    submit_parser.add_argument("--budget", metavar="DURATION", default=None,
+                               help="Time budget in seconds, or e.g. 15m; cases that do not fit are deferred")
+    submit_parser.add_argument("--ignore-conflicts", action="store_true", default=None,
+                               help="Also run cases together that touch the same paths, processes, tables "
+                                    "or Exclusive tags")
+
+    for command, help_text in (("status", "Show the running submissions"), ("stop", "Stop the daemon")):
+        subparsers.add_parser(command, help=help_text)
+    for subparser in subparsers.choices.values():
+        if subparser is not serve_parser:
+            subparser.add_argument("--connect", default=None,
+                                   help="Daemon address (default: [runner_daemon] address in config.ini)")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            pool_sizes = load_pool_sizes()
+            pool_sizes.update(parse_pool_sizes(args.pools))
+            parse_address(args.listen or load_daemon_address())
+        except ValueError as e:
+            parser.error(str(e))
+        daemon = RunnerDaemon(args.listen or load_daemon_address(), pool_sizes=pool_sizes,
+                              cpu_processes=load_cpu_processes() if args.cpu_processes is None else True)
+        signal.signal(signal.SIGINT, lambda signum, frame: daemon.stop())
+        if hasattr(signal, "SIGTERM"):
+            signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+        try:
+            daemon.serve()
+        except RunnerDaemonError as e:
+            print(e, file=sys.stderr)
+            return 1
+        return 0
+
+    try:
+        if args.command == "submit":
+            return _submit_main(args)
+        client = RunnerClient(args.connect)
+        try:
+            if args.command == "status":
+                status = client.call("status")
+                print(f"Resource pools: {status['pools']}")
+                for run in status["runs"]:
+                    print(f"Run {run['run_id']}: {run['cases']} case(s), {run['state']}")
+                if not status["runs"]:
+                    print("No runs in progress")
+            else:
+                client.call("shutdown")
+        finally:
+            client.close()
+    except RunnerDaemonError as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
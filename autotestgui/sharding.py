@@ -0,0 +1,97 @@
+"""
+Duration-Aware Case Ordering and Sharding
+
+Cases are estimated from their recorded durations (see case_history) and,
+for cases without history, from their step count and step delays. Suites are
+split into shards by longest-processing-time-first: cases are taken longest
+first and each goes to the shard with the least estimated work so far, which
+keeps the slowest shard (the makespan) close to the optimum.
+"""
+import heapq
+
+from case_history import average_duration
+
+# Seconds per step assumed when no case has any history yet
+DEFAULT_STEP_SECONDS = 1.0
+
+
+def estimate_durations(plans, history):
+    """
+    Estimate the duration of each case
+
+    Args:
+        plans: CasePlans
+        history: Run history from case_history.load_history()
+
+    Returns:
+        dict: Case name -> (estimated seconds, True if taken from history)
+    """
+    # Average seconds per step across all cases with history
+    total_time = 0.0
+    total_steps = 0
+    for entry in history.values():
+        duration = average_duration(entry)
+        if duration is not None and entry.get("steps"):
+            total_time += duration
+            total_steps += entry["steps"]
+    step_seconds = total_time / total_steps if total_steps else DEFAULT_STEP_SECONDS
+
+    estimates = {}
+    for plan in plans:
+        duration = average_duration(history.get(plan.name))
+        if duration is not None:
+            estimates[plan.name] = (duration, True)
+        else:
+            delays = sum(step.delay for step in plan.steps)
+            estimates[plan.name] = (len(plan) * step_seconds + delays, False)
+    return estimates
+
+
+def longest_first(plans, history):
+    """Return the plans ordered by estimated duration, longest first"""
+    estimates = estimate_durations(plans, history)
+    return sorted(plans, key=lambda plan: estimates[plan.name][0], reverse=True)
+
+
+def assign_shards(plans, shard_count, history):
+    """
+    Split cases into shards with balanced estimated durations
+
+    Args:
+        plans: CasePlans
+        shard_count: Number of shards
+        history: Run history from case_history.load_history()
+
+    Returns:
+        list: One (estimated seconds, [CasePlan, ...]) tuple per shard; the
+              cases of each shard keep their suite order
+    """
+    estimates = estimate_durations(plans, history)
+    order = {plan.name: index for index, plan in enumerate(plans)}
+    shards = [[] for _ in range(shard_count)]
+    loads = [0.0] * shard_count
+    # (load, shard index) so ties go to the lowest shard number
+    heap = [(0.0, index) for index in range(shard_count)]
+    for plan in longest_first(plans, history):
+        load, index = heapq.heappop(heap)
+        shards[index].append(plan)
+        loads[index] = load + estimates[plan.name][0]
+        heapq.heappush(heap, (loads[index], index))
+    return [(loads[index], sorted(shard, key=lambda plan: order[plan.name]))
+            for index, shard in enumerate(shards)]
+
+
+def parse_shard(spec):
+    """
+    Parse a shard selector of the form "K/N" (1-based)
+
+    Returns:
+        tuple: (K, N)
+    """
+    index, sep, count = spec.partition("/")
+    if not sep or not index.isdigit() or not count.isdigit():
+        raise ValueError(f"Invalid shard '{spec}', expected K/N such as 2/4")
+    index, count = int(index), int(count)
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}', K must be between 1 and N")
+    return index, count
@@ -0,0 +1,197 @@
+"""
+Incremental Step Cache
+
+In incremental runs a step that passed before is not executed again while its
+parameters and the files it reads are unchanged; it is reported as
+"PASS (cached)". Only step types that declare their inputs (see
+StepType.cache_inputs) take part, and config.ini can exclude more of them.
+
+Entries live in TestReports/step_cache.json, keyed by a hash of the step type
+and its resolved parameters. Each entry holds the fingerprint of the input
+files taken right after the step last passed: their size and modification
+time, or a SHA-256 of their contents when hash_contents is set.
+"""
+import configparser
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import reporting
+from execution_plan import thaw
+from resource_pools import CONFIG_PATH
+
+CACHE_PATH = os.path.join(reporting.REPORT_OUTPUT_FOLDER, "step_cache.json")
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_path(path, hash_contents=False):
+    """
+    Describe the current state of a file or directory tree
+
+    Returns:
+        JSON-serialisable value that changes when the path changes
+    """
+    def describe(file_path):
+        if hash_contents:
+            return _file_digest(file_path)
+        stat = os.stat(file_path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    if not path or not os.path.exists(path):
+        return None
+    if os.path.isfile(path):
+        return describe(path)
+    tree = []
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            tree.append([os.path.relpath(file_path, path), describe(file_path)])
+    return tree
+
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class StepCache:
+    """Passing step results of earlier runs, shared by the cases of one run"""
+
+    def __init__(self, path=CACHE_PATH, excluded=(), hash_contents=False):
+        """
+        Args:
+            path: Cache file
+            excluded: Step type names that are never cached
+            hash_contents: Fingerprint input files by content instead of size
+                           and modification time
+        """
+        self.path = path
+        self.excluded = set(excluded)
+        self.hash_contents = hash_contents
+        self.hits = 0
+        self._entries = self._load()
+        self._changed = {}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _key(self, registered, details):
+        """
+        Return (entry key, input paths) for a step, or None if it cannot be cached
+        """
+        if registered is None or registered.cache_inputs is None or registered.name in self.excluded:
+            return None
+        try:
+            args = registered.prepare(thaw(details))
+            paths = list(registered.cache_inputs(args))
+        except Exception:
+            # Invalid details fail when the step runs
+            return None
+        return _digest([registered.name, args]), paths
+
+    def _fingerprint(self, paths):
+        try:
+            return _digest([fingerprint_path(path, self.hash_contents) for path in paths])
+        except OSError:
+            return None
+
+    def lookup(self, registered, details):
+        """
+        Return True if the step passed before with the same parameters and inputs
+
+        Args:
+            registered: StepType of the step
+            details: Step details
+        """
+        key = self._key(registered, details)
+        if key is None:
+            return False
+        key, paths = key
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return False
+        fingerprint = self._fingerprint(paths)
+        if fingerprint is None or fingerprint != entry.get("inputs"):
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, registered, details):
+        """Remember that a step passed with its current parameters and inputs"""
+        key = self._key(registered, details)
+        if key is None:
+            return
+        key, paths = key
+        fingerprint = self._fingerprint(paths)
+        if fingerprint is None:
+            return
+        entry = {"step_type": registered.name, "inputs": fingerprint, "passed_at": time.time()}
+        with self._lock:
+            self._entries[key] = entry
+            self._changed[key] = entry
+
+    def save(self):
+        """Write the entries added by this run to the cache file"""
+        with self._lock:
+            changed = dict(self._changed)
+            self._changed.clear()
+        if not changed:
+            return
+        # Re-read right before writing so runs finishing together lose little
+        entries = self._load()
+        entries.update(changed)
+        try:
+            # A temp file of its own, also for runs sharing a process (the runner daemon)
+            fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(self.path)}.", suffix=".tmp",
+                                            dir=os.path.dirname(self.path) or ".")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def load_step_cache(enabled=None, path=CONFIG_PATH):
+    """
+    Create the StepCache of a run from the [step_cache] section of config.ini
+
+    Args:
+        enabled: Force incremental mode on or off (None = use config.ini)
+
+    Returns:
+        StepCache, or None when incremental mode is off
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    if enabled is None:
+        enabled = parser.getboolean("step_cache", "enabled", fallback=False)
+    if not enabled:
+        return None
+    excluded = [name.strip() for name in parser.get("step_cache", "exclude", fallback="").split(",")
+                if name.strip()]
+    return StepCache(excluded=excluded,
+                     hash_contents=parser.getboolean("step_cache", "hash_contents", fallback=False))
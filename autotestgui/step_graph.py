@@ -0,0 +1,73 @@
+"""
+Step Dependency Graph
+
+Builds the dependency graph of a compiled test case for parallel step
+execution. A step depends on the steps its run condition looks at, on its
+target step, and on any steps listed in its "Depends On" field. Steps with no
+path between them in the graph can run at the same time.
+"""
+
+# Conditions that only look at the step immediately before
+PREVIOUS_STEP_CONDITIONS = {
+    "If Previous Passed",
+    "If Previous Failed",
+    "If Previous Skipped",
+}
+
+# Conditions that look at every earlier step
+ALL_PREVIOUS_CONDITIONS = {
+    "If All Previous Passed",
+    "If Any Previous Failed",
+    "On Error Only",
+    "On Success Only",
+}
+
+# Conditions that look at the step given in target_step
+TARGET_STEP_CONDITIONS = {
+    "If Specific Step Passed",
+    "If Specific Step Failed",
+}
+
+
+def step_dependencies(step):
+    """
+    Return the step numbers a step must wait for
+
+    Only earlier steps are returned, which keeps the graph acyclic; later
+    steps named in "Depends On" are ignored.
+
+    Args:
+        step: StepPlan
+
+    Returns:
+        set: Step numbers (1-based)
+    """
+    index = step.index
+    deps = {d for d in step.depends_on if 0 < d < index}
+
+    if step.run_condition in PREVIOUS_STEP_CONDITIONS and index > 1:
+        deps.add(index - 1)
+    elif step.run_condition in ALL_PREVIOUS_CONDITIONS:
+        deps.update(range(1, index))
+    elif step.run_condition in TARGET_STEP_CONDITIONS and step.target_step is not None:
+        if 0 < step.target_step < index:
+            deps.add(step.target_step)
+    return deps
+
+
+def build_step_graph(plan):
+    """
+    Build the dependency graph of a test case
+
+    Args:
+        plan: CasePlan
+
+    Returns:
+        dict: Step number -> set of step numbers it depends on
+    """
+    return {step.index: step_dependencies(step) for step in plan.steps}
+
+
+def ignored_dependencies(step):
+    """Return "Depends On" entries that do not name an earlier step"""
+    return [d for d in step.depends_on if not 0 < d < step.index]
@@ -0,0 +1,112 @@
+"""
+Step Watchdog
+
+Enforces the per-step timeout for every step type. The step runs on its
+resource pool (or a helper thread) while the case thread waits for it. When
+the timeout passes, the step's CancellationToken is cancelled so cooperative
+operations stop and release what they hold (subprocesses are killed, SQL
+statements cancelled, waits end). If the step is still blocked after a short
+grace period, for example inside a network file copy or a database connect,
+its pool slot is handed back and the thread is left to finish in the
+background, so a hung step never stalls the rest of the run.
+
+Work for worker processes is handed over only when a process is free (see
+ResourcePools.submit), so its clock also starts when it starts. The token
+does not reach the process: timed-out work there finishes in the background.
+Work that has not started when the timeout passes is withdrawn and never runs.
+"""
+import concurrent.futures
+import configparser
+import threading
+
+from resource_pools import CONFIG_PATH
+
+# Seconds a timed-out step gets to stop after its token is cancelled
+GRACE_PERIOD = 2.0
+
+TIMEOUT = "TIMEOUT"
+
+
+class StepTimeout(Exception):
+    """Raised when a step exceeds its timeout"""
+
+    def __init__(self, timeout, note=None):
+        message = f"Step exceeded its {timeout}s timeout"
+        super().__init__(f"{message} ({note})" if note else message)
+        self.timeout = timeout
+
+
+def load_default_step_timeout(path=CONFIG_PATH):
+    """Read the suite default step timeout from the [timeouts] section of config.ini (0 = none)"""
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    return parser.getint("timeouts", "default_step_timeout", fallback=0)
+
+
+def _start_thread(fn):
+    """Run fn on a daemon thread and return a Future for its result"""
+    future = concurrent.futures.Future()
+
+    def target():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, daemon=True, name="step-watchdog").start()
+    return future
+
+
+def run_watched(pools, resource_class, timeout, token, fn, *args):
+    """
+    Run fn(*args) and wait at most timeout seconds once it has started
+
+    Args:
+        pools: ResourcePools, or None to run on a helper thread
+        resource_class: Pool the work runs on
+        timeout: Seconds the work may run
+        token: CancellationToken of the step, cancelled on timeout
+        fn: Work to run
+
+    Returns:
+        The result of fn; raises StepTimeout if it does not finish in time
+    """
+    started = threading.Event()
+    note = None
+    if pools is not None and pools.uses_processes(resource_class):
+        # Work sent to processes must be picklable; submit returns once a process has it
+        future = pools.submit(resource_class, fn, *args)
+        started.set()
+        note = "its worker process finishes it in the background"
+    else:
+        def watched(*args):
+            started.set()
+            return fn(*args)
+
+        if pools is None:
+            future = _start_thread(lambda: watched(*args))
+        else:
+            # Passed through, so pool observers see the arguments of the step
+            future = pools.submit(resource_class, watched, *args)
+        # Also wakes the wait below if the work fails before it starts
+        future.add_done_callback(lambda f: started.set())
+
+    started.wait()
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        pass
+
+    if future.cancel():
+        # Never started: withdrawn, so it does not run after the case moved on
+        raise StepTimeout(timeout, "never started; not run")
+    token.cancel(f"Timed out after {timeout}s")
+    try:
+        future.result(GRACE_PERIOD)
+    except Exception:
+        pass
+    if not future.done() and pools is not None:
+        pools.abandon(resource_class, future)
+    raise StepTimeout(timeout, note)
@@ -0,0 +1,170 @@
+"""
+Suite-Level Fixtures
+
+A test case whose steps are all in the Setup category is a Setup fixture, and
+one whose steps are all in the Cleanup category is a Cleanup fixture. Suite
+runs execute every Setup fixture once before the other cases and every
+Cleanup fixture once after them, even when the run is cancelled.
+
+Cases reference a Setup fixture with a "Use Fixture" step instead of copying
+its steps. The step passes when the fixture passed; it waits while the
+fixture is still running, and runs the fixture first when nothing has run it
+yet (a single case run from the GUI). Either way each fixture runs at most
+once per SuiteFixtures.
+"""
+import concurrent.futures
+import os
+import sys
+import threading
+
+from execution_plan import CLEANUP_FIXTURE, SETUP_FIXTURE
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from step_types.cancellation import Cancelled, current_token
+from step_types.fixtures import USE_FIXTURE
+
+
+def split_fixtures(plans):
+    """
+    Separate the fixtures of a suite from its test cases
+
+    Returns:
+        (fixtures, cases): Lists of CasePlans in suite order
+    """
+    fixtures = [plan for plan in plans if plan.fixture]
+    cases = [plan for plan in plans if not plan.fixture]
+    return fixtures, cases
+
+
+def referenced_fixtures(plan):
+    """Return the names of the fixtures the Use Fixture steps of a case reference"""
+    return {str(step.details.get("fixture", "")).strip() for step in plan.steps
+            if step.step_type == USE_FIXTURE} - {""}
+
+
+class SuiteFixtures:
+    """The Setup and Cleanup fixtures of one run and their outcomes"""
+
+    def __init__(self, plans, run_fixture):
+        """
+        Args:
+            plans: CasePlans of the suite; only the fixtures among them are kept
+            run_fixture: Callable (plan, cleanup) -> structured case result
+                         executing a fixture; cleanup is True for Cleanup
+                         fixtures, which must run even when the run is cancelled
+        """
+        fixtures, _ = split_fixtures(plans)
+        self.setup = [plan for plan in fixtures if plan.fixture == SETUP_FIXTURE]
+        self.cleanup = [plan for plan in fixtures if plan.fixture == CLEANUP_FIXTURE]
+        self._plans = {plan.name: plan for plan in fixtures}
+        self._run_fixture = run_fixture
+        self._futures = {}
+        self._lock = threading.Lock()
+        # Results of the fixtures executed so far, in the order they finished
+        self.results = []
+
+    def __bool__(self):
+        return bool(self._plans)
+
+    def ensure(self, name):
+        """
+        Run a Setup fixture unless it already ran or is running, and wait for it
+
+        Returns:
+            dict: Structured result of the fixture
+        """
+        with self._lock:
+            future = self._futures.get(name)
+            owner = future is None
+            if owner:
+                future = self._futures[name] = concurrent.futures.Future()
+        if owner:
+            try:
+                result = self._run_fixture(self._plans[name], False)
+            except Exception as e:
+                result = {'name': name, 'success': False, 'status': f"ERROR - {e}",
+                          'steps': [], 'execution_time': 0.0}
+            with self._lock:
+                self.results.append(result)
+            future.set_result(result)
+            return result
+
+        # Another case is running it; stay responsive to this case's token
+        token = current_token()
+        woken = threading.Event()
+        future.add_done_callback(lambda _: woken.set())
+        with token.on_cancel(woken.set):
+            woken.wait()
+        if not future.done():
+            raise Cancelled(token.reason)
+        return future.result()
+
+    def record(self, result):
+        """Take the result of a Setup fixture that ran in another process"""
+        future = concurrent.futures.Future()
+        future.set_result(result)
+        with self._lock:
+            self._futures.setdefault(result['name'], future)
+
+    def use(self, name, log):
+        """
+        Execute a Use Fixture step
+
+        Args:
+            name: Fixture name
+            log: Step log writer
+
+        Returns:
+            (success: bool, message: str, output: str)
+        """
+        plan = self._plans.get(name)
+        if plan is None:
+            msg = f"Unknown fixture '{name}' (a test case whose steps are all Setup steps)"
+            return False, msg, msg
+        if plan.fixture != SETUP_FIXTURE:
+            msg = f"'{name}' is a Cleanup fixture; it runs after the cases"
+            return False, msg, msg
+        with self._lock:
+            started = name in self._futures
+        if not started:
+            log(f"🔧 Running fixture: {name}")
+        result = self.ensure(name)
+        if result['success']:
+            return True, f"Fixture '{name}' passed", f"Fixture '{name}' passed"
+        msg = f"Fixture '{name}' did not pass: {result['status']}"
+        return False, msg, msg
+
+    def run_setup(self):
+        """
+        Run every Setup fixture that has not run yet, in suite order
+
+        Returns:
+            list: Structured results of the Setup fixtures
+        """
+        return [self.ensure(plan.name) for plan in self.setup]
+
+    def run_cleanup(self, always=True):
+        """
+        Run every Cleanup fixture, in suite order
+
+        Args:
+            always: False to skip them when no Setup fixture has run (runs
+                    that only start fixtures on demand)
+
+        Returns:
+            list: Structured results of the Cleanup fixtures
+        """
+        with self._lock:
+            if not always and not self._futures:
+                return []
+        results = []
+        for plan in self.cleanup:
+            try:
+                result = self._run_fixture(plan, True)
+            except Exception as e:
+                result = {'name': plan.name, 'success': False, 'status': f"ERROR - {e}",
+                          'steps': [], 'execution_time': 0.0}
+            results.append(result)
+        with self._lock:
+            self.results.extend(results)
+        return results
@@ -0,0 +1,745 @@
+"""
+Headless Suite Runner
+
+Runs a suite exported by TestCaseGUI.export_all without a display. Each case
+is executed by CaseRunner with the same step semantics as the GUI, and the
+usual TestReports/ output and summary files are written.
+
+Usage:
+    python autotestgui/suite_runner.py suite.json [--parallel] [--workers N]
+                                                  [--pool CLASS=N ...] [--cpu-processes]
+                                                  [--parallel-steps] [--engine {async,processes}]
+                                                  [--recycle-after N] [--adaptive] [--ignore-conflicts]
+                                                  [--sandbox]
+                                                  [--shard K/N] [--list-shards N]
+                                                  [--abort-on-critical] [--max-failures N]
+                                                  [--step-timeout SECONDS] [--incremental]
+                                                  [--rerun-failed] [--resume] [--watch [--debounce SECONDS]]
+                                                  [--budget DURATION]
+                                                  [--order {suite,failures}]
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+from adaptive_concurrency import ConcurrencyController, describe_timeline, load_adaptive_concurrency
+from async_runner import AsyncCaseRunner
+import case_history
+from case_sandbox import load_case_sandboxes
+import last_run
+from case_runner import CancellationToken, CaseRunner, DEFAULT_STEP_WORKERS
+from execution_plan import compile_suite
+from fail_fast import FailFastPolicy, load_fail_fast
+from failure_ordering import ORDERS, describe_order, likely_failures_first, load_case_order, step_priorities
+from process_runner import CaseProcessPool, load_process_isolation
+import reporting
+from resource_conflicts import ConflictScheduler, build_conflict_graph, describe_conflicts, load_resource_conflicts
+from resource_pools import ResourcePools, load_cpu_processes, load_pool_sizes, parse_pool_sizes
+from run_journal import describe_resume, load_journal, load_run_journal, resume_state
+from step_cache import load_step_cache
+from step_watchdog import load_default_step_timeout
+from suite_fixtures import SuiteFixtures, split_fixtures
+from time_budget import TimeBudget, load_time_budget, parse_budget
+from watch_mode import DEFAULT_DEBOUNCE, SuiteWatcher
+from sharding import assign_shards, estimate_durations, longest_first, parse_shard
+
+# Default cap on test cases in flight in parallel mode; the step work
+# itself is bounded by the resource pools
+DEFAULT_CASE_WORKERS = 32
+
+# Execution engines: worker threads, one asyncio event loop, or worker
+# processes (see process_runner)
+ENGINES = ["threads", "async", "processes"]
+
+# Runs sharing a process (the runner daemon) write the summary, the combined
+# report, the history and the last results one at a time
+_reports_lock = threading.Lock()
+
+
+def load_suite(path):
+    """
+    Load a suite exported by TestCaseGUI.export_all
+
+    Returns:
+        dict: Mapping of test case name to its list of step dicts
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Suite file must contain an object of test cases: {path}")
+    return data
+
+
+class SuiteRunner:
+    """Runs a set of test cases sequentially or in parallel"""
+
+    def __init__(self, plans, output=None, pool_sizes=None, parallel_steps=False,
+                 step_workers=DEFAULT_STEP_WORKERS, cpu_processes=False, fail_fast=None, step_timeout=None,
+                 step_cache=None, previous_results=None, order="suite", on_step=None, recycle_after=None,
+                 adaptive=False, avoid_conflicts=True, sandboxes=None, journal=None, resumed=None, budget=None):
+        """
+        Args:
+            plans: List of CasePlans to run, in suite order; Setup and Cleanup
+                   fixtures among them run before and after the other cases
+                   (see suite_fixtures)
+            output: Callable receiving console text (defaults to stdout)
+            pool_sizes: Resource pool size overrides for parallel runs
+            cpu_processes: Run CPU-heavy steps in worker processes in parallel runs
+            parallel_steps: Run independent steps of each case concurrently
+            step_workers: Maximum concurrent steps per case with parallel_steps
+            fail_fast: Optional FailFastPolicy (see fail_fast)
+            step_timeout: Default step timeout in seconds for steps without
+                          their own Step Timeout (None or 0 = no limit)
+            step_cache: Optional StepCache for an incremental run (see step_cache)
+            previous_results: For a rerun of failed cases, the last results of
+                              every case of the suite in suite order (see
+                              last_run); passing steps of the failed cases are
+                              not rerun and the combined report covers the
+                              whole suite
+            order: "suite" (suite order; longest first in parallel runs) or
+                   "failures" (likeliest failures first, see failure_ordering)
+            on_step: Optional callable (case name, step result) called as
+                     soon as each step has finished
+            recycle_after: With the processes engine, cases a worker process
+                           runs before it is replaced (None = config.ini)
+            adaptive: In parallel runs, adjust the number of cases in flight
+                      and the resource pool sizes to latency and host load
+                      (see adaptive_concurrency)
+            avoid_conflicts: In parallel runs, never run two cases at the same
+                             time that touch the same paths, processes, tables
+                             or Exclusive tags (see resource_conflicts)
+            sandboxes: Optional CaseSandboxes giving every case a fresh
+                       ${CASE_DIR} (see case_sandbox)
+            journal: Optional RunJournal recording the run as it happens
+                     (see run_journal)
+            resumed: For a resumed run, case name -> step number -> journaled
+                     result of the steps the interrupted cases finished
+            budget: Optional time budget in seconds; only the most important
+                    cases that fit are run and the rest are deferred (see
+                    time_budget)
+        """
+        self.plans = plans
+        self.pool_sizes = pool_sizes
+        self.parallel_steps = parallel_steps
+        self.step_workers = step_workers
+        self.cpu_processes = cpu_processes
+        self.fail_fast = fail_fast or FailFastPolicy()
+        self.step_timeout = step_timeout
+        self.step_cache = step_cache
+        self.previous_results = previous_results
+        self.order = order
+        self.on_step = on_step
+        self.recycle_after = recycle_after
+        self.adaptive = adaptive
+        self.avoid_conflicts = avoid_conflicts
+        self.sandboxes = sandboxes
+        self.journal = journal
+        self.resumed = resumed or {}
+        self.resuming = resumed is not None
+        self.budget = budget
+        self.deferred = {}
+        self.cancel_token = CancellationToken()
+        self.fixtures = None
+        self._controller = None
+        self._scheduler = None
+        self._budget = None
+        self._history = {}
+        self._output = output or sys.stdout.write
+        self._output_lock = threading.Lock()
+
+    def _case_output(self, name, prefix):
+        if not prefix:
+            return self._output
+
+        def write(text):
+            lines = "".join(f"[{name}] {line}\n" for line in text.rstrip("\n").split("\n"))
+            with self._output_lock:
+                self._output(lines)
+        return write
+
+    def cancel(self, reason="Cancelled"):
+        """Stop the run: running steps are interrupted and remaining steps are skipped"""
+        if self.cancel_token.cancel(reason):
+            self._output(f"⏹ {reason}: cancelling the run\n")
+
+    def _carry_over(self, plan):
+        """Return the steps of a rerun or resumed case that keep their previous result"""
+        if plan.name in self.resumed:
+            return self.resumed[plan.name]
+        if self.previous_results is None or plan.name not in self.previous_results:
+            return None
+        return last_run.rerun_steps(plan, self.previous_results[plan.name])
+
+    def _step_callback(self, plan):
+        """Return the on_step callback of CaseRunner for a case"""
+        if self.on_step is None and self.journal is None:
+            return None
+
+        def on_step(step_result):
+            if self.journal is not None:
+                self.journal.step_finished(plan.name, step_result)
+            if self.on_step is not None:
+                self.on_step(plan.name, step_result)
+        return on_step
+
+    def _step_start_callback(self, plan):
+        """Return the on_step_start callback of CaseRunner for a case"""
+        if self.journal is None:
+            return None
+        return lambda index: self.journal.step_started(plan.name, index)
+
+    def _case_finished(self, result):
+        """Apply the fail-fast policy to a finished case and journal it"""
+        self.fail_fast.case_finished(result, self.cancel_token)
+        if self.journal is not None:
+            self.journal.case_finished(result)
+
+    def _step_priority(self, plan):
+        """Return the start priorities of the independent steps of a case"""
+        if self.order != "failures":
+            return None
+        return step_priorities(plan, self._history)
+
+    def _order_cases(self, plans, parallel):
+        """Return the cases in the order they are started"""
+        if self.order == "failures":
+            return likely_failures_first(plans, self._history)
+        if parallel:
+            # Longest cases first so none of them starts last and becomes the long tail
+            return longest_first(plans, self._history)
+        return plans
+
+    def _submit(self, plan, start, *args):
+        """
+        Start a case through the conflict scheduler and the adaptive controller, where active
+
+        Args:
+            plan: CasePlan being started
+            start: Callable starting the case and returning a Future of its result
+            args: Arguments for start
+
+        Returns:
+            concurrent.futures.Future: Resolves to the result of the case
+        """
+        if self._controller is not None:
+            start, args = self._controller.submit_case, (start,) + args
+        if self._scheduler is not None:
+            return self._scheduler.submit_case(plan.name, start, *args)
+        return start(*args)
+
+    def _admit(self, plan):
+        """Return True if a case may start now; under a time budget a case that no longer fits is deferred"""
+        return self._budget is None or self._budget.admit(plan.name)
+
+    def _run_admitted(self, plan, prefix=False, pools=None):
+        """Run a case if it is admitted when it starts, otherwise return None"""
+        return self.run_case(plan, prefix, pools) if self._admit(plan) else None
+
+    def run_case(self, plan, prefix=False, pools=None):
+        """Run a single case and return its structured result"""
+        result = CaseRunner(plan, output=self._case_output(plan.name, prefix), pools=pools,
+                            parallel_steps=self.parallel_steps, step_workers=self.step_workers,
+                            refresh_combined=False, cancel_token=self.cancel_token,
+                            fail_fast=self.fail_fast, step_timeout=self.step_timeout,
+                            step_cache=self.step_cache, carry_over=self._carry_over(plan),
+                            fixtures=self.fixtures, step_priority=self._step_priority(plan),
+                            on_step=self._step_callback(plan), on_step_start=self._step_start_callback(plan),
+                            sandboxes=self.sandboxes).run()
+        self._case_finished(result)
+        return result
+
+    def _fixture_runner(self, pools):
+        """Return the run_fixture callable of SuiteFixtures for this run"""
+        def run_fixture(plan, cleanup):
+            output = self._case_output(plan.name, False)
+            output(f"\n🔧 {'Cleanup' if cleanup else 'Setup'} fixture: {plan.name}\n")
+            # Fixtures always run in full; Cleanup fixtures also run after Stop
+            result = CaseRunner(plan, output=output, pools=pools,
+                                parallel_steps=self.parallel_steps, step_workers=self.step_workers,
+                                refresh_combined=False, cancel_token=None if cleanup else self.cancel_token,
+                                fail_fast=self.fail_fast, step_timeout=self.step_timeout,
+                                step_cache=self.step_cache, on_step=self._step_callback(plan),
+                                on_step_start=self._step_start_callback(plan), sandboxes=self.sandboxes).run()
+            self._case_finished(result)
+            return result
+        return run_fixture
+
+    async def run_case_async(self, plan, prefix=False, pools=None):
+        """Run a single case on the event loop and return its structured result"""
+        result = await AsyncCaseRunner(plan, output=self._case_output(plan.name, prefix), pools=pools,
+                                       parallel_steps=self.parallel_steps, step_workers=self.step_workers,
+                                       refresh_combined=False, cancel_token=self.cancel_token,
+                                       fail_fast=self.fail_fast, step_timeout=self.step_timeout,
+                                       step_cache=self.step_cache, carry_over=self._carry_over(plan),
+                                       fixtures=self.fixtures,
+                                       step_priority=self._step_priority(plan),
+                                       on_step=self._step_callback(plan),
+                                       on_step_start=self._step_start_callback(plan),
+                                       sandboxes=self.sandboxes).run_async()
+        self._case_finished(result)
+        return result
+
+    def run_case_in_process(self, plan, process_pool, prefix=False):
+        """Queue a single case on a CaseProcessPool and return a Future of its structured result"""
+        return process_pool.submit(plan, output=self._case_output(plan.name, prefix),
+                                   on_step=self._step_callback(plan), cancel_token=self.cancel_token,
+                                   parallel_steps=self.parallel_steps, step_workers=self.step_workers,
+                                   abort_on_critical=self.fail_fast.abort_case_on_critical,
+                                   step_timeout=self.step_timeout, incremental=self.step_cache is not None,
+                                   carry_over=self._carry_over(plan), step_priority=self._step_priority(plan),
+                                   fixtures=self.fixtures, sandbox=self.sandboxes is not None,
+                                   on_step_start=self._step_start_callback(plan),
+                                   admit=lambda: self._admit(plan))
+
+    @staticmethod
+    def _case_slots(plans, parallel, workers, engine):
+        """Return how many cases an engine runs at the same time"""
+        if not parallel:
+            return 1
+        if engine == "processes":
+            return workers or load_process_isolation()[1] or min(len(plans), os.cpu_count() or 2)
+        if engine == "async":
+            # Unbounded unless a worker limit was given
+            return workers or len(plans)
+        return workers or min(len(plans), DEFAULT_CASE_WORKERS)
+
+    def _run_processes(self, plans, parallel, workers):
+        """Run every case in a worker process; sequential runs use a single worker"""
+        recycle_after = load_process_isolation()[2]
+        workers = self._case_slots(plans, parallel, workers, "processes")
+        results = []
+        with CaseProcessPool(workers, self.recycle_after or recycle_after) as process_pool:
+            self._output(f"Case processes: {process_pool.describe()}\n")
+            futures = {self._submit(plan, self.run_case_in_process, plan, process_pool, parallel): plan.name
+                       for plan in plans}
+            for future in concurrent.futures.as_completed(futures):
+                if future.cancelled():
+                    # Deferred by the time budget
+                    continue
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'name': futures[future], 'success': False,
+                              'status': f"ERROR - {e}", 'steps': [], 'execution_time': 0.0}
+                self._case_finished(result)
+                if self.step_cache is not None:
+                    # The workers keep their own caches; count their hits here
+                    self.step_cache.hits += sum(1 for step in result['steps'] if step.get('cached'))
+                results.append(result)
+        return results
+
+    async def _run_async(self, plans, parallel, workers, pools):
+        """Run every case as a coroutine; waiting cases hold no thread"""
+        if not parallel:
+            return [await self.run_case_async(plan, pools=pools) for plan in plans if self._admit(plan)]
+
+        # Unbounded unless a worker limit was given
+        slots = asyncio.Semaphore(workers) if workers else None
+
+        async def run_case(plan):
+            try:
+                if slots is None:
+                    return await self.run_case_async(plan, True, pools) if self._admit(plan) else None
+                async with slots:
+                    return await self.run_case_async(plan, True, pools) if self._admit(plan) else None
+            except Exception as e:
+                return {'name': plan.name, 'success': False,
+                        'status': f"ERROR - {e}", 'steps': [], 'execution_time': 0.0}
+
+        if self._scheduler is None:
+            started = [run_case(plan) for plan in plans]
+        else:
+            # The scheduler starts each coroutine as a task once its conflicts have finished
+            loop = asyncio.get_running_loop()
+            started = [asyncio.wrap_future(self._scheduler.submit_case(plan.name, loop.create_task, run_case(plan)))
+                       for plan in plans]
+        results = []
+        for future in asyncio.as_completed(started):
+            result = await future
+            if result is not None:
+                results.append(result)
+        return results
+
+    def _run_cases(self, plans, parallel, workers, engine, pools):
+        """Run the cases, in the given start order, and return the results in completion order"""
+        if engine == "async":
+            return asyncio.run(self._run_async(plans, parallel, workers, pools))
+        if engine == "processes":
+            return self._run_processes(plans, parallel, workers)
+        if not (parallel and plans):
+            return [self.run_case(plan) for plan in plans if self._admit(plan)]
+
+        results = []
+        max_workers = self._case_slots(plans, parallel, workers, engine)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {self._submit(plan, executor.submit, self._run_admitted, plan, True, pools): plan.name
+                       for plan in plans}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    result = future.result()
+                    if result is not None:
+                        results.append(result)
+                except Exception as e:
+                    results.append({'name': futures[future], 'success': False,
+                                    'status': f"ERROR - {e}", 'steps': [], 'execution_time': 0.0})
+        return results
+
+    def run(self, parallel=False, workers=None, engine="threads", pools=None):
+        """
+        Run every case and write the summary and combined reports
+
+        Args:
+            parallel: Run cases concurrently
+            workers: Maximum number of concurrent cases in parallel mode
+            engine: "threads", "async" (see async_runner) or "processes"
+                    (see process_runner)
+            pools: Optional ResourcePools kept warm by the caller across runs
+                   (used in parallel mode instead of new pools, and left running)
+
+        Returns:
+            list: Structured case results in completion order, with the
+                  Setup fixtures first and the Cleanup fixtures last; a
+                  resumed run starts with the cases the interrupted run
+                  finished
+        """
+        reporting.combined_report_data.clear()
+        start_time = time.time()
+        if self.fail_fast.describe() != "off":
+            self._output(f"Fail-fast: {self.fail_fast.describe()}\n")
+        if self.step_cache is not None:
+            self._output("Incremental: reusing passing steps with unchanged inputs\n")
+        if self.sandboxes is not None:
+            self._output(f"Sandboxes: {self.sandboxes.describe()}\n")
+
+        self._history = case_history.load_history()
+        fixture_plans, cases = split_fixtures(self.plans)
+        controller = None
+        if self.adaptive and parallel:
+            _, settings = load_adaptive_concurrency()
+            controller = ConcurrencyController(workers or min(len(cases), DEFAULT_CASE_WORKERS),
+                                               output=self._output, **settings)
+
+        own_pools = pools is None and parallel
+        if own_pools:
+            pools = ResourcePools(self.pool_sizes, cpu_processes=self.cpu_processes,
+                                  observer=controller.observe if controller is not None else None)
+            self._output(f"Resource pools: {pools.describe()}\n")
+        elif not parallel:
+            pools = None
+
+        cases = self._order_cases(cases, parallel)
+        run_order = None
+        if self.order == "failures":
+            run_order = describe_order(cases, self._history)
+            self._output(f"{run_order}\n")
+        graph = None
+        if self.avoid_conflicts and parallel and len(cases) > 1:
+            graph = build_conflict_graph(cases)
+        budget = None
+        if self.budget:
+            budget = self._budget = TimeBudget(self.budget, load_time_budget()[1])
+            slots = self._case_slots(cases, parallel, workers, engine)
+            if controller is not None and engine != "async":
+                # The controller starts below the worker count and only grows when it is safe
+                slots = min(slots, controller.gate.limit)
+            # The budget's own order: most important cases first
+            cases = budget.plan(cases, fixture_plans, self._history, slots, graph)
+            self._output(f"{budget.describe(cases)}\n")
+            if graph is not None:
+                chosen = {plan.name for plan in cases}
+                graph = {name: {other: resource for other, resource in conflicts.items() if other in chosen}
+                         for name, conflicts in graph.items() if name in chosen}
+        self.fixtures = SuiteFixtures(fixture_plans, self._fixture_runner(pools))
+        if self.journal is not None:
+            self.journal.start([plan.name for plan in cases])
+        if graph is not None and len(cases) > 1:
+            self._output(f"{describe_conflicts(graph)}\n")
+            if any(graph.values()):
+                self._scheduler = ConflictScheduler(graph)
+        if controller is not None:
+            # Pools kept by the caller may be shared with other runs; they keep their sizes
+            controller.start(pools if own_pools else None, self.cancel_token)
+            self._output(f"Adaptive concurrency: starting with {controller.gate.limit} case(s) in flight\n")
+            if engine == "async":
+                self._output("   (the async engine keeps its case limit; only the pools adapt)\n")
+            self._controller = controller
+        try:
+            results = self.fixtures.run_setup()
+            try:
+                results += self._run_cases(cases, parallel, workers, engine, pools)
+            finally:
+                results += self.fixtures.run_cleanup()
+            if self.journal is not None:
+                self.journal.finish()
+        finally:
+            if self.journal is not None:
+                # A run that did not get to finish() stays resumable
+                self.journal.close()
+            self.fixtures = None
+            self._controller = None
+            self._scheduler = None
+            self._budget = None
+            if controller is not None:
+                controller.stop()
+            if own_pools:
+                pools.shutdown()
+
+        if self.resuming:
+            # The cases the interrupted run finished count towards the summary and the outcome
+            rerun = {result['name'] for result in results}
+            results = [result for name, result in self.previous_results.items() if name not in rerun] + results
+        if self.previous_results is not None:
+            # A resumed run only has the finished cases in previous_results
+            names = list(dict.fromkeys(list(self.previous_results) + [result['name'] for result in results]))
+            report_data = last_run.merged_report_data(self.previous_results, results, names)
+        else:
+            # From the results rather than the shared list, which concurrent runs also fill
+            report_data = [result['report'] for result in results if result.get('report')]
+        self.deferred = dict(budget.deferred) if budget is not None else {}
+        with _reports_lock:
+            write_suite_summary(results, time.time() - start_time, parallel, self._output, report_data, run_order,
+                                controller.timeline if controller is not None else None,
+                                budget.describe_deferred() if budget is not None else None)
+            case_history.record_results(results)
+            last_run.record_results(results)
+            if self.step_cache is not None:
+                self.step_cache.save()
+        if self.step_cache is not None:
+            self._output(f"Step cache: {self.step_cache.hits} step(s) reused\n")
+        if self.sandboxes is not None:
+            # Removal runs in the background while the cases run; finish it before exiting
+            self.sandboxes.wait()
+        return results
+
+
+def write_suite_summary(results, total_time, parallel, output=sys.stdout.write, report_data=None, run_order=None,
+                        concurrency=None, deferred=None):
+    """
+    Write the summary file and the combined HTML report for a finished run
+
+    Args:
+        results: Structured case results
+        total_time: Wall-clock time of the run in seconds
+        parallel: Whether cases ran concurrently (selects the summary file)
+        output: Callable receiving console text
+        report_data: Report dicts for the combined report (defaults to the
+                     cases of this run)
+        run_order: Optional description of the start order (see
+                   failure_ordering.describe_order)
+        concurrency: Optional limits chosen by adaptive concurrency (see
+                     ConcurrencyController.timeline)
+        deferred: Optional list of the cases a time budget deferred (see
+                  TimeBudget.describe_deferred)
+    """
+    summary = "\n".join(f"{r['name']}: {r['status']}" for r in results)
+    if deferred:
+        summary += f"\n\n{deferred}"
+    if run_order:
+        summary += f"\n\n{run_order}"
+    if concurrency:
+        summary += f"\n\n{describe_timeline(concurrency)}"
+    if parallel:
+        summary += f"\n\nTotal execution time (Parallel): {total_time:.2f}s"
+        summary_path = "test_summary_parallel.txt"
+    else:
+        summary += f"\n\nTotal execution time: {total_time:.2f}s"
+        summary_path = "test_summary.txt"
+    with open(summary_path, "w") as f:
+        f.write(summary)
+
+    # Generate combined HTML report after all tests complete
+    reporting.save_combined_html(report_data, concurrency)
+
+    output(f"\n{summary}\nSaved to {summary_path}\n")
+
+
+def print_shards(plans, shard_count, output=sys.stdout.write):
+    """
+    Print the cases of each shard with their estimated durations
+
+    Estimates marked with * come from step counts because the case has no history.
+    """
+    history = case_history.load_history()
+    estimates = estimate_durations(plans, history)
+    for index, (load, shard) in enumerate(assign_shards(plans, shard_count, history), 1):
+        output(f"Shard {index}/{shard_count}: {len(shard)} case(s), ~{load:.1f}s\n")
+        for plan in shard:
+            seconds, known = estimates[plan.name]
+            output(f"    {plan.name}: {seconds:.1f}s{'' if known else '*'}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run an exported test suite without the GUI")
+    parser.add_argument("suite", help="JSON file produced by Export All")
+    parser.add_argument("--parallel", action="store_true", help="Run test cases in parallel")
+    parser.add_argument("--workers", type=int, default=None, help="Maximum concurrent test cases in parallel mode")
+    parser.add_argument("--case", action="append", dest="case_names", metavar="NAME",
+                        help="Only run the named test case (may be repeated)")
+    parser.add_argument("--pool", action="append", dest="pools", metavar="CLASS=N",
+                        help="Resource pool size for parallel mode, e.g. database=2 "
+                             "(classes: file_io, database, subprocess, cpu, wait)")
+    parser.add_argument("--cpu-processes", action="store_true", default=None,
+                        help="Run CPU-heavy steps (checksums, archive extraction, log parsing) in worker "
+                             "processes in parallel mode (default: [process_pool] cpu_steps in config.ini)")
+    parser.add_argument("--parallel-steps", action="store_true",
+                        help="Run independent steps of a case concurrently, following run conditions, "
+                             "target steps and Depends On markers")
+    parser.add_argument("--engine", choices=ENGINES, default="threads",
+                        help="Execution engine; 'async' runs waits, delays and waited-for commands "
+                             "on one event loop instead of one thread per case; 'processes' runs each case in "
+                             "a worker process")
+    parser.add_argument("--adaptive", action="store_true", default=None,
+                        help="In parallel mode, adjust the cases in flight and the resource pool sizes to step "
+                             "latency and host CPU, memory and disk load "
+                             "(default: [adaptive_concurrency] enabled in config.ini)")
+    parser.add_argument("--ignore-conflicts", action="store_true", default=None,
+                        help="In parallel mode, also run cases together that touch the same paths, processes, "
+                             "tables or Exclusive tags (default: [resource_conflicts] enabled in config.ini)")
+    parser.add_argument("--recycle-after", type=int, metavar="N", default=None,
+                        help="With --engine processes, replace a worker process after N cases "
+                             "(default: [process_isolation] recycle_after in config.ini)")
+    parser.add_argument("--step-workers", type=int, default=DEFAULT_STEP_WORKERS,
+                        help="Maximum concurrent steps per case with --parallel-steps")
+    parser.add_argument("--shard", metavar="K/N",
+                        help="Only run shard K of N; cases are balanced across shards by their "
+                             "recorded durations, longest first")
+    parser.add_argument("--list-shards", type=int, metavar="N",
+                        help="Print the assignment of cases to N shards with estimated durations and exit")
+    parser.add_argument("--abort-on-critical", action="store_true", default=None,
+                        help="Skip the rest of a case once one of its Critical steps fails "
+                             "(default: [fail_fast] abort_case_on_critical in config.ini)")
+    parser.add_argument("--max-failures", type=int, metavar="N", default=None,
+                        help="Cancel the suite once N cases have failed "
+                             "(default: [fail_fast] max_failed_cases in config.ini, 0 = never)")
+    parser.add_argument("--step-timeout", type=int, metavar="SECONDS", default=None,
+                        help="Timeout for steps without their own Step Timeout; longer steps are marked TIMEOUT "
+                             "(default: [timeouts] default_step_timeout in config.ini, 0 = none)")
+    parser.add_argument("--incremental", action="store_true", default=None,
+                        help="Skip steps that passed before with the same parameters and unchanged input files "
+                             "(default: [step_cache] enabled in config.ini)")
+    parser.add_argument("--sandbox", action="store_true", default=None,
+                        help="Give every case a fresh scratch directory as ${CASE_DIR} (on tmpfs where "
+                             "available), removed after the case (default: [sandbox] enabled in config.ini)")
+    parser.add_argument("--rerun-failed", action="store_true",
+                        help="Only rerun the cases that did not pass in their last run, and within them only "
+                             "the steps that did not pass plus the steps their run conditions depend on")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the last run after a crash or kill: skip the cases it finished and "
+                             "restart each interrupted case at its first unfinished step")
+    parser.add_argument("--budget", metavar="DURATION", default=None,
+                        help="Time budget of the run in seconds, or e.g. 15m: the most important cases (Critical "
+                             "first, then likely failures) that fit by their recorded durations run, the rest are "
+                             "deferred and listed in the summary (default: [time_budget] budget in config.ini)")
+    parser.add_argument("--watch", action="store_true",
+                        help="After the run, keep watching the files the steps read and rerun the cases "
+                             "whose inputs change (Ctrl+C to stop)")
+    parser.add_argument("--debounce", type=float, metavar="SECONDS", default=DEFAULT_DEBOUNCE,
+                        help=f"With --watch, seconds the inputs must stay unchanged before a rerun "
+                             f"(default: {DEFAULT_DEBOUNCE})")
+    parser.add_argument("--order", choices=ORDERS, default=None,
+                        help="Case start order; 'failures' runs the cases (and ready independent steps) most "
+                             "likely to fail first, from their recorded outcomes "
+                             "(default: [scheduling] order in config.ini)")
+    args = parser.parse_args(argv)
+    if args.watch and args.rerun_failed:
+        parser.error("--watch cannot be combined with --rerun-failed")
+    if args.resume and (args.watch or args.rerun_failed or args.case_names or args.shard):
+        parser.error("--resume continues the cases of the interrupted run; it cannot be combined with "
+                     "--watch, --rerun-failed, --case or --shard")
+
+    try:
+        pool_sizes = load_pool_sizes()
+        pool_sizes.update(parse_pool_sizes(args.pools))
+        budget = load_time_budget()[0] if args.budget is None else parse_budget(args.budget)
+    except ValueError as e:
+        parser.error(str(e))
+
+    cases = load_suite(args.suite)
+    if args.case_names:
+        missing = [name for name in args.case_names if name not in cases]
+        if missing:
+            parser.error(f"Unknown test case(s): {', '.join(missing)}")
+    # Fixtures take part in every selection, rerun and shard
+    fixtures, plans = split_fixtures(compile_suite(cases))
+    if args.case_names:
+        plans = [plan for plan in plans if plan.name in args.case_names]
+
+    previous_results = None
+    resumed = None
+    sandboxes = load_case_sandboxes(args.sandbox)
+    if args.resume:
+        state = resume_state(load_journal(), fixtures + plans, sandboxed=sandboxes is not None)
+        if state is None:
+            print("Nothing to resume: the last run finished")
+            return 0
+        previous_results, remaining, resumed = state
+        print(describe_resume(previous_results, remaining, resumed))
+        plans = [plan for plan in plans if plan.name in remaining]
+    if args.rerun_failed:
+        recorded = last_run.load_last_run()
+        previous_results = {plan.name: recorded[plan.name] for plan in fixtures + plans if plan.name in recorded}
+        if not previous_results:
+            parser.error("No previous results to rerun; run the suite first")
+        failed = set(last_run.failed_case_names(previous_results, [plan.name for plan in plans]))
+        if not failed:
+            print("No failed test cases in the last run")
+            return 0
+        plans = [plan for plan in plans if plan.name in failed]
+
+    if args.list_shards is not None:
+        if args.list_shards < 1:
+            parser.error("--list-shards must be at least 1")
+        print_shards(plans, args.list_shards)
+        return 0
+    if args.shard:
+        try:
+            index, count = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+        plans = assign_shards(plans, count, case_history.load_history())[index - 1][1]
+
+    fail_fast = load_fail_fast()
+    if args.abort_on_critical:
+        fail_fast.abort_case_on_critical = True
+    if args.max_failures is not None:
+        fail_fast.max_failed_cases = args.max_failures
+
+    runner = SuiteRunner(fixtures + plans, pool_sizes=pool_sizes,
+                         parallel_steps=args.parallel_steps, step_workers=args.step_workers,
+                         cpu_processes=load_cpu_processes() if args.cpu_processes is None else True,
+                         fail_fast=fail_fast,
+                         step_timeout=load_default_step_timeout() if args.step_timeout is None else args.step_timeout,
+                         step_cache=load_step_cache(args.incremental),
+                         previous_results=previous_results,
+                         order=args.order or load_case_order(),
+                         recycle_after=args.recycle_after,
+                         adaptive=load_adaptive_concurrency()[0] if args.adaptive is None else True,
+                         avoid_conflicts=load_resource_conflicts() if args.ignore_conflicts is None else False,
+                         sandboxes=sandboxes,
+                         # Watch mode reruns forever; there is no run to resume
+                         journal=None if args.watch else load_run_journal(resume=args.resume),
+                         resumed=resumed,
+                         budget=budget)
+
+    def interrupt(signum, frame):
+        # First Ctrl+C stops the run and still writes the reports; a second one exits at once
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        runner.cancel("Interrupted")
+
+    signal.signal(signal.SIGINT, interrupt)
+    if args.watch:
+        SuiteWatcher(runner, debounce=args.debounce).watch(parallel=args.parallel, workers=args.workers,
+                                                           engine=args.engine)
+        return 0
+    results = runner.run(parallel=args.parallel, workers=args.workers, engine=args.engine)
+    return 0 if all(r['success'] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import shutil, os, datetime, json, time, threading
+import shutil, os, sys, datetime, json, time, threading
 import pyodbc  # For MSSQL only
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from step_types import registry
+
 
 class TestStep:
     def __init__(self, parent, step_num):
@@ -10,13 +13,14 @@ class TestStep:
         self.frame = ttk.LabelFrame(parent, text=self.step_name)
         self.step_type = tk.StringVar()
         self.details = {}
-        self.column_entries = []
         self.is_checked = tk.BooleanVar(value=False)
         
         # Conditional execution settings
         self.run_condition = tk.StringVar(value="Always")
         self.category = tk.StringVar(value="General")
         self.target_step = tk.StringVar(value="")
+        self.depends_on = tk.StringVar(value="")
+        self.exclusive = tk.StringVar(value="")
         self.execution_time = 0
         self.last_result = None
         
@@ -50,34 +54,21 @@ class TestStep:
         self.target_step_entry.pack(side='left', padx=(0, 5))
         self.target_step_entry.pack_forget()  # Hide initially
         
+        # Explicit dependencies, used when the case runs its steps in parallel
+        self.depends_on_label = ttk.Label(top_frame, text="Depends On:", style="Step.TLabel")
+        self.depends_on_label.pack(side='left', padx=(15, 5))
+        ttk.Entry(top_frame, textvariable=self.depends_on, width=8).pack(side='left', padx=(0, 5))
+
+        # Resources no other case may use at the same time in parallel runs
+        ttk.Label(top_frame, text="Exclusive:", style="Step.TLabel").pack(side='left', padx=(15, 5))
+        ttk.Entry(top_frame, textvariable=self.exclusive, width=15).pack(side='left', padx=(0, 5))
+        
         # Second row with step type dropdown and label
         type_frame = ttk.Frame(self.frame, style="StepInner.TFrame")
         type_frame.grid(row=1, column=0, columnspan=3, sticky='ew', padx=5, pady=(0, 5))
         
         ttk.Label(type_frame, text="Step Type:", style="Step.TLabel").pack(side='left', padx=(5, 5))
-        self.type_dropdown = ttk.Combobox(type_frame, values=[
-            "── File Operations ──",
-            "Compare Files",
-            "Copy File",
-            "Create Directory",
-            "Delete File/Folder",
-            "Extract Archive",
-            "Move File",
-            "Rename File",
-            "Wait for File",
-            "── File Validation ──",
-            "Check File Exists",
-            "── System Operations ──",
-            "Check Disk Space",
-            "Check Memory",
-            "Check Process Running",
-            "Run Command",
-            "Start Process",
-            "Stop Process",
-            "── Application Testing ──",
-            "Check Database Entry",
-            "Check Log File"
-        ], state="readonly", textvariable=self.step_type, style="Step.TCombobox", width=25)
+        self.type_dropdown = ttk.Combobox(type_frame, values=registry.dropdown_values(), state="readonly", textvariable=self.step_type, style="Step.TCombobox", width=25)
         self.type_dropdown.pack(side='left', padx=(0, 5))
         self.type_dropdown.bind("<<ComboboxSelected>>", self.on_step_type_selected)
 
@@ -97,7 +88,6 @@ class TestStep:
         for widget in self.fields_frame.winfo_children():
             widget.destroy()
         self.details.clear()
-        self.column_entries.clear()
 
         step_type = self.step_type.get()
 
@@ -106,121 +96,67 @@ class TestStep:
         self.details["step_delay"].insert(0, "0")
         self.details["step_delay"].grid(row=0, column=1, sticky='w', padx=5, pady=2)
 
-        row = 1
-        if step_type == "Copy File":
-            self.details["from_files"] = []
-            ttk.Label(self.fields_frame, text="From Files:", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
-            from_files_entry = tk.Entry(self.fields_frame, width=50)
-            from_files_entry.grid(row=row, column=1, sticky='w', padx=5, pady=2)
-            self.details["from"] = from_files_entry
-            ttk.Button(self.fields_frame, text="Browse Files", command=self.browse_files, style="Ghost.TButton").grid(row=row, column=2)
-            row += 1
-
-            ttk.Label(self.fields_frame, text="To Path:", style="Step.TLabel").grid(row=row, column=0)
-            self.details["to"] = tk.Entry(self.fields_frame, width=50)
-            self.details["to"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
-
-        elif step_type == "Check Log File":
-            ttk.Label(self.fields_frame, text="Log Type:", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
-            self.details["log_type"] = ttk.Combobox(
-                self.fields_frame, values=["", "L", "M", "H", "DEBUG", "ERROR", "INFO"], state="readonly", style="Step.TCombobox")
-            self.details["log_type"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
-            row += 1
-
-            ttk.Label(self.fields_frame, text="Search String:", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
-            self.details["search"] = tk.Entry(self.fields_frame, width=100)
-            self.details["search"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
-            row += 1
-
-            ttk.Label(self.fields_frame, text="Duration (mins):", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
-            self.details["duration"] = tk.Entry(self.fields_frame)
-            self.details["duration"].insert(0, "60")
-            self.details["duration"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
-            row += 1
+        # Watchdog limit for any step type; blank uses the suite default
+        ttk.Label(self.fields_frame, text="Step Timeout (secs):", style="Step.TLabel").grid(row=0, column=2, sticky='w', padx=5, pady=2)
+        self.details["step_timeout"] = tk.Entry(self.fields_frame, width=10)
+        self.details["step_timeout"].grid(row=0, column=3, sticky='w', padx=5, pady=2)
 
-            ttk.Label(self.fields_frame, text="Wait Before Search (secs):", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
-            self.details["delay"] = tk.Entry(self.fields_frame)
-            self.details["delay"].insert(0, "0")
-            self.details["delay"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
-            row += 1
-
-            ttk.Label(self.fields_frame, text="Log File Path:", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
-            self.details["log_file_path"] = tk.Entry(self.fields_frame, width=50)
-            self.details["log_file_path"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
-
-        elif step_type == "Check Database Entry":
-            labels = [("Table Name", "table")]
-            for label, key in labels:
-                ttk.Label(self.fields_frame, text=label + ":", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
-                self.details[key] = tk.Entry(self.fields_frame, width=40)
-                self.details[key].grid(row=row, column=1, sticky='w', padx=5, pady=2)
-                row += 1
-
-            self.columns_frame = ttk.LabelFrame(self.fields_frame, text="Columns to Check", style="Step.TLabelframe")
-            self.columns_frame.grid(row=row, column=0, columnspan=2, pady=5)
-            self.add_column_entry()
-
-            row += 1
-            add_col_btn = ttk.Button(self.fields_frame, text="Add Column", command=self.add_column_entry, style="Ghost.TButton")
-            add_col_btn.grid(row=row, column=0, columnspan=2)
-        
-        # Import and use the modular UI builders
-        else:
-            try:
-                import sys
-                sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                from step_types.step_ui_builder import StepTypeUI
-                
-                ui_map = {
-                    "Move File": StepTypeUI.build_move_file_ui,
-                    "Delete File/Folder": StepTypeUI.build_delete_path_ui,
-                    "Rename File": StepTypeUI.build_rename_path_ui,
-                    "Create Directory": StepTypeUI.build_create_directory_ui,
-                    "Check File Exists": StepTypeUI.build_check_path_exists_ui,
-                    "Compare Files": StepTypeUI.build_compare_files_ui,
-                    "Extract Archive": StepTypeUI.build_extract_archive_ui,
-                    "Wait for File": StepTypeUI.build_wait_for_file_ui,
-                    "Run Command": StepTypeUI.build_run_command_ui,
-                    "Start Process": StepTypeUI.build_start_process_ui,
-                    "Stop Process": StepTypeUI.build_stop_process_ui,
-                    "Check Process Running": StepTypeUI.build_check_process_ui,
-                    "Check Disk Space": StepTypeUI.build_check_disk_space_ui,
-                    "Check Memory": StepTypeUI.build_check_memory_ui,
-                }
-                
-                if step_type in ui_map:
-                    ui_map[step_type](self.fields_frame, self.details, row)
-            except Exception as e:
-                ttk.Label(self.fields_frame, text=f"Error loading UI: {str(e)}", style="Step.TLabel").grid(row=row, column=0, columnspan=3)
-
-    def browse_files(self):
-        files = filedialog.askopenfilenames()
-        if files:
-            self.details["from_files"] = files
-            self.details["from"].delete(0, tk.END)
-            self.details["from"].insert(0, ", ".join(files))
-
-    def add_column_entry(self):
-        row = len(self.column_entries)
-        col_name = tk.Entry(self.columns_frame, width=15)
-        operator = ttk.Combobox(self.columns_frame, values=["=", "LIKE", ">=", "<=", "<", ">", "!="], width=5, style="Step.TCombobox")
-        operator.set("=")
-        col_value = tk.Entry(self.columns_frame, width=15)
-
-        col_name.grid(row=row, column=0, padx=2, pady=2)
-        operator.grid(row=row, column=1, padx=2, pady=2)
-        col_value.grid(row=row, column=2, padx=2, pady=2)
+        registered = registry.get_step_type(step_type)
+        if registered is None or registered.build_ui is None:
+            return
+        try:
+            registered.build_ui(self.fields_frame, self.details, 1)
+        except Exception as e:
+            ttk.Label(self.fields_frame, text=f"Error loading UI: {str(e)}", style="Step.TLabel").grid(row=1, column=0, columnspan=3)
 
-        self.column_entries.append((col_name, operator, col_value))
+    def set_details(self, details_data):
+        """Fill the detail widgets from saved step details"""
+        for key, widget in self.details.items():
+            value = details_data.get(key)
+            if value is None or key == "from_files":
+                continue
+            if isinstance(widget, ttk.Combobox):
+                widget.set(value)
+            elif isinstance(widget, tk.Entry):
+                widget.delete(0, tk.END)
+                widget.insert(0, str(value))
+            elif isinstance(widget, tk.Text):
+                widget.delete("1.0", tk.END)
+                widget.insert("1.0", value)
+            elif hasattr(widget, "set"):
+                # Checkbox variables and the database column list
+                widget.set(value)
+
+        # Copy File source list, also shown in the "from" entry
+        if "from_files" in self.details and details_data.get("from_files"):
+            from_files_data = details_data["from_files"]
+            if isinstance(from_files_data, (list, tuple)):
+                from_files_list = list(from_files_data)
+            else:
+                from_files_list = [str(from_files_data)]
+            self.details["from_files"] = from_files_list
+            if isinstance(self.details.get("from"), tk.Entry):
+                self.details["from"].delete(0, tk.END)
+                self.details["from"].insert(0, "; ".join(from_files_list))
 
     def on_condition_change(self, event=None):
         """Show/hide target step entry based on condition"""
         condition = self.run_condition.get()
         if condition in ["If Specific Step Passed", "If Specific Step Failed"]:
-            self.target_step_entry.pack(side='left', padx=(0, 5))
+            self.target_step_entry.pack(side='left', padx=(0, 5), before=self.depends_on_label)
         else:
             self.target_step_entry.pack_forget()
     
+    def set_run_settings(self, step_data):
+        """Restore category, run condition, target step, dependencies and exclusive resources from step data"""
+        self.category.set(step_data.get("category", "General"))
+        self.run_condition.set(step_data.get("run_condition", "Always"))
+        self.target_step.set(step_data.get("target_step", ""))
+        self.depends_on.set(step_data.get("depends_on", ""))
+        self.exclusive.set(step_data.get("exclusive", ""))
+        self.on_condition_change()
+        self.frame.config(text=f"{self.step_name} [{self.category.get()}]")
+
     def get_step_data(self):
         step = {
             "name": self.step_name, 
@@ -228,7 +164,9 @@ class TestStep:
             "details": {},
             "run_condition": self.run_condition.get(),
             "category": self.category.get(),
-            "target_step": self.target_step.get()
+            "target_step": self.target_step.get(),
+            "depends_on": self.depends_on.get(),
+            "exclusive": self.exclusive.get()
         }
         for key, widget in self.details.items():
             # Handle different widget types properly
@@ -240,19 +178,6 @@ class TestStep:
                     step["details"][key] = widget.get()
             else:
                 step["details"][key] = widget
-
-        if self.step_type.get() == "Copy File":
-            step["details"]["from_files"] = self.details.get("from_files", [])
-
-        if self.step_type.get() == "Check Database Entry":
-            step["details"]["columns"] = []
-            for name_entry, op_entry, val_entry in self.column_entries:
-                if name_entry.get():
-                    step["details"]["columns"].append({
-                        "column": name_entry.get(),
-                        "operator": op_entry.get(),
-                        "value": val_entry.get()
-                    })
         return step
 
 def load_db_config():
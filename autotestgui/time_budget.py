@@ -0,0 +1,171 @@
+"""
+Time-Budgeted Runs
+
+A gate with a hard time limit cannot wait for every case of a suite. With a
+budget, cases are ranked by importance: cases with a Critical step first,
+then cases with a Validation step, then the rest. Within a rank the likeliest
+failures come first (see failure_ordering), then the shorter case.
+
+Before the run, the ranked cases are laid out on the case slots of the run
+(one when sequential) with their estimated durations (see sharding). A case
+that shares resources with an earlier one (see resource_conflicts) is laid
+out after it. The estimates of the Setup and Cleanup fixtures are taken off
+the budget first.
+A case that would end after the budget is deferred, and a shorter case
+ranked below it may still take the time that is left. During the run a case
+only starts if its estimate still fits in the time left before the deadline,
+keeping the time the Cleanup fixtures need. Running cases are never stopped.
+
+Deferred cases do not run and leave no result, so their history and last
+results stay as they were. They are listed in the run summary.
+"""
+import configparser
+import heapq
+import re
+import threading
+import time
+
+from execution_plan import CLEANUP_FIXTURE
+from failure_ordering import case_probabilities
+from resource_pools import CONFIG_PATH
+from sharding import estimate_durations
+
+# Step categories that rank a case, most important first; cases with none of
+# them come last
+CATEGORY_RANKS = {"Critical": 0, "Validation": 1}
+
+# Factor applied to every duration estimate, since averages are sometimes exceeded
+DEFAULT_SAFETY_FACTOR = 1.2
+
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_budget(text):
+    """
+    Parse a time budget such as "900", "90s", "15m" or "1.5h"
+
+    Returns:
+        float: Seconds, or None for an empty or zero budget
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", str(text).lower())
+    if match is None:
+        raise ValueError(f"Invalid time budget '{text}', expected seconds or a value such as 15m")
+    seconds = float(match.group(1)) * _UNITS[match.group(2)]
+    return seconds or None
+
+
+def load_time_budget(path=CONFIG_PATH):
+    """
+    Read the [time_budget] section of config.ini
+
+    Returns:
+        (budget in seconds or None, safety factor)
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    try:
+        budget = parse_budget(parser.get("time_budget", "budget", fallback="") or "0")
+    except ValueError:
+        budget = None
+    return budget, max(1.0, parser.getfloat("time_budget", "safety_factor", fallback=DEFAULT_SAFETY_FACTOR))
+
+
+def case_rank(plan):
+    """Return the rank of a case: the rank of its most important step category"""
+    return min((CATEGORY_RANKS.get(step.category, len(CATEGORY_RANKS)) for step in plan.steps),
+               default=len(CATEGORY_RANKS))
+
+
+def budget_order(plans, history):
+    """Return the plans most important first: by category rank, failure probability, then duration"""
+    probabilities = case_probabilities(plans, history)
+    estimates = estimate_durations(plans, history)
+    return sorted(plans, key=lambda plan: (case_rank(plan), -probabilities[plan.name], estimates[plan.name][0]))
+
+
+class TimeBudget:
+    """Picks the cases that fit a time budget and defers the rest"""
+
+    def __init__(self, seconds, safety_factor=DEFAULT_SAFETY_FACTOR):
+        """
+        Args:
+            seconds: Wall-clock time the run may take
+            safety_factor: Factor applied to the duration estimates
+        """
+        self.seconds = seconds
+        self.safety_factor = safety_factor
+        self.deadline = None
+        self.deferred = {}
+        self._estimates = {}
+        self._cleanup_reserve = 0.0
+        self._planned = 0.0
+        self._lock = threading.Lock()
+
+    def plan(self, cases, fixtures, history, slots=1, conflicts=None):
+        """
+        Start the clock and choose the cases expected to fit the budget
+
+        Args:
+            cases: CasePlans of the run, without the fixtures
+            fixtures: Setup and Cleanup fixture CasePlans of the run
+            history: Run history from case_history.load_history()
+            slots: Cases that run at the same time
+            conflicts: Optional conflict graph from build_conflict_graph();
+                       conflicting cases are laid out one after the other
+
+        Returns:
+            list: The chosen cases, most important first; the others are
+                  recorded in deferred
+        """
+        self.deadline = time.monotonic() + self.seconds
+        estimates = estimate_durations(list(cases) + list(fixtures), history)
+        self._estimates = {name: seconds * self.safety_factor for name, (seconds, _) in estimates.items()}
+        self._cleanup_reserve = sum(self._estimates[plan.name] for plan in fixtures
+                                    if plan.fixture == CLEANUP_FIXTURE)
+        available = self.seconds - sum(self._estimates[plan.name] for plan in fixtures)
+        conflicts = conflicts or {}
+        # Greedy list scheduling: each case goes to the slot that frees up
+        # first, and starts no earlier than the chosen cases it conflicts with end
+        loads = [0.0] * max(1, slots)
+        ends = {}
+        chosen = []
+        for plan in budget_order(cases, history):
+            start = max([loads[0]] + [ends[other] for other in conflicts.get(plan.name, {}) if other in ends])
+            end = start + self._estimates[plan.name]
+            if end > available:
+                self.deferred[plan.name] = (f"needs ~{self._estimates[plan.name]:.1f}s, "
+                                            f"would end after the budget")
+                continue
+            heapq.heapreplace(loads, end)
+            ends[plan.name] = end
+            chosen.append(plan)
+        self._planned = max(loads)
+        return chosen
+
+    def admit(self, name):
+        """
+        Decide, right before a case starts, whether it still fits
+
+        Returns:
+            bool: True if the case may start; otherwise it is recorded in deferred
+        """
+        left = self.deadline - time.monotonic() - self._cleanup_reserve
+        needed = self._estimates.get(name, 0.0)
+        if needed <= left:
+            return True
+        with self._lock:
+            self.deferred[name] = f"needs ~{needed:.1f}s, {max(left, 0.0):.1f}s left"
+        return False
+
+    def describe(self, chosen):
+        """Return a printable summary of the plan"""
+        return (f"Time budget: {self.seconds:g}s; {len(chosen)} case(s) planned (~{self._planned:.1f}s), "
+                f"{len(self.deferred)} deferred")
+
+    def describe_deferred(self):
+        """Return the printable list of the deferred cases, or None if every case ran"""
+        if not self.deferred:
+            return None
+        lines = [f"Deferred by the time budget: {len(self.deferred)} case(s) not run"]
+        lines += [f"   {name}: {reason}" for name, reason in self.deferred.items()]
+        return "\n".join(lines)
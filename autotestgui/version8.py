@@ -1,389 +1,42 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
+import concurrent.futures
 import json
 import threading
 import time
-import os
-import re
 from datetime import datetime
 from test_step import TestStep
-from condition_handler import ConditionHandler
+from step_types import registry
+from adaptive_concurrency import ConcurrencyController, describe_timeline, load_adaptive_concurrency
+import case_history
+from case_sandbox import load_case_sandboxes
+from case_runner import CancellationToken, CaseRunner
+from console_output import ConsoleQueue
+from execution_plan import compile_case
+from fail_fast import load_fail_fast
+from failure_ordering import describe_order, likely_failures_first, load_case_order, step_priorities
+import last_run
+from step_cache import load_step_cache
+from step_watchdog import load_default_step_timeout
+from suite_fixtures import SuiteFixtures
+from process_runner import CaseProcessPool, load_process_isolation
+from resource_conflicts import ConflictScheduler, build_conflict_graph, describe_conflicts, load_resource_conflicts
+from resource_pools import ResourcePools, load_cpu_processes, load_pool_sizes
+from run_journal import load_journal, load_run_journal, resume_state
+from runner_daemon import RunnerClient, RunnerDaemonError
+from reporting import combined_report_data, save_combined_html
+from sharding import estimate_durations
 
-REPORT_OUTPUT_FOLDER = "TestReports"
-os.makedirs(REPORT_OUTPUT_FOLDER, exist_ok=True)
-
-combined_report_data = []
 clipboard_step_data = []  # Now supports multiple steps
 
-def save_combined_html():
-    if not combined_report_data:
-        return
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    version_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    # Parse all test case data to generate aggregate statistics
-    total_test_cases = len(combined_report_data)
-    total_passed_cases = 0
-    total_failed_cases = 0
-    total_steps_all = 0
-    total_passed_steps = 0
-    total_failed_steps = 0
-    total_execution_time = 0.0
-    
-    test_case_summaries = []  # Store compact summaries for quick access table
-    
-    # Extract statistics from structured report data
-    for report_data in combined_report_data:
-        # Handle both old (string) and new (dict) formats for backward compatibility
-        if isinstance(report_data, dict):
-            test_name = report_data['name']
-            passed_steps = report_data['passed_steps']
-            failed_steps = report_data['failed_steps']
-            total_steps = report_data['total_steps']
-            exec_time = report_data['execution_time']
-            is_passed = report_data['success']
-        else:
-            # Fallback to regex parsing for old format (string)
-            import re
-            report_html = report_data
-            name_match = re.search(r'Feature: ([^<]+)', report_html)
-            test_name = name_match.group(1) if name_match else "Unknown"
-            
-            is_passed = '#5cb85c' in report_html.split('cucumber-banner')[1].split('</div>')[0] if 'cucumber-banner' in report_html else False
-            
-            passed_match = re.search(r'(\d+)</div>\s*<div[^>]*>Passed</div>', report_html)
-            failed_match = re.search(r'(\d+)</div>\s*<div[^>]*>Failed</div>', report_html)
-            total_match = re.search(r'(\d+)</div>\s*<div[^>]*>Total</div>', report_html)
-            
-            passed_steps = int(passed_match.group(1)) if passed_match else 0
-            failed_steps = int(failed_match.group(1)) if failed_match else 0
-            total_steps = int(total_match.group(1)) if total_match else 0
-            
-            time_match = re.search(r'Total Duration</div>\s*<div[^>]*>([\d.]+)s</div>', report_html)
-            exec_time = float(time_match.group(1)) if time_match else 0.0
-        
-        # Aggregate statistics
-        if is_passed:
-            total_passed_cases += 1
-        else:
-            total_failed_cases += 1
-        
-        total_passed_steps += passed_steps
-        total_failed_steps += failed_steps
-        total_steps_all += total_steps
-        total_execution_time += exec_time
-        
-        # Store summary for table
-        test_case_summaries.append({
-            'name': test_name,
-            'status': 'PASS' if is_passed else 'FAIL',
-            'passed': passed_steps,
-            'failed': failed_steps,
-            'total': total_steps,
-            'time': exec_time
-        })
-    
-    # Calculate overall success rate
-    overall_success_rate = (total_passed_steps / total_steps_all * 100) if total_steps_all > 0 else 0
-    case_success_rate = (total_passed_cases / total_test_cases * 100) if total_test_cases > 0 else 0
-    
-    combined_html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Test Execution Dashboard - v{version_timestamp}</title>
-    <style>
-        * {{ box-sizing: border-box; margin: 0; padding: 0; }}
-        body {{ 
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 20px;
-            line-height: 1.6;
-            color: #1e293b;
-        }}
-        .container {{ max-width: 1600px; margin: 0 auto; }}
-        .dashboard-header {{ 
-            background: white;
-            border-radius: 16px;
-            padding: 40px;
-            margin-bottom: 25px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        }}
-        .dashboard-header h1 {{ 
-            font-size: 36px;
-            background: linear-gradient(135deg, #667eea, #764ba2);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            margin-bottom: 10px;
-            font-weight: 800;
-        }}
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin: 25px 0;
-        }}
-        .stat-card {{
-            background: white;
-            border-radius: 12px;
-            padding: 25px;
-            text-align: center;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-            transition: transform 0.2s;
-        }}
-        .stat-card:hover {{ transform: translateY(-4px); box-shadow: 0 6px 20px rgba(0,0,0,0.15); }}
-        .stat-value {{ font-size: 42px; font-weight: 700; margin: 10px 0; }}
-        .stat-label {{ font-size: 13px; text-transform: uppercase; letter-spacing: 1px; color: #64748b; font-weight: 600; }}
-        .chart-section {{
-            background: white;
-            border-radius: 12px;
-            padding: 30px;
-            margin-bottom: 25px;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        }}
-        .progress-bar {{
-            display: flex;
-            height: 50px;
-            border-radius: 25px;
-            overflow: hidden;
-            box-shadow: inset 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .progress-segment {{
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-weight: 700;
-            font-size: 18px;
-            transition: all 0.3s;
-        }}
-        .summary-table {{
-            width: 100%;
-            border-collapse: separate;
-            border-spacing: 0;
-            background: white;
-            border-radius: 12px;
-            overflow: hidden;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        }}
-        .summary-table thead {{
-            background: linear-gradient(135deg, #667eea, #764ba2);
-            color: white;
-        }}
-        .summary-table th {{
-            padding: 15px;
-            text-align: left;
-            font-weight: 600;
-            text-transform: uppercase;
-            font-size: 12px;
-            letter-spacing: 1px;
-        }}
-        .summary-table td {{
-            padding: 12px 15px;
-            border-bottom: 1px solid #e5e7eb;
-        }}
-        .summary-table tbody tr:hover {{ background: #f8fafc; }}
-        .badge {{ 
-            display: inline-block;
-            padding: 4px 12px;
-            border-radius: 12px;
-            font-weight: 600;
-            font-size: 11px;
-            text-transform: uppercase;
-        }}
-        .badge-pass {{ background: #d1fae5; color: #065f46; }}
-        .badge-fail {{ background: #fee2e2; color: #991b1b; }}
-        .compact-test {{ 
-            background: white;
-            border-radius: 8px;
-            padding: 15px 20px;
-            margin: 15px 0;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-            border-left: 4px solid #3b82f6;
-        }}
-        .compact-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            cursor: pointer;
-            user-select: none;
-        }}
-        .compact-header:hover {{ opacity: 0.8; }}
-        .details {{ display: none; margin-top: 15px; padding-top: 15px; border-top: 1px solid #e5e7eb; }}
-        .details.expanded {{ display: block; }}
-        @media print {{ body {{ background: white; }} }}
-    </style>
-    <script>
-        function toggleDetails(id) {{
-            const details = document.getElementById('details-' + id);
-            const arrow = document.getElementById('arrow-' + id);
-            if (details.classList.contains('expanded')) {{
-                details.classList.remove('expanded');
-                arrow.textContent = '▼';
-            }} else {{
-                details.classList.add('expanded');
-                arrow.textContent = '▲';
-            }}
-        }}
-    </script>
-</head>
-<body>
-    <div class="container">
-        <div class="dashboard-header">
-            <h1>🧪 Test Execution Dashboard</h1>
-            <p style='color: #64748b; font-size: 15px; margin-top: 5px;'>Comprehensive overview of all test executions</p>
-            <p style='color: #94a3b8; font-size: 13px; margin-top: 8px;'>📅 {timestamp} | 🔖 Version: {version_timestamp}</p>
-        </div>
-
-        <!-- Aggregate Statistics -->
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-label">Test Cases</div>
-                <div class="stat-value" style="color: #3b82f6;">{total_test_cases}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Passed Cases</div>
-                <div class="stat-value" style="color: #10b981;">{total_passed_cases}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Failed Cases</div>
-                <div class="stat-value" style="color: #ef4444;">{total_failed_cases}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Total Steps</div>
-                <div class="stat-value" style="color: #8b5cf6;">{total_steps_all}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Success Rate</div>
-                <div class="stat-value" style="color: {'#10b981' if overall_success_rate >= 80 else '#f59e0b' if overall_success_rate >= 50 else '#ef4444'};">{overall_success_rate:.1f}%</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Total Time</div>
-                <div class="stat-value" style="color: #06b6d4;">{total_execution_time:.1f}s</div>
-            </div>
-        </div>
-
-        <!-- Visual Progress Chart -->
-        <div class="chart-section">
-            <h2 style="margin-bottom: 20px; font-size: 22px; color: #1e293b;">📊 Overall Test Execution</h2>
-            <div class="progress-bar">
-                <div class="progress-segment" style="flex: {total_passed_steps}; background: linear-gradient(135deg, #10b981, #059669);">
-                    {total_passed_steps if total_passed_steps > 0 else ''}
-                </div>
-                <div class="progress-segment" style="flex: {total_failed_steps}; background: linear-gradient(135deg, #ef4444, #dc2626);">
-                    {total_failed_steps if total_failed_steps > 0 else ''}
-                </div>
-            </div>
-            <div style="display: flex; justify-content: space-around; margin-top: 15px; font-size: 14px; color: #64748b;">
-                <span><strong style="color: #10b981;">✓ {total_passed_steps}</strong> Passed</span>
-                <span><strong style="color: #ef4444;">✗ {total_failed_steps}</strong> Failed</span>
-                <span><strong style="color: #3b82f6;">Total: {total_steps_all}</strong></span>
-            </div>
-        </div>
-
-        <!-- Quick Summary Table -->
-        <div class="chart-section">
-            <h2 style="margin-bottom: 20px; font-size: 22px; color: #1e293b;">📋 Test Cases Summary</h2>
-            <table class="summary-table">
-                <thead>
-                    <tr>
-                        <th>#</th>
-                        <th>Test Case Name</th>
-                        <th style="text-align: center;">Status</th>
-                        <th style="text-align: center;">Passed</th>
-                        <th style="text-align: center;">Failed</th>
-                        <th style="text-align: center;">Total</th>
-                        <th style="text-align: center;">Duration</th>
-                        <th style="text-align: center;">Details</th>
-                    </tr>
-                </thead>
-                <tbody>
-"""
-    
-    # Add summary table rows
-    for idx, summary in enumerate(test_case_summaries, 1):
-        badge_class = 'badge-pass' if summary['status'] == 'PASS' else 'badge-fail'
-        combined_html += f"""
-                    <tr>
-                        <td><strong>#{idx}</strong></td>
-                        <td>{summary['name']}</td>
-                        <td style="text-align: center;"><span class="badge {badge_class}">{summary['status']}</span></td>
-                        <td style="text-align: center; color: #10b981; font-weight: 600;">{summary['passed']}</td>
-                        <td style="text-align: center; color: #ef4444; font-weight: 600;">{summary['failed']}</td>
-                        <td style="text-align: center; font-weight: 600;">{summary['total']}</td>
-                        <td style="text-align: center;">{summary['time']:.2f}s</td>
-                        <td style="text-align: center;"><a href="#test-{idx}" style="color: #3b82f6; text-decoration: none; font-weight: 600;">View ↓</a></td>
-                    </tr>
-"""
-    
-    combined_html += """
-                </tbody>
-            </table>
-        </div>
-
-        <!-- Detailed Test Cases (Compact, Expandable) -->
-        <div class="chart-section">
-            <h2 style="margin-bottom: 20px; font-size: 22px; color: #1e293b;">📝 Detailed Test Results</h2>
-"""
-    
-    # Add compact test case sections
-    for idx, report_data in enumerate(combined_report_data, 1):
-        summary = test_case_summaries[idx - 1]
-        status_icon = '✓' if summary['status'] == 'PASS' else '✗'
-        status_color = '#10b981' if summary['status'] == 'PASS' else '#ef4444'
-        
-        # Extract HTML from report_data (handle both dict and string formats)
-        report_html = report_data['html'] if isinstance(report_data, dict) else report_data
-        
-        combined_html += f"""
-            <div class="compact-test" id="test-{idx}">
-                <div class="compact-header" onclick="toggleDetails({idx})">
-                    <div>
-                        <span style="font-size: 20px; margin-right: 10px;">{status_icon}</span>
-                        <strong style="font-size: 16px; color: {status_color};">#{idx}. {summary['name']}</strong>
-                        <span style="margin-left: 15px; color: #64748b; font-size: 14px;">
-                            {summary['passed']} passed, {summary['failed']} failed • {summary['time']:.2f}s
-                        </span>
-                    </div>
-                    <span id="arrow-{idx}" style="font-size: 14px; color: #64748b;">▼</span>
-                </div>
-                <div id="details-{idx}" class="details">
-                    {report_html}
-                </div>
-            </div>
-"""
-    
-    combined_html += """
-        </div>
-    </div>
-</body>
-</html>
-"""
-
-    # Delete old combined reports to keep only the latest
-    import glob
-    old_reports = glob.glob(os.path.join(REPORT_OUTPUT_FOLDER, "Combined_Test_Summary_*.html"))
-    for old_report in old_reports:
-        try:
-            os.remove(old_report)
-        except:
-            pass
-    
-    # Save only the latest combined report
-    latest_filename = os.path.join(REPORT_OUTPUT_FOLDER, "Combined_Test_Summary_Latest.html")
-    
-    with open(latest_filename, "w", encoding="utf-8") as f:
-        f.write(combined_html)
-
-    print(f"✅ Combined report generated: Combined_Test_Summary_Latest.html")
 
 class TestCaseFrame:
-    def __init__(self, parent, name):
+    def __init__(self, parent, name, fixture_source=None):
         global clipboard_step_data
 
         self.name = name
+        # Callable returning the SuiteFixtures a single Run may use
+        self.fixture_source = fixture_source
         self.frame = ttk.LabelFrame(parent, text=name, style="Case.TLabelframe")
         self.frame.pack(fill="x", padx=8, pady=6)
 
@@ -396,13 +49,14 @@ class TestCaseFrame:
 
         ttk.Button(btns, text="➕ Add Step", command=self.add_step, style="Accent.TButton").grid(row=0, column=0, padx=2)
         ttk.Button(btns, text="🗑 Clear", command=self.clear_steps, style="Ghost.TButton").grid(row=0, column=1, padx=2)
-        ttk.Button(btns, text="▶ Run", command=self.run, style="Accent.TButton").grid(row=0, column=2, padx=2)
-        ttk.Button(btns, text="📋 Copy Checked", command=self.copy_checked_steps, style="Ghost.TButton").grid(row=0, column=3, padx=2)
-        ttk.Button(btns, text="🗑 Delete", command=self.delete_selected_step, style="Danger.TButton").grid(row=0, column=4, padx=2)
-        ttk.Button(btns, text="📋 Paste", command=self.paste_step_from_clipboard, style="Ghost.TButton").grid(row=0, column=5, padx=2)
-        ttk.Button(btns, text="✏ Rename Step", command=self.rename_selected_step, style="Ghost.TButton").grid(row=0, column=6, padx=2)
-        ttk.Button(btns, text="☑ Select All", command=self.select_all_steps, style="Ghost.TButton").grid(row=0, column=7, padx=2)
-        ttk.Button(btns, text="☐ Unselect All", command=self.unselect_all_steps, style="Ghost.TButton").grid(row=0, column=8, padx=2)
+        ttk.Button(btns, text="▶ Run", command=self.run_single, style="Accent.TButton").grid(row=0, column=2, padx=2)
+        ttk.Button(btns, text="⏹ Stop", command=self.stop, style="Danger.TButton").grid(row=0, column=3, padx=2)
+        ttk.Button(btns, text="📋 Copy Checked", command=self.copy_checked_steps, style="Ghost.TButton").grid(row=0, column=4, padx=2)
+        ttk.Button(btns, text="🗑 Delete", command=self.delete_selected_step, style="Danger.TButton").grid(row=0, column=5, padx=2)
+        ttk.Button(btns, text="📋 Paste", command=self.paste_step_from_clipboard, style="Ghost.TButton").grid(row=0, column=6, padx=2)
+        ttk.Button(btns, text="✏ Rename Step", command=self.rename_selected_step, style="Ghost.TButton").grid(row=0, column=7, padx=2)
+        ttk.Button(btns, text="☑ Select All", command=self.select_all_steps, style="Ghost.TButton").grid(row=0, column=8, padx=2)
+        ttk.Button(btns, text="☐ Unselect All", command=self.unselect_all_steps, style="Ghost.TButton").grid(row=0, column=9, padx=2)
         
         # Filter bar with dropdowns
         filter_frame = ttk.Frame(self.frame, style="CaseInner.TFrame")
@@ -421,7 +75,7 @@ class TestCaseFrame:
         ttk.Label(filter_frame, text="Step Type:", style="Case.TLabelframe.Label").pack(side='left', padx=(0, 5))
         self.step_type_filter_var = tk.StringVar(value="All")
         self.step_type_filter = ttk.Combobox(filter_frame, textvariable=self.step_type_filter_var,
-                                             values=["All", "Copy File", "Check Log File", "Check Database Entry"],
+                                             values=["All"] + [t.name for t in registry.step_types()],
                                              width=20, state="readonly", style="Step.TCombobox")
         self.step_type_filter.pack(side='left', padx=(0, 15))
         self.step_type_filter.bind("<<ComboboxSelected>>", lambda e: self.apply_filters())
@@ -429,6 +83,10 @@ class TestCaseFrame:
         # Clear filters button
         ttk.Button(filter_frame, text="✖ Clear All Filters", command=self.clear_all_filters, style="Ghost.TButton").pack(side='left', padx=(0, 15))
         
+        # Opt-in concurrent execution of independent steps
+        self.parallel_steps_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filter_frame, text="⚡ Parallel Steps", variable=self.parallel_steps_var).pack(side='left', padx=(0, 15))
+        
         # Toggle output button
         self.toggle_output_btn = ttk.Button(filter_frame, text="📊 Show Output", command=self.toggle_output, style="Ghost.TButton")
         self.toggle_output_btn.pack(side='left', padx=(0, 5))
@@ -481,9 +139,13 @@ class TestCaseFrame:
         self.output = tk.Text(self.output_frame, height=7, relief="solid", bg="#f8fafc", fg="#1e293b", wrap="word", borderwidth=1)
         self.output.configure(insertbackground="#1e293b", highlightthickness=0, bd=1, padx=8, pady=6, font=("Consolas", 9))
         self.output.pack(fill="both", expand=True)
+        # Worker threads write here; the Tk thread drains it into self.output
+        self.console = ConsoleQueue(self.output)
         
         self.output_visible = False
         self.last_result = "Pending"
+        self.last_plan = None
+        self.runner = None
 
     def toggle_output(self):
         if self.output_visible:
@@ -589,29 +251,9 @@ class TestCaseFrame:
                 step.frame.config(text=data["name"])
             step.step_type.set(data["type"])
             step.show_fields()
+            step.set_run_settings(data)
 
-            for key, widget in step.details.items():
-                value = data["details"].get(key)
-                if value is not None:
-                    if isinstance(widget, ttk.Combobox):
-                        widget.set(value)
-                    elif isinstance(widget, tk.Entry):
-                        widget.delete(0, tk.END)
-                        widget.insert(0, value)
-                    elif key == "from_files":
-                        step.details["from_files"] = value
-                        if "from" in step.details:
-                            step.details["from"].delete(0, tk.END)
-                            step.details["from"].insert(0, ", ".join(value))
-
-            if data["type"] == "Check Database Entry":
-                for idx, col in enumerate(data["details"].get("columns", [])):
-                    if idx >= len(step.column_entries):
-                        step.add_column_entry()
-                    name_entry, op_entry, val_entry = step.column_entries[idx]
-                    name_entry.insert(0, col.get("column", ""))
-                    op_entry.set(col.get("operator", "="))
-                    val_entry.insert(0, col.get("value", ""))
+            step.set_details(data["details"])
 
             self.steps.append(step)
 
@@ -632,7 +274,7 @@ class TestCaseFrame:
             step.frame.destroy()
         self.steps.clear()
         self.selected_step_index = None
-        self.output.delete("1.0", tk.END)
+        self.console.clear()
 
     def rename_selected_step(self):
         if self.selected_step_index is None or self.selected_step_index >= len(self.steps):
@@ -680,42 +322,9 @@ class TestCaseFrame:
                 step.frame.config(text=step_data["name"])
             step.step_type.set(step_data["type"])
             step.show_fields()
+            step.set_run_settings(step_data)
             
-            # Load other fields first
-            for key, widget in step.details.items():
-                if key == "from_files" or key == "from":
-                    continue  # Handle these separately for Copy File steps
-                value = step_data["details"].get(key)
-                if value is not None:
-                    if isinstance(widget, ttk.Combobox):
-                        widget.set(value)
-                    elif isinstance(widget, tk.Entry):
-                        widget.delete(0, tk.END)
-                        widget.insert(0, str(value))
-            
-            # Handle from_files separately for Copy File step type
-            if step_data["type"] == "Copy File" and "from_files" in step_data["details"]:
-                from_files_data = step_data["details"]["from_files"]
-                if isinstance(from_files_data, list):
-                    from_files_list = from_files_data
-                else:
-                    # Handle string or other formats
-                    from_files_list = [str(from_files_data)]
-                
-                step.details["from_files"] = from_files_list
-                # Update the "from" entry field with the file list
-                if "from" in step.details and isinstance(step.details["from"], tk.Entry):
-                    step.details["from"].delete(0, tk.END)
-                    step.details["from"].insert(0, "; ".join(from_files_list))
-
-            if step_data["type"] == "Check Database Entry":
-                for idx, col in enumerate(step_data["details"].get("columns", [])):
-                    if idx >= len(step.column_entries):
-                        step.add_column_entry()
-                    name_entry, op_entry, val_entry = step.column_entries[idx]
-                    name_entry.insert(0, col.get("column", ""))
-                    op_entry.set(col.get("operator", "="))
-                    val_entry.insert(0, col.get("value", ""))
+            step.set_details(step_data["details"])
 
             self.steps.append(step)
 
@@ -744,659 +353,127 @@ class TestCaseFrame:
         self.apply_filters()
 
 
-    def run(self):
+    def run(self, plan=None, pools=None, parallel_steps=None, cancel_token=None, fail_fast=None,
+            step_cache=None, carry_over=None, fixtures=None, step_priority=None, process_pool=None,
+            journal=None):
+        """
+        Run the test case on a worker thread, or in a worker process of process_pool
+
+        Args:
+            plan: Pre-compiled CasePlan; compiled from the widgets if omitted,
+                  which must then happen on the Tk thread
+            pools: Optional ResourcePools shared by a parallel run
+            parallel_steps: Run independent steps concurrently; read from the
+                  "Parallel Steps" checkbox if omitted (Tk thread only)
+            cancel_token: Optional CancellationToken of a Run All
+            fail_fast: Optional FailFastPolicy (read from config.ini if omitted)
+            step_cache: Optional StepCache of a Run All; a single run uses
+                  its own when [step_cache] is enabled in config.ini
+            carry_over: Optional step number -> previous step result for
+                  the steps a Rerun Failed does not execute again
+            fixtures: Optional SuiteFixtures for the Use Fixture steps
+            step_priority: Optional step number -> start priority of
+                  independent steps (see failure_ordering)
+            process_pool: Optional CaseProcessPool of a process-isolated
+                  Run All Parallel; fixtures must have run already
+            journal: Optional RunJournal of a Run All (see run_journal)
+
+        Returns:
+            concurrent.futures.Future: Resolves to the structured case result
+        """
+        if plan is None:
+            plan = compile_case(self.name, self.get_data())
+        if parallel_steps is None:
+            parallel_steps = self.parallel_steps_var.get()
+        self.last_plan = plan
+        self.last_result = "Pending"
+        own_cache = step_cache is None
+        if own_cache:
+            step_cache = load_step_cache()
+        fail_fast = fail_fast or load_fail_fast()
+        # A fresh ${CASE_DIR} per run when [sandbox] is enabled in config.ini
+        sandboxes = load_case_sandboxes()
+        on_step = self._step_finished
+        on_step_start = None
+        if journal is not None:
+            def on_step(step_result):
+                journal.step_finished(plan.name, step_result)
+                self._step_finished(step_result)
+
+            def on_step_start(index):
+                journal.step_started(plan.name, index)
+        if process_pool is None:
+            runner = CaseRunner(plan, output=self.console.write, pools=pools, parallel_steps=parallel_steps,
+                                cancel_token=cancel_token, fail_fast=fail_fast,
+                                step_timeout=load_default_step_timeout(), step_cache=step_cache,
+                                carry_over=carry_over, fixtures=fixtures, step_priority=step_priority,
+                                on_step=on_step, on_step_start=on_step_start, sandboxes=sandboxes)
+        else:
+            # ⏹ Stop cancels just this case, as CaseRunner.cancel() does
+            runner = CancellationToken(parent=cancel_token)
+        self.runner = runner
+        future = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+
         def execute():
-            import shutil
             try:
-                import pyodbc  # type: ignore
-            except ImportError:
-                self.output.insert(tk.END, "❌ pyodbc is not installed. Install it and retry.\n")
-                self.last_result = "FAIL"
-                return
-            from test_step import load_db_config
-            from datetime import datetime, timedelta
-            self.output.delete("1.0", tk.END)
-            self.output.insert(tk.END, f"▶ Running test case: {self.name}\n")
-            success = True
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            log_lines = [f"[{timestamp}] Running {self.name}"]
-            
-            # Initialize HTML report - will build proper structure at the end
-            html_report = []
-            
-            # Track execution metrics
-            total_steps = len(self.steps)
-            executed_steps = 0
-            skipped_steps = 0
-            
-            # Initialize condition handler
-            condition_handler = ConditionHandler()
-            condition_handler.reset_history()
-
-            for i, step in enumerate(self.steps, 1):
-                try:
-                    step_data = step.get_step_data()
-                    run_condition = step_data.get("run_condition", "Always")
-                    category = step_data.get("category", "General")
-                    step_name = step_data.get('name', f'Step {i}')
-                    target_step_str = step_data.get("target_step", "")
-                    
-                    # Parse target step number if provided
-                    target_step = None
-                    if target_step_str and target_step_str.strip():
-                        try:
-                            target_step = int(target_step_str.strip())
-                        except ValueError:
-                            pass
-                    
-                    # Check conditional execution using ConditionHandler
-                    should_run, skip_reason = condition_handler.should_run_step(i, run_condition, total_steps, target_step)
-                    
-                    if not should_run:
-                        msg = f"⏭ Step {i}: {step_name} [{category}]: SKIPPED - {skip_reason}"
-                        self.output.insert(tk.END, msg + "\n")
-                        log_lines.append(f"[{datetime.now()}] {msg}")
-                        html_report.append(f"<li style='color: #888;'>{msg}</li>")
-                        skipped_steps += 1
-                        
-                        # Record skipped step in history
-                        condition_handler.record_step_result(i, step_name, None, was_skipped=True)
-                        continue
-                    
-                    executed_steps += 1
-                    step_start_time = time.time()
-                    
-                    delay = int(step_data["details"].get("step_delay", 0))
-                    if delay > 0:
-                        msg = f"⏱ Waiting {delay} seconds before Step {i}"
-                        self.output.insert(tk.END, msg + "\n")
-                        self.output.update()
-                        time.sleep(delay)
-                        log_lines.append(f"[{datetime.now()}] {msg}")
-
-                    msg = f"➡ Step {i}: {step_name} [{category}]: {step_data['type']}"
-                    self.output.insert(tk.END, msg + "\n")
-                    details = step_data["details"]
-                    log_lines.append(f"[{datetime.now()}] {msg}")
-                    passed = True
-
-                    # Check if this is a new modular step type
-                    modular_step_types = [
-                        "Move File", "Delete File/Folder", "Rename File", "Create Directory",
-                        "Check File Exists", "Compare Files", "Extract Archive", "Wait for File",
-                        "Run Command", "Start Process", "Stop Process", "Check Process Running",
-                        "Check Disk Space", "Check Memory"
-                    ]
-                    
-                    if step_data["type"] in modular_step_types:
-                        try:
-                            from step_types.step_executor import StepExecutor
-                            success_result, message, output = StepExecutor.execute_step(step_data["type"], details)
-                            
-                            icon = "✅" if success_result else "❌"
-                            msg = f"{icon} {message}"
-                            self.output.insert(tk.END, msg + "\n")
-                            
-                            if output and output != message:
-                                self.output.insert(tk.END, f"Output:\n{output}\n")
-                            
-                            log_lines.append(f"[{datetime.now()}] {msg}")
-                            if output and output != message:
-                                log_lines.append(f"[{datetime.now()}] Output: {output}")
-                            
-                            passed = success_result
-                        except ImportError as e:
-                            msg = f"❌ Module import failed: {str(e)}. Install required dependencies."
-                            self.output.insert(tk.END, msg + "\n")
-                            log_lines.append(f"[{datetime.now()}] {msg}")
-                            passed = False
-                        except Exception as e:
-                            msg = f"❌ Step execution error: {str(e)}"
-                            self.output.insert(tk.END, msg + "\n")
-                            log_lines.append(f"[{datetime.now()}] {msg}")
-                            passed = False
-                    
-                    elif step_data["type"] == "Copy File":
-                        from_files = details.get("from_files", [])
-                        # Also check the "from" entry field for manually typed paths
-                        from_entry = details.get("from", "")
-                        
-                        # If from_files list is empty but entry has text, use that
-                        if not from_files and from_entry:
-                            # Split by semicolon or newline for multiple files
-                            from_files = [f.strip() for f in from_entry.replace('\n', ';').split(';') if f.strip()]
-                        
-                        dest = details.get("to", "")
-                        
-                        if not from_files:
-                            msg = f"❌ No source files specified"
-                            passed = False
-                            self.output.insert(tk.END, msg + "\n")
-                            log_lines.append(f"[{datetime.now()}] {msg}")
-                        elif not dest:
-                            msg = f"❌ No destination path specified"
-                            passed = False
-                            self.output.insert(tk.END, msg + "\n")
-                            log_lines.append(f"[{datetime.now()}] {msg}")
-                        else:
-                            # Validate destination directory exists
-                            if not os.path.exists(dest):
-                                msg = f"❌ Destination path does not exist: {dest}"
-                                passed = False
-                                self.output.insert(tk.END, msg + "\n")
-                                log_lines.append(f"[{datetime.now()}] {msg}")
-                            elif not os.path.isdir(dest):
-                                msg = f"❌ Destination path is not a directory: {dest}"
-                                passed = False
-                                self.output.insert(tk.END, msg + "\n")
-                                log_lines.append(f"[{datetime.now()}] {msg}")
-                            else:
-                                # Copy each file with validation
-                                for src in from_files:
-                                    src = src.strip()
-                                    if not src:
-                                        continue
-                                    
-                                    if not os.path.exists(src):
-                                        msg = f"❌ Source path does not exist: {src}"
-                                        passed = False
-                                    elif not os.path.isfile(src):
-                                        msg = f"❌ Source path is not a file: {src}"
-                                        passed = False
-                                    else:
-                                        try:
-                                            shutil.copy(src, dest)
-                                            msg = f"✅ Copied '{os.path.basename(src)}' from '{src}' to '{dest}'"
-                                        except PermissionError as e:
-                                            msg = f"❌ Permission denied copying '{src}': {e}"
-                                            passed = False
-                                        except Exception as e:
-                                            msg = f"❌ Failed to copy '{src}': {e}"
-                                            passed = False
-                                    
-                                    self.output.insert(tk.END, msg + "\n")
-                                    log_lines.append(f"[{datetime.now()}] {msg}")
-
-
-
-                    elif step_data["type"] == "Check Log File":
-                        path = details.get("log_file_path")
-                        log_type = details.get("log_type", "").lower()
-                        search = details.get("search", "").strip().lower()
-                        search = search.encode('unicode_escape').decode().lower()
-                        log_delay = int(details.get("delay", 0))
-                        duration = int(details.get("duration", 0))  # in minutes
-                        custom_format = details.get("timestamp_format")  # optional override
-
-                        timestamp_patterns = [
-                            (r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}", "%Y-%m-%d %H:%M:%S,%f"),  # <-- Add this
-                            (r"^\d{2}\.\d{2}\.\d{4} \d{2}:\d{2}:\d{2}\.\d{3}", "%d.%m.%Y %H:%M:%S.%f"),
-                            (r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}", "%Y-%m-%d %H:%M:%S.%f"),
-                            (r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}(?=\s|$)", "%Y-%m-%d %H:%M:%S.%f"),
-                            (r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", "%Y-%m-%d %H:%M:%S"),
-                            (r"^\d{2}-\d{2}-\d{4} \d{2}:\d{2}:\d{2}", "%d-%m-%Y %H:%M:%S"),
-                            (r"^\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}", "%d/%m/%Y %H:%M:%S"),
-                            (r"^\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}", "%Y/%m/%d %H:%M:%S"),
-                            (r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}", "%Y-%m-%d %H:%M"),
-                        ]
-
-                        if custom_format:
-                            timestamp_patterns.insert(0, (r"^.*", custom_format))  # allow full line parsing
-
-                        if log_delay > 0:
-                            msg = f"⏳ Waiting {log_delay}s before log check"
-                            self.output.insert(tk.END, msg + "\n")
-                            self.output.update()
-                            time.sleep(log_delay)
-                            log_lines.append(f"[{datetime.now()}] {msg}")
-
-                        if not os.path.exists(path):
-                            msg = f"❌ Log file not found: {path}"
-                            self.output.insert(tk.END, msg + "\n")
-                            log_lines.append(f"[{datetime.now()}] {msg}")
-                            passed = False
-                        else:
-                            now = datetime.now()
-                            time_threshold = now - timedelta(minutes=duration)
-                            matched = []
-
-                            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                                lines = f.readlines()
-
-                            for line in lines:
-                                log_time = None
-                                for pattern, fmt in timestamp_patterns:
-                                    match = re.match(pattern, line)
-                                    if match:
-                                        timestamp_str = match.group()
-                                        try:
-                                            if "%f" in fmt and "," in timestamp_str:
-                                                timestamp_str = timestamp_str.replace(",", ".")
-                                            log_time = datetime.strptime(timestamp_str, fmt)
-                                            break
-                                        except ValueError:
-                                            continue
-
-                                if not log_time:
-                                    continue
-
-                                # Time-based filter
-                                if duration > 0 and log_time < time_threshold:
-                                    continue
-
-                                # Case-insensitive match checks
-                                normalized_line = line.lower()
-
-                                # Log type filter
-                                if log_type and not re.search(rf"\b{re.escape(log_type.lower())}\b", normalized_line):
-                                    continue
-
-                                # Normalize inputs to avoid escape issues
-                                # Normalize slashes
-                                normalized_line = line.strip().lower().replace("\\", "/").replace("//", "/")
-                                normalized_search = search.strip().lower().replace("\\", "/").replace("//", "/")
-
-                                print("Searching for:", repr(normalized_search))
-                                print("In log line:", repr(normalized_line))
-
-                                if normalized_search and normalized_search not in normalized_line:
-                                    continue
-
-                                matched.append(line)
-
-                                # if duration == 0 or log_time >= time_threshold:
-                                #     if (log_type in line.lower()) and (search in line.lower() if search else True):
-                                #         matched.append(line)
-
-                            if matched:
-                                msg = f"✅ Found {len(matched)} matching log lines (last {duration} min). Last 3:"
-                                passed = True
-                            else:
-                                msg = "❌ No entries found that match the search parameters.."
-                                passed = False
-
-                            self.output.insert(tk.END, msg + "\n")
-                            log_lines.append(f"[{datetime.now()}] {msg}")
-                            for line in matched[-3:]:
-                                self.output.insert(tk.END, f"   ➤ {line.strip()}\n")
-
-                    elif step_data["type"] == "Check Database Entry":
-                        config = load_db_config()
-                        if not config:
-                            msg = "❌ DB config not loaded"
-                            passed = False
-                        else:
-                            conn = pyodbc.connect(
-                                f"DRIVER={{SQL Server}};SERVER={config['server']};DATABASE={config['database']};"
-                                f"UID={config['username']};PWD={config['password']}"
-                            )
-                            cursor = conn.cursor()
-                            where = " AND ".join(
-                                f"{entry['column']} {entry['operator']} '{entry['value']}'" for entry in
-                                details.get("columns", []))
-                            sql = f"SELECT COUNT(*) FROM {details['table']} WHERE {where}"
-                            msg = f"🧾 Executing SQL: {sql}"
-                            self.output.insert(tk.END, msg + "\n")
-                            log_lines.append(f"[{datetime.now()}] {msg}")
-                            cursor.execute(sql)
-                            count = cursor.fetchone()[0]
-                            if count > 0:
-                                msg = f"✅ Found {count} matching rows."
-                            else:
-                                msg = "❌ No matching records."
-                                passed = False
-                            self.output.insert(tk.END, msg + "\n")
-                            log_lines.append(f"[{datetime.now()}] {msg}")
-                            cursor.close()
-                            conn.close()
-
-                    # Calculate execution time for this step
-                    step_end_time = time.time()
-                    step_execution_time = step_end_time - step_start_time
-                    step.execution_time = step_execution_time
-                    step_result = "PASS" if passed else "FAIL"
-                    step.last_result = step_result
-                    
-                    # Record step result in condition handler
-                    condition_handler.record_step_result(i, step_name, step_result, was_skipped=False)
-                    
-                    result_msg = f"{'✔️' if passed else '❌'} Step {i}: {step_name} [{category}] {'passed' if passed else 'failed'} ({step_execution_time:.2f}s)"
-                    self.output.insert(tk.END, result_msg + "\n")
-                    
-                    # Cucumber-style step entry for HTML table
-                    status_icon = '✓' if passed else '✗'
-                    status_color = '#10b981' if passed else '#ef4444'
-                    status_bg = '#f0fdf4' if passed else '#fef2f2'
-                    html_report.append(f"""
-                        <tr style='background: {status_bg}; border-left: 4px solid {status_color};'>
-                            <td style='padding: 12px; font-weight: 600;'>Step {i}</td>
-                            <td style='padding: 12px;'>{step_name}</td>
-                            <td style='padding: 12px; text-align: center;'>
-                                <span style='display: inline-block; padding: 4px 12px; border-radius: 4px; background: {status_color}; color: white; font-weight: 600;'>
-                                    {status_icon} {'PASSED' if passed else 'FAILED'}
-                                </span>
-                            </td>
-                            <td style='padding: 12px; text-align: center; font-weight: 600;'>{step_execution_time:.2f}s</td>
-                            <td style='padding: 12px; text-align: center;'><span style='padding: 4px 8px; background: #f3f4f6; border-radius: 4px; font-size: 12px;'>{category}</span></td>
-                        </tr>
-                    """)
-                    log_lines.append(f"[{datetime.now()}] {result_msg}")
-                    self.output.update()
-                    if not passed:
-                        success = False
-
-                except Exception as e:
-                    step_end_time = time.time()
-                    step_execution_time = step_end_time - step_start_time if 'step_start_time' in locals() else 0
-                    step.execution_time = step_execution_time
-                    step.last_result = "ERROR"
-                    executed_steps += 1
-                    step_name = step.get_step_data().get('name', f'Step {i}')
-                    
-                    # Record error result in condition handler
-                    condition_handler.record_step_result(i, step_name, "ERROR", was_skipped=False)
-                    
-                    msg = f"❌ Error in Step {i}: {step_name}: {e} ({step_execution_time:.2f}s)"
-                    self.output.insert(tk.END, msg + "\n")
-                    
-                    # Cucumber-style error entry
-                    category = step.get_step_data().get('category', 'General')
-                    html_report.append(f"""
-                        <tr style='background: #fef2f2; border-left: 4px solid #dc2626;'>
-                            <td style='padding: 12px; font-weight: 600;'>Step {i}</td>
-                            <td style='padding: 12px;'>{step_name}</td>
-                            <td style='padding: 12px; text-align: center;'>
-                                <span style='display: inline-block; padding: 4px 12px; border-radius: 4px; background: #dc2626; color: white; font-weight: 600;'>
-                                    ⚠ ERROR
-                                </span>
-                            </td>
-                            <td style='padding: 12px; text-align: center; font-weight: 600;'>{step_execution_time:.2f}s</td>
-                            <td style='padding: 12px; text-align: center;'><span style='padding: 4px 8px; background: #f3f4f6; border-radius: 4px; font-size: 12px;'>{category}</span></td>
-                        </tr>
-                        <tr style='background: #fef2f2;'>
-                            <td colspan='5' style='padding: 8px 12px; color: #dc2626; font-size: 13px; border-left: 4px solid #dc2626;'>
-                                <strong>Error Details:</strong> {str(e)}
-                            </td>
-                        </tr>
-                    """)
-                    log_lines.append(f"[{datetime.now()}] {msg}")
-                    success = False
-
-            # Calculate comprehensive metrics
-            total_execution_time = sum(step.execution_time for step in self.steps if hasattr(step, 'execution_time'))
-            passed_steps = sum(1 for s in self.steps if hasattr(s, 'last_result') and s.last_result == 'PASS')
-            failed_steps = sum(1 for s in self.steps if hasattr(s, 'last_result') and s.last_result == 'FAIL')
-            error_steps = sum(1 for s in self.steps if hasattr(s, 'last_result') and s.last_result == 'ERROR')
-            
-            # Calculate category breakdown
-            category_stats = {}
-            for step in self.steps:
-                step_data = step.get_step_data()
-                cat = step_data.get('category', 'General')
-                if cat not in category_stats:
-                    category_stats[cat] = {'passed': 0, 'failed': 0, 'skipped': 0, 'total': 0}
-                category_stats[cat]['total'] += 1
-                if hasattr(step, 'last_result'):
-                    if step.last_result == 'PASS':
-                        category_stats[cat]['passed'] += 1
-                    elif step.last_result in ['FAIL', 'ERROR']:
-                        category_stats[cat]['failed'] += 1
+                self.console.clear()
+                if process_pool is None:
+                    result = runner.run()
                 else:
-                    category_stats[cat]['skipped'] += 1
-            
-            # Calculate pass rate
-            pass_rate = (passed_steps / executed_steps * 100) if executed_steps > 0 else 0
-            
-            # Find slowest steps
-            step_times = [(s.get_step_data().get('name', f'Step {i+1}'), s.execution_time) 
-                         for i, s in enumerate(self.steps) if hasattr(s, 'execution_time')]
-            slowest_steps = sorted(step_times, key=lambda x: x[1], reverse=True)[:3]
-            
-            # Generate execution summary
-            final_msg = f"\n{'✅ PASSED' if success else '❌ FAILED'}"
-            summary = f"\n📊 Execution Summary:\n"
-            summary += f"   • Total Steps: {total_steps}\n"
-            summary += f"   • Executed: {executed_steps} | Passed: {passed_steps} | Failed: {failed_steps} | Errors: {error_steps}\n"
-            summary += f"   • Skipped: {skipped_steps}\n"
-            summary += f"   • Pass Rate: {pass_rate:.1f}%\n"
-            summary += f"   • Total Time: {total_execution_time:.2f}s | Avg: {total_execution_time/executed_steps:.2f}s/step\n"
-            
-            self.output.insert(tk.END, final_msg + "\n")
-            self.output.insert(tk.END, summary)
-            
-            # Build complete HTML structure with proper order: Banner -> Summary -> Steps Table -> Metrics
-            complete_html = []
-            
-            # 1. Cucumber-style status banner (at top)
-            status_bg = '#5cb85c' if success else '#d9534f'
-            complete_html.append(f"""
-            <div class='cucumber-banner' style='background: {status_bg}; padding: 25px; margin: 30px 0; border-radius: 8px; color: white; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
-                <div style='display: flex; justify-content: space-between; align-items: center;'>
-                    <div>
-                        <h2 style='margin: 0; font-size: 28px; font-weight: 600;'>{'✓' if success else '✗'} Feature: {self.name}</h2>
-                        <p style='margin: 8px 0 0 0; opacity: 0.95; font-size: 15px;'>Scenario executed on {datetime.now().strftime("%Y-%m-%d at %H:%M:%S")}</p>
-                    </div>
-                    <div class='stats-badge' style='text-align: right;'>
-                        <div style='font-size: 42px; font-weight: bold;'>{pass_rate:.0f}%</div>
-                        <div style='font-size: 13px; opacity: 0.9; text-transform: uppercase; letter-spacing: 1px;'>Success Rate</div>
-                    </div>
-                </div>
-            </div>
-            
-            <!-- JUnit-style summary bar -->
-            <div class='junit-summary' style='display: flex; gap: 0; border-radius: 8px; overflow: hidden; margin: 20px 0; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
-                <div style='flex: 1; background: #5cb85c; color: white; padding: 20px; text-align: center;'>
-                    <div style='font-size: 32px; font-weight: bold;'>{passed_steps}</div>
-                    <div style='font-size: 12px; text-transform: uppercase; letter-spacing: 1px; margin-top: 5px;'>Passed</div>
-                </div>
-                <div style='flex: 1; background: #d9534f; color: white; padding: 20px; text-align: center;'>
-                    <div style='font-size: 32px; font-weight: bold;'>{failed_steps}</div>
-                    <div style='font-size: 12px; text-transform: uppercase; letter-spacing: 1px; margin-top: 5px;'>Failed</div>
-                </div>
-                <div style='flex: 1; background: #f0ad4e; color: white; padding: 20px; text-align: center;'>
-                    <div style='font-size: 32px; font-weight: bold;'>{error_steps}</div>
-                    <div style='font-size: 12px; text-transform: uppercase; letter-spacing: 1px; margin-top: 5px;'>Errors</div>
-                </div>
-                <div style='flex: 1; background: #777; color: white; padding: 20px; text-align: center;'>
-                    <div style='font-size: 32px; font-weight: bold;'>{skipped_steps}</div>
-                    <div style='font-size: 12px; text-transform: uppercase; letter-spacing: 1px; margin-top: 5px;'>Skipped</div>
-                </div>
-                <div style='flex: 1; background: #5bc0de; color: white; padding: 20px; text-align: center;'>
-                    <div style='font-size: 32px; font-weight: bold;'>{total_steps}</div>
-                    <div style='font-size: 12px; text-transform: uppercase; letter-spacing: 1px; margin-top: 5px;'>Total</div>
-                </div>
-            </div>
-            
-            <!-- Cucumber-style Steps Table -->
-            <div class='cucumber-steps-table' style='margin: 30px 0;'>
-                <h3 style='color: #333; font-size: 20px; margin-bottom: 20px; border-bottom: 2px solid #e0e0e0; padding-bottom: 10px;'>
-                    📋 Scenario Steps Details
-                </h3>
-                <table style='width: 100%; border-collapse: separate; border-spacing: 0; box-shadow: 0 2px 8px rgba(0,0,0,0.08); border-radius: 8px; overflow: hidden; background: white;'>
-                    <thead>
-                        <tr style='background: linear-gradient(to right, #4a5568, #2d3748); color: white;'>
-                            <th style='padding: 15px; text-align: left; font-weight: 600; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px; width: 10%;'>Step</th>
-                            <th style='padding: 15px; text-align: left; font-weight: 600; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px; width: 40%;'>Given/When/Then</th>
-                            <th style='padding: 15px; text-align: center; font-weight: 600; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px; width: 15%;'>Status</th>
-                            <th style='padding: 15px; text-align: center; font-weight: 600; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px; width: 15%;'>Duration</th>
-                            <th style='padding: 15px; text-align: center; font-weight: 600; font-size: 13px; text-transform: uppercase; letter-spacing: 0.5px; width: 20%;'>Category</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """)
-            
-            # Add all step rows
-            complete_html.extend(html_report)
-            
-            complete_html.append("""</tbody></table></div>""")
-            complete_html.append(f"""
-            
-            <!-- JUnit-style visual progress bar -->
-            <div style='margin: 25px 0;'>
-                <h3 style='color: #333; font-size: 18px; margin-bottom: 15px;'>Test Execution Progress</h3>
-                <div style='display: flex; height: 40px; border-radius: 8px; overflow: hidden; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
-                    <div style='flex: {passed_steps}; background: #10b981; display: flex; align-items: center; justify-content: center; color: white; font-weight: 600; font-size: 14px;'>
-                        {passed_steps if passed_steps > 0 else ''}
-                    </div>
-                    <div style='flex: {failed_steps}; background: #ef4444; display: flex; align-items: center; justify-content: center; color: white; font-weight: 600; font-size: 14px;'>
-                        {failed_steps if failed_steps > 0 else ''}
-                    </div>
-                    <div style='flex: {error_steps}; background: #f59e0b; display: flex; align-items: center; justify-content: center; color: white; font-weight: 600; font-size: 14px;'>
-                        {error_steps if error_steps > 0 else ''}
-                    </div>
-                    <div style='flex: {skipped_steps}; background: #9ca3af; display: flex; align-items: center; justify-content: center; color: white; font-weight: 600; font-size: 14px;'>
-                        {skipped_steps if skipped_steps > 0 else ''}
-                    </div>
-                </div>
-                <div style='display: flex; justify-content: space-between; margin-top: 10px; font-size: 13px; color: #6b7280;'>
-                    <span>✓ Passed: {passed_steps}</span>
-                    <span>✗ Failed: {failed_steps}</span>
-                    <span>⚠ Errors: {error_steps}</span>
-                    <span>⊘ Skipped: {skipped_steps}</span>
-                </div>
-            </div>
-            
-            <!-- Execution Time Analysis -->
-            <div style='margin-top: 25px; padding: 20px; background: white; border-radius: 12px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);'>
-                <h3 style='margin-top: 0; color: #1f2937;'>⏱️ Execution Time Analysis</h3>
-                <div style='display: flex; justify-content: space-between; margin-bottom: 15px;'>
-                    <div>
-                        <div style='font-size: 14px; color: #6b7280;'>Total Duration</div>
-                        <div style='font-size: 24px; font-weight: bold; color: #3b82f6;'>{total_execution_time:.2f}s</div>
-                    </div>
-                    <div>
-                        <div style='font-size: 14px; color: #6b7280;'>Average per Step</div>
-                        <div style='font-size: 24px; font-weight: bold; color: #3b82f6;'>{total_execution_time/executed_steps if executed_steps > 0 else 0:.2f}s</div>
-                    </div>
-                    <div>
-                        <div style='font-size: 14px; color: #6b7280;'>Executed Steps</div>
-                        <div style='font-size: 24px; font-weight: bold; color: #3b82f6;'>{executed_steps}/{total_steps}</div>
-                    </div>
-                </div>
-                
-                <h4 style='color: #1f2937; margin-top: 20px;'>🐌 Slowest Steps</h4>
-                <ul style='list-style: none; padding: 0;'>
-            """)
-            
-            for step_name, step_time in slowest_steps:
-                complete_html.append(f"<li style='padding: 8px; background: #f9fafb; margin: 5px 0; border-radius: 6px;'>{step_name}: <strong>{step_time:.2f}s</strong></li>")
-            
-            complete_html.append(f"""
-                </ul>
-            </div>
-            
-            <!-- Category Breakdown -->
-            <div style='margin-top: 25px; padding: 20px; background: white; border-radius: 12px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);'>
-                <h3 style='margin-top: 0; color: #1f2937;'>📂 Category Breakdown</h3>
-                <table style='width: 100%; border-collapse: collapse;'>
-                    <thead>
-                        <tr style='background: #f3f4f6;'>
-                            <th style='padding: 10px; text-align: left; border-bottom: 2px solid #e5e7eb;'>Category</th>
-                            <th style='padding: 10px; text-align: center; border-bottom: 2px solid #e5e7eb;'>Total</th>
-                            <th style='padding: 10px; text-align: center; border-bottom: 2px solid #e5e7eb;'>Passed</th>
-                            <th style='padding: 10px; text-align: center; border-bottom: 2px solid #e5e7eb;'>Failed</th>
-                            <th style='padding: 10px; text-align: center; border-bottom: 2px solid #e5e7eb;'>Skipped</th>
-                            <th style='padding: 10px; text-align: center; border-bottom: 2px solid #e5e7eb;'>Success Rate</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """)
-            
-            for category, stats in sorted(category_stats.items()):
-                executed_in_cat = stats['total'] - stats['skipped']
-                success_rate_cat = (stats['passed'] / executed_in_cat * 100) if executed_in_cat > 0 else 0
-                rate_color = '#10b981' if success_rate_cat >= 80 else '#f59e0b' if success_rate_cat >= 50 else '#ef4444'
-                complete_html.append(f"""
-                    <tr style='border-bottom: 1px solid #e5e7eb;'>
-                        <td style='padding: 10px;'><strong>{category}</strong></td>
-                        <td style='padding: 10px; text-align: center;'>{stats['total']}</td>
-                        <td style='padding: 10px; text-align: center; color: #10b981;'>{stats['passed']}</td>
-                        <td style='padding: 10px; text-align: center; color: #ef4444;'>{stats['failed']}</td>
-                        <td style='padding: 10px; text-align: center; color: #6b7280;'>{stats['skipped']}</td>
-                        <td style='padding: 10px; text-align: center;'><span style='color: {rate_color}; font-weight: bold;'>{success_rate_cat:.0f}%</span></td>
-                    </tr>
-                """)
-            
-            complete_html.append(f"""
-                    </tbody>
-                </table>
-            </div>
-            """)
-            
-            log_lines.append(f"[{datetime.now()}] {final_msg}")
-            log_lines.append(f"[{datetime.now()}] {summary}")
-            self.last_result = "PASS" if success else "FAIL"
-
-            safe_name = re.sub(r'[^a-zA-Z0-9_\-]', '_', self.name)
-            log_path = os.path.join(REPORT_OUTPUT_FOLDER, f"log_{safe_name}.txt")
-            html_path = os.path.join(REPORT_OUTPUT_FOLDER, f"report_{safe_name}.html")
-
-            with open(log_path, "w", encoding="utf-8") as log_file:
-                log_file.write("\n".join(log_lines))
-
-            try:
-                html_template = f"""
-                <!DOCTYPE html>
-                <html lang="en">
-                <head>
-                    <meta charset="UTF-8">
-                    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                    <title>Test Report - {self.name}</title>
-                    <style>
-                        * {{ box-sizing: border-box; margin: 0; padding: 0; }}
-                        body {{ 
-                            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-                            background: #f9fafb;
-                            padding: 40px 20px;
-                            line-height: 1.6;
-                            color: #1f2937;
-                        }}
-                        .container {{ max-width: 1200px; margin: 0 auto; }}
-                        h2, h3, h4 {{ margin-bottom: 15px; }}
-                        ul {{ margin: 15px 0; padding-left: 0; }}
-                        li {{ 
-                            padding: 12px 15px; 
-                            margin: 8px 0; 
-                            border-radius: 8px; 
-                            background: white;
-                            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                            list-style: none;
-                        }}
-                        @media print {{
-                            body {{ background: white; }}
-                            .no-print {{ display: none; }}
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <div class="container">
-                        {"\n".join(html_report)}
-                    </div>
-                </body>
-                </html>
-                """
-                with open(html_path, "w", encoding="utf-8") as html_file:
-                    html_file.write(html_template)
-                    # Store report data with metadata for accurate combined report generation
-                    report_data = {
-                        'html': "".join(complete_html),
-                        'name': self.name,
-                        'passed_steps': passed_steps,
-                        'failed_steps': failed_steps,
-                        'total_steps': total_steps,
-                        'execution_time': total_execution_time,
-                        'success': success
-                    }
-                    combined_report_data.append(report_data)
-                    
-                    # Generate combined report immediately after individual test execution
-                    save_combined_html()
-
+                    try:
+                        result = process_pool.submit(
+                            plan, output=self.console.write, on_step=on_step, cancel_token=runner,
+                            parallel_steps=parallel_steps, abort_on_critical=fail_fast.abort_case_on_critical,
+                            step_timeout=load_default_step_timeout(), incremental=step_cache is not None,
+                            carry_over=carry_over, step_priority=step_priority, fixtures=fixtures,
+                            sandbox=sandboxes is not None, on_step_start=on_step_start).result()
+                    finally:
+                        runner.detach()
+                if own_cache and step_cache is not None:
+                    step_cache.save()
+                if journal is not None:
+                    journal.case_finished(result)
+                if cancel_token is None:
+                    # A Run All records all of its results once at the end
+                    last_run.record_results([result])
+                for step, step_result in zip(self.steps, result['steps']):
+                    step.execution_time = step_result['execution_time']
+                    step.last_result = step_result['result']
+                self.last_result = result['status']
             except Exception as e:
-                self.output.insert(tk.END, f"❌ Failed to write HTML report: {e}\n")
+                self.last_result = "ERROR"
+                self.console.write(f"❌ Test case aborted: {e}\n")
+                future.set_exception(e)
+            else:
+                future.set_result(result)
 
         threading.Thread(target=execute, daemon=True).start()
+        return future
+
+    def _step_finished(self, step_result):
+        """Show a step result as soon as the step has finished (called from the runner)"""
+        if 0 < step_result['index'] <= len(self.steps):
+            step = self.steps[step_result['index'] - 1]
+            step.execution_time = step_result['execution_time']
+            step.last_result = step_result['result']
+
+    def run_single(self):
+        """Run only this test case (▶ Run); the fixtures its Use Fixture steps need run first"""
+        plan = compile_case(self.name, self.get_data())
+        fixtures = None
+        if self.fixture_source is not None and not plan.fixture:
+            fixtures = self.fixture_source()
+        future = self.run(plan, fixtures=fixtures)
+        if fixtures:
+            future.add_done_callback(lambda _: threading.Thread(
+                target=fixtures.run_cleanup, kwargs={"always": False}, daemon=True).start())
+        return future
+
+    def stop(self):
+        """Cancel the running test case, interrupting its current step"""
+        if self.runner is not None:
+            self.runner.cancel("Stopped by user")
 
 
 class TestCaseGUI:
@@ -1577,6 +654,7 @@ class TestCaseGUI:
             background=[("active", self.colors["accent"]), ("!active", self.colors["muted"])])
 
         self.case_frames = {}
+        self.suite_token = None
 
         self.dropdown_var = tk.StringVar()
 
@@ -1601,6 +679,10 @@ class TestCaseGUI:
         ttk.Button(btns, text="📊 Export Reports to Excel", command=self.export_reports_to_excel, style="Ghost.TButton").grid(row=0, column=5, padx=2)
         ttk.Button(btns, text="▶️ Run All Sequential", command=self.run_all_cases, style="Accent.TButton").grid(row=0, column=6, padx=2)
         ttk.Button(btns, text="⚡ Run All Parallel", command=self.run_all_cases_parallel, style="Accent.TButton").grid(row=0, column=7, padx=2)
+        ttk.Button(btns, text="🔁 Rerun Failed", command=self.rerun_failed_cases, style="Accent.TButton").grid(row=0, column=8, padx=2)
+        ttk.Button(btns, text="⏹ Stop All", command=self.stop_all_cases, style="Danger.TButton").grid(row=0, column=9, padx=2)
+        ttk.Button(btns, text="🛰 Run on Daemon", command=self.run_all_cases_on_daemon, style="Ghost.TButton").grid(row=0, column=10, padx=2)
+        ttk.Button(btns, text="⏯ Resume Run", command=self.resume_interrupted_run, style="Ghost.TButton").grid(row=0, column=11, padx=2)
         
         dropdown_frame = ttk.Frame(header, style="Header.TFrame")
         dropdown_frame.pack(side="right", padx=4)
@@ -1624,7 +706,7 @@ class TestCaseGUI:
 
     def new_case(self):
         name = f"TestCase{len(self.case_frames) + 1}"
-        frame = TestCaseFrame(self.case_container, name)
+        frame = TestCaseFrame(self.case_container, name, self.fixtures_for_single_run)
         self.case_frames[name] = frame
         self.update_dropdown()
         self.dropdown.set(name)
@@ -1655,6 +737,7 @@ class TestCaseGUI:
     def delete_case(self):
         name = self.dropdown_var.get()
         if name and messagebox.askyesno("Delete Test Case", f"Delete {name}?"):
+            self.case_frames[name].console.stop()
             self.case_frames[name].frame.destroy()
             del self.case_frames[name]
             self.update_dropdown()
@@ -1680,12 +763,14 @@ class TestCaseGUI:
         try:
             with open(file) as f:
                 data = json.load(f)
+            for frame in self.case_frames.values():
+                frame.console.stop()
             self.case_frames.clear()
             for widget in self.case_container.winfo_children():
                 widget.destroy()
 
             for name, steps in data.items():
-                frame = TestCaseFrame(self.case_container, name)
+                frame = TestCaseFrame(self.case_container, name, self.fixtures_for_single_run)
                 frame.load_data(steps)
                 self.case_frames[name] = frame
 
@@ -1697,27 +782,177 @@ class TestCaseGUI:
         except Exception as e:
             messagebox.showerror("Import Failed", str(e))
 
+    def compile_all_cases(self):
+        """
+        Compile every test case on the Tk thread before a suite run starts
+
+        Returns:
+            list: (frame, plan, parallel_steps) tuples in display order
+        """
+        return [(frame, compile_case(name, frame.get_data()), frame.parallel_steps_var.get())
+                for name, frame in self.case_frames.items()]
+
+    def _suite_fixtures(self, case_plans, suite_token, fail_fast=None, step_cache=None, pools=None):
+        """
+        Prepare the Setup and Cleanup fixtures of a run (see suite_fixtures)
+
+        Args:
+            case_plans: (frame, plan, parallel_steps) tuples from compile_all_cases()
+            suite_token: CancellationToken of the run; Cleanup fixtures ignore it
+
+        Returns:
+            (SuiteFixtures, case_plans without the fixtures)
+        """
+        frames = {plan.name: (frame, parallel_steps) for frame, plan, parallel_steps in case_plans}
+
+        def run_fixture(plan, cleanup):
+            frame, parallel_steps = frames[plan.name]
+            # Cleanup fixtures also run after Stop All
+            token = CancellationToken() if cleanup else suite_token
+            return frame.run(plan, pools, parallel_steps, token, fail_fast, step_cache).result()
+
+        fixtures = SuiteFixtures([plan for _, plan, _ in case_plans], run_fixture)
+        return fixtures, [case for case in case_plans if not case[1].fixture]
+
+    @staticmethod
+    def _failures_first(cases, history):
+        """
+        Order cases by failure probability when [scheduling] order = failures
+
+        Args:
+            cases: (frame, plan, parallel_steps) tuples
+            history: Run history from case_history.load_history()
+
+        Returns:
+            (cases in start order, run order description), or (None, None)
+            when the configured order is the suite order
+        """
+        if load_case_order() != "failures":
+            return None, None
+        by_name = {plan.name: (frame, plan, parallel_steps) for frame, plan, parallel_steps in cases}
+        ordered = likely_failures_first([plan for _, plan, _ in cases], history)
+        return [by_name[plan.name] for plan in ordered], describe_order(ordered, history)
+
+    def fixtures_for_single_run(self):
+        """Return the fixtures for a single ▶ Run; they only run when a Use Fixture step needs them"""
+        case_plans = [case for case in self.compile_all_cases() if case[1].fixture]
+        if not case_plans:
+            return None
+        return self._suite_fixtures(case_plans, CancellationToken(), load_fail_fast())[0]
+
+    def stop_all_cases(self):
+        """Cancel the running Run All: current steps are interrupted, the rest is skipped"""
+        if self.suite_token is not None:
+            self.suite_token.cancel("Stopped by user")
+
     def run_all_cases(self):
+        self._run_cases_sequential(self.compile_all_cases())
+
+    def rerun_failed_cases(self):
+        """Rerun the cases that did not pass in their last run, keeping the results of their passing steps"""
+        case_plans = self.compile_all_cases()
+        recorded = last_run.load_last_run()
+        previous_results = {plan.name: recorded[plan.name] for _, plan, _ in case_plans if plan.name in recorded}
+        failed = set(last_run.failed_case_names(previous_results,
+                                                [plan.name for _, plan, _ in case_plans if not plan.fixture]))
+        if not failed:
+            messagebox.showinfo("Rerun Failed", "No failed test cases in the last run.")
+            return
+        # The fixtures run again around the rerun cases
+        self._run_cases_sequential([case for case in case_plans if case[1].fixture or case[1].name in failed],
+                                   previous_results)
+
+    def resume_interrupted_run(self):
+        """Continue the last Run All after a crash: skip its finished cases and resume the interrupted ones"""
+        case_plans = self.compile_all_cases()
+        state = resume_state(load_journal(), [plan for _, plan, _ in case_plans],
+                             sandboxed=load_case_sandboxes() is not None)
+        if state is None:
+            messagebox.showinfo("Resume Run", "Nothing to resume: the last run finished.")
+            return
+        finished, remaining, carry_over = state
+        # The fixtures run again around the remaining cases
+        self._run_cases_sequential([case for case in case_plans if case[1].fixture or case[1].name in remaining],
+                                   finished, carry_over)
+
+    def _run_cases_sequential(self, case_plans, previous_results=None, resumed=None):
+        """
+        Run test cases one after another on a background thread
+
+        Args:
+            case_plans: (frame, plan, parallel_steps) tuples from compile_all_cases();
+                        Setup fixtures among them run first, Cleanup fixtures last
+            previous_results: For Rerun Failed, the last results of every case,
+                              and for Resume Run, the results of the cases the
+                              interrupted run finished; the combined report
+                              then covers all of them
+            resumed: For Resume Run, case name -> step number -> journaled
+                     result of the steps the interrupted cases finished
+        """
+        suite_token = self.suite_token = CancellationToken()
+        fail_fast = load_fail_fast()
+        step_cache = load_step_cache()
+        journal = load_run_journal(resume=resumed is not None)
+        fixtures, cases = self._suite_fixtures(case_plans, suite_token, fail_fast, step_cache)
+        history = case_history.load_history()
+        ordered, run_order = self._failures_first(cases, history)
+
         def run_all():
-            global combined_report_data
-            combined_report_data = []  # Clear previous data
+            combined_report_data.clear()  # Clear previous data
             start_time = time.time()
-            results = []
-            for name, frame in self.case_frames.items():
-                frame.run()
-                while frame.last_result == "Pending":
-                    time.sleep(0.2)
-                results.append(f"{name}: {frame.last_result}")
+            if journal is not None:
+                journal.start([plan.name for _, plan, _ in ordered or cases])
+            case_results = fixtures.run_setup()
+            results = [f"{result['name']}: {result['status']}" for result in case_results]
+            for frame, plan, parallel_steps in ordered or cases:
+                # Chain the next case as soon as this one completes
+                carry_over = None
+                if resumed is not None and plan.name in resumed:
+                    carry_over = resumed[plan.name]
+                elif previous_results is not None and plan.name in previous_results:
+                    carry_over = last_run.rerun_steps(plan, previous_results[plan.name])
+                try:
+                    result = frame.run(plan, parallel_steps=parallel_steps, cancel_token=suite_token,
+                                       fail_fast=fail_fast, step_cache=step_cache, carry_over=carry_over,
+                                       fixtures=fixtures,
+                                       step_priority=step_priorities(plan, history) if run_order else None,
+                                       journal=journal).result()
+                    fail_fast.case_finished(result, suite_token)
+                    case_results.append(result)
+                    results.append(f"{plan.name}: {result['status']}")
+                except Exception as e:
+                    results.append(f"{plan.name}: ERROR - {e}")
+            for result in fixtures.run_cleanup():
+                case_results.append(result)
+                results.append(f"{result['name']}: {result['status']}")
+            if resumed is not None:
+                # The cases the interrupted run finished belong in the summary
+                rerun = {result['name'] for result in case_results}
+                finished = [result for name, result in previous_results.items() if name not in rerun]
+                case_results = finished + case_results
+                results = [f"{result['name']}: {result['status']}" for result in finished] + results
+            if journal is not None:
+                journal.finish()
+            case_history.record_results(case_results)
+            last_run.record_results(case_results)
+            if step_cache is not None:
+                step_cache.save()
             end_time = time.time()
             total_time = end_time - start_time
             
             summary = "\n".join(results)
+            if run_order:
+                summary += f"\n\n{run_order}"
             summary += f"\n\nTotal execution time: {total_time:.2f}s"
             with open("test_summary.txt", "w") as f:
                 f.write(summary)
             
             # Generate combined HTML report after all tests complete
-            save_combined_html()
+            if previous_results is None:
+                save_combined_html()
+            else:
+                names = dict.fromkeys(list(previous_results) + [result['name'] for result in case_results])
+                save_combined_html(last_run.merged_report_data(previous_results, case_results, list(names)))
             
             messagebox.showinfo("Summary Report", f"✅ Completed test cases (Sequential):\n{summary}\nSaved to test_summary.txt")
 
@@ -1725,46 +960,158 @@ class TestCaseGUI:
     
     def run_all_cases_parallel(self):
         """Run all test cases in parallel for faster execution"""
+        case_plans = self.compile_all_cases()
+        suite_token = self.suite_token = CancellationToken()
+        fail_fast = load_fail_fast()
+        step_cache = load_step_cache()
+        journal = load_run_journal()
+
         def run_parallel():
-            global combined_report_data
-            combined_report_data = []  # Clear previous data
-            import concurrent.futures
+            combined_report_data.clear()  # Clear previous data
             start_time = time.time()
-            results = []
             
-            def run_single_case(name, frame):
-                frame.run()
-                while frame.last_result == "Pending":
-                    time.sleep(0.2)
-                return f"{name}: {frame.last_result}"
+            adaptive, adaptive_settings = load_adaptive_concurrency()
+            controller = None
+            if adaptive:
+                # Cases start as the controller's case limit allows (see adaptive_concurrency)
+                controller = ConcurrencyController(max(1, len(case_plans)), **adaptive_settings)
+            # Bound concurrent step work per resource class for this run
+            pools = ResourcePools(load_pool_sizes(), cpu_processes=load_cpu_processes(),
+                                  observer=controller.observe if controller is not None else None)
+            isolated, process_workers, recycle_after = load_process_isolation()
+            # Cases (not fixtures) run in worker processes when [process_isolation] is enabled
+            process_pool = CaseProcessPool(process_workers, recycle_after) if isolated else None
+            fixtures, cases = self._suite_fixtures(case_plans, suite_token, fail_fast, step_cache, pools)
+            case_results = fixtures.run_setup()
+            results = [f"{result['name']}: {result['status']}" for result in case_results]
+            history = case_history.load_history()
+            ordered, run_order = self._failures_first(cases, history)
+            if ordered is None:
+                # Start the longest cases first so none of them becomes the long tail
+                estimates = estimate_durations([plan for _, plan, _ in cases], history)
+                ordered = sorted(cases, key=lambda case: estimates[case[1].name][0], reverse=True)
+            if journal is not None:
+                journal.start([plan.name for _, plan, _ in ordered])
+
+            def start(frame, plan, parallel_steps):
+                return frame.run(plan, pools, parallel_steps, suite_token, fail_fast, step_cache,
+                                 fixtures=fixtures,
+                                 step_priority=step_priorities(plan, history) if run_order else None,
+                                 process_pool=process_pool, journal=journal)
+
+            def submit(frame, plan, parallel_steps):
+                if controller is None:
+                    return start(frame, plan, parallel_steps)
+                return controller.submit_case(start, frame, plan, parallel_steps)
+
+            conflicts = None
+            scheduler = None
+            if load_resource_conflicts() and len(ordered) > 1:
+                # Cases touching the same paths, processes, tables or Exclusive tags never run together
+                graph = build_conflict_graph([plan for _, plan, _ in ordered])
+                conflicts = describe_conflicts(graph)
+                if any(graph.values()):
+                    scheduler = ConflictScheduler(graph)
+            if controller is not None:
+                controller.start(pools, suite_token)
+            if scheduler is None:
+                futures = {submit(*case): case[1].name for case in ordered}
+            else:
+                futures = {scheduler.submit_case(case[1].name, submit, *case): case[1].name for case in ordered}
             
-            with concurrent.futures.ThreadPoolExecutor(max_workers=len(self.case_frames)) as executor:
-                futures = {executor.submit(run_single_case, name, frame): name 
-                          for name, frame in self.case_frames.items()}
-                
-                for future in concurrent.futures.as_completed(futures):
-                    try:
-                        result = future.result()
-                        results.append(result)
-                    except Exception as e:
-                        case_name = futures[future]
-                        results.append(f"{case_name}: ERROR - {e}")
+            # Wait on real completions instead of polling each case
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    result = future.result()
+                    fail_fast.case_finished(result, suite_token)
+                    case_results.append(result)
+                    results.append(f"{result['name']}: {result['status']}")
+                except Exception as e:
+                    case_name = futures[future]
+                    results.append(f"{case_name}: ERROR - {e}")
+            if process_pool is not None:
+                process_pool.shutdown()
+            if controller is not None:
+                controller.stop()
+            for result in fixtures.run_cleanup():
+                case_results.append(result)
+                results.append(f"{result['name']}: {result['status']}")
+            pools.shutdown()
+            if journal is not None:
+                journal.finish()
+            case_history.record_results(case_results)
+            last_run.record_results(case_results)
+            if step_cache is not None:
+                step_cache.save()
             
             end_time = time.time()
             total_time = end_time - start_time
             
             summary = "\n".join(results)
+            if run_order:
+                summary += f"\n\n{run_order}"
+            if conflicts:
+                summary += f"\n\n{conflicts}"
+            if controller is not None:
+                summary += f"\n\n{describe_timeline(controller.timeline)}"
             summary += f"\n\nTotal execution time (Parallel): {total_time:.2f}s"
             with open("test_summary_parallel.txt", "w") as f:
                 f.write(summary)
             
-            # Generate combined HTML report after all tests complete
-            save_combined_html()
+            # Generate combined HTML report after all tests complete; cases run in
+            # worker processes only come back through their results
+            save_combined_html([result['report'] for result in case_results if result.get('report')],
+                               controller.timeline if controller is not None else None)
             
             messagebox.showinfo("Summary Report", f"✅ Completed test cases (Parallel):\n{summary}\nSaved to test_summary_parallel.txt")
         
         threading.Thread(target=run_parallel, daemon=True).start()
     
+    def run_all_cases_on_daemon(self):
+        """Run all test cases in parallel on the runner daemon, which keeps its pools warm between runs"""
+        case_plans = self.compile_all_cases()
+        suite = {plan.name: plan.to_data() for _, plan, _ in case_plans}
+        # The daemon takes one Parallel Steps setting per submission
+        options = {"parallel": True, "parallel_steps": any(parallel_steps for _, _, parallel_steps in case_plans)}
+        frames = {plan.name: frame for frame, plan, _ in case_plans}
+        suite_token = self.suite_token = CancellationToken()
+
+        def on_event(event):
+            frame = frames.get(event.get("case"))
+            if frame is None:
+                return
+            if event["type"] == "output":
+                frame.console.write(event["text"])
+            elif event["type"] == "step":
+                frame._step_finished(event["step"])
+            elif event["type"] == "case":
+                frame.last_result = event["result"]['status']
+
+        def run_on_daemon():
+            try:
+                client = RunnerClient()
+            except RunnerDaemonError as e:
+                messagebox.showerror("Runner Daemon", str(e))
+                return
+            for frame, plan, _ in case_plans:
+                frame.last_plan = plan
+                frame.last_result = "Pending"
+                frame.console.clear()
+            suite_token.add_callback(client.cancel)
+            start_time = time.time()
+            try:
+                finished = client.submit(suite, options, on_event)
+            except (RunnerDaemonError, OSError) as e:
+                messagebox.showerror("Runner Daemon", str(e))
+                return
+            finally:
+                client.close()
+            summary = "\n".join(f"{result['name']}: {result['status']}" for result in finished["results"])
+            summary += f"\n\nTotal execution time (Daemon): {time.time() - start_time:.2f}s"
+            messagebox.showinfo("Summary Report", f"✅ Completed test cases (Runner Daemon):\n{summary}")
+
+        threading.Thread(target=run_on_daemon, daemon=True).start()
+
     def export_reports_to_excel(self):
         """Export test execution reports to Excel"""
         try:
@@ -1818,18 +1165,18 @@ class TestCaseGUI:
                 cell.fill = PatternFill(start_color="10B981", end_color="10B981", fill_type="solid")
                 cell.alignment = Alignment(horizontal="center")
             
-            # Add step details
-            for i, step in enumerate(frame.steps, 1):
-                step_data = step.get_step_data()
+            # Add step details from the plan that produced the results
+            plan = frame.last_plan or compile_case(name, frame.get_data())
+            for i, (step_plan, step) in enumerate(zip(plan.steps, frame.steps), 1):
                 status = getattr(step, 'last_result', 'Not Run')
                 exec_time = getattr(step, 'execution_time', 0)
                 
                 row = [
                     i,
-                    step_data.get('name', f'Step {i}'),
-                    step_data.get('type', 'N/A'),
-                    step_data.get('category', 'General'),
-                    step_data.get('run_condition', 'Always'),
+                    step_plan.name,
+                    step_plan.step_type or 'N/A',
+                    step_plan.category,
+                    step_plan.run_condition,
                     status,
                     f"{exec_time:.2f}"
                 ]
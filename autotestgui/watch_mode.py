@@ -0,0 +1,224 @@
+"""
+Watch Mode
+
+Runs a suite, then keeps watching the files its steps read (Copy File sources,
+Compare Files inputs, archives, log files, ...) and reruns only the cases
+whose inputs changed. Changes are debounced so saving or copying many files
+triggers one run, and the resource pools (including the cpu worker
+processes) stay warm between runs.
+
+File system events come from the optional watchdog package (inotify on
+Linux, ReadDirectoryChangesW on Windows); without it the inputs are polled.
+Setup and Cleanup fixtures (see suite_fixtures) run again around every rerun,
+and a change to the inputs of a Setup fixture reruns the cases using it.
+Either way an input counts as changed only when its size or modification time
+differs from the state recorded after the last run, so files written by the
+cases themselves while they run do not trigger another run.
+"""
+import os
+import sys
+import threading
+
+from case_sandbox import CASE_DIR_VARIABLE
+from execution_plan import thaw
+from resource_pools import ResourcePools
+from step_cache import fingerprint_path
+from suite_fixtures import referenced_fixtures, split_fixtures
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from step_types import registry
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+# Seconds the inputs must stay unchanged before a run starts
+DEFAULT_DEBOUNCE = 0.5
+
+# Seconds between checks when watchdog is not installed
+POLL_INTERVAL = 1.0
+
+# Detail fields holding the files a built-in step type reads; other step types
+# are covered by their cache_inputs (see StepType)
+INPUT_DETAILS = {
+    "Copy File": ("from_files", "from"),
+    "Compare Files": ("file1", "file2"),
+    "Extract Archive": ("archive_path",),
+    "Check Log File": ("log_file_path",),
+    "Check File Exists": ("path",),
+    "Wait for File": ("file_path",),
+}
+
+
+def _split_paths(value):
+    if isinstance(value, (list, tuple)):
+        return [str(path).strip() for path in value]
+    return [path.strip() for path in str(value or "").replace("\n", ";").split(";")]
+
+
+def case_inputs(plan):
+    """
+    Collect the paths the steps of a case read
+
+    Args:
+        plan: CasePlan
+
+    Returns:
+        set: Absolute paths
+    """
+    paths = set()
+    for step in plan.steps:
+        if step.step_type in INPUT_DETAILS:
+            for key in INPUT_DETAILS[step.step_type]:
+                paths.update(_split_paths(step.details.get(key)))
+            continue
+        registered = registry.get_step_type(step.step_type)
+        if registered is not None and registered.cache_inputs is not None:
+            try:
+                paths.update(registered.cache_inputs(registered.prepare(thaw(step.details))))
+            except Exception:
+                pass
+    # Files in ${CASE_DIR} are written by the case itself
+    return {os.path.abspath(path) for path in paths if path and CASE_DIR_VARIABLE not in path}
+
+
+def _watch_root(path):
+    """Return (directory, recursive) to subscribe to for changes of a path"""
+    if os.path.isdir(path):
+        return path, True
+    # Files are watched through their folder, so they can also be (re)created
+    parent = os.path.dirname(path)
+    while parent and not os.path.isdir(parent) and os.path.dirname(parent) != parent:
+        parent = os.path.dirname(parent)
+    return parent, False
+
+
+class SuiteWatcher:
+    """Reruns the cases of a suite whose input files change"""
+
+    def __init__(self, runner, debounce=DEFAULT_DEBOUNCE, output=None):
+        """
+        Args:
+            runner: SuiteRunner holding every case of the suite
+            debounce: Seconds the inputs must stay unchanged before a run
+            output: Callable receiving console text (defaults to stdout)
+        """
+        self.runner = runner
+        self.fixtures, self.plans = split_fixtures(runner.plans)
+        self.debounce = debounce
+        self._output = output or sys.stdout.write
+        self.inputs = {plan.name: case_inputs(plan) for plan in self.fixtures + self.plans}
+        self._paths = sorted(set().union(*self.inputs.values()))
+        self._wake = threading.Event()
+        self._observer = None
+        # Input state after the last run
+        self._state = {}
+
+    def _snapshot(self):
+        return {path: fingerprint_path(path) for path in self._paths}
+
+    def _subscribe(self):
+        """(Re)subscribe to the folders of the inputs; folders may appear between runs"""
+        if Observer is None:
+            return
+        if self._observer is None:
+            self._observer = Observer()
+            self._observer.start()
+        self._observer.unschedule_all()
+        handler = FileSystemEventHandler()
+        handler.on_any_event = lambda event: self._wake.set()
+        roots = {}
+        for path in self._paths:
+            root, recursive = _watch_root(path)
+            if root:
+                roots[root] = roots.get(root, False) or recursive
+        for root, recursive in roots.items():
+            try:
+                self._observer.schedule(handler, root, recursive=recursive)
+            except OSError:
+                pass
+
+    def _wait_for_changes(self):
+        """
+        Block until inputs change and stay unchanged for the debounce period
+
+        Returns:
+            set: Changed paths, or None once the run is cancelled
+        """
+        token = self.runner.cancel_token
+        while True:
+            self._wake.wait(None if self._observer is not None else POLL_INTERVAL)
+            self._wake.clear()
+            if token.cancelled:
+                return None
+            snapshot = self._snapshot()
+            if snapshot == self._state:
+                continue
+            # Debounce: wait until a check finds nothing new
+            while not token.wait(self.debounce):
+                latest = self._snapshot()
+                if latest == snapshot:
+                    break
+                snapshot = latest
+            if token.cancelled:
+                return None
+            return {path for path in self._paths if snapshot[path] != self._state.get(path)}
+
+    def _affected(self, changed):
+        """Return the cases to rerun for a set of changed paths"""
+        fixtures = {plan.name for plan in self.fixtures if self.inputs[plan.name] & changed}
+        return [plan for plan in self.plans
+                if self.inputs[plan.name] & changed or referenced_fixtures(plan) & fixtures]
+
+    def _run(self, plans, parallel, workers, engine, pools):
+        self.runner.plans = self.fixtures + plans
+        self.runner.run(parallel=parallel, workers=workers, engine=engine, pools=pools)
+        self._state = self._snapshot()
+        self._subscribe()
+
+    def watch(self, parallel=False, workers=None, engine="threads"):
+        """
+        Run the whole suite once, then rerun affected cases until the runner is cancelled
+
+        Args:
+            parallel: Run cases concurrently
+            workers: Maximum number of concurrent cases in parallel mode
+            engine: "threads", "async" or "processes" (see suite_runner.ENGINES)
+        """
+        runner = self.runner
+        # Wake the wait below on Ctrl+C
+        runner.cancel_token.add_callback(self._wake.set)
+        pools = ResourcePools(runner.pool_sizes, cpu_processes=runner.cpu_processes) if parallel else None
+        if pools is not None:
+            self._output(f"Resource pools: {pools.describe()} (kept warm between runs)\n")
+        try:
+            self._run(self.plans, parallel, workers, engine, pools)
+            unwatched = [plan.name for plan in self.plans if not self.inputs[plan.name]]
+            method = "file system events" if self._observer is not None else f"polling every {POLL_INTERVAL:g}s"
+            self._output(f"\n👀 Watching {len(self._paths)} input path(s) of "
+                         f"{len(self.plans) - len(unwatched)} case(s) ({method}); press Ctrl+C to stop\n")
+            if unwatched:
+                self._output(f"   Cases without file inputs are not rerun: {', '.join(unwatched)}\n")
+
+            while not runner.cancel_token.cancelled:
+                changed = self._wait_for_changes()
+                if changed is None:
+                    break
+                affected = self._affected(changed)
+                if not affected:
+                    # Only inputs of fixtures no case uses changed
+                    self._state = self._snapshot()
+                    continue
+                self._output(f"\n🔄 Changed: {', '.join(sorted(changed))}\n"
+                             f"   Rerunning: {', '.join(plan.name for plan in affected)}\n")
+                self._run(affected, parallel, workers, engine, pools)
+                if not runner.cancel_token.cancelled:
+                    self._output("\n👀 Waiting for changes...\n")
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join()
+            if pools is not None:
+                pools.shutdown()
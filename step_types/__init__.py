@@ -1,5 +1,8 @@
 # Step Types Module
 from .file_operations import FileOperations
 from .system_operations import SystemOperations
+from .registry import StepType, register, get_step_type
+from .cancellation import CancellationToken, Cancelled, current_token
 
-__all__ = ['FileOperations', 'SystemOperations']
+__all__ = ['FileOperations', 'SystemOperations', 'StepType', 'register', 'get_step_type',
+           'CancellationToken', 'Cancelled', 'current_token']
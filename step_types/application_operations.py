@@ -0,0 +1,242 @@
+"""
+Application Testing Operations Module
+Handles copying input files, searching application logs and checking
+database entries
+"""
+import json
+import os
+import re
+import shutil
+from datetime import datetime, timedelta
+
+from step_types.cancellation import current_token
+
+
+TIMESTAMP_PATTERNS = [
+    (r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}", "%Y-%m-%d %H:%M:%S,%f"),
+    (r"^\d{2}\.\d{2}\.\d{4} \d{2}:\d{2}:\d{2}\.\d{3}", "%d.%m.%Y %H:%M:%S.%f"),
+    (r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}", "%Y-%m-%d %H:%M:%S.%f"),
+    (r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}(?=\s|$)", "%Y-%m-%d %H:%M:%S.%f"),
+    (r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", "%Y-%m-%d %H:%M:%S"),
+    (r"^\d{2}-\d{2}-\d{4} \d{2}:\d{2}:\d{2}", "%d-%m-%Y %H:%M:%S"),
+    (r"^\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}", "%d/%m/%Y %H:%M:%S"),
+    (r"^\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}", "%Y/%m/%d %H:%M:%S"),
+    (r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}", "%Y-%m-%d %H:%M"),
+]
+
+
+# (path, modification time) -> parsed config, so long-lived processes (the
+# runner daemon) re-read db_config.json only when it changes
+_db_config_cache = {}
+
+
+def load_db_config(path="db_config.json"):
+    """
+    Load the SQL Server connection settings
+
+    Returns:
+        dict or None: The config, or None if it could not be loaded
+    """
+    try:
+        key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+        config = _db_config_cache.get(key)
+        if config is None:
+            with open(path) as f:
+                config = json.load(f)
+            _db_config_cache.clear()
+            _db_config_cache[key] = config
+        # Callers get their own copy
+        return dict(config)
+    except Exception:
+        return None
+
+
+class ApplicationOperations:
+    """Handles application-level checks for test automation
+
+    Each operation takes the step details and a log(msg, console_only=False)
+    callable, logs its own progress and returns (success, message, output)
+    with message None.
+    """
+
+    @staticmethod
+    def copy_files(details, log):
+        """
+        Copy the source files of a Copy File step into a directory
+        Args:
+            details: from_files (list) or from (";"-separated paths), to
+            log: Console/log writer
+        """
+        from_files = details.get("from_files", [])
+        # Also check the "from" entry field for manually typed paths
+        from_entry = details.get("from", "")
+
+        # If from_files list is empty but entry has text, use that
+        if not from_files and from_entry:
+            # Split by semicolon or newline for multiple files
+            from_files = [f.strip() for f in from_entry.replace('\n', ';').split(';') if f.strip()]
+
+        dest = details.get("to", "")
+
+        if not from_files:
+            log("❌ No source files specified")
+            return False, None, None
+        if not dest:
+            log("❌ No destination path specified")
+            return False, None, None
+        # Validate destination directory exists
+        if not os.path.exists(dest):
+            log(f"❌ Destination path does not exist: {dest}")
+            return False, None, None
+        if not os.path.isdir(dest):
+            log(f"❌ Destination path is not a directory: {dest}")
+            return False, None, None
+
+        passed = True
+        # Copy each file with validation
+        for src in from_files:
+            src = src.strip()
+            if not src:
+                continue
+
+            if not os.path.exists(src):
+                msg = f"❌ Source path does not exist: {src}"
+                passed = False
+            elif not os.path.isfile(src):
+                msg = f"❌ Source path is not a file: {src}"
+                passed = False
+            else:
+                try:
+                    shutil.copy(src, dest)
+                    msg = f"✅ Copied '{os.path.basename(src)}' from '{src}' to '{dest}'"
+                except PermissionError as e:
+                    msg = f"❌ Permission denied copying '{src}': {e}"
+                    passed = False
+                except Exception as e:
+                    msg = f"❌ Failed to copy '{src}': {e}"
+                    passed = False
+            log(msg)
+        return passed, None, None
+
+    @staticmethod
+    def check_log_file(details, log):
+        """
+        Search a log file for recent lines matching a log type and text
+        Args:
+            details: log_file_path, log_type, search, duration (minutes),
+                     optional timestamp_format
+            log: Console/log writer
+        """
+        path = details.get("log_file_path")
+        log_type = details.get("log_type", "").lower()
+        search = details.get("search", "").strip().lower()
+        search = search.encode('unicode_escape').decode().lower()
+        duration = int(details.get("duration", 0))  # in minutes
+        custom_format = details.get("timestamp_format")  # optional override
+
+        timestamp_patterns = list(TIMESTAMP_PATTERNS)
+        if custom_format:
+            timestamp_patterns.insert(0, (r"^.*", custom_format))  # allow full line parsing
+
+        if not os.path.exists(path):
+            log(f"❌ Log file not found: {path}")
+            return False, None, None
+
+        time_threshold = datetime.now() - timedelta(minutes=duration)
+        normalized_search = search.strip().lower().replace("\\", "/").replace("//", "/")
+        log_type_pattern = re.compile(rf"\b{re.escape(log_type.lower())}\b") if log_type else None
+        matched = []
+
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            lines = f.readlines()
+
+        for line in lines:
+            log_time = None
+            for pattern, fmt in timestamp_patterns:
+                match = re.match(pattern, line)
+                if match:
+                    timestamp_str = match.group()
+                    try:
+                        if "%f" in fmt and "," in timestamp_str:
+                            timestamp_str = timestamp_str.replace(",", ".")
+                        log_time = datetime.strptime(timestamp_str, fmt)
+                        break
+                    except ValueError:
+                        continue
+
+            if not log_time:
+                continue
+
+            # Time-based filter
+            if duration > 0 and log_time < time_threshold:
+                continue
+
+            # Log type filter (case-insensitive)
+            if log_type_pattern and not log_type_pattern.search(line.lower()):
+                continue
+
+            # Normalize slashes to avoid escape issues
+            normalized_line = line.strip().lower().replace("\\", "/").replace("//", "/")
+            if normalized_search and normalized_search not in normalized_line:
+                continue
+
+            matched.append(line)
+
+        if matched:
+            msg = f"✅ Found {len(matched)} matching log lines (last {duration} min). Last 3:"
+            passed = True
+        else:
+            msg = "❌ No entries found that match the search parameters.."
+            passed = False
+
+        log(msg)
+        for line in matched[-3:]:
+            log(f"   ➤ {line.strip()}", console_only=True)
+        return passed, None, None
+
+    @staticmethod
+    def check_database_entry(details, log):
+        """
+        Check that a SQL Server table has rows matching column conditions
+        Args:
+            details: table, columns (list of column/operator/value dicts)
+            log: Console/log writer
+        """
+        try:
+            import pyodbc  # type: ignore
+        except ImportError:
+            log("❌ pyodbc is not installed. Install it and retry.")
+            return False, None, None
+
+        config = load_db_config()
+        if not config:
+            log("❌ DB config not loaded")
+            return False, None, None
+
+        current_token().raise_if_cancelled()
+        # pyodbc turns on ODBC connection pooling, so within one process
+        # (e.g. the runner daemon) close() keeps the connection for the next step
+        conn = pyodbc.connect(
+            f"DRIVER={{SQL Server}};SERVER={config['server']};DATABASE={config['database']};"
+            f"UID={config['username']};PWD={config['password']}"
+        )
+        try:
+            cursor = conn.cursor()
+            where = " AND ".join(
+                f"{entry['column']} {entry['operator']} '{entry['value']}'" for entry in
+                details.get("columns", []))
+            sql = f"SELECT COUNT(*) FROM {details['table']} WHERE {where}"
+            log(f"🧾 Executing SQL: {sql}")
+            # Cancelling the run aborts the running statement on the server
+            with current_token().on_cancel(cursor.cancel):
+                cursor.execute(sql)
+                count = cursor.fetchone()[0]
+            cursor.close()
+        finally:
+            conn.close()
+
+        if count > 0:
+            log(f"✅ Found {count} matching rows.")
+            return True, None, None
+        log("❌ No matching records.")
+        return False, None, None
@@ -0,0 +1,145 @@
+"""
+Asynchronous Operations Module
+Event-loop versions of the step operations that mostly wait: file polling and
+commands/processes that are waited for. Waiting is done with asyncio timers
+and asyncio subprocesses, so no thread is held while a step waits.
+"""
+import asyncio
+import locale
+import os
+import time
+
+from step_types.cancellation import Cancelled, current_token
+from step_types.system_operations import kill_process_tree
+
+
+class AsyncOperations:
+    """Handles waiting file and process operations on an asyncio event loop"""
+
+    @staticmethod
+    async def wait_for_file(file_path, timeout=60, should_exist=True, check_interval=1, cancel_token=None):
+        """
+        Wait for file to appear or disappear
+        Args:
+            file_path: Path to monitor
+            timeout: Maximum wait time in seconds
+            should_exist: If True, wait for file to appear; if False, wait for it to disappear
+            check_interval: Time between checks in seconds
+            cancel_token: CancellationToken ending the wait early (defaults to the current one)
+        Returns: (success: bool, message: str)
+        """
+        token = cancel_token or current_token()
+        try:
+            file_path = file_path.strip()
+            start_time = time.time()
+
+            while (time.time() - start_time) < timeout:
+                exists = os.path.exists(file_path)
+
+                if should_exist and exists:
+                    elapsed = time.time() - start_time
+                    return True, f"File appeared after {elapsed:.2f}s: {file_path}"
+                elif not should_exist and not exists:
+                    elapsed = time.time() - start_time
+                    return True, f"File disappeared after {elapsed:.2f}s: {file_path}"
+
+                if await token.wait_async(check_interval):
+                    return False, f"Cancelled while waiting for file: {file_path}"
+
+            # Timeout reached
+            if should_exist:
+                return False, f"Timeout: File did not appear within {timeout}s: {file_path}"
+            else:
+                return False, f"Timeout: File did not disappear within {timeout}s: {file_path}"
+
+        except Exception as e:
+            return False, f"Wait for file failed: {str(e)}"
+
+    @staticmethod
+    async def _wait_process(process, timeout, token):
+        """
+        Wait for a process, killing it on timeout or cancellation
+
+        Returns:
+            (stdout, stderr); raises Cancelled or asyncio.TimeoutError
+        """
+        communicate = asyncio.ensure_future(process.communicate())
+        cancelled = asyncio.ensure_future(token.wait_async())
+        try:
+            done, _ = await asyncio.wait([communicate, cancelled], timeout=timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            cancelled.cancel()
+        if communicate in done:
+            return communicate.result()
+        kill_process_tree(process.pid)
+        await communicate
+        token.raise_if_cancelled()
+        raise asyncio.TimeoutError()
+
+    @staticmethod
+    async def run_command(command, timeout=None, working_dir=None):
+        """
+        Execute shell/PowerShell command
+        Args:
+            command: Command to execute
+            timeout: Command timeout in seconds
+            working_dir: Working directory for command
+        Returns: (success: bool, message: str, output: str)
+        """
+        try:
+            command = command.strip()
+
+            process = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=working_dir
+            )
+            stdout, stderr = await AsyncOperations._wait_process(process, timeout, current_token())
+
+            encoding = locale.getpreferredencoding(False)
+            output = (f"STDOUT:\n{stdout.decode(encoding, errors='replace')}"
+                      f"\n\nSTDERR:\n{stderr.decode(encoding, errors='replace')}")
+
+            if process.returncode == 0:
+                return True, f"Command executed successfully (exit code: 0)", output
+            else:
+                return False, f"Command failed with exit code: {process.returncode}", output
+
+        except asyncio.TimeoutError:
+            return False, f"Command timed out after {timeout}s", ""
+        except Cancelled as e:
+            return False, f"Command cancelled: {e}", ""
+        except Exception as e:
+            return False, f"Command execution failed: {str(e)}", ""
+
+    @staticmethod
+    async def start_process(executable_path, arguments="", working_dir=None, timeout=None):
+        """
+        Launch application/process and wait for it to complete
+        Args:
+            executable_path: Path to executable
+            arguments: Command line arguments
+            working_dir: Working directory
+            timeout: Maximum wait time in seconds
+        Returns: (success: bool, message: str)
+        """
+        try:
+            executable_path = executable_path.strip()
+
+            if not os.path.exists(executable_path):
+                return False, f"Executable not found: {executable_path}"
+
+            # Same command line as SystemOperations.start_process
+            command = f'"{executable_path}" {arguments}'
+            process = await asyncio.create_subprocess_shell(command, cwd=working_dir)
+            await AsyncOperations._wait_process(process, timeout, current_token())
+            return True, f"Process completed with exit code: {process.returncode}"
+
+        except asyncio.TimeoutError:
+            return False, f"Process timed out after {timeout}s"
+        except Cancelled as e:
+            return False, f"Process cancelled: {e}"
+        except Exception as e:
+            return False, f"Start process failed: {str(e)}"
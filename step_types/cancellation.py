@@ -0,0 +1,156 @@
+"""
+Cancellation Tokens
+A CancellationToken is shared by the work of one run (a suite, a test case)
+and stops it cooperatively: sleeps and polls wake up at once and running
+subprocesses are killed instead of being left to finish or time out.
+
+The runners make the token of the running case current while a step
+executes, so operations pick it up through current_token() and step type
+executors keep their (args, log) signature.
+"""
+import asyncio
+import contextlib
+import contextvars
+import threading
+
+
+class Cancelled(Exception):
+    """Raised when work is stopped through its CancellationToken"""
+
+
+class CancellationToken:
+    """Thread-safe, one-shot cancellation signal"""
+
+    def __init__(self, parent=None):
+        """
+        Args:
+            parent: Optional token; cancelling it cancels this token as well
+        """
+        self.reason = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = {}
+        self._next_handle = 0
+        self._parent = parent
+        self._parent_handle = None
+        if parent is not None:
+            self._parent_handle = parent.add_callback(lambda: self.cancel(parent.reason))
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self, reason="Cancelled"):
+        """
+        Cancel the token and run its callbacks
+
+        Returns:
+            bool: False if the token was already cancelled
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+        return True
+
+    def add_callback(self, callback):
+        """
+        Call callback() once when the token is cancelled (at once if it already is)
+
+        Returns:
+            Handle for remove_callback(), or None if the callback already ran
+        """
+        with self._lock:
+            if not self._event.is_set():
+                handle = self._next_handle
+                self._next_handle += 1
+                self._callbacks[handle] = callback
+                return handle
+        callback()
+        return None
+
+    def remove_callback(self, handle):
+        if handle is not None:
+            with self._lock:
+                self._callbacks.pop(handle, None)
+
+    @contextlib.contextmanager
+    def on_cancel(self, callback):
+        """Run callback() if the token is cancelled while the block executes"""
+        handle = self.add_callback(callback)
+        try:
+            yield
+        finally:
+            self.remove_callback(handle)
+
+    def wait(self, timeout=None):
+        """
+        Sleep until the token is cancelled or the timeout passes
+
+        Returns:
+            bool: True if the token is cancelled
+        """
+        return self._event.wait(timeout)
+
+    async def wait_async(self, timeout=None):
+        """Event-loop version of wait()"""
+        if self.cancelled:
+            return True
+        loop = asyncio.get_running_loop()
+        woken = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: woken.done() or woken.set_result(None))
+
+        with self.on_cancel(wake):
+            await asyncio.wait([woken], timeout=timeout)
+        return self.cancelled
+
+    def sleep(self, seconds):
+        """Sleep for seconds, raising Cancelled as soon as the token is cancelled"""
+        if self.wait(seconds):
+            raise Cancelled(self.reason)
+
+    async def sleep_async(self, seconds):
+        if await self.wait_async(seconds):
+            raise Cancelled(self.reason)
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise Cancelled(self.reason)
+
+    def detach(self):
+        """Stop following the parent token once this token's work is done"""
+        if self._parent is not None:
+            self._parent.remove_callback(self._parent_handle)
+            self._parent = None
+
+
+# Returned by current_token() outside a run; nothing ever cancels it
+_NEVER = CancellationToken()
+
+_current = contextvars.ContextVar("vcb_cancellation_token", default=None)
+
+
+def current_token():
+    """Return the token of the step being executed (a never-cancelled token outside a run)"""
+    token = _current.get()
+    return _NEVER if token is None else token
+
+
+@contextlib.contextmanager
+def use_token(token):
+    """Make token current for the code executed in the block"""
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
@@ -10,6 +10,8 @@ import tarfile
 import time
 from pathlib import Path
 
+from step_types.cancellation import current_token
+
 
 class FileOperations:
     """Handles file and directory operations for test automation"""
@@ -247,7 +249,7 @@ class FileOperations:
             return False, f"Extract archive failed: {str(e)}"
     
     @staticmethod
-    def wait_for_file(file_path, timeout=60, should_exist=True, check_interval=1):
+    def wait_for_file(file_path, timeout=60, should_exist=True, check_interval=1, cancel_token=None):
         """
         Wait for file to appear or disappear
         Args:
@@ -255,8 +257,10 @@ class FileOperations:
             timeout: Maximum wait time in seconds
             should_exist: If True, wait for file to appear; if False, wait for it to disappear
             check_interval: Time between checks in seconds
+            cancel_token: CancellationToken ending the wait early (defaults to the current one)
         Returns: (success: bool, message: str)
         """
+        token = cancel_token or current_token()
         try:
             file_path = file_path.strip()
             start_time = time.time()
@@ -271,7 +275,8 @@ class FileOperations:
                     elapsed = time.time() - start_time
                     return True, f"File disappeared after {elapsed:.2f}s: {file_path}"
                 
-                time.sleep(check_interval)
+                if token.wait(check_interval):
+                    return False, f"Cancelled while waiting for file: {file_path}"
             
             # Timeout reached
             if should_exist:
@@ -0,0 +1,54 @@
+"""
+Suite Fixtures
+A "Use Fixture" step makes a case depend on a suite-level Setup fixture (a
+test case whose steps are all in the Setup category) instead of repeating
+its steps. The fixture runs once per run and every case using it shares the
+outcome.
+
+The runners make the fixtures of the run current while a step executes, the
+same way as the cancellation token, so the step type executor keeps its
+(args, log) signature.
+"""
+import contextlib
+import contextvars
+
+# Step type name of the built-in step that references a fixture
+USE_FIXTURE = "Use Fixture"
+
+_current = contextvars.ContextVar("vcb_suite_fixtures", default=None)
+
+
+def current_fixtures():
+    """Return the fixtures of the running suite, or None outside a suite run"""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def use_fixtures(fixtures):
+    """Make fixtures current for the code executed in the block"""
+    reset = _current.set(fixtures)
+    try:
+        yield fixtures
+    finally:
+        _current.reset(reset)
+
+
+def use_fixture(args, log):
+    """
+    Execute a "Use Fixture" step
+
+    Args:
+        args: {"fixture": name of the Setup fixture}
+        log: Step log writer
+
+    Returns:
+        (success: bool, message: str, output: str)
+    """
+    name = args["fixture"]
+    if not name:
+        return False, "No fixture name given", ""
+    fixtures = current_fixtures()
+    if fixtures is None:
+        msg = f"Fixture '{name}' is not available here (fixtures run in suite runs and cannot use other fixtures)"
+        return False, msg, msg
+    return fixtures.use(name, log)
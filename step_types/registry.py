@@ -0,0 +1,168 @@
+"""
+Step Type Registry
+Every step type registers its executor, argument coercion, resource class and
+UI builder once. The runners and the GUI look step types up here instead of
+hard-coding them, and third-party packages can add step types through the
+"vcb.step_types" entry point group without changing this project.
+"""
+import sys
+import threading
+
+# Entry point group scanned for third-party step types. An entry point must
+# resolve to a StepType, a list of StepTypes, or a callable returning either.
+ENTRY_POINT_GROUP = "vcb.step_types"
+
+# Group shown in the step type dropdown when a step type does not name one
+DEFAULT_GROUP = "Custom Steps"
+
+# Kinds of resources a step can declare it touches (see StepType.resources)
+PATH_RESOURCE = "path"
+PROCESS_RESOURCE = "process"
+TABLE_RESOURCE = "table"
+
+_step_types = {}
+_loaded = False
+_loading = False
+# Held while the built-in step types and plugins are registered, so a lookup
+# from another thread never sees a half-filled registry
+_load_lock = threading.RLock()
+
+
+class StepType:
+    """Registration record for one step type"""
+
+    def __init__(self, name, execute, group=DEFAULT_GROUP, coerce=None, resource_class="file_io",
+                 build_ui=None, execute_async=None, cache_inputs=None, resources=None):
+        """
+        Args:
+            name: Step type name shown in the GUI and stored in step data
+            execute: Callable (args, log) -> (success, message, output).
+                     log(msg, console_only=False) writes a line to the console
+                     and the case log; message may be None when the executor
+                     has already logged everything itself
+            group: Dropdown group the step type is listed under
+            coerce: Optional callable turning step details into the args
+                    passed to execute (defaults to a plain dict copy)
+            resource_class: Resource pool the step runs on in parallel runs
+                            (file_io, database, subprocess, cpu or wait)
+            build_ui: Optional callable (fields_frame, details, row) -> next row
+                      creating the detail widgets in the GUI
+            execute_async: Optional coroutine function (args) ->
+                           (success, message, output) used by the async engine
+            cache_inputs: Optional callable (args) -> paths the step reads.
+                          Only step types without side effects that would be
+                          missed when skipped should declare it; their passing
+                          results can then be reused by incremental runs
+            resources: Optional callable (args) -> (kind, name, writes) tuples
+                       naming the paths, processes and database tables the
+                       step touches. Parallel runs do not run two cases at the
+                       same time when one of them writes a resource the other
+                       touches (see resource_conflicts)
+        """
+        self.name = name
+        self.execute = execute
+        self.group = group
+        self.coerce = coerce
+        self.resource_class = resource_class
+        self.build_ui = build_ui
+        self.execute_async = execute_async
+        self.cache_inputs = cache_inputs
+        self.resources = resources
+
+    def prepare(self, details):
+        """Return the executor arguments for a step's details"""
+        if self.coerce is not None:
+            return self.coerce(details)
+        return dict(details)
+
+    def run(self, details, log):
+        """Coerce the details and execute the step"""
+        return self.execute(self.prepare(details), log)
+
+    async def run_async(self, details):
+        """Coerce the details and execute the step on the event loop"""
+        return await self.execute_async(self.prepare(details))
+
+    def __repr__(self):
+        return f"StepType({self.name!r}, group={self.group!r})"
+
+
+def register(step_type):
+    """
+    Register a step type, replacing any step type with the same name
+
+    Returns:
+        StepType: The registered step type
+    """
+    _step_types[step_type.name] = step_type
+    return step_type
+
+
+def get_step_type(name):
+    """Return the registered StepType for a name, or None"""
+    _ensure_loaded()
+    return _step_types.get(name)
+
+
+def step_types():
+    """Return all registered step types in registration order"""
+    _ensure_loaded()
+    return list(_step_types.values())
+
+
+def dropdown_values():
+    """
+    Return the step type dropdown entries: a "── Group ──" header followed by
+    the step types of that group in alphabetical order
+    """
+    groups = {}
+    for step_type in step_types():
+        groups.setdefault(step_type.group, []).append(step_type.name)
+    values = []
+    for group, names in groups.items():
+        values.append(f"── {group} ──")
+        values.extend(sorted(names))
+    return values
+
+
+def _entry_points():
+    from importlib import metadata
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=ENTRY_POINT_GROUP)
+    # Python 3.8/3.9 return a dict of groups
+    return entry_points.get(ENTRY_POINT_GROUP, [])
+
+
+def load_entry_points():
+    """Register the step types published through the entry point group"""
+    for entry_point in _entry_points():
+        try:
+            provided = entry_point.load()
+            if callable(provided) and not isinstance(provided, StepType):
+                provided = provided()
+            if isinstance(provided, StepType):
+                provided = [provided]
+            for step_type in provided:
+                register(step_type)
+        except Exception as e:
+            print(f"⚠ Failed to load step types from '{entry_point.name}': {e}", file=sys.stderr)
+
+
+def _ensure_loaded():
+    """Register the built-in step types and plugins on first use"""
+    global _loaded, _loading
+    if _loaded:
+        return
+    with _load_lock:
+        # _loading stops a plugin that looks up step types while loading from recursing
+        if _loaded or _loading:
+            return
+        _loading = True
+        try:
+            # Importing the executor registers the built-in step types
+            import step_types.step_executor  # noqa: F401
+            load_entry_points()
+        finally:
+            _loaded = True
+            _loading = False
@@ -1,20 +1,233 @@
 """
 Step Executor Module
-Executes different step types and returns results
+Registers the built-in step types and executes steps through the registry
 """
+import functools
 import os
 import sys
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from step_types import registry
+from step_types.application_operations import ApplicationOperations
+from step_types.async_operations import AsyncOperations
 from step_types.file_operations import FileOperations
+from step_types.fixtures import USE_FIXTURE, use_fixture
+from step_types.registry import PATH_RESOURCE, PROCESS_RESOURCE, TABLE_RESOURCE, StepType
 from step_types.system_operations import SystemOperations
 
 
+def _flag(details, key, default):
+    """Read a checkbox value that may still be a Tk variable"""
+    value = details.get(key, default)
+    if hasattr(value, 'get'):
+        value = value.get()
+    return value
+
+
+def _optional_int(value):
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _optional_float(value):
+    try:
+        return float(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _message(operation):
+    """Adapt a (success, message) operation to the (success, message, output) result"""
+    @functools.wraps(operation)
+    def execute(args, log):
+        success, msg = operation(**args)
+        return success, msg, msg
+    return execute
+
+
+async def _message_async(operation):
+    success, msg = await operation
+    return success, msg, msg
+
+
+class _BuiltinStepType(StepType):
+    """Built-in step types report any exception, including bad arguments, as a failed step"""
+
+    def run(self, details, log):
+        try:
+            return super().run(details, log)
+        except Exception as e:
+            return False, f"Step execution error: {str(e)}", str(e)
+
+    async def run_async(self, details):
+        try:
+            return await super().run_async(details)
+        except Exception as e:
+            return False, f"Step execution error: {str(e)}", str(e)
+
+
+def _touches(kind, writes, *names):
+    """Return the resources of one kind a step reads or writes, skipping blank names"""
+    return [(kind, str(name).strip(), writes) for name in names if name and str(name).strip()]
+
+
+def _process_name(executable_path):
+    """Return the process name an executable runs as"""
+    return os.path.basename(str(executable_path or "").strip().strip('"'))
+
+
+def _copy_file_resources(args):
+    sources = args.get("from_files") or str(args.get("from", "")).replace("\n", ";").split(";")
+    if isinstance(sources, str):
+        sources = [sources]
+    return _touches(PATH_RESOURCE, False, *sources) + _touches(PATH_RESOURCE, True, args.get("to", ""))
+
+
+def _ui(builder_name):
+    """Resolve a StepTypeUI builder on first use so headless runs never import Tk"""
+    def build_ui(fields_frame, details, row):
+        from step_types.step_ui_builder import StepTypeUI
+        return getattr(StepTypeUI, builder_name)(fields_frame, details, row)
+    return build_ui
+
+
+def _builtin(name, group, execute, coerce, resource_class, builder_name, execute_async=None,
+             step_type_class=_BuiltinStepType, cache_inputs=None, resources=None):
+    registry.register(step_type_class(
+        name,
+        execute,
+        group=group,
+        coerce=coerce,
+        resource_class=resource_class,
+        build_ui=_ui(builder_name),
+        execute_async=execute_async,
+        cache_inputs=cache_inputs,
+        resources=resources,
+    ))
+
+
+def _command_args(details):
+    command = details.get("command", "")
+    if hasattr(command, 'get'):
+        command = command.get("1.0", "end-1c")
+    return {
+        "command": command,
+        "timeout": _optional_int(details.get("timeout", "30")),
+        "working_dir": details.get("working_dir", "") or None,
+    }
+
+
+def _run_command(args, log):
+    return SystemOperations.run_command(**args)
+
+
+async def _start_process_async(args):
+    if not args["wait"]:
+        # Nothing to wait for
+        return _message(SystemOperations.start_process)(args, None)
+    args = dict(args)
+    del args["wait"]
+    return await _message_async(AsyncOperations.start_process(**args))
+
+
+# File Operations
+_builtin("Compare Files", "File Operations", _message(FileOperations.compare_files),
+         lambda d: {"file1_path": d.get("file1", ""), "file2_path": d.get("file2", ""),
+                    "method": d.get("method", "checksum")},
+         "cpu", "build_compare_files_ui",
+         cache_inputs=lambda args: [args["file1_path"], args["file2_path"]],
+         resources=lambda args: _touches(PATH_RESOURCE, False, args["file1_path"], args["file2_path"]))
+_builtin("Copy File", "File Operations", ApplicationOperations.copy_files,
+         None, "file_io", "build_copy_file_ui", step_type_class=StepType, resources=_copy_file_resources)
+_builtin("Create Directory", "File Operations", _message(FileOperations.create_directory),
+         lambda d: {"path": d.get("path", ""), "create_parents": _flag(d, "create_parents_var", True)},
+         "file_io", "build_create_directory_ui",
+         resources=lambda args: _touches(PATH_RESOURCE, True, args["path"]))
+_builtin("Delete File/Folder", "File Operations", _message(FileOperations.delete_path),
+         lambda d: {"path": d.get("path", ""), "recursive": _flag(d, "recursive_var", False)},
+         "file_io", "build_delete_path_ui",
+         resources=lambda args: _touches(PATH_RESOURCE, True, args["path"]))
+_builtin("Extract Archive", "File Operations", _message(FileOperations.extract_archive),
+         lambda d: {"archive_path": d.get("archive_path", ""), "extract_to": d.get("extract_to", ""),
+                    "archive_type": d.get("archive_type", "auto")},
+         "cpu", "build_extract_archive_ui",
+         # The extracted files are inputs too, so deleting them invalidates the entry
+         cache_inputs=lambda args: [args["archive_path"], args["extract_to"]],
+         resources=lambda args: (_touches(PATH_RESOURCE, False, args["archive_path"])
+                                 + _touches(PATH_RESOURCE, True, args["extract_to"])))
+_builtin("Move File", "File Operations", _message(FileOperations.move_file),
+         lambda d: {"source_path": d.get("from_path", ""), "destination_path": d.get("to_path", "")},
+         "file_io", "build_move_file_ui",
+         resources=lambda args: _touches(PATH_RESOURCE, True, args["source_path"], args["destination_path"]))
+_builtin("Rename File", "File Operations", _message(FileOperations.rename_path),
+         lambda d: {"old_path": d.get("old_path", ""), "new_path": d.get("new_path", "")},
+         "file_io", "build_rename_path_ui",
+         resources=lambda args: _touches(PATH_RESOURCE, True, args["old_path"], args["new_path"]))
+_builtin("Wait for File", "File Operations", _message(FileOperations.wait_for_file),
+         lambda d: {"file_path": d.get("file_path", ""), "timeout": int(d.get("timeout", 60)),
+                    "should_exist": d.get("should_exist", "File to Appear") == "File to Appear"},
+         "wait", "build_wait_for_file_ui",
+         execute_async=lambda args: _message_async(AsyncOperations.wait_for_file(**args)),
+         resources=lambda args: _touches(PATH_RESOURCE, False, args["file_path"]))
+
+# File Validation
+_builtin("Check File Exists", "File Validation", _message(FileOperations.check_path_exists),
+         lambda d: {"path": d.get("path", ""), "should_exist": d.get("should_exist", "Yes") == "Yes"},
+         "file_io", "build_check_path_exists_ui",
+         cache_inputs=lambda args: [args["path"]],
+         resources=lambda args: _touches(PATH_RESOURCE, False, args["path"]))
+
+# System Operations
+_builtin("Check Disk Space", "System Operations", _message(SystemOperations.check_disk_space),
+         lambda d: {"path": d.get("path", "C:/"), "required_gb": _optional_float(d.get("required_gb", ""))},
+         "file_io", "build_check_disk_space_ui")
+_builtin("Check Memory", "System Operations", _message(SystemOperations.check_memory),
+         lambda d: {"required_mb": _optional_float(d.get("required_mb", ""))},
+         "subprocess", "build_check_memory_ui")
+_builtin("Check Process Running", "System Operations", _message(SystemOperations.check_process_running),
+         lambda d: {"process_name": d.get("process_name", ""), "should_run": d.get("should_run", "Yes") == "Yes"},
+         "subprocess", "build_check_process_ui",
+         resources=lambda args: _touches(PROCESS_RESOURCE, False, args["process_name"]))
+_builtin("Run Command", "System Operations", _run_command, _command_args,
+         "subprocess", "build_run_command_ui",
+         execute_async=lambda args: AsyncOperations.run_command(**args),
+         # What a command changes is unknown; its working directory is the best guess
+         resources=lambda args: _touches(PATH_RESOURCE, True, args["working_dir"]))
+_builtin("Start Process", "System Operations", _message(SystemOperations.start_process),
+         lambda d: {"executable_path": d.get("executable", ""), "arguments": d.get("arguments", ""),
+                    "wait": _flag(d, "wait_var", False)},
+         "subprocess", "build_start_process_ui",
+         execute_async=_start_process_async,
+         resources=lambda args: _touches(PROCESS_RESOURCE, True, _process_name(args["executable_path"])))
+_builtin("Stop Process", "System Operations", _message(SystemOperations.stop_process),
+         lambda d: {"process_name": d.get("process_name", "") or None, "pid": _optional_int(d.get("pid", "")),
+                    "force": _flag(d, "force_var", False)},
+         "subprocess", "build_stop_process_ui",
+         resources=lambda args: _touches(PROCESS_RESOURCE, True, args["process_name"]))
+
+# Application Testing
+_builtin("Check Database Entry", "Application Testing", ApplicationOperations.check_database_entry,
+         None, "database", "build_check_database_ui", step_type_class=StepType,
+         resources=lambda args: _touches(TABLE_RESOURCE, False, args.get("table", "")))
+_builtin("Check Log File", "Application Testing", ApplicationOperations.check_log_file,
+         None, "cpu", "build_check_log_file_ui", step_type_class=StepType,
+         resources=lambda args: _touches(PATH_RESOURCE, False, args.get("log_file_path", "")))
+
+# Fixtures
+# Runs on the case thread (see CaseRunner._dispatch_step); the fixture's own
+# steps take the pool slots
+_builtin(USE_FIXTURE, "Fixtures", use_fixture,
+         lambda d: {"fixture": str(d.get("fixture", "")).strip()},
+         "wait", "build_use_fixture_ui")
+
+
 class StepExecutor:
     """Executes test steps and returns results"""
-    
+
     @staticmethod
     def execute_step(step_type, details):
         """
@@ -25,161 +238,34 @@ class StepExecutor:
         Returns:
             (success: bool, message: str, output: str)
         """
+        registered = registry.get_step_type(step_type)
+        if registered is None:
+            return False, f"Unknown step type: {step_type}", ""
+
+        # Collect the lines of step types that log their own progress
+        lines = []
+        try:
+            success, msg, output = registered.run(details, lambda text, console_only=False: lines.append(text))
+        except Exception as e:
+            return False, f"Step execution error: {str(e)}", str(e)
+        if msg is None:
+            msg = output = "\n".join(lines)
+        return success, msg, output
+
+    @staticmethod
+    async def execute_step_async(step_type, details):
+        """
+        Execute a test step on the event loop where its type supports it
+        Args:
+            step_type: Type of step to execute
+            details: Dictionary of step details/parameters
+        Returns:
+            (success: bool, message: str, output: str)
+        """
+        registered = registry.get_step_type(step_type)
+        if registered is None or registered.execute_async is None:
+            return StepExecutor.execute_step(step_type, details)
         try:
-            # File Operations
-            if step_type == "Move File":
-                success, msg = FileOperations.move_file(
-                    details.get("from_path", ""),
-                    details.get("to_path", "")
-                )
-                return success, msg, msg
-            
-            elif step_type == "Delete File/Folder":
-                recursive = details.get("recursive_var", False)
-                if hasattr(recursive, 'get'):
-                    recursive = recursive.get()
-                success, msg = FileOperations.delete_path(
-                    details.get("path", ""),
-                    recursive=recursive
-                )
-                return success, msg, msg
-            
-            elif step_type == "Rename File":
-                success, msg = FileOperations.rename_path(
-                    details.get("old_path", ""),
-                    details.get("new_path", "")
-                )
-                return success, msg, msg
-            
-            elif step_type == "Create Directory":
-                create_parents = details.get("create_parents_var", True)
-                if hasattr(create_parents, 'get'):
-                    create_parents = create_parents.get()
-                success, msg = FileOperations.create_directory(
-                    details.get("path", ""),
-                    create_parents=create_parents
-                )
-                return success, msg, msg
-            
-            elif step_type == "Check File Exists":
-                should_exist = details.get("should_exist", "Yes") == "Yes"
-                success, msg = FileOperations.check_path_exists(
-                    details.get("path", ""),
-                    should_exist=should_exist
-                )
-                return success, msg, msg
-            
-            elif step_type == "Compare Files":
-                success, msg = FileOperations.compare_files(
-                    details.get("file1", ""),
-                    details.get("file2", ""),
-                    method=details.get("method", "checksum")
-                )
-                return success, msg, msg
-            
-            elif step_type == "Extract Archive":
-                success, msg = FileOperations.extract_archive(
-                    details.get("archive_path", ""),
-                    details.get("extract_to", ""),
-                    archive_type=details.get("archive_type", "auto")
-                )
-                return success, msg, msg
-            
-            elif step_type == "Wait for File":
-                should_exist = details.get("should_exist", "File to Appear") == "File to Appear"
-                timeout = int(details.get("timeout", 60))
-                success, msg = FileOperations.wait_for_file(
-                    details.get("file_path", ""),
-                    timeout=timeout,
-                    should_exist=should_exist
-                )
-                return success, msg, msg
-            
-            # System Operations
-            elif step_type == "Run Command":
-                command = details.get("command", "")
-                if hasattr(command, 'get'):
-                    command = command.get("1.0", "end-1c")
-                
-                timeout = details.get("timeout", "30")
-                try:
-                    timeout = int(timeout) if timeout else None
-                except:
-                    timeout = None
-                
-                working_dir = details.get("working_dir", "") or None
-                
-                success, msg, output = SystemOperations.run_command(
-                    command,
-                    timeout=timeout,
-                    working_dir=working_dir
-                )
-                return success, msg, output
-            
-            elif step_type == "Start Process":
-                wait = details.get("wait_var", False)
-                if hasattr(wait, 'get'):
-                    wait = wait.get()
-                
-                success, msg = SystemOperations.start_process(
-                    details.get("executable", ""),
-                    arguments=details.get("arguments", ""),
-                    wait=wait
-                )
-                return success, msg, msg
-            
-            elif step_type == "Stop Process":
-                force = details.get("force_var", False)
-                if hasattr(force, 'get'):
-                    force = force.get()
-                
-                pid = details.get("pid", "")
-                pid = int(pid) if pid else None
-                
-                process_name = details.get("process_name", "") or None
-                
-                success, msg = SystemOperations.stop_process(
-                    process_name=process_name,
-                    pid=pid,
-                    force=force
-                )
-                return success, msg, msg
-            
-            elif step_type == "Check Process Running":
-                should_run = details.get("should_run", "Yes") == "Yes"
-                success, msg = SystemOperations.check_process_running(
-                    process_name=details.get("process_name", ""),
-                    should_run=should_run
-                )
-                return success, msg, msg
-            
-            elif step_type == "Check Disk Space":
-                required_gb = details.get("required_gb", "")
-                try:
-                    required_gb = float(required_gb) if required_gb else None
-                except:
-                    required_gb = None
-                
-                success, msg = SystemOperations.check_disk_space(
-                    details.get("path", "C:/"),
-                    required_gb=required_gb
-                )
-                return success, msg, msg
-            
-            elif step_type == "Check Memory":
-                required_mb = details.get("required_mb", "")
-                try:
-                    required_mb = float(required_mb) if required_mb else None
-                except:
-                    required_mb = None
-                
-                success, msg = SystemOperations.check_memory(
-                    required_mb=required_mb
-                )
-                return success, msg, msg
-            
-            else:
-                return False, f"Unknown step type: {step_type}", ""
-        
+            return await registered.run_async(details)
         except Exception as e:
             return False, f"Step execution error: {str(e)}", str(e)
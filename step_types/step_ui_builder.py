@@ -3,7 +3,47 @@ Step Type UI Builder
 Creates UI fields for different step types
 """
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
+
+
+class ColumnEntries:
+    """Editable list of column conditions for the Check Database Entry step
+
+    Stored in the step details under "columns"; get() returns the conditions
+    in the saved format and set() restores them.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.entries = []
+
+    def add(self):
+        row = len(self.entries)
+        col_name = tk.Entry(self.frame, width=15)
+        operator = ttk.Combobox(self.frame, values=["=", "LIKE", ">=", "<=", "<", ">", "!="], width=5, style="Step.TCombobox")
+        operator.set("=")
+        col_value = tk.Entry(self.frame, width=15)
+
+        col_name.grid(row=row, column=0, padx=2, pady=2)
+        operator.grid(row=row, column=1, padx=2, pady=2)
+        col_value.grid(row=row, column=2, padx=2, pady=2)
+
+        self.entries.append((col_name, operator, col_value))
+
+    def get(self):
+        return [
+            {"column": name_entry.get(), "operator": op_entry.get(), "value": val_entry.get()}
+            for name_entry, op_entry, val_entry in self.entries if name_entry.get()
+        ]
+
+    def set(self, columns):
+        for idx, col in enumerate(columns):
+            if idx >= len(self.entries):
+                self.add()
+            name_entry, op_entry, val_entry = self.entries[idx]
+            name_entry.insert(0, col.get("column", ""))
+            op_entry.set(col.get("operator", "="))
+            val_entry.insert(0, col.get("value", ""))
 
 
 class StepTypeUI:
@@ -229,3 +269,87 @@ class StepTypeUI:
         details["required_mb"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
         ttk.Label(fields_frame, text="(leave empty to just report)", style="Step.TLabel").grid(row=row, column=2, sticky='w', padx=5, pady=2)
         return row + 1
+
+    @staticmethod
+    def build_copy_file_ui(fields_frame, details, row):
+        """Build UI for Copy File step"""
+        details["from_files"] = []
+        ttk.Label(fields_frame, text="From Files:", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
+        details["from"] = tk.Entry(fields_frame, width=50)
+        details["from"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
+
+        def browse_files():
+            files = filedialog.askopenfilenames()
+            if files:
+                details["from_files"] = files
+                details["from"].delete(0, tk.END)
+                details["from"].insert(0, ", ".join(files))
+
+        ttk.Button(fields_frame, text="Browse Files", command=browse_files, style="Ghost.TButton").grid(row=row, column=2)
+        row += 1
+
+        ttk.Label(fields_frame, text="To Path:", style="Step.TLabel").grid(row=row, column=0)
+        details["to"] = tk.Entry(fields_frame, width=50)
+        details["to"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
+        return row + 1
+
+    @staticmethod
+    def build_check_log_file_ui(fields_frame, details, row):
+        """Build UI for Check Log File step"""
+        ttk.Label(fields_frame, text="Log Type:", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
+        details["log_type"] = ttk.Combobox(
+            fields_frame, values=["", "L", "M", "H", "DEBUG", "ERROR", "INFO"], state="readonly", style="Step.TCombobox")
+        details["log_type"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
+        row += 1
+
+        ttk.Label(fields_frame, text="Search String:", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
+        details["search"] = tk.Entry(fields_frame, width=100)
+        details["search"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
+        row += 1
+
+        ttk.Label(fields_frame, text="Duration (mins):", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
+        details["duration"] = tk.Entry(fields_frame)
+        details["duration"].insert(0, "60")
+        details["duration"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
+        row += 1
+
+        ttk.Label(fields_frame, text="Wait Before Search (secs):", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
+        details["delay"] = tk.Entry(fields_frame)
+        details["delay"].insert(0, "0")
+        details["delay"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
+        row += 1
+
+        ttk.Label(fields_frame, text="Log File Path:", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
+        details["log_file_path"] = tk.Entry(fields_frame, width=50)
+        details["log_file_path"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
+        return row + 1
+
+    @staticmethod
+    def build_check_database_ui(fields_frame, details, row):
+        """Build UI for Check Database Entry step"""
+        ttk.Label(fields_frame, text="Table Name:", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
+        details["table"] = tk.Entry(fields_frame, width=40)
+        details["table"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
+        row += 1
+
+        columns_frame = ttk.LabelFrame(fields_frame, text="Columns to Check", style="Step.TLabelframe")
+        columns_frame.grid(row=row, column=0, columnspan=2, pady=5)
+        details["columns"] = ColumnEntries(columns_frame)
+        details["columns"].add()
+        row += 1
+
+        add_col_btn = ttk.Button(fields_frame, text="Add Column", command=details["columns"].add, style="Ghost.TButton")
+        add_col_btn.grid(row=row, column=0, columnspan=2)
+        return row + 1
+
+    @staticmethod
+    def build_use_fixture_ui(fields_frame, details, row):
+        """Build UI for Use Fixture step"""
+        ttk.Label(fields_frame, text="Setup Fixture:", style="Step.TLabel").grid(row=row, column=0, sticky='w', padx=5, pady=2)
+        details["fixture"] = tk.Entry(fields_frame, width=40)
+        details["fixture"].grid(row=row, column=1, sticky='w', padx=5, pady=2)
+        row += 1
+
+        ttk.Label(fields_frame, text="(name of a test case whose steps are all Setup steps)",
+                  style="Step.TLabel").grid(row=row, column=0, columnspan=2, sticky='w', padx=5, pady=2)
+        return row + 1
@@ -9,12 +9,46 @@ import time
 import shutil
 from pathlib import Path
 
+from step_types.cancellation import Cancelled, current_token
+
+
+def kill_process_tree(pid):
+    """Kill a process and all of its descendants (a shell and the command it started)"""
+    try:
+        parent = psutil.Process(pid)
+        processes = parent.children(recursive=True) + [parent]
+    except psutil.NoSuchProcess:
+        return
+    for process in processes:
+        try:
+            process.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+
+def _communicate(process, timeout, token):
+    """
+    Wait for a process, killing it when the token is cancelled
+
+    Returns:
+        (stdout, stderr, cancelled); raises subprocess.TimeoutExpired after
+        killing the process on timeout
+    """
+    with token.on_cancel(lambda: kill_process_tree(process.pid)):
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_tree(process.pid)
+            process.communicate()
+            raise
+    return stdout, stderr, token.cancelled
+
 
 class SystemOperations:
     """Handles system and process operations for test automation"""
     
     @staticmethod
-    def run_command(command, shell=True, timeout=None, working_dir=None):
+    def run_command(command, shell=True, timeout=None, working_dir=None, cancel_token=None):
         """
         Execute shell/PowerShell command
         Args:
@@ -22,34 +56,43 @@ class SystemOperations:
             shell: Run in shell context
             timeout: Command timeout in seconds
             working_dir: Working directory for command
+            cancel_token: CancellationToken killing the command (defaults to the current one)
         Returns: (success: bool, message: str, output: str)
         """
+        token = cancel_token or current_token()
         try:
             command = command.strip()
+            token.raise_if_cancelled()
             
-            result = subprocess.run(
+            process = subprocess.Popen(
                 command,
                 shell=shell,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=timeout,
                 cwd=working_dir
             )
+            stdout, stderr, cancelled = _communicate(process, timeout, token)
             
-            output = f"STDOUT:\n{result.stdout}\n\nSTDERR:\n{result.stderr}"
+            output = f"STDOUT:\n{stdout}\n\nSTDERR:\n{stderr}"
             
-            if result.returncode == 0:
+            if cancelled:
+                return False, f"Command cancelled: {token.reason}", output
+            if process.returncode == 0:
                 return True, f"Command executed successfully (exit code: 0)", output
             else:
-                return False, f"Command failed with exit code: {result.returncode}", output
+                return False, f"Command failed with exit code: {process.returncode}", output
         
         except subprocess.TimeoutExpired:
             return False, f"Command timed out after {timeout}s", ""
+        except Cancelled as e:
+            return False, f"Command cancelled: {e}", ""
         except Exception as e:
             return False, f"Command execution failed: {str(e)}", ""
     
     @staticmethod
-    def start_process(executable_path, arguments="", working_dir=None, wait=False, timeout=None):
+    def start_process(executable_path, arguments="", working_dir=None, wait=False, timeout=None,
+                      cancel_token=None):
         """
         Launch application/process
         Args:
@@ -58,8 +101,10 @@ class SystemOperations:
             working_dir: Working directory
             wait: If True, wait for process to complete
             timeout: Timeout if wait=True
+            cancel_token: CancellationToken killing a waited-for process (defaults to the current one)
         Returns: (success: bool, message: str)
         """
+        token = cancel_token or current_token()
         try:
             executable_path = executable_path.strip()
             
@@ -69,13 +114,15 @@ class SystemOperations:
             command = f'"{executable_path}" {arguments}'
             
             if wait:
-                result = subprocess.run(
+                token.raise_if_cancelled()
+                process = subprocess.Popen(
                     command,
                     shell=True,
-                    cwd=working_dir,
-                    timeout=timeout
+                    cwd=working_dir
                 )
-                return True, f"Process completed with exit code: {result.returncode}"
+                if _communicate(process, timeout, token)[2]:
+                    return False, f"Process cancelled: {token.reason}"
+                return True, f"Process completed with exit code: {process.returncode}"
             else:
                 subprocess.Popen(
                     command,
@@ -86,6 +133,8 @@ class SystemOperations:
         
         except subprocess.TimeoutExpired:
             return False, f"Process timed out after {timeout}s"
+        except Cancelled as e:
+            return False, f"Process cancelled: {e}"
         except Exception as e:
             return False, f"Start process failed: {str(e)}"
     
@@ -0,0 +1,26 @@
+"""
+Shared test setup
+
+The modules in autotestgui/ import each other by their bare names, as they do
+when run as scripts, so that folder goes on sys.path next to the project root
+(for step_types).
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "autotestgui"))
+
+
+def pytest_configure(config):
+    # reporting creates TestReports/ in the working directory when imported
+    os.chdir(tempfile.mkdtemp(prefix="vcb-tests-"))
+
+
+def step(name="Step", step_type="Run Command", **fields):
+    """Return a step dict as exported by TestStep.get_step_data()"""
+    data = {"name": name, "type": step_type, "details": fields.pop("details", {})}
+    data.update(fields)
+    return data
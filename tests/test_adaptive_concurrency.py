@@ -0,0 +1,113 @@
+import threading
+import time
+
+import adaptive_concurrency
+from adaptive_concurrency import ConcurrencyController
+from resource_pools import CPU, FILE_IO, WAIT
+
+
+class _FakePools:
+    """Pool sizes and load the controller reads, without any threads"""
+
+    def __init__(self, sizes):
+        self.sizes = dict(sizes)
+        self.loads = {name: (0, 0) for name in sizes}
+
+    def resizable(self):
+        return list(self.sizes)
+
+    def load(self, resource_class):
+        return self.loads[resource_class]
+
+    def resize(self, resource_class, size):
+        self.sizes[resource_class] = size
+
+
+def _controller(monkeypatch, pools=None, max_cases=16):
+    host = {'cpu': 10.0, 'memory': 10.0, 'disk': None}
+    monkeypatch.setattr(adaptive_concurrency, "host_pressure",
+                        lambda previous, interval: (host['cpu'], host['memory'], host['disk'], None))
+    controller = ConcurrencyController(max_cases)
+    controller.pools = pools
+    if pools is not None:
+        controller._pool_limits = {name: (1, pools.sizes[name] * controller.max_growth) for name in pools.sizes}
+    controller._start_time = time.monotonic()
+    return controller, host
+
+
+def _wait_for_a_slot(gate):
+    waiter = threading.Thread(target=gate.acquire, daemon=True)
+    waiter.start()
+    while gate.load()[1] == 0:
+        time.sleep(0.01)
+
+
+def test_cases_double_until_congestion_then_grow_by_one(monkeypatch):
+    controller, host = _controller(monkeypatch)
+    gate = controller.gate
+    for _ in range(gate.limit):
+        gate.acquire()
+    _wait_for_a_slot(gate)
+    controller._adjust(1)
+    assert gate.limit == 8 and gate.load() == (5, 0)
+
+    host['cpu'] = 95.0
+    controller._adjust(1)
+    assert gate.limit == 5
+    assert "cases 8→5 (cpu 95%)" in controller.timeline[-1]['change']
+
+    host['cpu'] = 10.0
+    _wait_for_a_slot(gate)
+    controller._adjust(1)
+    assert gate.limit == 6
+
+
+def test_an_idle_or_unsaturated_run_keeps_its_limits(monkeypatch):
+    controller, _ = _controller(monkeypatch, _FakePools({CPU: 4}))
+    controller.gate.acquire()
+    controller.pools.loads[CPU] = (4, 0)
+    controller._adjust(1)
+    assert controller.gate.limit == 4 and controller.pools.sizes == {CPU: 4}
+    assert controller.timeline == []
+
+
+def test_a_pool_whose_steps_slow_down_is_cut(monkeypatch):
+    pools = _FakePools({CPU: 4, WAIT: 4})
+    controller, _ = _controller(monkeypatch, pools)
+    for seconds in (1.0, 1.0, 1.0):
+        controller.observe(CPU, None, ("Run Command",), seconds)
+        controller.observe(WAIT, None, ("Wait",), seconds)
+    controller._adjust(1)
+    assert pools.sizes == {CPU: 4, WAIT: 4}
+
+    for seconds in (2.0, 2.0, 2.0):
+        controller.observe(CPU, None, ("Run Command",), seconds)
+        controller.observe(WAIT, None, ("Wait",), seconds * 10)
+    controller._adjust(1)
+    # Waiting steps are slow by design and never count as congestion
+    assert pools.sizes == {CPU: 2, WAIT: 4}
+    assert "cpu 4→2 (latency x2.0)" in controller.timeline[-1]['change']
+
+
+def test_a_saturated_pool_grows_up_to_its_ceiling(monkeypatch):
+    pools = _FakePools({FILE_IO: 4})
+    controller, _ = _controller(monkeypatch, pools)
+    for _ in range(3):
+        pools.loads[FILE_IO] = (pools.sizes[FILE_IO], 2)
+        controller._adjust(1)
+    assert pools.sizes[FILE_IO] == 4 * controller.max_growth
+
+
+def test_host_pressure_cuts_the_limits_it_concerns_and_stops_growth(monkeypatch):
+    pools = _FakePools({CPU: 4, FILE_IO: 4, WAIT: 4})
+    controller, host = _controller(monkeypatch, pools)
+    for name in pools.sizes:
+        pools.loads[name] = (4, 3)
+    host['disk'] = 95.0
+    controller._adjust(1)
+    # The disk is busy: file_io shrinks, the saturated cpu and wait pools stay put
+    assert pools.sizes == {CPU: 4, FILE_IO: 2, WAIT: 4}
+
+    host['disk'], host['memory'] = None, 95.0
+    controller._adjust(1)
+    assert pools.sizes == {CPU: 2, FILE_IO: 1, WAIT: 2}
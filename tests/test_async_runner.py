@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from conftest import step
+import async_runner
+from async_runner import AsyncCaseRunner
+from case_runner import CancellationToken
+from execution_plan import compile_case
+from step_watchdog import StepTimeout
+
+
+def _waiting(name, path, timeout=30):
+    return compile_case(name, [step("wait", "Wait for File", details={"file_path": path, "timeout": str(timeout)})])
+
+
+def _run(runners):
+    async def run_all():
+        return await asyncio.gather(*(runner.run_async() for runner in runners))
+    return asyncio.run(run_all())
+
+
+def test_waiting_cases_hold_no_thread_each(tmp_path):
+    path = str(tmp_path / "ready")
+    runners = [AsyncCaseRunner(_waiting(f"Case {n}", path), output=lambda text: None, refresh_combined=False)
+               for n in range(50)]
+
+    async def run_all():
+        cases = asyncio.gather(*(runner.run_async() for runner in runners))
+        await asyncio.sleep(0.5)
+        threads = threading.active_count()
+        open(path, "w").close()
+        return threads, await cases
+
+    threads, results = asyncio.run(run_all())
+    # The default executor tops out at 32 threads whatever the number of waiting cases
+    assert threads < len(runners)
+    assert all(result['success'] for result in results)
+
+
+def test_a_step_timeout_ends_an_async_wait(tmp_path):
+    runner = AsyncCaseRunner(_waiting("Case", str(tmp_path / "never")), output=lambda text: None,
+                             refresh_combined=False, step_timeout=0.3)
+    started = time.monotonic()
+    [result] = _run([runner])
+    assert [s['result'] for s in result['steps']] == ["TIMEOUT"]
+    assert time.monotonic() - started < 5
+
+
+def test_cancelling_the_run_stops_every_waiting_case(tmp_path):
+    suite = CancellationToken()
+    runners = [AsyncCaseRunner(_waiting(f"Case {n}", str(tmp_path / "never")), output=lambda text: None,
+                               refresh_combined=False, cancel_token=suite) for n in range(10)]
+    threading.Timer(0.3, suite.cancel, ["Stopped"]).start()
+    started = time.monotonic()
+    results = _run(runners)
+    assert {result['status'] for result in results} == {"CANCELLED - Stopped"}
+    assert time.monotonic() - started < 5
+
+
+def test_a_step_that_ignores_its_token_is_dropped_after_the_grace_period(monkeypatch):
+    monkeypatch.setattr(async_runner, "GRACE_PERIOD", 0.1)
+    token = CancellationToken()
+
+    async def watched():
+        stuck = asyncio.ensure_future(asyncio.sleep(30))
+        with pytest.raises(StepTimeout):
+            await AsyncCaseRunner._run_watched_async(stuck, 0.2, token)
+        await asyncio.sleep(0)
+        return stuck
+
+    stuck = asyncio.run(watched())
+    assert token.cancelled and stuck.cancelled()
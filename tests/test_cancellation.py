@@ -0,0 +1,61 @@
+import threading
+import time
+
+from conftest import step
+from case_runner import CaseRunner
+from execution_plan import compile_case
+from fail_fast import FailFastPolicy
+from step_types.cancellation import CancellationToken, use_token
+from step_types.file_operations import FileOperations
+
+
+def test_cancelling_the_token_ends_a_file_wait(tmp_path):
+    token = CancellationToken()
+    threading.Timer(0.2, token.cancel).start()
+    started = time.monotonic()
+    success, message = FileOperations.wait_for_file(str(tmp_path / "never"), timeout=30, cancel_token=token)
+    assert not success and message.startswith("Cancelled while waiting for file")
+    assert time.monotonic() - started < 5
+
+
+def test_a_file_wait_follows_the_current_token(tmp_path):
+    token = CancellationToken()
+    token.cancel("Stopped")
+    with use_token(token):
+        success, message = FileOperations.wait_for_file(str(tmp_path / "never"), timeout=30)
+    assert not success and "Cancelled" in message
+
+
+def test_a_child_token_follows_its_parent_until_detached():
+    parent = CancellationToken()
+    child, detached = CancellationToken(parent=parent), CancellationToken(parent=parent)
+    detached.detach()
+    parent.cancel("Suite stopped")
+    assert child.cancelled and child.reason == "Suite stopped"
+    assert not detached.cancelled
+    # Cancelling a child leaves the parent alone
+    suite = CancellationToken()
+    CancellationToken(parent=suite).cancel()
+    assert not suite.cancelled
+
+
+def test_the_suite_is_cancelled_once_the_failure_limit_is_reached():
+    policy = FailFastPolicy(max_failed_cases=2)
+    suite = CancellationToken()
+    policy.case_finished({'success': True}, suite)
+    policy.case_finished({'success': False}, suite)
+    assert not suite.cancelled
+    policy.case_finished({'success': False}, suite)
+    assert suite.cancelled and suite.reason == "Suite aborted after 2 failed case(s)"
+
+
+def test_a_failed_critical_step_skips_the_rest_of_its_case(tmp_path):
+    plan = compile_case("Case", [
+        step("missing", "Check File Exists", category="Critical",
+             details={"path": str(tmp_path / "missing"), "should_exist": "Yes"}),
+        step("after", "Check File Exists", details={"path": str(tmp_path), "should_exist": "Yes"}),
+    ])
+    result = CaseRunner(plan, output=lambda text: None, refresh_combined=False,
+                        fail_fast=FailFastPolicy(abort_case_on_critical=True)).run()
+    assert [s['result'] for s in result['steps']] == ["FAIL", None]
+    assert not result['success']
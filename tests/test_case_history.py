@@ -0,0 +1,49 @@
+from case_history import average_duration, load_history, record_results
+
+
+def _result(name, seconds, results, status="PASS", **flags):
+    return {'name': name, 'success': status == "PASS", 'status': status, 'execution_time': seconds,
+            'steps': [dict({'index': index, 'result': result}, **flags)
+                      for index, result in enumerate(results, 1)]}
+
+
+def test_a_finished_run_adds_its_duration_and_outcomes(tmp_path):
+    path = str(tmp_path / "history.json")
+    record_results([_result("A", 600, ["PASS", "FAIL"], status="FAIL")], path)
+    entry = load_history(path)["A"]
+    assert entry["durations"] == [600] and entry["steps"] == 2
+    assert entry["outcomes"] == [1]
+    assert entry["step_outcomes"] == {"1": [0], "2": [1]}
+
+
+def test_a_cancelled_run_leaves_the_history_alone(tmp_path):
+    path = str(tmp_path / "history.json")
+    record_results([_result("A", 600, ["PASS"])], path)
+    # Stopped before its first step finished
+    record_results([_result("A", 0.0, [None], status="CANCELLED - Stopped")], path)
+    record_results([_result("A", 12.0, ["PASS", None], status="CANCELLED - Stopped")], path)
+    entry = load_history(path)["A"]
+    assert average_duration(entry) == 600
+    assert entry["outcomes"] == [0]
+
+
+def test_mostly_reused_steps_add_an_outcome_but_no_duration(tmp_path):
+    path = str(tmp_path / "history.json")
+    record_results([_result("A", 600, ["PASS", "PASS", "PASS"])], path)
+    cached = _result("A", 0.5, ["PASS", "PASS", "PASS"], cached=True)
+    cached['steps'][0].pop('cached')
+    record_results([cached], path)
+    record_results([_result("A", 0.1, ["PASS", "PASS", "PASS"], carried_over=True)], path)
+    entry = load_history(path)["A"]
+    assert entry["durations"] == [600]
+    assert entry["outcomes"] == [0, 0, 0]
+    # Only the step that really ran adds a step outcome
+    assert entry["step_outcomes"]["1"] == [0, 0]
+
+
+def test_a_run_without_steps_is_skipped(tmp_path):
+    path = str(tmp_path / "history.json")
+    record_results([{'name': "A", 'success': False, 'status': "ERROR - bad", 'steps': [], 'execution_time': 0.0}],
+                   path)
+    assert "A" not in load_history(path)
+    assert average_duration(None) is None
@@ -0,0 +1,72 @@
+import os
+
+from conftest import step
+from case_runner import CaseRunner
+from case_sandbox import CaseSandboxes, expand_case_dir, uses_case_dir
+from execution_plan import compile_case
+from suite_runner import SuiteRunner
+
+
+def _sandboxed(name, last="Yes"):
+    # Writes into its sandbox, then checks the folder is still there at its last step
+    return compile_case(name, [
+        step("make", "Create Directory", details={"path": "${CASE_DIR}/out"}),
+        step("check", "Check File Exists", details={"path": "${CASE_DIR}/out", "should_exist": last}),
+    ])
+
+
+def _sandbox_dirs(sandboxes):
+    return os.listdir(sandboxes.root) if os.path.isdir(sandboxes.root) else []
+
+
+def test_case_dir_is_replaced_in_every_step_detail():
+    plan = _sandboxed("A")
+    assert uses_case_dir(plan)
+    expanded = expand_case_dir(plan, "/scratch/a")
+    assert [s.details["path"] for s in expanded.steps] == ["/scratch/a/out", "/scratch/a/out"]
+    assert not uses_case_dir(expanded)
+
+
+def test_the_sandbox_lives_until_the_last_step_and_is_removed_after_the_case(tmp_path):
+    sandboxes = CaseSandboxes(root=str(tmp_path))
+    result = CaseRunner(_sandboxed("A"), output=lambda text: None, refresh_combined=False,
+                        sandboxes=sandboxes).run()
+    assert result['success']
+    sandboxes.wait()
+    assert _sandbox_dirs(sandboxes) == []
+
+
+def test_a_failed_case_keeps_its_sandbox_when_asked(tmp_path):
+    sandboxes = CaseSandboxes(root=str(tmp_path), keep_failed=True)
+    output = []
+    result = CaseRunner(_sandboxed("A", last="No"), output=output.append, refresh_combined=False,
+                        sandboxes=sandboxes).run()
+    assert not result['success']
+    sandboxes.wait()
+    assert len(_sandbox_dirs(sandboxes)) == 1
+    assert "Sandbox kept for inspection" in "".join(output)
+
+
+def test_every_case_gets_its_own_sandbox(tmp_path):
+    sandboxes = CaseSandboxes(root=str(tmp_path))
+    first, second = sandboxes.create("Same name"), sandboxes.create("Same name")
+    assert first != second and os.path.isdir(first) and os.path.isdir(second)
+    for path in (first, second):
+        sandboxes.release(path, passed=True)
+    sandboxes.wait()
+    assert not os.path.exists(first) and not os.path.exists(second)
+
+
+def test_a_suite_run_returns_after_its_sandboxes_are_removed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("TestReports")
+    sandboxes = CaseSandboxes(root=str(tmp_path / "root"))
+    cleanup = compile_case("Tidy", [step("tidy", "Check File Exists", category="Cleanup",
+                                         details={"path": "${CASE_DIR}", "should_exist": "Yes"})])
+    runner = SuiteRunner([_sandboxed("A"), _sandboxed("B"), cleanup], output=lambda text: None,
+                         sandboxes=sandboxes)
+    results = runner.run(parallel=True, workers=2)
+    # The Cleanup fixture runs after the cases and still gets a sandbox of its own
+    assert [result['name'] for result in results][-1] == "Tidy"
+    assert all(result['success'] for result in results)
+    assert _sandbox_dirs(sandboxes) == []
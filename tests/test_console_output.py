@@ -0,0 +1,82 @@
+import tkinter as tk
+
+from console_output import ConsoleQueue
+
+
+class _FakeText:
+    """Just enough of a Tk Text widget and its root; timers fire on tick()"""
+
+    def __init__(self, root=None):
+        self.root = root or self
+        self.text = ""
+        self.destroyed = False
+        self.timers = {}
+        self.bindings = []
+        self._ids = 0
+
+    def _root(self):
+        return self.root
+
+    def after(self, ms, fn):
+        self._ids += 1
+        self.timers[self._ids] = fn
+        return self._ids
+
+    def after_cancel(self, after_id):
+        self.timers.pop(after_id, None)
+
+    def tick(self):
+        timers, self.timers = self.timers, {}
+        for fn in timers.values():
+            fn()
+
+    def bind(self, event, fn, add=None):
+        self.bindings.append(fn)
+
+    def destroy(self):
+        self.destroyed = True
+        for fn in self.bindings:
+            fn(None)
+
+    def insert(self, index, text):
+        if self.destroyed:
+            raise tk.TclError("invalid command name")
+        self.text += text
+
+    def delete(self, first, last):
+        self.text = ""
+
+    def see(self, index):
+        pass
+
+
+def test_one_timer_drains_every_console():
+    root = _FakeText()
+    first, second = _FakeText(root), _FakeText(root)
+    consoles = [ConsoleQueue(first), ConsoleQueue(second)]
+    assert len(root.timers) == 1
+
+    consoles[0].write("a")
+    consoles[0].write("b")
+    consoles[1].write("c")
+    consoles[1].clear()
+    consoles[1].write("d")
+    root.tick()
+    assert (first.text, second.text) == ("ab", "d")
+    assert len(root.timers) == 1
+    for console in consoles:
+        console.stop()
+
+
+def test_the_timer_ends_with_the_last_console():
+    root = _FakeText()
+    first, second = _FakeText(root), _FakeText(root)
+    consoles = [ConsoleQueue(first), ConsoleQueue(second)]
+    consoles[0].stop()
+    assert len(root.timers) == 1
+    # A destroyed widget leaves the timer without an explicit stop()
+    second.destroy()
+    assert root.timers == {}
+    consoles[1].write("late")
+    root.tick()
+    assert second.text == ""
@@ -0,0 +1,70 @@
+import os
+import socket
+import threading
+
+from conftest import step
+from distributed import Connection, Coordinator, Worker
+from execution_plan import compile_case
+
+
+def _append(name, category, marker):
+    return compile_case(name, [step(name.lower(), category=category, details={"command": f"echo {name} >> {marker}"})])
+
+
+def test_fixtures_run_once_on_the_coordinator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("TestReports")
+    marker = str(tmp_path / "marker.txt")
+    cases = [compile_case(f"Case{index}", [step("use", "Use Fixture", details={"fixture": "Prepare"})])
+             for index in range(4)]
+    address = f"unix:{tmp_path / 'vcb.sock'}"
+    coordinator = Coordinator([_append("Prepare", "Setup", marker)] + cases + [_append("Tidy", "Cleanup", marker)],
+                              address, output=lambda text: None)
+
+    def start_workers():
+        for index in range(2):
+            threading.Thread(target=Worker(address, slots=2, name=f"w{index}").run, daemon=True).start()
+
+    results = coordinator.run(start_workers)
+
+    with open(marker) as f:
+        assert f.read().split() == ["Prepare", "Tidy"]
+    assert [result['name'] for result in results][0] == "Prepare"
+    assert [result['name'] for result in results][-1] == "Tidy"
+    assert all(result['success'] for result in results)
+    with open("test_summary_parallel.txt") as f:
+        summary = f.read()
+    assert "Prepare: " in summary and "Tidy: " in summary
+
+
+def _check(name):
+    return compile_case(name, [step("check", "Check File Exists", details={"path": ".", "should_exist": "Yes"})])
+
+
+def test_cases_fail_when_no_worker_connects(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("TestReports")
+    coordinator = Coordinator([_check("A"), _check("B")], f"unix:{tmp_path / 'vcb.sock'}",
+                              output=lambda text: None, worker_timeout=0.2)
+    results = coordinator.run()
+    assert sorted(result['name'] for result in results) == ["A", "B"]
+    assert all(result['status'] == "ERROR - no worker connected for 0.2s" for result in results)
+
+
+def test_cases_fail_once_every_worker_is_lost(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("TestReports")
+    address = f"unix:{tmp_path / 'vcb.sock'}"
+    coordinator = Coordinator([_check("A")], address, output=lambda text: None, worker_timeout=0.5)
+
+    def vanishing_worker():
+        # Takes the case and disconnects without a result
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(tmp_path / "vcb.sock"))
+        connection = Connection(sock)
+        connection.send({"type": "hello", "worker": "gone", "slots": 1})
+        assert connection.receive()["type"] == "case"
+        connection.close()
+
+    results = coordinator.run(lambda: threading.Thread(target=vanishing_worker, daemon=True).start())
+    assert [result['status'] for result in results] == ["ERROR - no worker connected for 0.5s"]
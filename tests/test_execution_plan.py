@@ -0,0 +1,69 @@
+import pytest
+
+from conftest import step
+from execution_plan import CLEANUP_FIXTURE, SETUP_FIXTURE, compile_case, compile_suite, thaw
+
+
+def test_numeric_details_are_parsed_at_compile_time():
+    plan = compile_case("Case", [step(details={"timeout": " 30 ", "required_gb": "1.5", "command": "dir"})])
+    details = plan.steps[0].details
+    assert details["timeout"] == 30
+    assert details["required_gb"] == 1.5
+    assert details["command"] == "dir"
+
+
+def test_invalid_numbers_keep_their_text_and_a_bad_delay_is_reported():
+    plan = compile_case("Case", [step(details={"timeout": "soon", "step_delay": "later"})])
+    compiled = plan.steps[0]
+    assert compiled.details["timeout"] == "soon"
+    assert compiled.delay == 0
+    assert "later" in compiled.error
+
+
+def test_step_fields_are_parsed():
+    plan = compile_case("Case", [
+        step("a"), step("b"),
+        step("c", run_condition="If Specific Step Passed", target_step=" 1 ",
+             depends_on="2, 2 x 5", exclusive="license, account, license",
+             details={"step_timeout": "0"}),
+    ])
+    compiled = plan.steps[2]
+    assert compiled.index == 3
+    assert compiled.target_step == 1
+    assert compiled.depends_on == (2, 5)
+    assert compiled.exclusive == ("license", "account")
+    # A zero Step Timeout means the suite default
+    assert compiled.timeout is None
+
+
+def test_plans_are_immutable():
+    plan = compile_case("Case", [step(details={"paths": ["a", "b"], "options": {"x": 1}})])
+    with pytest.raises(AttributeError):
+        plan.name = "Other"
+    with pytest.raises(AttributeError):
+        plan.steps[0].delay = 5
+    with pytest.raises(TypeError):
+        plan.steps[0].details["options"]["x"] = 2
+    assert plan.steps[0].details["paths"] == ("a", "b")
+
+
+def test_thaw_returns_plain_copies_that_round_trip():
+    steps = [step("a", details={"paths": ["a", "b"], "options": {"x": [1, 2]}}, category="Validation",
+                  run_condition="If Previous Passed", depends_on="1", exclusive="db")]
+    plan = compile_case("Case", steps)
+    details = thaw(plan.steps[0].details)
+    assert details == {"paths": ["a", "b"], "options": {"x": [1, 2]}}
+    assert type(details["options"]) is dict
+    recompiled = compile_case("Case", plan.to_data())
+    assert recompiled.to_data() == plan.to_data()
+
+
+def test_fixture_needs_every_step_in_the_category():
+    setup, cleanup, mixed = compile_suite({
+        "Setup": [step(category=SETUP_FIXTURE), step(category=SETUP_FIXTURE)],
+        "Cleanup": [step(category=CLEANUP_FIXTURE)],
+        "Mixed": [step(category=SETUP_FIXTURE), step(category="General")],
+    })
+    assert setup.fixture == SETUP_FIXTURE
+    assert cleanup.fixture == CLEANUP_FIXTURE
+    assert mixed.fixture is None
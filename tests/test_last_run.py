@@ -0,0 +1,76 @@
+from conftest import step
+from execution_plan import compile_case
+import last_run
+from step_graph import build_step_graph, ignored_dependencies
+
+
+def _result(plan, outcomes, status="FAIL"):
+    return {'name': plan.name, 'success': status == "PASS", 'status': status,
+            'steps': [{'index': s.index, 'name': s.name, 'type': s.step_type, 'result': outcome}
+                      for s, outcome in zip(plan.steps, outcomes)]}
+
+
+def test_step_graph_follows_conditions_targets_and_depends_on():
+    plan = compile_case("Case", [
+        step("1"),
+        step("2", run_condition="If Previous Passed"),
+        step("3", run_condition="If Specific Step Failed", target_step="1"),
+        step("4", run_condition="If All Previous Passed"),
+        step("5", depends_on="2, 7, 5"),
+        step("6"),
+    ])
+    assert build_step_graph(plan) == {1: set(), 2: {1}, 3: {1}, 4: {1, 2, 3}, 5: {2}, 6: set()}
+    # Later and self references cannot be waited for
+    assert ignored_dependencies(plan.steps[4]) == [7, 5]
+
+
+def test_rerun_keeps_independent_passing_steps():
+    plan = compile_case("Case", [
+        step("setup"),
+        step("check", depends_on="1"),
+        step("other"),
+        step("report", run_condition="If Previous Failed"),
+    ])
+    kept = last_run.rerun_steps(plan, _result(plan, ["PASS", "FAIL", "PASS", "PASS"]))
+    # check reruns with the setup it depends on; other is independent, and
+    # report does not look at check
+    assert sorted(kept) == [3, 4]
+
+
+def test_rerun_includes_steps_whose_conditions_look_at_a_rerun_step():
+    plan = compile_case("Case", [
+        step("a"),
+        step("b"),
+        step("c", run_condition="If Specific Step Failed", target_step="2"),
+        step("d"),
+    ])
+    kept = last_run.rerun_steps(plan, _result(plan, ["PASS", "FAIL", "PASS", "PASS"]))
+    assert sorted(kept) == [1, 4]
+
+
+def test_skipped_steps_after_the_first_failure_rerun():
+    plan = compile_case("Case", [step("a"), step("b"), step("c")])
+    kept = last_run.rerun_steps(plan, _result(plan, ["PASS", "ERROR", None]))
+    assert sorted(kept) == [1]
+
+
+def test_cancelled_and_edited_cases_rerun_in_full():
+    plan = compile_case("Case", [step("a"), step("b")])
+    assert last_run.rerun_steps(plan, _result(plan, ["PASS", "FAIL"], status="CANCELLED - Stopped")) == {}
+    edited = compile_case("Case", [step("a"), step("renamed")])
+    assert last_run.rerun_steps(edited, _result(plan, ["PASS", "FAIL"])) == {}
+
+
+def test_failed_case_names_and_merged_reports():
+    previous = {"A": {'name': "A", 'success': True, 'report': "a1"},
+                "B": {'name': "B", 'success': False, 'report': "b1"}}
+    assert last_run.failed_case_names(previous, ["B", "A", "C"]) == ["B"]
+    merged = last_run.merged_report_data(previous, [{'name': "B", 'report': "b2"}], ["A", "B"])
+    assert merged == ["a1", "b2"]
+
+
+def test_record_results_replaces_earlier_results(tmp_path):
+    path = str(tmp_path / "last_run.json")
+    last_run.record_results([{'name': "A", 'success': False}, {'name': "B", 'success': True}], path)
+    last_run.record_results([{'name': "A", 'success': True}], path)
+    assert last_run.load_last_run(path) == {"A": {'name': "A", 'success': True}, "B": {'name': "B", 'success': True}}
@@ -0,0 +1,42 @@
+import os
+import threading
+
+from conftest import step
+from case_runner import CancellationToken
+from execution_plan import compile_case
+import process_runner
+from process_runner import CaseProcessPool
+
+
+def _passing(name, path):
+    return compile_case(name, [step("exists", "Check File Exists", details={"path": path, "should_exist": "Yes"})])
+
+
+def test_a_worker_is_replaced_after_recycle_after_cases(tmp_path):
+    with CaseProcessPool(workers=1, recycle_after=2) as pool:
+        futures = [pool.submit(_passing(name, str(tmp_path)), output=lambda text: None) for name in "ABC"]
+        results = [future.result(timeout=60) for future in futures]
+    assert [result['success'] for result in results] == [True, True, True]
+    # A and B share the first worker, C gets a fresh one
+    assert pool.started == 2
+    assert pool.describe() == "up to 1 worker process(es), each replaced after 2 case(s)"
+
+
+def test_a_case_that_ignores_cancellation_loses_its_worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(process_runner, "CANCEL_GRACE", 0.5)
+    monkeypatch.setattr(process_runner, "POLL_INTERVAL", 0.1)
+    # Opening a FIFO without a writer blocks in C, out of reach of the token
+    log = str(tmp_path / "app.log")
+    os.mkfifo(log)
+    stuck = compile_case("Stuck", [step("read", "Check Log File", details={"log_file_path": log, "search": "x"})])
+    token = CancellationToken()
+    with CaseProcessPool(workers=1) as pool:
+        future = pool.submit(stuck, output=lambda text: None, cancel_token=token,
+                             on_step_start=lambda number: threading.Timer(0.5, token.cancel, ["Stopped"]).start())
+        result = future.result(timeout=60)
+        # The next case gets a fresh worker
+        after = pool.submit(_passing("After", str(tmp_path)), output=lambda text: None).result(timeout=60)
+    assert result['status'] == "CANCELLED - Stopped (worker process terminated after 0.5s)"
+    assert not result['success']
+    assert after['success']
+    assert pool.started == 2
@@ -0,0 +1,69 @@
+import sys
+import threading
+import time
+
+from step_types import registry
+from step_types.registry import PATH_RESOURCE, StepType
+
+
+def test_builtin_step_types_are_registered():
+    compare = registry.get_step_type("Compare Files")
+    assert compare is not None
+    assert compare.resource_class == "cpu"
+    assert registry.get_step_type("No Such Step") is None
+
+
+def test_dropdown_lists_groups_with_sorted_names():
+    values = registry.dropdown_values()
+    header = values.index("── File Operations ──")
+    names = []
+    for value in values[header + 1:]:
+        if value.startswith("──"):
+            break
+        names.append(value)
+    assert "Copy File" in names
+    assert names == sorted(names)
+
+
+def test_prepare_uses_the_coercion():
+    step_type = StepType("Doubled", lambda args, log: (True, None, ""),
+                         coerce=lambda details: {"value": details["value"] * 2})
+    assert step_type.prepare({"value": 2}) == {"value": 4}
+    assert StepType("Plain", None).prepare({"value": 2}) == {"value": 2}
+
+
+def test_builtin_resources():
+    registered = registry.get_step_type("Move File")
+    args = registered.prepare({"from_path": "a.txt", "to_path": "b.txt"})
+    assert registered.resources(args) == [(PATH_RESOURCE, "a.txt", True), (PATH_RESOURCE, "b.txt", True)]
+
+
+def test_concurrent_first_lookups_wait_for_the_builtins(monkeypatch):
+    # Start from an empty registry and make loading slow, so lookups from
+    # other threads arrive while the built-in step types are being registered
+    monkeypatch.setattr(registry, "_step_types", {})
+    monkeypatch.setattr(registry, "_loaded", False)
+    monkeypatch.delitem(sys.modules, "step_types.step_executor")
+    register = registry.register
+
+    def slow_register(step_type):
+        time.sleep(0.005)
+        return register(step_type)
+
+    monkeypatch.setattr(registry, "register", slow_register)
+    monkeypatch.setattr(registry, "load_entry_points", lambda: None)
+
+    start = threading.Barrier(8)
+    found = []
+
+    def look_up():
+        start.wait()
+        found.append(registry.get_step_type("Check Log File"))
+
+    threads = [threading.Thread(target=look_up) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(found) == 8
+    assert all(step_type is not None for step_type in found)
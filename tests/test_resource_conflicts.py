@@ -0,0 +1,137 @@
+import concurrent.futures
+import os
+import threading
+
+from conftest import step
+from execution_plan import compile_case
+from resource_conflicts import (EXCLUSIVE_RESOURCE, ConflictScheduler, build_conflict_graph, case_resources,
+                                describe_conflicts, find_conflict)
+from step_types.registry import PATH_RESOURCE, TABLE_RESOURCE
+
+
+def _copy(name, source, target):
+    return compile_case(name, [step("copy", "Copy File", details={"from": source, "to": target})])
+
+
+def _check(name, path):
+    return compile_case(name, [step("check", "Check File Exists", details={"path": path, "should_exist": "Yes"})])
+
+
+def test_case_resources_mark_reads_and_writes(tmp_path):
+    plan = _copy("A", str(tmp_path / "in.txt"), str(tmp_path / "out"))
+    resources = case_resources(plan)
+    assert resources[(PATH_RESOURCE, os.path.normcase(str(tmp_path / "in.txt")))] is False
+    assert resources[(PATH_RESOURCE, os.path.normcase(str(tmp_path / "out")))] is True
+
+
+def test_case_dir_paths_and_table_names_are_normalised():
+    plan = compile_case("A", [
+        step("copy", "Copy File", details={"from": "${CASE_DIR}/a", "to": "${CASE_DIR}/b"}),
+        step("db", "Check Database Entry", details={"table": "[dbo].[Orders]"}),
+    ])
+    assert list(case_resources(plan)) == [(TABLE_RESOURCE, "orders")]
+
+
+def test_only_a_writer_causes_a_conflict(tmp_path):
+    folder = str(tmp_path / "shared")
+    reader = case_resources(_check("R", os.path.join(folder, "a.txt")))
+    other_reader = case_resources(_check("R2", os.path.join(folder, "a.txt")))
+    writer = case_resources(_copy("W", str(tmp_path / "in.txt"), folder))
+    assert find_conflict(reader, other_reader) is None
+    # The folder written by W contains the file R reads
+    assert find_conflict(reader, writer) == (PATH_RESOURCE, os.path.normcase(os.path.join(folder, "a.txt")))
+    assert find_conflict(writer, reader) is not None
+
+
+def test_sibling_paths_with_a_common_prefix_do_not_conflict(tmp_path):
+    first = case_resources(_copy("A", str(tmp_path / "in"), str(tmp_path / "out")))
+    second = case_resources(_copy("B", str(tmp_path / "in"), str(tmp_path / "out2")))
+    assert find_conflict(first, second) is None
+
+
+def test_exclusive_tags_conflict_with_the_same_tag_only():
+    license_a = compile_case("A", [step(exclusive="License Server")])
+    license_b = compile_case("B", [step(exclusive="license server, account")])
+    account = compile_case("C", [step(exclusive="other")])
+    graph = build_conflict_graph([license_a, license_b, account])
+    assert graph == {"A": {"B": (EXCLUSIVE_RESOURCE, "license server")},
+                     "B": {"A": (EXCLUSIVE_RESOURCE, "license server")},
+                     "C": {}}
+    assert "A ↔ B: exclusive license server" in describe_conflicts(graph)
+    assert describe_conflicts({"C": {}}) == "Resource conflicts: none"
+
+
+class _Starter:
+    """Start callable for ConflictScheduler whose cases finish when the test says so"""
+
+    def __init__(self):
+        self.running = {}
+        self.started = []
+
+    def __call__(self, name):
+        future = concurrent.futures.Future()
+        self.running[name] = future
+        self.started.append(name)
+        return future
+
+    def finish(self, name, result=None):
+        self.running.pop(name).set_result(result or name)
+
+
+def test_scheduler_never_runs_conflicting_cases_together():
+    graph = {"A": {"B": None}, "B": {"A": None}, "C": {}}
+    starter = _Starter()
+    scheduler = ConflictScheduler(graph)
+    futures = {name: scheduler.submit_case(name, starter, name) for name in "ABC"}
+    assert starter.started == ["A", "C"]
+
+    starter.finish("A", "done")
+    assert starter.started == ["A", "C", "B"]
+    assert futures["A"].result(timeout=1) == "done"
+    starter.finish("B")
+    starter.finish("C")
+    assert all(future.done() for future in futures.values())
+
+
+def test_a_held_back_case_is_not_overtaken_by_later_conflicting_cases():
+    # B waits for A; C conflicts only with B, so it waits behind B
+    graph = {"A": {"B": None}, "B": {"A": None, "C": None}, "C": {"B": None}}
+    starter = _Starter()
+    scheduler = ConflictScheduler(graph)
+    for name in "ABC":
+        scheduler.submit_case(name, starter, name)
+    assert starter.started == ["A"]
+    starter.finish("A")
+    assert starter.started == ["A", "B"]
+    starter.finish("B")
+    assert starter.started == ["A", "B", "C"]
+
+
+def test_a_failing_start_releases_the_case():
+    graph = {"A": {"B": None}, "B": {"A": None}}
+    starter = _Starter()
+    scheduler = ConflictScheduler(graph)
+
+    def broken(name):
+        raise RuntimeError("no worker")
+
+    failed = scheduler.submit_case("A", broken, "A")
+    scheduler.submit_case("B", starter, "B")
+    assert isinstance(failed.exception(timeout=1), RuntimeError)
+    assert starter.started == ["B"]
+
+
+def test_a_case_that_never_started_is_cancelled_not_failed():
+    graph = {"A": {"B": None}, "B": {"A": None}}
+    starter = _Starter()
+    scheduler = ConflictScheduler(graph)
+    first = scheduler.submit_case("A", starter, "A")
+    second = scheduler.submit_case("B", starter, "B")
+    # A worker pool cancels the Future of a case it decided not to run,
+    # while the runner already waits for the cases to complete
+    threading.Timer(0.1, starter.running["A"].cancel).start()
+    assert next(concurrent.futures.as_completed([first], timeout=5)) is first
+    assert first.cancelled()
+    assert starter.started == ["A", "B"]
+    starter.finish("B")
+    assert second.result(timeout=1) == "B"
@@ -0,0 +1,85 @@
+from conftest import step
+from execution_plan import compile_case
+from run_journal import RunJournal, describe_resume, load_journal, resume_state
+
+
+def _plan(name, *step_names, **details):
+    return compile_case(name, [step(step_name, "Check File Exists", details=dict(details))
+                               for step_name in step_names])
+
+
+def _step(index, name, result="PASS"):
+    return {'index': index, 'name': name, 'type': "Check File Exists", 'result': result}
+
+
+def _interrupted_run(path):
+    journal = RunJournal(str(path))
+    journal.start(["A", "B", "C"])
+    journal.step_finished("A", _step(1, "a1"))
+    journal.case_finished({'name': "A", 'success': True, 'status': "PASS", 'steps': [_step(1, "a1")]})
+    journal.step_started("B", 1)
+    journal.step_finished("B", _step(1, "b1"))
+    journal.step_finished("B", _step(2, "b2", "FAIL"))
+    journal.close()
+
+
+def test_resume_skips_finished_cases_and_continues_interrupted_ones(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    _interrupted_run(path)
+    plans = [_plan("A", "a1"), _plan("B", "b1", "b2", "b3"), _plan("C", "c1")]
+    finished, remaining, carry_over = resume_state(load_journal(str(path)), plans)
+    assert list(finished) == ["A"]
+    assert remaining == ["B", "C"]
+    assert sorted(carry_over["B"]) == [1, 2]
+    assert "B: continuing after 2 finished step(s)" in describe_resume(finished, remaining, carry_over)
+
+
+def test_a_line_torn_by_the_crash_is_ignored(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    _interrupted_run(path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"event": "case", "result": {"name": "B", "succ')
+    plans = [_plan("A", "a1"), _plan("B", "b1", "b2", "b3"), _plan("C", "c1")]
+    finished, remaining, carry_over = resume_state(load_journal(str(path)), plans)
+    assert list(finished) == ["A"]
+    assert remaining == ["B", "C"]
+    assert sorted(carry_over["B"]) == [1, 2]
+
+
+def test_steps_that_no_longer_match_the_case_are_rerun(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    _interrupted_run(path)
+    # Step 2 was renamed since the crash; step 1 still matches
+    plans = [_plan("A", "a1"), _plan("B", "b1", "renamed", "b3"), _plan("C", "c1")]
+    _, _, carry_over = resume_state(load_journal(str(path)), plans)
+    assert sorted(carry_over["B"]) == [1]
+    # A case that lost its steps keeps nothing
+    _, _, carry_over = resume_state(load_journal(str(path)), [_plan("B", "other")])
+    assert carry_over == {}
+
+
+def test_sandboxed_cases_using_case_dir_restart_from_the_top(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    _interrupted_run(path)
+    plans = [_plan("B", "b1", "b2", path="${CASE_DIR}/out")]
+    _, remaining, carry_over = resume_state(load_journal(str(path)), plans, sandboxed=True)
+    assert remaining == ["B"]
+    assert carry_over == {}
+
+
+def test_a_resume_continues_the_same_journal_until_a_run_ends(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    _interrupted_run(path)
+    plans = [_plan("A", "a1"), _plan("B", "b1", "b2", "b3"), _plan("C", "c1")]
+    resumed = RunJournal(str(path), resume=True)
+    resumed.start(["B", "C"])
+    resumed.case_finished({'name': "B", 'success': True, 'status': "PASS", 'steps': []})
+    resumed.close()
+    finished, remaining, _ = resume_state(load_journal(str(path)), plans)
+    assert list(finished) == ["A", "B"] and remaining == ["C"]
+
+    resumed = RunJournal(str(path), resume=True)
+    resumed.start(["C"])
+    resumed.finish()
+    assert resume_state(load_journal(str(path)), plans) is None
+    assert load_journal(str(tmp_path / "missing.jsonl")) == []
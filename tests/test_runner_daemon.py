@@ -0,0 +1,79 @@
+import os
+import socket
+import threading
+
+from conftest import step
+from distributed import Connection
+from execution_plan import compile_case
+from runner_daemon import RunnerClient, RunnerDaemon, _DaemonSuiteRunner
+
+
+def _check(name):
+    return compile_case(name, [step("check", "Check File Exists", details={"path": ".", "should_exist": "Yes"})])
+
+
+def test_every_engine_sends_case_events(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("TestReports")
+    for engine in ["threads", "async", "processes"]:
+        events = []
+        runner = _DaemonSuiteRunner([_check("A"), _check("B")], lambda kind, **fields: events.append((kind, fields)))
+        runner.run(parallel=True, workers=2, engine=engine)
+        assert sorted(fields["result"]["name"] for kind, fields in events if kind == "case") == ["A", "B"], engine
+
+
+def test_submissions_sharing_cases_run_one_after_the_other():
+    daemon = RunnerDaemon(output=lambda text: None)
+    runners = {run_id: _DaemonSuiteRunner(plans, lambda kind, **fields: None)
+               for run_id, plans in [(1, [_check("A")]), (2, [_check("A"), _check("B")]), (3, [_check("C")])]}
+    for run_id, runner in runners.items():
+        daemon._runs[run_id] = {"runner": runner, "cases": 1, "thread": None, "waiting": False}
+    assert daemon._claim_cases(1, runners[1], lambda kind, **fields: None) == {"A"}
+    # A different case runs at once
+    assert daemon._claim_cases(3, runners[3], lambda kind, **fields: None) == {"C"}
+
+    claimed = []
+    emitted = []
+    waiter = threading.Thread(target=lambda: claimed.append(
+        daemon._claim_cases(2, runners[2], lambda kind, **fields: emitted.append(fields["text"]))))
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive() and daemon.status()["runs"][1]["state"] == "waiting"
+    with daemon._cases_released:
+        daemon._running_cases -= {"A"}
+        daemon._cases_released.notify_all()
+    waiter.join(5)
+    assert claimed == [{"A", "B"}]
+    assert "Waiting for another run" in emitted[0]
+
+
+def test_a_waiting_submission_can_be_cancelled():
+    daemon = RunnerDaemon(output=lambda text: None)
+    first, second = (_DaemonSuiteRunner([_check("A")], lambda kind, **fields: None) for _ in range(2))
+    daemon._runs[1] = {"runner": first, "cases": 1, "thread": None, "waiting": False}
+    daemon._runs[2] = {"runner": second, "cases": 1, "thread": None, "waiting": False}
+    daemon._claim_cases(1, first, lambda kind, **fields: None)
+    threading.Timer(0.1, daemon.cancel, args=(2,)).start()
+    assert daemon._claim_cases(2, second, lambda kind, **fields: None) is None
+
+
+def test_the_client_keeps_events_sent_before_the_submit_response(tmp_path):
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(tmp_path / "d.sock"))
+    server.listen()
+
+    def daemon():
+        connection = Connection(server.accept()[0])
+        request = connection.receive()
+        for kind in ["output", "finished"]:
+            connection.send({"jsonrpc": "2.0", "method": "event",
+                             "params": {"run_id": 7, "type": kind, "text": "early", "success": True}})
+        connection.send({"jsonrpc": "2.0", "id": request["id"], "result": {"run_id": 7}})
+
+    threading.Thread(target=daemon, daemon=True).start()
+    client = RunnerClient(f"unix:{tmp_path / 'd.sock'}")
+    events = []
+    assert client.submit({"A": []}, on_event=events.append)["success"]
+    assert [event["type"] for event in events] == ["output", "finished"]
+    client.close()
+    server.close()
@@ -0,0 +1,60 @@
+import pytest
+
+from conftest import step
+from execution_plan import compile_case
+from sharding import DEFAULT_STEP_SECONDS, assign_shards, estimate_durations, longest_first, parse_shard
+
+
+def _cases(*step_counts):
+    return [compile_case(f"C{index}", [step() for _ in range(count)]) for index, count in enumerate(step_counts)]
+
+
+def _history(**durations):
+    return {name: {"durations": [seconds], "steps": 1} for name, seconds in durations.items()}
+
+
+def test_estimates_use_history_and_fall_back_to_the_step_rate():
+    plans = _cases(1, 2, 3)
+    estimates = estimate_durations(plans, {"C0": {"durations": [4.0, 6.0], "steps": 1}})
+    assert estimates["C0"] == (5.0, True)
+    # 5 seconds for the one step of C0 sets the rate of the cases without history
+    assert estimates["C1"] == (10.0, False)
+    assert estimates["C2"] == (15.0, False)
+
+
+def test_estimates_without_any_history_add_the_step_delays():
+    plan = compile_case("C", [step(details={"step_delay": "2"}), step()])
+    assert estimate_durations([plan], {})["C"] == (2 * DEFAULT_STEP_SECONDS + 2, False)
+
+
+def test_longest_first():
+    plans = _cases(1, 1, 1)
+    ordered = longest_first(plans, _history(C0=1, C1=3, C2=2))
+    assert [plan.name for plan in ordered] == ["C1", "C2", "C0"]
+
+
+def test_assign_shards_balances_longest_first():
+    plans = _cases(1, 1, 1, 1, 1)
+    history = _history(C0=7, C1=5, C2=4, C3=3, C4=1)
+    shards = assign_shards(plans, 2, history)
+    # LPT: 7 -> A, 5 -> B, 4 -> B (9), 3 -> A (10), 1 -> B (10)
+    assert [load for load, _ in shards] == [10, 10]
+    assert [[plan.name for plan in shard] for _, shard in shards] == [["C0", "C3"], ["C1", "C2", "C4"]]
+
+
+def test_every_case_lands_in_exactly_one_shard():
+    plans = _cases(*range(1, 12))
+    shards = assign_shards(plans, 3, {})
+    names = [plan.name for _, shard in shards for plan in shard]
+    assert sorted(names) == sorted(plan.name for plan in plans)
+
+
+@pytest.mark.parametrize("spec, expected", [("1/1", (1, 1)), ("2/4", (2, 4))])
+def test_parse_shard(spec, expected):
+    assert parse_shard(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["0/2", "3/2", "2", "a/b", "1/0"])
+def test_parse_shard_rejects_invalid_selectors(spec):
+    with pytest.raises(ValueError):
+        parse_shard(spec)
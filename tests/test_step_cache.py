@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from step_cache import StepCache, fingerprint_path
+from step_types import registry
+
+
+@pytest.fixture
+def check_exists():
+    return registry.get_step_type("Check File Exists")
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("one")
+    return path
+
+
+def _details(path):
+    return {"path": str(path), "should_exist": "Yes"}
+
+
+def test_a_stored_step_is_found_until_its_input_changes(tmp_path, check_exists, input_file):
+    cache = StepCache(path=str(tmp_path / "cache.json"))
+    assert not cache.lookup(check_exists, _details(input_file))
+    cache.store(check_exists, _details(input_file))
+    assert cache.lookup(check_exists, _details(input_file))
+    assert cache.hits == 1
+
+    input_file.write_text("changed")
+    assert not cache.lookup(check_exists, _details(input_file))
+
+
+def test_other_parameters_are_a_different_entry(tmp_path, check_exists, input_file):
+    cache = StepCache(path=str(tmp_path / "cache.json"))
+    cache.store(check_exists, _details(input_file))
+    assert not cache.lookup(check_exists, {"path": str(input_file), "should_exist": "No"})
+
+
+def test_hashing_ignores_a_touched_but_unchanged_file(tmp_path, check_exists, input_file):
+    cache = StepCache(path=str(tmp_path / "cache.json"), hash_contents=True)
+    cache.store(check_exists, _details(input_file))
+    stat = os.stat(input_file)
+    os.utime(input_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert cache.lookup(check_exists, _details(input_file))
+
+
+def test_excluded_and_undeclared_step_types_are_never_cached(tmp_path, check_exists, input_file):
+    cache = StepCache(path=str(tmp_path / "cache.json"), excluded=["Check File Exists"])
+    cache.store(check_exists, _details(input_file))
+    assert not cache.lookup(check_exists, _details(input_file))
+
+    run_command = registry.get_step_type("Run Command")
+    cache = StepCache(path=str(tmp_path / "cache.json"))
+    cache.store(run_command, {"command": "echo"})
+    assert not cache.lookup(run_command, {"command": "echo"})
+
+
+def test_saved_entries_are_found_by_the_next_run(tmp_path, check_exists, input_file):
+    path = str(tmp_path / "cache.json")
+    cache = StepCache(path=path)
+    cache.store(check_exists, _details(input_file))
+    cache.save()
+    assert StepCache(path=path).lookup(check_exists, _details(input_file))
+    # No temp file is left behind
+    assert sorted(os.listdir(tmp_path)) == ["cache.json", "input.txt"]
+
+
+def test_fingerprint_of_a_folder_covers_its_files(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a.txt").write_text("a")
+    before = fingerprint_path(str(tmp_path))
+    (tmp_path / "sub" / "b.txt").write_text("b")
+    assert fingerprint_path(str(tmp_path)) != before
+    assert fingerprint_path(str(tmp_path / "missing")) is None
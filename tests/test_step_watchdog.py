@@ -0,0 +1,49 @@
+import os
+import threading
+import time
+
+import pytest
+
+from case_runner import CancellationToken
+from resource_pools import CPU, FILE_IO, ResourcePools
+import step_watchdog
+from step_watchdog import StepTimeout, run_watched
+
+
+def test_a_cooperative_step_stops_at_its_timeout():
+    token = CancellationToken()
+    with pytest.raises(StepTimeout, match="exceeded its 0.2s timeout$"):
+        run_watched(None, FILE_IO, 0.2, token, token.wait, 10)
+    assert token.cancelled
+
+
+def test_a_hung_step_hands_its_pool_slot_back(monkeypatch):
+    monkeypatch.setattr(step_watchdog, "GRACE_PERIOD", 0.1)
+    release = threading.Event()
+    with ResourcePools({FILE_IO: 1}) as pools:
+        # Ignores its token, like a blocked network copy
+        with pytest.raises(StepTimeout):
+            run_watched(pools, FILE_IO, 0.2, CancellationToken(), release.wait, 10)
+        started = time.monotonic()
+        assert run_watched(pools, FILE_IO, 5, CancellationToken(), lambda: "next") == "next"
+        assert time.monotonic() - started < 1
+        release.set()
+
+
+def test_time_waiting_for_a_worker_process_does_not_count(tmp_path):
+    marker = str(tmp_path / "ran")
+    with ResourcePools({CPU: 1}, cpu_processes=True) as pools:
+        pools.run(CPU, len, ())  # Start the worker process
+        busy = threading.Thread(target=pools.run, args=(CPU, time.sleep, 1))
+        busy.start()
+        time.sleep(0.2)
+        # Waits about 0.8s for the process, then runs well within its timeout
+        run_watched(pools, CPU, 0.5, CancellationToken(), os.mkdir, marker)
+        busy.join()
+    assert os.path.exists(marker)
+
+
+def test_the_timeout_of_a_worker_process_step_says_it_keeps_running():
+    with ResourcePools({CPU: 1}, cpu_processes=True) as pools:
+        with pytest.raises(StepTimeout, match="its worker process finishes it in the background"):
+            run_watched(pools, CPU, 0.5, CancellationToken(), time.sleep, 1)
@@ -0,0 +1,74 @@
+import os
+
+import case_history
+from conftest import step
+from execution_plan import compile_case
+import last_run
+import suite_runner
+from suite_runner import SuiteRunner
+
+
+def _case(name, delay):
+    # Both cases hold the same Exclusive tag, so they never run together
+    return compile_case(name, [step("wait", "Check File Exists", exclusive="database",
+                                    details={"path": ".", "should_exist": "Yes", "step_delay": str(delay)})])
+
+
+def test_processes_defer_a_case_held_back_by_a_conflict_past_the_budget(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("TestReports")
+    # The history promises half a second each, so the plan takes both cases;
+    # X then runs for two seconds and leaves Y no time when its turn comes
+    case_history.save_history({"X": {"durations": [0.5], "steps": 1}, "Y": {"durations": [0.5], "steps": 1}})
+    runner = SuiteRunner([_case("X", 2), _case("Y", 0)], output=lambda text: None, budget=2)
+    results = runner.run(parallel=True, workers=2, engine="processes")
+
+    assert [result['name'] for result in results] == ["X"]
+    assert list(runner.deferred) == ["Y"]
+    assert "left" in runner.deferred["Y"]
+    # A deferred case leaves no result behind
+    assert "Y" not in last_run.load_last_run()
+    assert case_history.load_history()["Y"] == {"durations": [0.5], "steps": 1}
+    with open("test_summary_parallel.txt") as f:
+        summary = f.read()
+    assert "Y: ERROR" not in summary
+    assert "Deferred by the time budget: 1 case(s) not run" in summary
+
+
+def test_case_slots_follow_the_engine_limits(monkeypatch):
+    plans = [_case(f"C{index}", 0) for index in range(40)]
+    monkeypatch.setattr(suite_runner, "load_process_isolation", lambda: (False, 3, 20))
+    assert SuiteRunner._case_slots(plans, False, None, "threads") == 1
+    assert SuiteRunner._case_slots(plans, True, None, "threads") == suite_runner.DEFAULT_CASE_WORKERS
+    assert SuiteRunner._case_slots(plans[:4], True, None, "threads") == 4
+    assert SuiteRunner._case_slots(plans, True, None, "processes") == 3
+    assert SuiteRunner._case_slots(plans, True, None, "async") == 40
+    assert SuiteRunner._case_slots(plans, True, 5, "processes") == 5
+
+
+def test_the_budget_plan_uses_the_worker_count(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("TestReports")
+    case_history.save_history({name: {"durations": [1.0], "steps": 1} for name in "ABC"})
+    plans = [compile_case(name, [step("check", "Check File Exists", details={"path": ".", "should_exist": "Yes"})])
+             for name in "ABC"]
+    output = []
+    runner = SuiteRunner(plans, output=output.append, budget=2.5)
+    runner.run(parallel=True, workers=1)
+    # One worker fits two of the 1.2s estimates, not all three
+    assert "2 case(s) planned (~2.4s), 1 deferred" in "".join(output)
+
+
+def test_a_resumed_run_reports_the_cases_finished_before_the_interruption(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("TestReports")
+    finished = {"A": {'name': "A", 'success': False, 'status': "FAIL", 'steps': [], 'execution_time': 1.0}}
+    plan = compile_case("B", [step("check", "Check File Exists", details={"path": ".", "should_exist": "Yes"})])
+    runner = SuiteRunner([plan], output=lambda text: None, previous_results=finished, resumed={})
+    results = runner.run()
+
+    assert [result['name'] for result in results] == ["A", "B"]
+    assert not all(result['success'] for result in results)
+    with open("test_summary.txt") as f:
+        summary = f.read()
+    assert summary.startswith("A: FAIL\nB: ")
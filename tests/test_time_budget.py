@@ -0,0 +1,104 @@
+import pytest
+
+from conftest import step
+from execution_plan import CLEANUP_FIXTURE, SETUP_FIXTURE, compile_case
+import time_budget
+from time_budget import TimeBudget, budget_order, case_rank, parse_budget
+
+
+def _case(name, category="General", steps=1):
+    return compile_case(name, [step(category=category) for _ in range(steps)])
+
+
+def _history(**durations):
+    return {name: {"durations": [seconds], "steps": 1} for name, seconds in durations.items()}
+
+
+@pytest.mark.parametrize("text, seconds", [
+    ("900", 900), ("90s", 90), ("15m", 900), ("1.5h", 5400), (" 2 M ", 120), ("1.5", 1.5),
+])
+def test_parse_budget(text, seconds):
+    assert parse_budget(text) == seconds
+
+
+@pytest.mark.parametrize("text", ["0", "0m", "0.0"])
+def test_a_zero_budget_means_none(text):
+    assert parse_budget(text) is None
+
+
+@pytest.mark.parametrize("text", ["", "soon", "15min", "-5", "1e3"])
+def test_parse_budget_rejects_invalid_values(text):
+    with pytest.raises(ValueError):
+        parse_budget(text)
+
+
+def test_rank_comes_from_the_most_important_step():
+    assert case_rank(compile_case("A", [step(category="General"), step(category="Critical")])) == 0
+    assert case_rank(_case("B", "Validation")) == 1
+    assert case_rank(_case("C")) == 2
+
+
+def test_order_is_rank_then_failure_history_then_duration():
+    plans = [_case("Long"), _case("Short"), _case("Flaky"), _case("Check", "Validation"), _case("Key", "Critical")]
+    history = _history(Long=5, Short=1, Flaky=3, Check=9, Key=9)
+    history["Flaky"]["outcomes"] = [1, 1, 1]
+    assert [plan.name for plan in budget_order(plans, history)] == ["Key", "Check", "Flaky", "Short", "Long"]
+
+
+def test_plan_defers_what_does_not_fit_and_fills_with_shorter_cases():
+    plans = [_case("Key", "Critical"), _case("Long"), _case("Short")]
+    budget = TimeBudget(10, safety_factor=1.0)
+    chosen = budget.plan(plans, [], _history(Key=6, Long=5, Short=3))
+    assert [plan.name for plan in chosen] == ["Key", "Short"]
+    assert list(budget.deferred) == ["Long"]
+    assert "Time budget: 10s; 2 case(s) planned (~9.0s), 1 deferred" == budget.describe(chosen)
+    assert "Long: needs ~5.0s, would end after the budget" in budget.describe_deferred()
+
+
+def test_plan_spreads_cases_over_the_slots():
+    plans = [_case(name) for name in "ABCD"]
+    budget = TimeBudget(10, safety_factor=1.0)
+    chosen = budget.plan(plans, [], _history(A=6, B=6, C=4, D=4), slots=2)
+    assert len(chosen) == 4
+    assert budget.deferred == {}
+
+
+def test_plan_takes_the_fixtures_off_the_budget_and_applies_the_safety_factor():
+    setup = _case("Setup", SETUP_FIXTURE)
+    cleanup = _case("Cleanup", CLEANUP_FIXTURE)
+    budget = TimeBudget(10, safety_factor=1.5)
+    chosen = budget.plan([_case("A"), _case("B")], [setup, cleanup], _history(Setup=1, Cleanup=1, A=2, B=3))
+    # 10s - 3s of fixtures leaves 7s: A takes 3s, B would need 4.5s more
+    assert [plan.name for plan in chosen] == ["A"]
+    assert list(budget.deferred) == ["B"]
+
+
+def test_admit_checks_the_time_left_before_the_cleanup(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(time_budget.time, "monotonic", lambda: clock[0])
+    cleanup = _case("Cleanup", CLEANUP_FIXTURE)
+    budget = TimeBudget(10, safety_factor=1.0)
+    budget.plan([_case("A"), _case("B")], [cleanup], _history(A=3, B=3, Cleanup=2))
+    assert budget.deferred == {}
+
+    clock[0] = 104.0  # 6s left, 2s kept for the cleanup
+    assert budget.admit("A")
+    clock[0] = 105.5
+    assert not budget.admit("B")
+    assert budget.deferred == {"B": "needs ~3.0s, 2.5s left"}
+
+
+def test_plan_lays_conflicting_cases_out_one_after_the_other():
+    plans = [_case("A", "Critical"), _case("B", "Validation"), _case("C")]
+    conflicts = {"A": {"B": None}, "B": {"A": None}, "C": {}}
+    budget = TimeBudget(10, safety_factor=1.0)
+    chosen = budget.plan(plans, [], _history(A=6, B=6, C=4), slots=3, conflicts=conflicts)
+    # Three slots, but B cannot start before A ends at 6s
+    assert [plan.name for plan in chosen] == ["A", "C"]
+    assert list(budget.deferred) == ["B"]
+
+
+def test_describe_keeps_fractional_budgets():
+    budget = TimeBudget(90.5)
+    budget.plan([], [], {})
+    assert budget.describe([]).startswith("Time budget: 90.5s;")